@@ -24,7 +24,7 @@ from typing import List, Optional, Iterator, Dict
 import attr
 from google.cloud import bigquery, exceptions
 
-from recidiviz.big_query.big_query_view import BigQueryView
+from recidiviz.big_query.big_query_view import BigQueryView, VIEW_QUERY_HASH_LABEL
 from recidiviz.utils import metadata
 
 _clients_by_project_id = {}
@@ -145,7 +145,8 @@ class BigQueryClient:
                               # TODO(3020): BigQueryView now encodes dataset information, remove this parameter.
                               dataset_ref: bigquery.DatasetReference,
                               view: BigQueryView) -> bigquery.Table:
-        """Create a View if it does not exist, or update its query if it does.
+        """Create a View if it does not exist, or update its query if it does. The view is labeled with the
+        view_query_hash of its query.
 
         This runs synchronously and waits for the job to complete.
 
@@ -319,20 +320,22 @@ class BigQueryClient:
     @abc.abstractmethod
     def insert_into_table_from_cloud_storage_async(
             self,
-            source_uri: str,
+            source_uris: List[str],
             destination_dataset_ref: bigquery.DatasetReference,
             destination_table_id: str,
             destination_table_schema: List[bigquery.SchemaField]) -> bigquery.job.LoadJob:
         """Inserts rows from CSV data in GCS into a table in BigQuery.
 
-        Given a desired table name, source data URI and destination schema, inserts the data into the BigQuery table.
+        Given a desired table name, source data URIs and destination schema, inserts the data from all source URIs into
+        the BigQuery table in a single load job.
 
         This starts the job, but does not wait until it completes.
 
         Tables are created if they do not exist, and rows are merely appended if they do exist.
 
         Args:
-            source_uri: The path in Google Cloud Storage to read contents from (starts with 'gs://').
+            source_uris: The paths in Google Cloud Storage to read contents from (starting with 'gs://'). All files
+                must have the same columns.
             destination_dataset_ref: The BigQuery dataset to load the table into. Gets created
                 if it does not already exist.
             destination_table_id: String name of the table to import.
@@ -465,10 +468,11 @@ class BigQueryClientImpl(BigQueryClient):
     def create_or_update_view(self, dataset_ref: bigquery.DatasetReference, view: BigQueryView) -> bigquery.Table:
         bq_view = bigquery.Table(view)
         bq_view.view_query = view.view_query
+        bq_view.labels = {VIEW_QUERY_HASH_LABEL: view.view_query_hash}
 
         if self.table_exists(dataset_ref, view.view_id):
             logging.info("Updating existing view [%s]", str(bq_view))
-            return self.client.update_table(bq_view, ['view_query'])
+            return self.client.update_table(bq_view, ['view_query', 'labels'])
 
         logging.info("Creating view %s", str(bq_view))
         return self.client.create_table(bq_view)
@@ -480,7 +484,7 @@ class BigQueryClientImpl(BigQueryClient):
             destination_table_id: str,
             destination_table_schema: List[bigquery.SchemaField]) -> bigquery.job.LoadJob:
 
-        return self._load_table_from_cloud_storage_async(source_uri=source_uri,
+        return self._load_table_from_cloud_storage_async(source_uris=[source_uri],
                                                          destination_dataset_ref=destination_dataset_ref,
                                                          destination_table_id=destination_table_id,
                                                          destination_table_schema=destination_table_schema,
@@ -488,7 +492,7 @@ class BigQueryClientImpl(BigQueryClient):
 
     def _load_table_from_cloud_storage_async(
             self,
-            source_uri: str,
+            source_uris: List[str],
             destination_dataset_ref: bigquery.DatasetReference,
             destination_table_id: str,
             destination_table_schema: List[bigquery.SchemaField],
@@ -505,7 +509,7 @@ class BigQueryClientImpl(BigQueryClient):
         job_config.write_disposition = write_disposition
 
         load_job = self.client.load_table_from_uri(
-            source_uri,
+            source_uris,
             destination_table_ref,
             job_config=job_config
         )
@@ -678,11 +682,11 @@ class BigQueryClientImpl(BigQueryClient):
 
     def insert_into_table_from_cloud_storage_async(
             self,
-            source_uri: str,
+            source_uris: List[str],
             destination_dataset_ref: bigquery.DatasetReference,
             destination_table_id: str,
             destination_table_schema: List[bigquery.SchemaField]) -> bigquery.job.LoadJob:
-        return self._load_table_from_cloud_storage_async(source_uri=source_uri,
+        return self._load_table_from_cloud_storage_async(source_uris=source_uris,
                                                          destination_dataset_ref=destination_dataset_ref,
                                                          destination_table_id=destination_table_id,
                                                          destination_table_schema=destination_table_schema,
@@ -16,6 +16,7 @@
 # =============================================================================
 """An implementation of bigquery.TableReference with extra functionality related to views."""
 import abc
+import hashlib
 from typing import Optional, Dict, TypeVar, Generic
 
 from google.cloud import bigquery
@@ -24,6 +25,9 @@ from recidiviz.utils import metadata, environment
 
 PROJECT_ID_KEY = 'project_id'
 
+# Label set on deployed views that holds the view_query_hash of the deployed query.
+VIEW_QUERY_HASH_LABEL = 'view_query_hash'
+
 
 @environment.test_only
 def test_only_project_id() -> str:
@@ -72,6 +76,12 @@ class BigQueryView(bigquery.TableReference):
     def view_query(self) -> str:
         return self._view_query
 
+    @property
+    def view_query_hash(self) -> str:
+        """A hash of the view_query, which is stored as a label on the deployed view so that unchanged views do not need
+        to be updated. A SHA-1 hex digest fits within the 63 character limit on BigQuery label values."""
+        return hashlib.sha1(self.view_query.encode('utf-8')).hexdigest()
+
     @property
     def select_query(self) -> str:
         return f'SELECT * FROM `{self.project}.{self.dataset_id}.{self.view_id}`'
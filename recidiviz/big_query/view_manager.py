@@ -23,11 +23,15 @@ This can be run on-demand whenever a set of views needs to be updated. Run local
 """
 import argparse
 import logging
+import re
 import sys
-from typing import Dict, List
+from concurrent import futures
+from typing import Dict, List, Set, Tuple
+
+from google.cloud import bigquery
 
 from recidiviz.big_query.big_query_client import BigQueryClientImpl
-from recidiviz.big_query.big_query_view import BigQueryView, BigQueryViewBuilder
+from recidiviz.big_query.big_query_view import BigQueryView, BigQueryViewBuilder, VIEW_QUERY_HASH_LABEL
 from recidiviz.calculator.query.county.view_config import VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as COUNTY_VIEW_BUILDERS
 from recidiviz.calculator.query.state.view_config import VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as STATE_VIEW_BUILDERS
 from recidiviz.validation.views.view_config import VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as VALIDATION_VIEW_BUILDERS
@@ -40,6 +44,12 @@ VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE: Dict[str, Dict[str, List[BigQueryViewBuilder]
     'validation': VALIDATION_VIEW_BUILDERS
 }
 
+# Matches fully-qualified table references of the form `project.dataset.table` in a view query.
+_TABLE_REFERENCE_REGEX = re.compile(r'`([\w-]+)\.(\w+)\.(\w+)`')
+
+# A view is identified by its (dataset_id, view_id).
+_ViewKey = Tuple[str, str]
+
 
 def create_dataset_and_update_views_for_view_builders(view_builders_to_update: Dict[str, List[BigQueryViewBuilder]]):
     """Converts the map of dataset_ids to BigQueryViewBuilders lists into a map of dataset_ids to BigQueryViews by
@@ -61,16 +71,74 @@ def _create_dataset_and_update_views(views_to_update: Dict[str, List[BigQueryVie
     For each dataset key in the given dictionary, creates the dataset if it does not exist, and creates or updates the
     underlying views mapped to that dataset.
 
+    Views are updated in waves, where each view is in a later wave than all of the views in |views_to_update| that it
+    queries, and the views in a single wave are updated concurrently. Views that are already deployed with the same
+    view_query are not updated.
+
     Args:
         views_to_update: Dict of BigQuery dataset name to list of view objects to be created or updated.
     """
     bq_client = BigQueryClientImpl()
+    dataset_refs: Dict[str, bigquery.DatasetReference] = {}
+    deployed_view_query_hashes: Dict[_ViewKey, str] = {}
+    views: Dict[_ViewKey, BigQueryView] = {}
     for dataset_name, view_list in views_to_update.items():
         views_dataset_ref = bq_client.dataset_ref_for_id(dataset_name)
         bq_client.create_dataset_if_necessary(views_dataset_ref)
+        dataset_refs[dataset_name] = views_dataset_ref
+
+        for table in bq_client.list_tables(dataset_name):
+            view_query_hash = (table.labels or {}).get(VIEW_QUERY_HASH_LABEL)
+            if view_query_hash:
+                deployed_view_query_hashes[(dataset_name, table.table_id)] = view_query_hash
 
         for view in view_list:
-            bq_client.create_or_update_view(views_dataset_ref, view)
+            views[(dataset_name, view.view_id)] = view
+
+    with futures.ThreadPoolExecutor() as executor:
+        for wave in _get_view_update_waves(views):
+            views_to_deploy = [key for key in wave
+                               if deployed_view_query_hashes.get(key) != views[key].view_query_hash]
+            logging.info('Updating %d views, skipping %d unchanged views', len(views_to_deploy),
+                         len(wave) - len(views_to_deploy))
+
+            update_futures = [executor.submit(bq_client.create_or_update_view, dataset_refs[key[0]], views[key])
+                              for key in views_to_deploy]
+
+            # Waits for every view in this wave to be updated before moving on to the views that query them, and
+            # raises the first error encountered.
+            for future in update_futures:
+                future.result()
+
+
+def _get_view_update_waves(views: Dict[_ViewKey, BigQueryView]) -> List[List[_ViewKey]]:
+    """Returns the keys of the given |views|, grouped into waves such that every view is in a later wave than all of
+    the other |views| that its view_query references. Raises a ValueError if the views have a circular dependency."""
+    parents: Dict[_ViewKey, Set[_ViewKey]] = {key: _get_parent_view_keys(view, views) for key, view in views.items()}
+
+    waves = []
+    remaining = dict(parents)
+    updated: Set[_ViewKey] = set()
+    while remaining:
+        wave = [key for key, view_parents in remaining.items() if view_parents <= updated]
+        if not wave:
+            raise ValueError(f'Found circular dependency between views: {sorted(remaining)}')
+        for key in wave:
+            del remaining[key]
+        updated.update(wave)
+        waves.append(wave)
+
+    return waves
+
+
+def _get_parent_view_keys(view: BigQueryView, views: Dict[_ViewKey, BigQueryView]) -> Set[_ViewKey]:
+    """Returns the keys of the |views| that the given |view| references in its view_query."""
+    parent_keys = set()
+    for project_id, dataset_id, table_id in _TABLE_REFERENCE_REGEX.findall(view.view_query):
+        key = (dataset_id, table_id)
+        if project_id == view.project and key in views and key != (view.dataset_id, view.view_id):
+            parent_keys.add(key)
+    return parent_keys
 
 
 def parse_arguments(argv):
@@ -308,12 +308,6 @@ def combination_incarceration_metrics(
 
     metrics.append((event_based_same_month_combo, 1))
 
-    # Create the person-based combo for the 1-month period of the month of the event
-    person_based_same_month_combo = augmented_combo_for_calculations(
-        combo, incarceration_event.state_code,
-        event_year, event_month,
-        MetricMethodologyType.PERSON, metric_period_months=metric_period_months)
-
     day_match_value = event_date.day if is_daily_metric else None
 
     # Get the events of the same type that happened in the same month
@@ -327,6 +321,12 @@ def combination_incarceration_metrics(
             incarceration_event,
             last_day_of_month(event_date),
             events_in_period):
+        # Create the person-based combo for the 1-month period of the month of the event
+        person_based_same_month_combo = augmented_combo_for_calculations(
+            combo, incarceration_event.state_code,
+            event_year, event_month,
+            MetricMethodologyType.PERSON, metric_period_months=metric_period_months)
+
         # Include this event in the person-based count
         metrics.append((person_based_same_month_combo, 1))
 
@@ -385,12 +385,6 @@ def combination_incarceration_metric_period_metrics(
     for period_length, events_in_period in periods_and_events.items():
         if incarceration_event in events_in_period:
             # This event falls within this metric period
-            person_based_period_combo = augmented_combo_for_calculations(
-                combo, incarceration_event.state_code,
-                period_end_year, period_end_month,
-                MetricMethodologyType.PERSON, period_length
-            )
-
             related_events_in_period: List[IncarcerationEvent] = []
 
             if isinstance(incarceration_event, IncarcerationAdmissionEvent):
@@ -408,6 +402,12 @@ def combination_incarceration_metric_period_metrics(
                     incarceration_event,
                     metric_period_end_date,
                     related_events_in_period):
+                person_based_period_combo = augmented_combo_for_calculations(
+                    combo, incarceration_event.state_code,
+                    period_end_year, period_end_month,
+                    MetricMethodologyType.PERSON, period_length
+                )
+
                 # Include this event in the person-based count for this time period
                 metrics.append((person_based_period_combo, 1))
 
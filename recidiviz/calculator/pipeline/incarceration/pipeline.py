@@ -44,7 +44,8 @@ from recidiviz.calculator.pipeline.utils.entity_hydration_utils import SetSenten
     ConvertSentencesToStateSpecificType
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
+from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity, BigQueryReadCache, \
+    register_state_entity_coder
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
 from recidiviz.calculator.query.state.views.reference.incarceration_period_judicial_district_association import \
     INCARCERATION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATION_VIEW_NAME
@@ -327,7 +328,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         metric_types: List[str],
         state_code: Optional[str],
         calculation_end_month: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        use_state_entity_coder: bool):
     """Runs the incarceration calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
@@ -346,12 +348,19 @@ def run(apache_beam_pipeline_options: PipelineOptions,
 
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
+    if use_state_entity_coder:
+        register_state_entity_coder()
+
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
+        # Shared by all entity extraction so that each table is only read from BigQuery once
+        bq_read_cache = BigQueryReadCache()
+
         # Get StatePersons
         persons = (p | 'Load StatePersons' >>
                    BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StatePerson,
                                    unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set))
+                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set,
+                                   bq_read_cache=bq_read_cache))
 
         # Get StateSentenceGroups
         sentence_groups = (p | 'Load StateSentenceGroups' >>
@@ -361,7 +370,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                unifying_id_field=entities.StatePerson.get_class_id_name(),
                                build_related_entities=True,
                                unifying_id_field_filter_set=person_id_filter_set,
-                               state_code=state_code
+                               state_code=state_code,
+                               bq_read_cache=bq_read_cache
                            ))
 
         # Get StateIncarcerationSentences
@@ -372,7 +382,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                        unifying_id_field=entities.StatePerson.get_class_id_name(),
                                        build_related_entities=True,
                                        unifying_id_field_filter_set=person_id_filter_set,
-                                       state_code=state_code
+                                       state_code=state_code,
+                                       bq_read_cache=bq_read_cache
                                    ))
 
         # Get StateSupervisionSentences
@@ -383,7 +394,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                      unifying_id_field=entities.StatePerson.get_class_id_name(),
                                      build_related_entities=True,
                                      unifying_id_field_filter_set=person_id_filter_set,
-                                     state_code=state_code
+                                     state_code=state_code,
+                                     bq_read_cache=bq_read_cache
                                  ))
 
         if state_code is None or state_code == 'US_MO':
@@ -279,13 +279,6 @@ def combination_program_monthly_metrics(
 
     metrics.append((event_based_same_month_combo, 1))
 
-    # Create the person-based combo for the base metric period of the month of the event
-    person_based_same_month_combo = augmented_combo_for_calculations(
-        combo, program_event.state_code,
-        event_year, event_month,
-        MetricMethodologyType.PERSON, base_metric_period
-    )
-
     events_in_period: List[ProgramEvent] = []
 
     if metric_type == ProgramMetricType.PARTICIPATION:
@@ -308,6 +301,13 @@ def combination_program_monthly_metrics(
                               program_event,
                               last_day_of_month(event_date),
                               events_in_period):
+        # Create the person-based combo for the base metric period of the month of the event
+        person_based_same_month_combo = augmented_combo_for_calculations(
+            combo, program_event.state_code,
+            event_year, event_month,
+            MetricMethodologyType.PERSON, base_metric_period
+        )
+
         # Include this event in the person-based count
         metrics.append((person_based_same_month_combo, 1))
 
@@ -342,12 +342,6 @@ def combination_program_metric_period_metrics(
     for period_length, events_in_period in periods_and_events.items():
         if program_event in events_in_period:
             # This event falls within this metric period
-            person_based_period_combo = augmented_combo_for_calculations(
-                combo, program_event.state_code,
-                period_end_year, period_end_month,
-                MetricMethodologyType.PERSON, period_length
-            )
-
             referral_events_in_period = [
                 event for event in events_in_period
                 if isinstance(event, ProgramReferralEvent)
@@ -358,6 +352,12 @@ def combination_program_metric_period_metrics(
                     program_event,
                     metric_period_end_date,
                     referral_events_in_period):
+                person_based_period_combo = augmented_combo_for_calculations(
+                    combo, program_event.state_code,
+                    period_end_year, period_end_month,
+                    MetricMethodologyType.PERSON, period_length
+                )
+
                 # Include this event in the person-based count for this time period
                 metrics.append((person_based_period_combo, 1))
 
@@ -36,7 +36,8 @@ from recidiviz.calculator.pipeline.program.program_event import ProgramEvent
 from recidiviz.calculator.pipeline.utils.beam_utils import ConvertDictToKVTuple
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
+from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity, BigQueryReadCache, \
+    register_state_entity_coder
 from recidiviz.calculator.pipeline.utils.metric_utils import \
     json_serializable_metric_key
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
@@ -310,7 +311,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         metric_types: List[str],
         state_code: Optional[str],
         calculation_end_month: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        use_state_entity_coder: bool):
     """Runs the program calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
@@ -329,12 +331,19 @@ def run(apache_beam_pipeline_options: PipelineOptions,
 
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
+    if use_state_entity_coder:
+        register_state_entity_coder()
+
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
+        # Shared by all entity extraction so that each table is only read from BigQuery once
+        bq_read_cache = BigQueryReadCache()
+
         # Get StatePersons
         persons = (p | 'Load Persons' >>
                    BuildRootEntity(dataset=input_dataset, root_entity_class=entities.StatePerson,
                                    unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set))
+                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set,
+                                   bq_read_cache=bq_read_cache))
 
         # Get StateProgramAssignments
         program_assignments = (p | 'Load Program Assignments' >>
@@ -344,7 +353,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                                unifying_id_field=entities.StatePerson.get_class_id_name(),
                                                build_related_entities=True,
                                                unifying_id_field_filter_set=person_id_filter_set,
-                                               state_code=state_code))
+                                               state_code=state_code,
+                                               bq_read_cache=bq_read_cache))
 
         # Get StateAssessments
         assessments = (p | 'Load Assessments' >>
@@ -352,7 +362,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                        unifying_id_field=entities.StatePerson.get_class_id_name(),
                                        build_related_entities=False,
                                        unifying_id_field_filter_set=person_id_filter_set,
-                                       state_code=state_code))
+                                       state_code=state_code,
+                                       bq_read_cache=bq_read_cache))
 
         # Get StateSupervisionPeriods
         supervision_periods = (p | 'Load SupervisionPeriods' >>
@@ -360,7 +371,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                                unifying_id_field=entities.StatePerson.get_class_id_name(),
                                                build_related_entities=False,
                                                unifying_id_field_filter_set=person_id_filter_set,
-                                               state_code=state_code))
+                                               state_code=state_code,
+                                               bq_read_cache=bq_read_cache))
 
         supervision_period_to_agent_association_query = select_all_by_person_query(
             reference_dataset, SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
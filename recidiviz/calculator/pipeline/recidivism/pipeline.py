@@ -46,7 +46,8 @@ from recidiviz.calculator.pipeline.utils.entity_hydration_utils import \
     SetViolationResponseOnIncarcerationPeriod, SetViolationOnViolationsResponse
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
+from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity, BigQueryReadCache, \
+    register_state_entity_coder
 from recidiviz.calculator.pipeline.utils.metric_utils import \
     json_serializable_metric_key
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
@@ -325,7 +326,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         output: str,
         metric_types: List[str],
         state_code: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        use_state_entity_coder: bool):
     """Runs the recidivism calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is
@@ -346,13 +348,20 @@ def run(apache_beam_pipeline_options: PipelineOptions,
 
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
+    if use_state_entity_coder:
+        register_state_entity_coder()
+
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
+        # Shared by all entity extraction so that each table is only read from BigQuery once
+        bq_read_cache = BigQueryReadCache()
+
         # Get StatePersons
         persons = (p
                    | 'Load Persons' >>
                    BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StatePerson,
                                    unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set))
+                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set,
+                                   bq_read_cache=bq_read_cache))
 
         # Get StateIncarcerationPeriods
         incarceration_periods = (p
@@ -362,7 +371,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
                                                  unifying_id_field=entities.StatePerson.get_class_id_name(),
                                                  build_related_entities=True,
                                                  unifying_id_field_filter_set=person_id_filter_set,
-                                                 state_code=state_code
+                                                 state_code=state_code,
+                                                 bq_read_cache=bq_read_cache
                                                  ))
 
         # Get StateSupervisionViolations
@@ -372,7 +382,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
              BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StateSupervisionViolation,
                              unifying_id_field=entities.StatePerson.get_class_id_name(), build_related_entities=True,
                              unifying_id_field_filter_set=person_id_filter_set,
-                             state_code=state_code
+                             state_code=state_code,
+                             bq_read_cache=bq_read_cache
                              ))
 
         # TODO(2769): Don't bring this in as a root entity
@@ -383,7 +394,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
              BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StateSupervisionViolationResponse,
                              unifying_id_field=entities.StatePerson.get_class_id_name(), build_related_entities=True,
                              unifying_id_field_filter_set=person_id_filter_set,
-                             state_code=state_code
+                             state_code=state_code,
+                             bq_read_cache=bq_read_cache
                              ))
 
         # Group StateSupervisionViolationResponses and
@@ -21,16 +21,14 @@ SupervisionTimeBuckets into supervision metrics, key-value pairs where the key r
 represented in the data point, and the value represents an indicator of whether the person should contribute to that
 metric.
 """
-from collections import defaultdict
 from datetime import date
-from operator import attrgetter
 from typing import Dict, List, Tuple, Any, Optional
 
 from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
     SupervisionTimeBucket, RevocationReturnSupervisionTimeBucket, ProjectedSupervisionCompletionBucket, \
     NonRevocationReturnSupervisionTimeBucket, SupervisionTerminationBucket
 from recidiviz.calculator.pipeline.utils.calculator_utils import \
-    augmented_combo_for_calculations, relevant_metric_periods, \
+    augmented_combo_for_calculations, \
     augment_combination, include_in_historical_metrics, \
     get_calculation_month_lower_bound_date, characteristics_with_person_id_fields, add_demographic_characteristics, \
     get_calculation_month_upper_bound_date
@@ -40,6 +38,7 @@ from recidiviz.calculator.pipeline.supervision.metrics import \
     SupervisionMetricType
 from recidiviz.calculator.pipeline.utils.metric_utils import \
     MetricMethodologyType
+from recidiviz.calculator.pipeline.utils.supervision_time_bucket_index import SupervisionTimeBucketIndex
 from recidiviz.calculator.pipeline.utils.state_utils.state_calculation_config_manager import \
     supervision_types_distinct_for_state
 from recidiviz.persistence.entity.state.entities import StatePerson
@@ -71,9 +70,6 @@ def map_supervision_combinations(person: StatePerson,
         A list of key-value tuples representing specific metric combinations and the value corresponding to that metric.
     """
     metrics: List[Tuple[Dict[str, Any], Any]] = []
-    periods_and_buckets: Dict[int, List[SupervisionTimeBucket]] = defaultdict()
-
-    supervision_time_buckets.sort(key=attrgetter('year', 'month'))
 
     calculation_month_upper_bound = get_calculation_month_upper_bound_date(calculation_end_month)
 
@@ -82,14 +78,16 @@ def map_supervision_combinations(person: StatePerson,
     include_metric_period_output = calculation_month_upper_bound == get_calculation_month_upper_bound_date(
         date.today().strftime('%Y-%m'))
 
-    if include_metric_period_output:
-        periods_and_buckets = _classify_buckets_by_relevant_metric_periods(supervision_time_buckets,
-                                                                           calculation_month_upper_bound)
+    # Index the buckets once so that the person-based counts for each bucket do not require a scan over all of the
+    # person's buckets
+    supervision_time_bucket_index = SupervisionTimeBucketIndex(
+        supervision_time_buckets=supervision_time_buckets,
+        metric_period_end_date=(calculation_month_upper_bound if include_metric_period_output else None))
 
     calculation_month_lower_bound = get_calculation_month_lower_bound_date(
         calculation_month_upper_bound, calculation_month_count)
 
-    for supervision_time_bucket in supervision_time_buckets:
+    for supervision_time_bucket in supervision_time_bucket_index.supervision_time_buckets:
         if isinstance(supervision_time_bucket, ProjectedSupervisionCompletionBucket):
             if metric_inclusions.get(SupervisionMetricType.SUCCESS):
                 characteristic_combo_success = characteristics_dict(
@@ -98,7 +96,7 @@ def map_supervision_combinations(person: StatePerson,
                 supervision_success_metrics = map_metric_combinations(
                     characteristic_combo_success, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    supervision_time_bucket_index,
                     SupervisionMetricType.SUCCESS, include_metric_period_output)
 
                 metrics.extend(supervision_success_metrics)
@@ -115,7 +113,7 @@ def map_supervision_combinations(person: StatePerson,
                 successful_sentence_length_metrics = map_metric_combinations(
                     characteristic_combo_successful_sentence_length, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    supervision_time_bucket_index,
                     SupervisionMetricType.SUCCESSFUL_SENTENCE_DAYS_SERVED, include_metric_period_output)
 
                 metrics.extend(successful_sentence_length_metrics)
@@ -128,7 +126,7 @@ def map_supervision_combinations(person: StatePerson,
                 termination_metrics = map_metric_combinations(
                     characteristic_combo_termination, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    supervision_time_bucket_index,
                     SupervisionMetricType.TERMINATION, include_metric_period_output)
 
                 metrics.extend(termination_metrics)
@@ -141,7 +139,7 @@ def map_supervision_combinations(person: StatePerson,
                 population_metrics = map_metric_combinations(
                     characteristic_combo_population, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    supervision_time_bucket_index,
                     SupervisionMetricType.POPULATION,
                     # The SupervisionPopulationMetric metric is explicitly a daily metric
                     include_metric_period_output=False)
@@ -157,7 +155,7 @@ def map_supervision_combinations(person: StatePerson,
                 compliance_metrics = map_metric_combinations(
                     characteristic_combo_compliance, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    supervision_time_bucket_index,
                     SupervisionMetricType.COMPLIANCE,
                     # The SupervisionCaseComplianceMetric metric is explicitly a daily metric
                     include_metric_period_output=False)
@@ -174,8 +172,7 @@ def map_supervision_combinations(person: StatePerson,
                         supervision_time_bucket,
                         calculation_month_upper_bound,
                         calculation_month_lower_bound,
-                        supervision_time_buckets,
-                        periods_and_buckets,
+                        supervision_time_bucket_index,
                         SupervisionMetricType.REVOCATION,
                         include_metric_period_output)
 
@@ -190,8 +187,7 @@ def map_supervision_combinations(person: StatePerson,
                         supervision_time_bucket,
                         calculation_month_upper_bound,
                         calculation_month_lower_bound,
-                        supervision_time_buckets,
-                        periods_and_buckets,
+                        supervision_time_bucket_index,
                         SupervisionMetricType.REVOCATION_ANALYSIS,
                         include_metric_period_output
                     )
@@ -206,7 +202,7 @@ def map_supervision_combinations(person: StatePerson,
                     revocation_violation_type_analysis_metrics = get_revocation_violation_type_analysis_metrics(
                         supervision_time_bucket, characteristic_combo_revocation_violation_type_analysis,
                         calculation_month_upper_bound, calculation_month_lower_bound,
-                        supervision_time_buckets, periods_and_buckets,
+                        supervision_time_bucket_index,
                         include_metric_period_output
                     )
 
@@ -367,8 +363,7 @@ def map_metric_combinations(
         supervision_time_bucket: SupervisionTimeBucket,
         calculation_month_upper_bound: date,
         calculation_month_lower_bound: Optional[date],
-        all_supervision_time_buckets: List[SupervisionTimeBucket],
-        periods_and_buckets: Dict[int, List[SupervisionTimeBucket]],
+        supervision_time_bucket_index: SupervisionTimeBucketIndex,
         metric_type: SupervisionMetricType,
         include_metric_period_output: bool) -> \
         List[Tuple[Dict[str, Any], Any]]:
@@ -380,9 +375,7 @@ def map_metric_combinations(
         supervision_time_bucket: The time bucket on supervision from which the combination was derived.
         calculation_month_upper_bound: The year and month of the last month for which metrics should be calculated.
         calculation_month_lower_bound: The date of the first month to be included in the monthly calculations
-        all_supervision_time_buckets: All of the person's SupervisionTimeBuckets
-        periods_and_buckets: Dictionary mapping metric period month lengths to the SupervisionTimeBuckets that fall in
-            that period.
+        supervision_time_bucket_index: The index of all of the person's SupervisionTimeBuckets
         metric_type: The metric type to set on each combination.
         include_metric_period_output: Whether or not to include metrics for the various metric periods before the
             current month. If False, will still include metric_period_months = 0 or 1 for the current month.
@@ -404,14 +397,14 @@ def map_metric_combinations(
 
         metrics.extend(combination_supervision_monthly_metrics(
             characteristic_combo, supervision_time_bucket,
-            all_supervision_time_buckets, metric_type, is_daily_metric))
+            supervision_time_bucket_index, metric_type, is_daily_metric))
 
     if include_metric_period_output:
         metrics.extend(combination_supervision_metric_period_metrics(
             characteristic_combo,
             supervision_time_bucket,
             calculation_month_upper_bound,
-            periods_and_buckets,
+            supervision_time_bucket_index,
             metric_type
         ))
 
@@ -423,8 +416,7 @@ def get_revocation_violation_type_analysis_metrics(
         characteristic_combo: Dict[str, Any],
         calculation_month_upper_bound: date,
         calculation_month_lower_bound: Optional[date],
-        all_buckets_sorted: List[SupervisionTimeBucket],
-        periods_and_buckets: Dict[int, List[SupervisionTimeBucket]],
+        supervision_time_bucket_index: SupervisionTimeBucketIndex,
         include_metric_period_output: bool) -> List[Tuple[Dict[str, Any], Any]]:
     """Produces metrics of the type REVOCATION_VIOLATION_TYPE_ANALYSIS. For each violation type list in the bucket's
     violation_type_frequency_counter, produces metrics for each violation type in the list, and one with a
@@ -442,8 +434,7 @@ def get_revocation_violation_type_analysis_metrics(
                 supervision_time_bucket,
                 calculation_month_upper_bound,
                 calculation_month_lower_bound,
-                all_buckets_sorted,
-                periods_and_buckets,
+                supervision_time_bucket_index,
                 SupervisionMetricType.REVOCATION_VIOLATION_TYPE_ANALYSIS,
                 include_metric_period_output
             )
@@ -462,8 +453,7 @@ def get_revocation_violation_type_analysis_metrics(
                     supervision_time_bucket,
                     calculation_month_upper_bound,
                     calculation_month_lower_bound,
-                    all_buckets_sorted,
-                    periods_and_buckets,
+                    supervision_time_bucket_index,
                     SupervisionMetricType.REVOCATION_VIOLATION_TYPE_ANALYSIS,
                     include_metric_period_output
                 )
@@ -476,7 +466,7 @@ def get_revocation_violation_type_analysis_metrics(
 def combination_supervision_monthly_metrics(
         combo: Dict[str, Any],
         supervision_time_bucket: SupervisionTimeBucket,
-        all_supervision_time_buckets: List[SupervisionTimeBucket],
+        supervision_time_bucket_index: SupervisionTimeBucketIndex,
         metric_type: SupervisionMetricType,
         is_daily_metric: bool
 ) -> List[Tuple[Dict[str, Any], int]]:
@@ -489,7 +479,7 @@ def combination_supervision_monthly_metrics(
     Args:
         combo: A characteristic combination to convert into metrics
         supervision_time_bucket: The SupervisionTimeBucket from which the combination was derived
-        all_supervision_time_buckets: All of this person's SupervisionTimeBuckets
+        supervision_time_bucket_index: The index of all of this person's SupervisionTimeBuckets
         metric_type: The type of metric being tracked by this combo
         is_daily_metric:  If True, limits person-based counts to the date of the event. If False, limits person-based
             counts to the month of the event.
@@ -505,12 +495,6 @@ def combination_supervision_monthly_metrics(
 
     base_metric_period = 0 if is_daily_metric else 1
 
-    # Add event-based combo for the base metric period of the month and year of the bucket
-    event_based_same_bucket_combo = augmented_combo_for_calculations(
-        combo, supervision_time_bucket.state_code,
-        bucket_year, bucket_month,
-        MetricMethodologyType.EVENT, base_metric_period)
-
     event_combo_value = None
 
     if isinstance(supervision_time_bucket, ProjectedSupervisionCompletionBucket):
@@ -536,70 +520,43 @@ def combination_supervision_monthly_metrics(
         # If the event_combo_value is not set, then exclude this bucket from all metrics
         return metrics
 
-    # TODO(2913): Exclude combos with a supervision_type of DUAL from event-based counts
-    metrics.append((event_based_same_bucket_combo, event_combo_value))
-
-    # Create the person-based combo for the base metric period of the month of the bucket
-    person_based_same_bucket_combo = augmented_combo_for_calculations(
+    # Add event-based combo for the base metric period of the month and year of the bucket
+    event_based_same_bucket_combo = augmented_combo_for_calculations(
         combo, supervision_time_bucket.state_code,
         bucket_year, bucket_month,
-        MetricMethodologyType.PERSON, base_metric_period
-    )
+        MetricMethodologyType.EVENT, base_metric_period)
+
+    # TODO(2913): Exclude combos with a supervision_type of DUAL from event-based counts
+    metrics.append((event_based_same_bucket_combo, event_combo_value))
 
     buckets_in_period: List[SupervisionTimeBucket] = []
 
     if metric_type == SupervisionMetricType.POPULATION:
         # Get all other supervision time buckets for the same day as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if (isinstance(bucket, (RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket)))
-            and bucket.bucket_date == supervision_time_bucket.bucket_date
-        ]
-    elif metric_type == SupervisionMetricType.REVOCATION:
+        buckets_in_period = supervision_time_bucket_index.population_buckets_on_date(
+            supervision_time_bucket.bucket_date)
+    elif metric_type in (SupervisionMetricType.REVOCATION,
+                         SupervisionMetricType.REVOCATION_ANALYSIS,
+                         SupervisionMetricType.REVOCATION_VIOLATION_TYPE_ANALYSIS):
         # Get all other revocation supervision buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, RevocationReturnSupervisionTimeBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
+        buckets_in_period = supervision_time_bucket_index.buckets_of_type_in_month(
+            RevocationReturnSupervisionTimeBucket, bucket_year, bucket_month)
     elif metric_type in (SupervisionMetricType.SUCCESS, SupervisionMetricType.SUCCESSFUL_SENTENCE_DAYS_SERVED):
         # Get all other projected completion buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, ProjectedSupervisionCompletionBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
+        buckets_in_period = supervision_time_bucket_index.buckets_of_type_in_month(
+            ProjectedSupervisionCompletionBucket, bucket_year, bucket_month)
     elif metric_type == SupervisionMetricType.TERMINATION:
         # Get all other termination buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, SupervisionTerminationBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
-    elif metric_type in (SupervisionMetricType.REVOCATION_ANALYSIS,
-                         SupervisionMetricType.REVOCATION_VIOLATION_TYPE_ANALYSIS):
-        # Get all other revocation supervision buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, RevocationReturnSupervisionTimeBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
+        buckets_in_period = supervision_time_bucket_index.buckets_of_type_in_month(
+            SupervisionTerminationBucket, bucket_year, bucket_month)
     elif metric_type == SupervisionMetricType.COMPLIANCE:
         if supervision_time_bucket.case_compliance is None:
             raise ValueError("Attempting to calculate COMPLIANCE metrics on a SupervisionTimeBucket that has no"
                              "case_compliance set.")
 
         # Get all other NonRevocationReturnSupervisionTimeBucket buckets with a set case_compliance field
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, NonRevocationReturnSupervisionTimeBucket)
-            and bucket.case_compliance is not None
-            and bucket.case_compliance.date_of_evaluation == supervision_time_bucket.case_compliance.date_of_evaluation
-        ]
+        buckets_in_period = supervision_time_bucket_index.compliance_buckets_on_evaluation_date(
+            supervision_time_bucket.case_compliance.date_of_evaluation)
 
     if buckets_in_period and include_supervision_in_count(
             combo,
@@ -608,6 +565,13 @@ def combination_supervision_monthly_metrics(
             metric_type):
         person_combo_value = _person_combo_value(combo, supervision_time_bucket, buckets_in_period, metric_type)
 
+        # Create the person-based combo for the base metric period of the month of the bucket
+        person_based_same_bucket_combo = augmented_combo_for_calculations(
+            combo, supervision_time_bucket.state_code,
+            bucket_year, bucket_month,
+            MetricMethodologyType.PERSON, base_metric_period
+        )
+
         # Include this event in the person-based count
         metrics.append((person_based_same_bucket_combo, person_combo_value))
 
@@ -618,7 +582,7 @@ def combination_supervision_metric_period_metrics(
         combo: Dict[str, Any],
         supervision_time_bucket: SupervisionTimeBucket,
         metric_period_end_date: date,
-        periods_and_buckets: Dict[int, List[SupervisionTimeBucket]],
+        supervision_time_bucket_index: SupervisionTimeBucketIndex,
         metric_type: SupervisionMetricType) \
         -> List[Tuple[Dict[str, Any], int]]:
     """Returns all unique supervision metrics for the given time bucket and combination for each of the relevant
@@ -632,8 +596,8 @@ def combination_supervision_metric_period_metrics(
         supervision_time_bucket: The SupervisionTimeBucket from which the
             combination was derived
         metric_period_end_date: The day the metric periods end
-        periods_and_buckets: Dictionary mapping metric period month lengths to
-            the SupervisionTimeBuckets that fall in that period
+        supervision_time_bucket_index: The index of all of this person's SupervisionTimeBuckets, with the buckets
+            classified into the metric periods ending on the metric_period_end_date
         metric_type: The type of metric being tracked by this combo
 
     Returns:
@@ -645,38 +609,26 @@ def combination_supervision_metric_period_metrics(
     period_end_year = metric_period_end_date.year
     period_end_month = metric_period_end_date.month
 
-    for period_length, buckets_in_period in periods_and_buckets.items():
-        if supervision_time_bucket in buckets_in_period:
+    for period_length in supervision_time_bucket_index.buckets_by_metric_period.keys():
+        if supervision_time_bucket_index.bucket_in_metric_period(supervision_time_bucket, period_length):
             # This event falls within this metric period
-            person_based_period_combo = augmented_combo_for_calculations(
-                combo, supervision_time_bucket.state_code,
-                period_end_year, period_end_month,
-                MetricMethodologyType.PERSON, period_length
-            )
-
             relevant_buckets_in_period: List[SupervisionTimeBucket] = []
 
             if metric_type == SupervisionMetricType.TERMINATION:
                 # Get all other supervision time buckets for this period that should contribute to an termination
                 # metric
-                relevant_buckets_in_period = [
-                    bucket for bucket in buckets_in_period
-                    if (isinstance(bucket, SupervisionTerminationBucket))
-                ]
+                relevant_buckets_in_period = supervision_time_bucket_index.buckets_of_type_in_metric_period(
+                    SupervisionTerminationBucket, period_length)
             elif metric_type in (SupervisionMetricType.REVOCATION,
                                  SupervisionMetricType.REVOCATION_ANALYSIS,
                                  SupervisionMetricType.REVOCATION_VIOLATION_TYPE_ANALYSIS):
                 # Get all other revocation return time buckets for this period
-                relevant_buckets_in_period = [
-                    bucket for bucket in buckets_in_period
-                    if isinstance(bucket, RevocationReturnSupervisionTimeBucket)
-                ]
+                relevant_buckets_in_period = supervision_time_bucket_index.buckets_of_type_in_metric_period(
+                    RevocationReturnSupervisionTimeBucket, period_length)
             elif metric_type in (SupervisionMetricType.SUCCESS, SupervisionMetricType.SUCCESSFUL_SENTENCE_DAYS_SERVED):
                 # Get all other projected completion buckets in this period
-                relevant_buckets_in_period = [
-                    bucket for bucket in buckets_in_period
-                    if (isinstance(bucket, ProjectedSupervisionCompletionBucket))
-                ]
+                relevant_buckets_in_period = supervision_time_bucket_index.buckets_of_type_in_metric_period(
+                    ProjectedSupervisionCompletionBucket, period_length)
 
             if relevant_buckets_in_period and include_supervision_in_count(
                     combo,
@@ -688,6 +640,12 @@ def combination_supervision_metric_period_metrics(
                     combo, supervision_time_bucket, relevant_buckets_in_period, metric_type
                 )
 
+                person_based_period_combo = augmented_combo_for_calculations(
+                    combo, supervision_time_bucket.state_code,
+                    period_end_year, period_end_month,
+                    MetricMethodologyType.PERSON, period_length
+                )
+
                 # Include this event in the person-based count
                 metrics.append((person_based_period_combo, person_combo_value))
 
@@ -838,29 +796,6 @@ def _person_combo_value(combo: Dict[str, Any],
     return person_combo_value
 
 
-def _classify_buckets_by_relevant_metric_periods(
-        supervision_time_buckets: List[SupervisionTimeBucket],
-        metric_period_end_date: date
-) -> Dict[int, List[SupervisionTimeBucket]]:
-    """Returns a dictionary mapping metric period month values to the corresponding relevant SupervisionTimeBuckets."""
-    periods_and_buckets: Dict[int, List[SupervisionTimeBucket]] = defaultdict(list)
-
-    # Organize the month buckets by the relevant metric periods
-    for supervision_time_bucket in supervision_time_buckets:
-        bucket_start_date = date(supervision_time_bucket.year, supervision_time_bucket.month, 1)
-
-        relevant_periods = relevant_metric_periods(
-            bucket_start_date,
-            metric_period_end_date.year,
-            metric_period_end_date.month)
-
-        if relevant_periods:
-            for period in relevant_periods:
-                periods_and_buckets[period].append(supervision_time_bucket)
-
-    return periods_and_buckets
-
-
 def _include_revocation_dimensions_for_metric(metric_type: SupervisionMetricType) -> bool:
     """Returns whether revocation dimensions should be included in metrics of the given metric_type."""
     if metric_type in (
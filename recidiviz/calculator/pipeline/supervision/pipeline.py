@@ -43,7 +43,8 @@ from recidiviz.calculator.pipeline.utils.entity_hydration_utils import \
     SetViolationResponseOnIncarcerationPeriod, SetViolationOnViolationsResponse, ConvertSentencesToStateSpecificType
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
+from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity, BigQueryReadCache, \
+    register_state_entity_coder
 from recidiviz.calculator.pipeline.utils.metric_utils import \
     json_serializable_metric_key
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
@@ -346,7 +347,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         metric_types: List[str],
         state_code: Optional[str],
         calculation_end_month: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        use_state_entity_coder: bool):
     """Runs the supervision calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
@@ -365,14 +367,21 @@ def run(apache_beam_pipeline_options: PipelineOptions,
 
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
+    if use_state_entity_coder:
+        register_state_entity_coder()
+
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
+        # Shared by all entity extraction so that each table is only read from BigQuery once
+        bq_read_cache = BigQueryReadCache()
+
         # Get StatePersons
         persons = (p | 'Load Persons' >> BuildRootEntity(dataset=input_dataset,
                                                          root_entity_class=entities.StatePerson,
                                                          unifying_id_field=entities.StatePerson.get_class_id_name(),
                                                          build_related_entities=True,
                                                          unifying_id_field_filter_set=person_id_filter_set,
-                                                         state_code=state_code))
+                                                         state_code=state_code,
+                                                         bq_read_cache=bq_read_cache))
 
         # Get StateIncarcerationPeriods
         incarceration_periods = (p | 'Load IncarcerationPeriods' >> BuildRootEntity(
@@ -381,7 +390,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=True,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # Get StateSupervisionViolations
@@ -391,7 +401,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=True,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # TODO(2769): Don't bring this in as a root entity
@@ -402,7 +413,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=True,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # Get StateSupervisionSentences
@@ -412,7 +424,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=True,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # Get StateIncarcerationSentences
@@ -422,7 +435,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=True,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # Get StateSupervisionPeriods
@@ -432,7 +446,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=True,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # Get StateAssessments
@@ -442,7 +457,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=False,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         supervision_contacts = (p | 'Load StateSupervisionContacts' >> BuildRootEntity(
@@ -451,7 +467,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
             unifying_id_field=entities.StatePerson.get_class_id_name(),
             build_related_entities=False,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
+            state_code=state_code,
+            bq_read_cache=bq_read_cache
         ))
 
         # Bring in the table that associates StateSupervisionViolationResponses to information about StateAgents
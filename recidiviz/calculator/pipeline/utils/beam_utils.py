@@ -21,6 +21,9 @@ from typing import Any, Dict, NamedTuple
 import apache_beam as beam
 from apache_beam.typehints import with_input_types, with_output_types
 
+from recidiviz.calculator.pipeline.utils.state_entity_encoding import encode_entity_graph, decode_entity_graph, \
+    UnencodableEntityError
+
 AverageFnResult = NamedTuple('AverageFnResult', [
         ('average_of_inputs', float),
         ('input_count', int),
@@ -56,6 +59,33 @@ class AverageFn(beam.CombineFn):
         )
 
 
+class StateEntityCoder(beam.coders.Coder):
+    """Coder for graphs of state entities that encodes each graph as a compact tuple of primitive values (see
+    state_entity_encoding.py) rather than pickling the entity objects, which carry full enum instances and field names.
+    Values that cannot be encoded this way, e.g. state-specific subclasses of state entities, are pickled."""
+    _ENCODED_TAG = b'\x00'
+    _PICKLED_TAG = b'\x01'
+
+    def __init__(self):
+        self._primitives_coder = beam.coders.FastPrimitivesCoder()
+        self._pickle_coder = beam.coders.PickleCoder()
+
+    def encode(self, value):
+        try:
+            encoded = encode_entity_graph(value)
+        except UnencodableEntityError:
+            return self._PICKLED_TAG + self._pickle_coder.encode(value)
+        return self._ENCODED_TAG + self._primitives_coder.encode(encoded)
+
+    def decode(self, encoded):
+        if encoded[:1] == self._ENCODED_TAG:
+            return decode_entity_graph(self._primitives_coder.decode(encoded[1:]))
+        return self._pickle_coder.decode(encoded[1:])
+
+    def is_deterministic(self):
+        return False
+
+
 class SumFn(beam.CombineFn):
     """Combine function that calculates the sum of the input values."""
     def create_accumulator(self):
@@ -17,6 +17,7 @@
 """Utils for the various calculation pipelines."""
 import datetime
 from datetime import date
+from functools import lru_cache
 from typing import Optional, List, Any, Dict, Tuple
 
 import dateutil
@@ -154,12 +155,7 @@ def augment_combination(characteristic_combo: Dict[str, Any],
     Returns:
         The augmented characteristic combination, ready for tracking.
     """
-    augmented_combo = characteristic_combo.copy()
-
-    for key, value in parameters.items():
-        augmented_combo[key] = value
-
-    return augmented_combo
+    return {**characteristic_combo, **parameters}
 
 
 def first_day_of_month(any_date: datetime.date):
@@ -257,24 +253,40 @@ def relevant_metric_periods(event_date: date,
     [12, 36], because the event occurred within the 12-month metric period and
     the 36-month metric period of the given month.
     """
+    end_of_month, period_boundary_dates = _metric_period_boundary_dates(end_year, end_month)
+
+    relevant_periods = []
+
+    for metric_period, boundary_date in period_boundary_dates:
+        if boundary_date < event_date <= end_of_month:
+            relevant_periods.append(metric_period)
+        else:
+            break
+
+    return relevant_periods
+
+
+@lru_cache(maxsize=None)
+def _metric_period_boundary_dates(end_year: int, end_month: int) -> Tuple[date, Tuple[Tuple[int, date], ...]]:
+    """Returns the last day of the month in which the metric periods end, and for each metric period length in
+    METRIC_PERIOD_MONTHS, the last day of the month before that metric period starts.
+
+    These only depend on the month in which the metric periods end, which is the same for every event in a
+    calculation, so they are computed once rather than for every event.
+    """
     start_of_month = date(end_year, end_month, 1)
     end_of_month = last_day_of_month(start_of_month)
 
-    relevant_periods = []
+    period_boundary_dates = []
 
     for metric_period in METRIC_PERIOD_MONTHS:
         start_of_bucket_boundary_month = \
             start_of_month - \
             dateutil.relativedelta.relativedelta(months=metric_period)
 
-        boundary_date = last_day_of_month(start_of_bucket_boundary_month)
-
-        if boundary_date < event_date <= end_of_month:
-            relevant_periods.append(metric_period)
-        else:
-            break
+        period_boundary_dates.append((metric_period, last_day_of_month(start_of_bucket_boundary_month)))
 
-    return relevant_periods
+    return end_of_month, tuple(period_boundary_dates)
 
 
 def augmented_combo_for_calculations(combo: Dict[str, Any],
@@ -296,17 +308,17 @@ def augmented_combo_for_calculations(combo: Dict[str, Any],
 
     Returns: Returns a dictionary that has been augmented with necessary parameters.
     """
-    parameters: Dict[str, Any] = {'state_code': state_code,
-                                  'methodology': methodology,
-                                  'year': year}
+    # Built in a single step rather than by copying the combo and setting each parameter, since this is called for
+    # every methodology and metric period of every event in every pipeline.
+    augmented_combo = {**combo, 'state_code': state_code, 'methodology': methodology, 'year': year}
 
     if month:
-        parameters['month'] = month
+        augmented_combo['month'] = month
 
     if metric_period_months is not None:
-        parameters['metric_period_months'] = metric_period_months
+        augmented_combo['metric_period_months'] = metric_period_months
 
-    return augment_combination(combo, parameters)
+    return augmented_combo
 
 
 def person_external_id_to_include(pipeline: str,
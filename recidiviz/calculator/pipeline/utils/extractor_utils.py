@@ -25,6 +25,7 @@ from more_itertools import one
 import apache_beam as beam
 from apache_beam.typehints import with_input_types, with_output_types
 
+from recidiviz.calculator.pipeline.utils.beam_utils import StateEntityCoder
 from recidiviz.calculator.pipeline.utils.execution_utils import select_all_query
 from recidiviz.common.attr_mixins import BuildableAttr
 from recidiviz.common.attr_utils import is_property_list, \
@@ -36,6 +37,17 @@ from recidiviz.persistence.entity.state import entities as state_entities
 from recidiviz.persistence.database import schema_utils
 
 
+def register_state_entity_coder() -> None:
+    """Registers the StateEntityCoder for the hydrated entities that are shuffled in the CoGroupByKey steps that
+    connect them to their related entities, so that they are encoded compactly instead of pickled.
+
+    This shrinks the shuffled entity graphs by about 2.5x but takes more CPU than pickling them (see
+    recidiviz/tools/benchmarks/entity_coder_benchmark.py), so it is only done for pipelines run with
+    --use_state_entity_coder. Must be called before the pipeline is constructed.
+    """
+    beam.coders.registry.register_coder(BuildableAttr, StateEntityCoder)
+
+
 class BuildRootEntity(beam.PTransform):
     """Builds a root Entity by extracting it and the entities it is related
     to.
@@ -47,7 +59,8 @@ class BuildRootEntity(beam.PTransform):
                  unifying_id_field: str,
                  build_related_entities: bool,
                  unifying_id_field_filter_set: Optional[Set[int]] = None,
-                 state_code: Optional[str] = None):
+                 state_code: Optional[str] = None,
+                 bq_read_cache: Optional['BigQueryReadCache'] = None):
         """Initializes the PTransform with the required arguments.
 
         Arguments:
@@ -63,6 +76,9 @@ class BuildRootEntity(beam.PTransform):
             unifying_id_field_filter_set: When non-empty, we will only build entity
                 objects that can be connected to root entities with one of these
                 unifying ids.
+            bq_read_cache: When set, BigQuery reads are shared with all other
+                transforms in the pipeline that use the same cache, so that
+                each table is only read once per pipeline run.
         """
 
         super(BuildRootEntity, self).__init__()
@@ -79,6 +95,7 @@ class BuildRootEntity(beam.PTransform):
         self._build_related_entities = build_related_entities
         self._unifying_id_field_filter_set = unifying_id_field_filter_set
         self._state_code = state_code
+        self._bq_read_cache = bq_read_cache
 
         if not dataset:
             raise ValueError("No valid data source passed to the pipeline.")
@@ -108,7 +125,8 @@ class BuildRootEntity(beam.PTransform):
                                         unifying_id_field=self._unifying_id_field,
                                         parent_id_field=None,
                                         unifying_id_field_filter_set=self._unifying_id_field_filter_set,
-                                        state_code=self._state_code))
+                                        state_code=self._state_code,
+                                        bq_read_cache=self._bq_read_cache))
 
         if self._build_related_entities:
             # Get the related property entities
@@ -122,7 +140,8 @@ class BuildRootEntity(beam.PTransform):
                                    parent_id_field=self._root_entity_class.get_class_id_name(),
                                    unifying_id_field=self._unifying_id_field,
                                    unifying_id_field_filter_set=self._unifying_id_field_filter_set,
-                                   state_code=self._state_code
+                                   state_code=self._state_code,
+                                   bq_read_cache=self._bq_read_cache
                                ))
         else:
             properties_dict = {}
@@ -163,6 +182,30 @@ class ReadFromBigQuery(beam.PTransform):
                               use_standard_sql=True)))
 
 
+class BigQueryReadCache:
+    """Tracks the BigQuery reads that have been added to a pipeline, keyed by query.
+
+    Many entity tables are read by more than one BuildRootEntity transform in a single pipeline, e.g. the
+    state_supervision_period table is read to build the root StateSupervisionPeriod entities as well as the
+    supervision_periods children of both sentence types. When the transforms share a cache, each distinct query is
+    only run once and the resulting PCollection is consumed by every transform that needs it.
+
+    A cache must only be used within a single pipeline.
+    """
+
+    def __init__(self):
+        self._reads_by_query: Dict[str, Any] = {}
+
+    def read(self, input_or_inputs, label: str, query: str):
+        """Returns the PCollection of the results of the |query|, adding a ReadFromBigQuery with the given |label| to
+        the pipeline if the query has not already been read."""
+        if query not in self._reads_by_query:
+            self._reads_by_query[query] = (input_or_inputs
+                                           | label >>
+                                           ReadFromBigQuery(query=query))
+        return self._reads_by_query[query]
+
+
 class _ExtractEntityBase(beam.PTransform):
     """Shared functionality between any PTransforms doing entity extraction."""
     def __init__(self,
@@ -171,9 +214,11 @@ class _ExtractEntityBase(beam.PTransform):
                  unifying_id_field: str,
                  parent_id_field: Optional[str],
                  unifying_id_field_filter_set: Optional[Set[int]],
-                 state_code: Optional[str]):
+                 state_code: Optional[str],
+                 bq_read_cache: Optional[BigQueryReadCache]):
         super(_ExtractEntityBase, self).__init__()
         self._dataset = dataset
+        self._bq_read_cache = bq_read_cache
 
         self._unifying_id_field = unifying_id_field
         self._unifying_id_field_filter_set = unifying_id_field_filter_set
@@ -187,6 +232,14 @@ class _ExtractEntityBase(beam.PTransform):
         self._entity_id_field = self._entity_class.get_class_id_name()
         self._state_code = state_code
 
+    def _read_from_bigquery(self, input_or_inputs, label: str, query: str):
+        if self._bq_read_cache:
+            return self._bq_read_cache.read(input_or_inputs, label, query)
+
+        return (input_or_inputs
+                | label >>
+                ReadFromBigQuery(query=query))
+
     def _entity_has_unifying_id_field(self):
         return hasattr(self._schema_class, self._unifying_id_field)
 
@@ -225,9 +278,9 @@ class _ExtractEntityBase(beam.PTransform):
         entity_query = self._get_entities_table_sql_query()
 
         # Read entities from BQ
-        entities_raw = (input_or_inputs
-                        | f"Read {self._entity_table_name} from BigQuery" >>
-                        ReadFromBigQuery(query=entity_query))
+        entities_raw = self._read_from_bigquery(input_or_inputs,
+                                                f"Read {self._entity_table_name} from BigQuery",
+                                                entity_query)
 
         return entities_raw
 
@@ -258,9 +311,10 @@ class _ExtractEntity(_ExtractEntityBase):
                  unifying_id_field: str,
                  parent_id_field: Optional[str],
                  unifying_id_field_filter_set: Optional[Set[int]],
-                 state_code: Optional[str]):
+                 state_code: Optional[str],
+                 bq_read_cache: Optional[BigQueryReadCache] = None):
         super(_ExtractEntity, self).__init__(dataset, entity_class, unifying_id_field, parent_id_field,
-                                             unifying_id_field_filter_set, state_code)
+                                             unifying_id_field_filter_set, state_code, bq_read_cache)
 
     def expand(self, input_or_inputs):
         entities_raw = self._get_entities_raw_pcollection(input_or_inputs)
@@ -296,7 +350,8 @@ class _ExtractRelationshipPropertyEntities(beam.PTransform):
                  parent_id_field: str,
                  unifying_id_field: str,
                  unifying_id_field_filter_set: Optional[Set[int]],
-                 state_code: Optional[str]):
+                 state_code: Optional[str],
+                 bq_read_cache: Optional[BigQueryReadCache] = None):
         super(_ExtractRelationshipPropertyEntities, self).__init__()
         self._dataset = dataset
         self._parent_schema_class = parent_schema_class
@@ -304,6 +359,7 @@ class _ExtractRelationshipPropertyEntities(beam.PTransform):
         self._unifying_id_field = unifying_id_field
         self._unifying_id_field_filter_set = unifying_id_field_filter_set
         self._state_code = state_code
+        self._bq_read_cache = bq_read_cache
 
     @staticmethod
     def _property_class_from_property_object(property_object) -> Type:
@@ -344,7 +400,8 @@ class _ExtractRelationshipPropertyEntities(beam.PTransform):
                                     association_table_parent_id_field=self._parent_id_field,
                                     association_table_entity_id_field=entity_id_field,
                                     unifying_id_field_filter_set=self._unifying_id_field_filter_set,
-                                    state_code=self._state_code)
+                                    state_code=self._state_code,
+                                    bq_read_cache=self._bq_read_cache)
                                 )
 
                 # 1-to-many relationship
@@ -358,7 +415,8 @@ class _ExtractRelationshipPropertyEntities(beam.PTransform):
                                     unifying_id_field=self._unifying_id_field,
                                     parent_id_field=self._parent_id_field,
                                     unifying_id_field_filter_set=self._unifying_id_field_filter_set,
-                                    state_code=self._state_code)
+                                    state_code=self._state_code,
+                                    bq_read_cache=self._bq_read_cache)
                                 )
 
                 # 1-to-1 relationship (from parent class perspective)
@@ -378,7 +436,8 @@ class _ExtractRelationshipPropertyEntities(beam.PTransform):
                                     association_table_parent_id_field=self._parent_id_field,
                                     association_table_entity_id_field=association_table_entity_id_field,
                                     unifying_id_field_filter_set=self._unifying_id_field_filter_set,
-                                    state_code=self._state_code)
+                                    state_code=self._state_code,
+                                    bq_read_cache=self._bq_read_cache)
                                 )
 
                 properties_dict[property_name] = entities
@@ -403,9 +462,11 @@ class _ExtractEntityWithAssociationTable(_ExtractEntityBase):
                  association_table_parent_id_field: str,
                  association_table_entity_id_field: str,
                  unifying_id_field_filter_set: Optional[Set[int]],
-                 state_code: Optional[str]):
+                 state_code: Optional[str],
+                 bq_read_cache: Optional[BigQueryReadCache] = None):
         super(_ExtractEntityWithAssociationTable, self).__init__(
-            dataset, entity_class, unifying_id_field, parent_id_field, unifying_id_field_filter_set, state_code)
+            dataset, entity_class, unifying_id_field, parent_id_field, unifying_id_field_filter_set, state_code,
+            bq_read_cache)
 
         self._association_table_parent_id_field = association_table_parent_id_field
         self._association_table_entity_id_field = association_table_entity_id_field
@@ -431,10 +492,9 @@ class _ExtractEntityWithAssociationTable(_ExtractEntityBase):
             f"{self._association_table}.{self._association_table_entity_id_field}"
 
         # Read association table from BQ
-        association_tuples_raw = (
-            input_or_inputs
-            | f"Read {self._association_table} from BigQuery" >>
-            ReadFromBigQuery(query=association_table_query))
+        association_tuples_raw = self._read_from_bigquery(input_or_inputs,
+                                                          f"Read {self._association_table} from BigQuery",
+                                                          association_table_query)
 
         return association_tuples_raw
 
@@ -53,6 +53,12 @@ def add_shared_pipeline_arguments(parser: argparse.ArgumentParser, include_calcu
                         help='An optional list of DB person_id values. When present, the pipeline will only calculate '
                              'metrics for these people and will not output to BQ.')
 
+    parser.add_argument('--use_state_entity_coder',
+                        action='store_true',
+                        help='When set, entities shuffled while building root entities are encoded with the compact '
+                             'StateEntityCoder rather than pickled. This reduces shuffle bytes at the cost of more '
+                             'CPU on the workers.')
+
     if include_calculation_limit_args:
         # Only for pipelines that may receive these arguments
         parser.add_argument('--calculation_end_month',
@@ -0,0 +1,248 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Compact, schema-driven encoding of graphs of state entities into tuples of primitive values.
+
+A graph is encoded as a tuple of records, one per entity reachable from the root entity, with the root first. Each
+record is a tuple of the index of the entity's class followed by the entity's field values, grouped by kind and in
+field order within each kind:
+    - flat values (strings, numbers and booleans) are encoded as-is,
+    - enum values are encoded as the index of the member among the members of all enum classes used by the entity's
+      class,
+    - dates are encoded as ordinals,
+    - references to other entities are encoded as the index of the other entity's record, and
+    - lists of entities are encoded as tuples of record indices.
+
+Since references are encoded as record indices, graphs with cycles (e.g. a StatePerson and the back edges from its
+children) are supported, and shared entities are only encoded once.
+
+Encoding and decoding run for every entity that is shuffled, so the per-class work is done once up front: the fields
+of each kind are read with a single attrgetter call per entity, and enum values are mapped to indices in one map() call
+over a lookup table for the class, rather than by branching on the kind of every field in Python.
+"""
+import datetime
+from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import attr
+
+from recidiviz.common.attr_utils import is_list, is_forward_ref, get_enum_cls, is_date
+from recidiviz.persistence.entity.base_entity import Entity
+from recidiviz.persistence.entity.entity_utils import get_all_entity_classes_in_module
+from recidiviz.persistence.entity.state import entities as state_entities
+
+EncodedEntityGraph = Tuple[Tuple[Any, ...], ...]
+
+
+# Types of the values of date fields that can be encoded. Values of subclasses of date, e.g. datetimes, cannot be.
+_DATE_VALUE_TYPES = frozenset({datetime.date, type(None)})
+
+
+class UnencodableEntityError(ValueError):
+    """Raised when a value cannot be encoded as a graph of state entities, e.g. because it contains an entity of a
+    class that is not defined in the state entities module."""
+
+
+def _tuple_getter(names: Tuple[str, ...]) -> Callable[[Entity], Tuple[Any, ...]]:
+    """Returns a function that returns the values of the fields with the given |names| on an entity, as a tuple."""
+    if not names:
+        return lambda _: ()
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda entity: (getter(entity),)
+    return attrgetter(*names)
+
+
+@attr.s(frozen=True)
+class _ClassEncoding:
+    """How the fields of an entity class are encoded. Records hold the class index followed by the values of the flat,
+    enum, date, reference and reference list fields, in that order."""
+    class_index: int = attr.ib()
+
+    # Names of all fields, in record order
+    field_names: Tuple[str, ...] = attr.ib()
+
+    get_flat_values: Callable[[Entity], Tuple[Any, ...]] = attr.ib()
+    get_enum_values: Callable[[Entity], Tuple[Any, ...]] = attr.ib()
+    get_date_values: Callable[[Entity], Tuple[Any, ...]] = attr.ib()
+    get_reference_values: Callable[[Entity], Tuple[Any, ...]] = attr.ib()
+    get_reference_list_values: Callable[[Entity], Tuple[Any, ...]] = attr.ib()
+
+    # Maps each member of the enum classes of all enum fields to its index, and None to None
+    enum_indices: Dict[Optional[Enum], Optional[int]] = attr.ib()
+
+    # Maps each index in |enum_indices| back to its member, and None to None
+    enum_members: Dict[Optional[int], Optional[Enum]] = attr.ib()
+
+    # Record positions of the first enum, date, reference and reference list values
+    enums_start: int = attr.ib()
+    dates_start: int = attr.ib()
+    references_start: int = attr.ib()
+    reference_lists_start: int = attr.ib()
+
+
+@lru_cache(maxsize=None)
+def _get_entity_classes() -> Tuple[Type[Entity], ...]:
+    """Returns all state entity classes, sorted by name so that class indices are stable across processes."""
+    return tuple(sorted(get_all_entity_classes_in_module(state_entities), key=lambda cls: cls.__name__))
+
+
+@lru_cache(maxsize=None)
+def _get_class_indices() -> Dict[Type[Entity], int]:
+    return {cls: i for i, cls in enumerate(_get_entity_classes())}
+
+
+@lru_cache(maxsize=None)
+def _get_class_encoding(entity_cls: Type[Entity]) -> _ClassEncoding:
+    """Returns the _ClassEncoding for the provided |entity_cls|, which is computed once per class."""
+    class_index = _get_class_indices().get(entity_cls)
+    if class_index is None:
+        raise UnencodableEntityError(f'Unexpected entity class [{entity_cls.__name__}]')
+
+    flat_names: List[str] = []
+    enum_names: List[str] = []
+    date_names: List[str] = []
+    reference_names: List[str] = []
+    reference_list_names: List[str] = []
+    enum_classes: List[Type[Enum]] = []
+    for attribute in attr.fields(entity_cls):
+        enum_cls = get_enum_cls(attribute)
+        if is_list(attribute):
+            reference_list_names.append(attribute.name)
+        elif is_forward_ref(attribute):
+            reference_names.append(attribute.name)
+        elif enum_cls is not None:
+            enum_names.append(attribute.name)
+            if enum_cls not in enum_classes:
+                enum_classes.append(enum_cls)
+        elif is_date(attribute):
+            date_names.append(attribute.name)
+        else:
+            flat_names.append(attribute.name)
+
+    enum_members: Dict[Optional[int], Optional[Enum]] = \
+        dict(enumerate(member for enum_cls in enum_classes for member in enum_cls))
+    enum_members[None] = None
+
+    enums_start = 1 + len(flat_names)
+    dates_start = enums_start + len(enum_names)
+    references_start = dates_start + len(date_names)
+    return _ClassEncoding(
+        class_index=class_index,
+        field_names=tuple(flat_names + enum_names + date_names + reference_names + reference_list_names),
+        get_flat_values=_tuple_getter(tuple(flat_names)),
+        get_enum_values=_tuple_getter(tuple(enum_names)),
+        get_date_values=_tuple_getter(tuple(date_names)),
+        get_reference_values=_tuple_getter(tuple(reference_names)),
+        get_reference_list_values=_tuple_getter(tuple(reference_list_names)),
+        enum_indices={member: index for index, member in enum_members.items()},
+        enum_members=enum_members,
+        enums_start=enums_start,
+        dates_start=dates_start,
+        references_start=references_start,
+        reference_lists_start=references_start + len(reference_names))
+
+
+def encode_entity_graph(root_entity: Entity) -> EncodedEntityGraph:
+    """Encodes the graph of all state entities reachable from the provided |root_entity| as a tuple of records of
+    primitive values. Raises an UnencodableEntityError if the graph contains values that cannot be encoded.
+
+    Values of flat fields are not type checked, since the coders that encode the resulting records fall back to
+    pickling for values that are not primitives.
+    """
+    # Entities in record order. Holding a reference to every entity keeps the ids in |record_indices| valid.
+    graph_entities: List[Entity] = [root_entity]
+    record_indices: Dict[Optional[int], Optional[int]] = {id(root_entity): 0, id(None): None}
+
+    def _add_entities(entities: Iterable[Any]) -> None:
+        for entity in entities:
+            if id(entity) not in record_indices:
+                if not isinstance(entity, Entity):
+                    raise UnencodableEntityError(f'Expected an entity, found [{type(entity).__name__}]')
+                record_indices[id(entity)] = len(graph_entities)
+                graph_entities.append(entity)
+
+    get_record_index = record_indices.__getitem__
+
+    records = []
+    i = 0
+    while i < len(graph_entities):
+        entity = graph_entities[i]
+        class_encoding = _get_class_encoding(type(entity))
+
+        try:
+            enum_values = tuple(map(class_encoding.enum_indices.__getitem__, class_encoding.get_enum_values(entity)))
+        except KeyError as e:
+            raise UnencodableEntityError(
+                f'Unexpected enum value for an entity of class [{type(entity).__name__}]') from e
+
+        dates = class_encoding.get_date_values(entity)
+        if not _DATE_VALUE_TYPES.issuperset(map(type, dates)):
+            raise UnencodableEntityError(
+                f'Unexpected value for a date field of an entity of class [{type(entity).__name__}]: {dates}')
+
+        references = class_encoding.get_reference_values(entity)
+        _add_entities(references)
+        reference_lists = class_encoding.get_reference_list_values(entity)
+        for reference_list in reference_lists:
+            if reference_list:
+                _add_entities(reference_list)
+
+        # Most reference lists are empty, so those skip the map() calls
+        records.append((class_encoding.class_index,
+                        *class_encoding.get_flat_values(entity),
+                        *enum_values,
+                        *[None if value is None else value.toordinal() for value in dates],
+                        *map(get_record_index, map(id, references)),
+                        *[tuple(map(get_record_index, map(id, reference_list))) if reference_list
+                          else None if reference_list is None else ()
+                          for reference_list in reference_lists]))
+        i += 1
+
+    return tuple(records)
+
+
+def decode_entity_graph(encoded: EncodedEntityGraph) -> Entity:
+    """Decodes a graph encoded by encode_entity_graph and returns its root entity."""
+    entity_classes = _get_entity_classes()
+
+    # All entities are created before any fields are set, since records may reference records that come after them.
+    # Like unpickling, this sets fields directly rather than calling __init__, since the encoded values came from
+    # valid entities.
+    graph_entities = [object.__new__(entity_classes[record[0]]) for record in encoded]
+    entities_by_index: Dict[Optional[int], Optional[Entity]] = dict(enumerate(graph_entities))
+    entities_by_index[None] = None
+    get_entity = entities_by_index.__getitem__
+    date_from_ordinal = datetime.date.fromordinal
+
+    for entity, record in zip(graph_entities, encoded):
+        class_encoding = _get_class_encoding(type(entity))
+        enums_start = class_encoding.enums_start
+        dates_start = class_encoding.dates_start
+        references_start = class_encoding.references_start
+        reference_lists_start = class_encoding.reference_lists_start
+
+        entity.__dict__ = dict(zip(class_encoding.field_names, (
+            *record[1:enums_start],
+            *map(class_encoding.enum_members.__getitem__, record[enums_start:dates_start]),
+            *[None if value is None else date_from_ordinal(value) for value in record[dates_start:references_start]],
+            *map(get_entity, record[references_start:reference_lists_start]),
+            *[list(map(get_entity, value)) if value else None if value is None else []
+              for value in record[reference_lists_start:]])))
+
+    return graph_entities[0]
@@ -0,0 +1,199 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""A class for caching information about a person's SupervisionTimeBuckets for use in the calculation pipelines."""
+
+from collections import defaultdict
+from datetime import date
+from operator import attrgetter
+from typing import List, Dict, Optional, Set, Tuple, Type
+
+import attr
+
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import SupervisionTimeBucket, \
+    RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket, \
+    ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket
+from recidiviz.calculator.pipeline.utils.calculator_utils import relevant_metric_periods
+
+# The SupervisionTimeBucket types that can be looked up by type in the index
+_INDEXED_BUCKET_TYPES: List[Type[SupervisionTimeBucket]] = [
+    RevocationReturnSupervisionTimeBucket,
+    NonRevocationReturnSupervisionTimeBucket,
+    ProjectedSupervisionCompletionBucket,
+    SupervisionTerminationBucket,
+]
+
+
+def _supervision_time_buckets_converter(supervision_time_buckets: List[SupervisionTimeBucket]):
+    supervision_time_buckets.sort(key=attrgetter('year', 'month'))
+    return supervision_time_buckets
+
+
+@attr.s
+class SupervisionTimeBucketIndex:
+    """A class for caching information about a person's SupervisionTimeBuckets for use in the calculation pipelines.
+
+    All lists of buckets stored in the index preserve the order of the buckets in |supervision_time_buckets|, which are
+    sorted in ascending order by year and month.
+    """
+
+    supervision_time_buckets: List[SupervisionTimeBucket] = attr.ib(converter=_supervision_time_buckets_converter)
+
+    # The date on which the metric periods end. If unset, no buckets are classified into metric periods.
+    metric_period_end_date: Optional[date] = attr.ib(default=None)
+
+    # A dictionary mapping a bucket_date to all RevocationReturnSupervisionTimeBuckets and
+    # NonRevocationReturnSupervisionTimeBuckets on that date.
+    population_buckets_by_date: Dict[date, List[SupervisionTimeBucket]] = attr.ib()
+
+    @population_buckets_by_date.default
+    def _population_buckets_by_date(self) -> Dict[date, List[SupervisionTimeBucket]]:
+        population_buckets_by_date: Dict[date, List[SupervisionTimeBucket]] = defaultdict(list)
+
+        for bucket in self.supervision_time_buckets:
+            if isinstance(bucket, (RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket)):
+                population_buckets_by_date[bucket.bucket_date].append(bucket)
+
+        return population_buckets_by_date
+
+    # A dictionary mapping each indexed SupervisionTimeBucket type to a dictionary mapping (year, month) tuples to the
+    # buckets of that type in that month.
+    buckets_by_type_and_month: Dict[Type[SupervisionTimeBucket], Dict[Tuple[int, int], List[SupervisionTimeBucket]]] = \
+        attr.ib()
+
+    @buckets_by_type_and_month.default
+    def _buckets_by_type_and_month(self) -> \
+            Dict[Type[SupervisionTimeBucket], Dict[Tuple[int, int], List[SupervisionTimeBucket]]]:
+        buckets_by_type_and_month: Dict[Type[SupervisionTimeBucket], Dict[Tuple[int, int],
+                                                                          List[SupervisionTimeBucket]]] = \
+            defaultdict(lambda: defaultdict(list))
+
+        for bucket in self.supervision_time_buckets:
+            for bucket_type in _INDEXED_BUCKET_TYPES:
+                if isinstance(bucket, bucket_type):
+                    buckets_by_type_and_month[bucket_type][(bucket.year, bucket.month)].append(bucket)
+
+        return buckets_by_type_and_month
+
+    # A dictionary mapping a date_of_evaluation to all NonRevocationReturnSupervisionTimeBuckets with a case_compliance
+    # evaluated on that date.
+    compliance_buckets_by_evaluation_date: Dict[date, List[SupervisionTimeBucket]] = attr.ib()
+
+    @compliance_buckets_by_evaluation_date.default
+    def _compliance_buckets_by_evaluation_date(self) -> Dict[date, List[SupervisionTimeBucket]]:
+        compliance_buckets_by_evaluation_date: Dict[date, List[SupervisionTimeBucket]] = defaultdict(list)
+
+        for bucket in self.supervision_time_buckets:
+            if isinstance(bucket, NonRevocationReturnSupervisionTimeBucket) and bucket.case_compliance is not None:
+                compliance_buckets_by_evaluation_date[bucket.case_compliance.date_of_evaluation].append(bucket)
+
+        return compliance_buckets_by_evaluation_date
+
+    # A dictionary mapping metric period month lengths to the SupervisionTimeBuckets that fall in that period, ending
+    # on the metric_period_end_date.
+    buckets_by_metric_period: Dict[int, List[SupervisionTimeBucket]] = attr.ib()
+
+    @buckets_by_metric_period.default
+    def _buckets_by_metric_period(self) -> Dict[int, List[SupervisionTimeBucket]]:
+        buckets_by_metric_period: Dict[int, List[SupervisionTimeBucket]] = defaultdict(list)
+
+        if not self.metric_period_end_date:
+            return buckets_by_metric_period
+
+        for bucket in self.supervision_time_buckets:
+            bucket_start_date = date(bucket.year, bucket.month, 1)
+
+            relevant_periods = relevant_metric_periods(
+                bucket_start_date,
+                self.metric_period_end_date.year,
+                self.metric_period_end_date.month)
+
+            for period in relevant_periods:
+                buckets_by_metric_period[period].append(bucket)
+
+        return buckets_by_metric_period
+
+    # A dictionary mapping metric period month lengths to the ids of the bucket objects that fall in that period
+    bucket_ids_by_metric_period: Dict[int, Set[int]] = attr.ib()
+
+    @bucket_ids_by_metric_period.default
+    def _bucket_ids_by_metric_period(self) -> Dict[int, Set[int]]:
+        return {
+            period: {id(bucket) for bucket in buckets}
+            for period, buckets in self.buckets_by_metric_period.items()
+        }
+
+    # A dictionary mapping metric period month lengths to a dictionary mapping each indexed SupervisionTimeBucket type
+    # to the buckets of that type that fall in that period.
+    buckets_by_metric_period_and_type: Dict[int, Dict[Type[SupervisionTimeBucket], List[SupervisionTimeBucket]]] = \
+        attr.ib()
+
+    @buckets_by_metric_period_and_type.default
+    def _buckets_by_metric_period_and_type(self) -> \
+            Dict[int, Dict[Type[SupervisionTimeBucket], List[SupervisionTimeBucket]]]:
+        buckets_by_metric_period_and_type: Dict[int, Dict[Type[SupervisionTimeBucket],
+                                                          List[SupervisionTimeBucket]]] = \
+            defaultdict(lambda: defaultdict(list))
+
+        for period, buckets in self.buckets_by_metric_period.items():
+            for bucket in buckets:
+                for bucket_type in _INDEXED_BUCKET_TYPES:
+                    if isinstance(bucket, bucket_type):
+                        buckets_by_metric_period_and_type[period][bucket_type].append(bucket)
+
+        return buckets_by_metric_period_and_type
+
+    def population_buckets_on_date(self, bucket_date: date) -> List[SupervisionTimeBucket]:
+        """Returns all RevocationReturnSupervisionTimeBuckets and NonRevocationReturnSupervisionTimeBuckets on the
+        given date."""
+        return self.population_buckets_by_date.get(bucket_date, [])
+
+    def buckets_of_type_in_month(self,
+                                 bucket_type: Type[SupervisionTimeBucket],
+                                 year: int,
+                                 month: int) -> List[SupervisionTimeBucket]:
+        """Returns all buckets of the given bucket_type in the given year and month."""
+        if bucket_type not in _INDEXED_BUCKET_TYPES:
+            raise ValueError(f"Unexpected SupervisionTimeBucket type for index lookup: {bucket_type}")
+
+        buckets_by_month = self.buckets_by_type_and_month.get(bucket_type)
+
+        if not buckets_by_month:
+            return []
+
+        return buckets_by_month.get((year, month), [])
+
+    def compliance_buckets_on_evaluation_date(self, date_of_evaluation: date) -> List[SupervisionTimeBucket]:
+        """Returns all NonRevocationReturnSupervisionTimeBuckets with a case_compliance evaluated on the given date."""
+        return self.compliance_buckets_by_evaluation_date.get(date_of_evaluation, [])
+
+    def bucket_in_metric_period(self, supervision_time_bucket: SupervisionTimeBucket, period: int) -> bool:
+        """Returns whether the given bucket falls in the metric period of the given month length."""
+        return id(supervision_time_bucket) in self.bucket_ids_by_metric_period.get(period, set())
+
+    def buckets_of_type_in_metric_period(self,
+                                         bucket_type: Type[SupervisionTimeBucket],
+                                         period: int) -> List[SupervisionTimeBucket]:
+        """Returns all buckets of the given bucket_type that fall in the metric period of the given month length."""
+        if bucket_type not in _INDEXED_BUCKET_TYPES:
+            raise ValueError(f"Unexpected SupervisionTimeBucket type for index lookup: {bucket_type}")
+
+        buckets_by_type = self.buckets_by_metric_period_and_type.get(period)
+
+        if not buckets_by_type:
+            return []
+
+        return buckets_by_type.get(bucket_type, [])
@@ -39,7 +39,8 @@ def start_table_load(
         big_query_client: BigQueryClient,
         dataset_ref: bigquery.dataset.DatasetReference,
         table_name: str,
-        schema_type: SchemaType) -> Optional[bigquery.job.LoadJob]:
+        schema_type: SchemaType,
+        destination_table_id: Optional[str] = None) -> Optional[bigquery.job.LoadJob]:
     """Loads a table from CSV data in GCS to BigQuery.
 
     Given a table name, retrieve the export URI and schema from export_config,
@@ -60,6 +61,9 @@ def start_table_load(
             in the export_config.*_TABLES_TO_EXPORT for the given module
         schema_type: The schema of the table being loaded, either
             SchemaType.JAILS or SchemaType.STATE.
+        destination_table_id: If set, the CSV data exported for this table id
+            is loaded into a table with this id instead, with the schema of
+            |table_name|.
     Returns:
         (load_job, table_ref) where load_job is the LoadJob object containing
             job details, and table_ref is the destination TableReference object.
@@ -75,7 +79,10 @@ def start_table_load(
         logging.exception("Unknown schema type: %s", schema_type)
         return None
 
-    uri = export_config.gcs_export_uri(table_name)
+    if destination_table_id is None:
+        destination_table_id = table_name
+
+    uri = export_config.gcs_export_uri(destination_table_id)
 
     try:
         bq_schema = [
@@ -92,7 +99,7 @@ def start_table_load(
     load_job = big_query_client.load_table_from_cloud_storage_async(
         source_uri=uri,
         destination_dataset_ref=dataset_ref,
-        destination_table_id=table_name,
+        destination_table_id=destination_table_id,
         destination_table_schema=bq_schema
     )
 
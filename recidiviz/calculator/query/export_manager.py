@@ -17,23 +17,30 @@
 
 """Export data from Cloud SQL and load it into BigQuery."""
 import argparse
+import datetime
 from http import HTTPStatus
 import json
 import logging
 import sys
+from typing import Dict, List, Set
 
 import flask
 from flask import request
 # Importing only for typing.
 from google.cloud import bigquery
+from google.cloud import exceptions
+import sqlalchemy
 
 from recidiviz.big_query.big_query_client import BigQueryClientImpl, BigQueryClient
-from recidiviz.calculator.query import export_config, cloudsql_export, bq_load
+from recidiviz.calculator.query import export_config, cloudsql_export, bq_load, incremental_export
 from recidiviz.calculator.query.bq_export_cloud_task_manager import \
     BQExportCloudTaskManager
 from recidiviz.calculator.query.county import dataset_config as county_dataset_config
 from recidiviz.calculator.query.state import dataset_config as state_dataset_config
 from recidiviz.calculator.query.operations import dataset_config as operations_dataset_config
+from recidiviz.persistence.database.base_schema import OperationsBase
+from recidiviz.persistence.database.schema.operations import dao as operations_dao
+from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.database.sqlalchemy_engine_manager import SchemaType
 from recidiviz.utils.auth import authenticate_request
 from recidiviz.utils import pubsub_helper
@@ -132,6 +139,82 @@ def export_all_then_load_all(big_query_client: BigQueryClient, schema_type: Sche
         big_query_client, base_tables_dataset_ref, tables_to_export, schema_type)
 
 
+def export_changed_then_merge_all_state_tables(big_query_client: BigQueryClient) -> None:
+    """Exports the rows of each state table that changed since that table's last successful export, then merges them
+    into the corresponding BigQuery tables. See incremental_export.py for details.
+
+    Tables that have never been exported, or whose changes are not tracked in a history table, are exported and loaded
+    in full. Exports happen in sequence, then all loads happen in parallel, then all merges happen in parallel. The
+    export watermark of each table is only advanced once its rows are fully loaded or merged into BigQuery.
+    """
+    schema_type = SchemaType.STATE
+    dataset_ref = big_query_client.dataset_ref_for_id(state_dataset_config.STATE_BASE_DATASET)
+    export_start_time = datetime.datetime.utcnow()
+
+    session = SessionFactory.for_schema_base(OperationsBase)
+    try:
+        watermarks = operations_dao.get_export_watermarks(session, schema_type.value)
+    finally:
+        session.close()
+
+    logging.info("Beginning CloudSQL export")
+    full_tables: List[sqlalchemy.Table] = []
+    incremental_tables: List[sqlalchemy.Table] = []
+    for table in export_config.STATE_TABLES_TO_EXPORT:
+        watermark_time = watermarks.get(table.name)
+        export_query = incremental_export.state_table_incremental_export_query(table, watermark_time) \
+            if watermark_time else None
+        if export_query is None:
+            if cloudsql_export.export_table(schema_type, table.name,
+                                            export_config.STATE_TABLE_EXPORT_QUERIES[table.name]):
+                full_tables.append(table)
+        elif cloudsql_export.export_table(schema_type, incremental_export.incremental_export_table_id(table.name),
+                                          export_query):
+            incremental_tables.append(table)
+
+    logging.info("Beginning BQ table load of [%d] full and [%d] incremental exports",
+                 len(full_tables), len(incremental_tables))
+    load_jobs: Dict[str, bigquery.job.LoadJob] = {}
+    for table in full_tables:
+        load_jobs[table.name] = bq_load.start_table_load(big_query_client, dataset_ref, table.name, schema_type)
+    for table in incremental_tables:
+        load_jobs[table.name] = bq_load.start_table_load(
+            big_query_client, dataset_ref, table.name, schema_type,
+            destination_table_id=incremental_export.incremental_export_table_id(table.name))
+    loaded_table_names: Set[str] = {
+        table_name for table_name, load_job in load_jobs.items()
+        if load_job and bq_load.wait_for_table_load(big_query_client, load_job)
+    }
+
+    logging.info("Beginning BQ merge of incremental exports")
+    merge_jobs: Dict[str, bigquery.QueryJob] = {
+        table.name: big_query_client.run_query_async(incremental_export.merge_incremental_export_query(
+            big_query_client.project_id, dataset_ref.dataset_id, table))
+        for table in incremental_tables if table.name in loaded_table_names
+    }
+    for table_name, merge_job in merge_jobs.items():
+        try:
+            merge_job.result()
+        except (exceptions.NotFound, exceptions.BadRequest):
+            logging.exception("Failed to merge incremental export of table [%s]", table_name)
+            loaded_table_names.remove(table_name)
+
+    session = SessionFactory.for_schema_base(OperationsBase)
+    try:
+        for table_name in loaded_table_names:
+            operations_dao.update_export_watermark(session, schema_type.value, table_name,
+                                                   incremental_export.next_watermark_time(export_start_time))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logging.info("Advanced export watermark of [%d] of [%d] tables",
+                 len(loaded_table_names), len(export_config.STATE_TABLES_TO_EXPORT))
+
+
 export_manager_blueprint = flask.Blueprint('export_manager', __name__)
 
 
@@ -241,6 +324,20 @@ def create_all_state_bq_export_tasks():
     return ('', HTTPStatus.OK)
 
 
+@export_manager_blueprint.route('/state_incremental_export')
+@authenticate_request
+def handle_state_incremental_export():
+    """Exports the rows of all state tables that changed since their last export and merges them into BigQuery, then
+    publishes the same message as the full state export once complete.
+    """
+    logging.info("Beginning incremental BQ export for state schema tables.")
+
+    export_changed_then_merge_all_state_tables(BigQueryClientImpl())
+
+    pubsub_helper.publish_message_to_topic(message='State export to BQ complete', topic='v1.calculator.recidivism')
+    return ('', HTTPStatus.OK)
+
+
 @export_manager_blueprint.route('/create_operations_export_tasks')
 @authenticate_request
 def create_all_operations_bq_export_tasks():
@@ -276,6 +373,11 @@ def parse_arguments(argv):
                         choices=[SchemaType.STATE.value, SchemaType.JAILS.value, SchemaType.OPERATIONS.value],
                         required=True)
 
+    parser.add_argument('--incremental',
+                        dest='incremental',
+                        action='store_true',
+                        help='Only export rows changed since the last export. Only supported for the STATE schema.')
+
     return parser.parse_known_args(argv)
 
 
@@ -291,4 +393,9 @@ if __name__ == '__main__':
         local_export_schema_type = SchemaType.OPERATIONS
 
     with local_project_id_override(GAE_PROJECT_STAGING):
-        export_all_then_load_all(BigQueryClientImpl(), local_export_schema_type)
+        if known_args.incremental:
+            if local_export_schema_type != SchemaType.STATE:
+                raise ValueError(f'Incremental export is not supported for schema [{local_export_schema_type}]')
+            export_changed_then_merge_all_state_tables(BigQueryClientImpl())
+        else:
+            export_all_then_load_all(BigQueryClientImpl(), local_export_schema_type)
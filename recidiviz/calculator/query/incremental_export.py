@@ -0,0 +1,135 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Queries for incrementally exporting state tables from Cloud SQL to BigQuery.
+
+Every change to a state entity opens a new snapshot in the entity's history
+table with a valid_from of the ingest time of the change. The rows of a table
+that changed since a watermark time are therefore the rows with a snapshot that
+opened at or after the watermark. Those rows are exported to a separate
+BigQuery table, which is then MERGEd into the full table.
+
+Rows that are deleted from Cloud SQL are not removed from BigQuery by an
+incremental export. A full export (see export_manager.export_all_then_load_all)
+reloads every table from scratch.
+"""
+import datetime
+from typing import Optional
+
+import sqlalchemy
+
+from recidiviz.calculator.query import export_config
+
+# Suffix of the BigQuery tables that incrementally exported rows are loaded into
+# before being merged into the full tables.
+INCREMENTAL_EXPORT_TABLE_SUFFIX = '_incremental'
+
+# Snapshots are written with the ingest time of the job that wrote them, which
+# may be well before that job commits. Each export therefore re-exports all
+# rows changed within this much time before the export started. Merging rows
+# that have already been merged has no effect.
+INCREMENTAL_EXPORT_LOOKBACK = datetime.timedelta(days=7)
+
+_HISTORY_TABLE_SUFFIX = '_history'
+
+
+def incremental_export_table_id(table_name: str) -> str:
+    """Returns the id of the BigQuery table that rows of |table_name| are
+    incrementally exported to."""
+    return f'{table_name}{INCREMENTAL_EXPORT_TABLE_SUFFIX}'
+
+
+def next_watermark_time(export_start_time: datetime.datetime) \
+        -> datetime.datetime:
+    """Returns the watermark to record for tables successfully exported by an
+    export that started at |export_start_time|."""
+    return export_start_time - INCREMENTAL_EXPORT_LOOKBACK
+
+
+def state_table_incremental_export_query(
+        table: sqlalchemy.Table,
+        watermark_time: datetime.datetime) -> Optional[str]:
+    """Returns a query for all rows of the state |table| that changed at or
+    after |watermark_time|, or None if changes to the table are not tracked, in
+    which case the table must be exported in full.
+    """
+    if _merge_key_column_name(table) is None:
+        return None
+
+    columns = export_config.STATE_TABLE_COLUMNS_TO_EXPORT[table.name]
+    export_query = export_config.TABLE_EXPORT_QUERY.format(
+        columns=', '.join(columns), table=table.name)
+    watermark = _format_timestamp(watermark_time)
+
+    if _is_history_table(table):
+        return (f"{export_query} WHERE valid_from >= '{watermark}' "
+                f"OR valid_to >= '{watermark}'")
+
+    history_table = _get_history_table(table)
+    if history_table is None:
+        return None
+
+    key = _merge_key_column_name(table)
+    return (f"{export_query} WHERE {key} IN ("
+            f"SELECT {key} FROM {history_table.name} "
+            f"WHERE valid_from >= '{watermark}')")
+
+
+def merge_incremental_export_query(project_id: str,
+                                   dataset_id: str,
+                                   table: sqlalchemy.Table) -> str:
+    """Returns a BigQuery query that merges the rows incrementally exported
+    for the state |table| into the full BigQuery table, matching rows on the
+    table's primary key.
+    """
+    key = _merge_key_column_name(table)
+    if key is None:
+        raise ValueError(
+            f'Table [{table.name}] cannot be exported incrementally')
+
+    columns = export_config.STATE_TABLE_COLUMNS_TO_EXPORT[table.name]
+    updates = ', '.join(f'{column} = changes.{column}'
+                        for column in columns if column != key)
+    inserted_columns = ', '.join(columns)
+    inserted_values = ', '.join(f'changes.{column}' for column in columns)
+    return (
+        f'MERGE `{project_id}.{dataset_id}.{table.name}` base\n'
+        f'USING `{project_id}.{dataset_id}.'
+        f'{incremental_export_table_id(table.name)}` changes\n'
+        f'ON base.{key} = changes.{key}\n'
+        f'WHEN MATCHED THEN UPDATE SET {updates}\n'
+        f'WHEN NOT MATCHED THEN INSERT ({inserted_columns}) '
+        f'VALUES ({inserted_values})')
+
+
+def _merge_key_column_name(table: sqlalchemy.Table) -> Optional[str]:
+    primary_key_columns = list(table.primary_key.columns)
+    if len(primary_key_columns) != 1:
+        return None
+    return primary_key_columns[0].name
+
+
+def _is_history_table(table: sqlalchemy.Table) -> bool:
+    return table.name.endswith(_HISTORY_TABLE_SUFFIX)
+
+
+def _get_history_table(table: sqlalchemy.Table) \
+        -> Optional[sqlalchemy.Table]:
+    return table.metadata.tables.get(f'{table.name}{_HISTORY_TABLE_SUFFIX}')
+
+
+def _format_timestamp(timestamp: datetime.datetime) -> str:
+    return timestamp.isoformat(sep=' ')
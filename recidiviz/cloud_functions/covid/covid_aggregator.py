@@ -24,6 +24,9 @@ import datetime
 from io import StringIO
 import logging
 import re
+
+import numpy as np
+import pandas as pd
 import requests
 import xlrd
 
@@ -63,6 +66,41 @@ COMPILATION_COLUMN = 'compilation'
 NOTES_COLUMN = 'notes'
 AGGREGATION_NOTES_COLUMN = 'aggregation_notes'
 
+# Columns with numeric values. All numeric values are combined across sources in
+# the same way.
+NUMERIC_COLUMNS = [
+    POP_TESTED_COLUMN,
+    POP_TESTED_POSITIVE_COLUMN,
+    POP_TESTED_NEGATIVE_COLUMN,
+    POP_PENDING_COLUMN,
+    POP_DEATHS_COLUMN,
+    POP_ACTIVE_CASES_COLUMN,
+    POP_RECOVERED_CASES_COLUMN,
+    STAFF_TESTED_COLUMN,
+    STAFF_TESTED_POSITIVE_COLUMN,
+    STAFF_TESTED_NEGATIVE_COLUMN,
+    STAFF_PENDING_COLUMN,
+    STAFF_DEATHS_COLUMN,
+    STAFF_ACTIVE_CASES_COLUMN,
+    STAFF_RECOVERED_CASES_COLUMN
+]
+
+# Columns identifying the facility and date of a row. These will have the same
+# value in every source that includes a row for that facility and date.
+FACILITY_INFO_COLUMNS = [
+    DATE_COLUMN,
+    FACILITY_TYPE_COLUMN,
+    STATE_COLUMN,
+    FACILITY_NAME_COLUMN
+]
+
+# Text columns whose values are joined across all sources
+COMBINED_TEXT_COLUMNS = [
+    SOURCE_COLUMN,
+    NOTES_COLUMN,
+    AGGREGATION_NOTES_COLUMN
+]
+
 OUTPUT_COLUMN_ORDER = [
     DATE_COLUMN,
     FACILITY_TYPE_COLUMN,
@@ -165,59 +203,44 @@ def aggregate(prison_csv_reader, ucla_workbook, recidiviz_csv_reader):
 
 
 def _parse_prison_csv(prison_csv_reader):
-    """Parses the prison data CSV"""
-    data = []
-
-    for raw_row in prison_csv_reader:
-        row = {k.strip(): v.strip() for (k, v) in raw_row.items()}
-
-        date = row['scrape_date']
-        # Rows with missing dates should be ignored, since they can't be used
-        if date in MISSING_DATE_VALUES:
-            continue
-        formatted_date = datetime.datetime.strptime(
-            date, PRISON_DATE_FORMAT).strftime(OUTPUT_DATE_FORMAT)
-
-        # Two different columns can correspond to deaths. Need to convert them
-        # to ints so they can be summed.
-        deaths = _int_or_none(row['inmates_deaths'])
-        deaths_confirmed = _int_or_none(row['inmates_deaths_confirmed'])
-        pop_deaths = None
-        aggregation_notes = None
-        # Explicit None checks, since 0 is a valid value
-        if deaths is not None and deaths_confirmed is not None:
-            pop_deaths = deaths + deaths_confirmed
-            aggregation_notes = DEATH_SUMMED_NOTE
-        elif deaths_confirmed is not None:
-            pop_deaths = deaths_confirmed
-        elif deaths is not None:
-            pop_deaths = deaths
-
-        # Extract subset of columns we care about
-        data_row = {
-            DATE_COLUMN: formatted_date,
-            STATE_COLUMN: row['state'],
-            FACILITY_NAME_COLUMN: row['facilities'],
-            POP_TESTED_COLUMN: row['inmates_tested'],
-            POP_TESTED_POSITIVE_COLUMN: row['inmates_positive'],
-            POP_TESTED_NEGATIVE_COLUMN: row['inmates_negative'],
-            POP_PENDING_COLUMN: row['inmates_pending'],
-            POP_DEATHS_COLUMN: pop_deaths,
-            STAFF_TESTED_COLUMN: row['staff_tested'],
-            STAFF_TESTED_POSITIVE_COLUMN: row['staff_positive'],
-            STAFF_TESTED_NEGATIVE_COLUMN: row['staff_negative'],
-            STAFF_PENDING_COLUMN: row['staff_pending'],
-            STAFF_DEATHS_COLUMN: row['staff_deaths'],
-            AGGREGATION_NOTES_COLUMN: aggregation_notes
-        }
-
-        data.append(data_row)
-
-    return data
+    """Parses the prison data CSV into a frame"""
+    raw_data = _read_csv_reader(prison_csv_reader)
+
+    # Rows with missing dates should be ignored, since they can't be used
+    raw_data = raw_data[~raw_data['scrape_date'].isin(MISSING_DATE_VALUES)]
+
+    # Two different columns can correspond to deaths. Need to convert them
+    # to ints so they can be summed.
+    deaths = _to_float_values(raw_data['inmates_deaths'])
+    deaths_confirmed = _to_float_values(raw_data['inmates_deaths_confirmed'])
+    has_both_deaths = deaths.notna() & deaths_confirmed.notna()
+    pop_deaths = deaths_confirmed \
+        .where(deaths_confirmed.notna(), deaths) \
+        .mask(has_both_deaths, deaths + deaths_confirmed)
+
+    # Extract subset of columns we care about
+    return pd.DataFrame({
+        DATE_COLUMN: _format_dates(raw_data['scrape_date'], PRISON_DATE_FORMAT),
+        STATE_COLUMN: raw_data['state'],
+        FACILITY_NAME_COLUMN: raw_data['facilities'],
+        POP_TESTED_COLUMN: raw_data['inmates_tested'],
+        POP_TESTED_POSITIVE_COLUMN: raw_data['inmates_positive'],
+        POP_TESTED_NEGATIVE_COLUMN: raw_data['inmates_negative'],
+        POP_PENDING_COLUMN: raw_data['inmates_pending'],
+        POP_DEATHS_COLUMN: pop_deaths,
+        STAFF_TESTED_COLUMN: raw_data['staff_tested'],
+        STAFF_TESTED_POSITIVE_COLUMN: raw_data['staff_positive'],
+        STAFF_TESTED_NEGATIVE_COLUMN: raw_data['staff_negative'],
+        STAFF_PENDING_COLUMN: raw_data['staff_pending'],
+        STAFF_DEATHS_COLUMN: raw_data['staff_deaths'],
+        AGGREGATION_NOTES_COLUMN:
+            pd.Series(None, index=raw_data.index, dtype=object)
+            .mask(has_both_deaths, DEATH_SUMMED_NOTE)
+    })
 
 
 def _parse_ucla_workbook(ucla_workbook):
-    """Parses the UCLA data Excel workbook"""
+    """Parses the UCLA data Excel workbook into a frame"""
     data_sheets = []
     for sheet in ucla_workbook.sheets():
         # Sheets with data in them (as opposed to summary sheets, etc.) have a
@@ -230,6 +253,20 @@ def _parse_ucla_workbook(ucla_workbook):
             'No data sheets found in UCLA source file. The sheet naming ' \
                 + 'format may have changed.')
 
+    # Maps each output column to the label of the column it is read from
+    column_labels = {
+        STATE_COLUMN: 'State',
+        FACILITY_NAME_COLUMN: 'Name',
+        POP_TESTED_COLUMN: 'Residents Tested',
+        POP_TESTED_POSITIVE_COLUMN: 'Residents confirmed',
+        POP_DEATHS_COLUMN: 'Resident Deaths',
+        STAFF_TESTED_COLUMN: 'Staff Tested',
+        STAFF_TESTED_POSITIVE_COLUMN: 'Staff Confirmed',
+        STAFF_DEATHS_COLUMN: 'Staff Deaths',
+        SOURCE_COLUMN: 'Website',
+        NOTES_COLUMN: 'Add\'l Notes',
+    }
+
     data = []
 
     for sheet in data_sheets:
@@ -238,19 +275,8 @@ def _parse_ucla_workbook(ucla_workbook):
         # This needs to be done separately for each sheet, because the order
         # isn't fixed across all sheets.
         header_row = [cell.value for cell in sheet.row(0)]
-        column_indices = {
-            'Date': None,
-            'State': None,
-            'Name': None,
-            'Staff Confirmed': None,
-            'Residents confirmed': None,
-            'Staff Deaths': None,
-            'Resident Deaths': None,
-            'Staff Tested': None,
-            'Residents Tested': None,
-            'Website': None,
-            'Add\'l Notes': None
-        }
+        column_indices = {'Date': None}
+        column_indices.update({label: None for label in column_labels.values()})
         for index, value in enumerate(header_row):
             if value in column_indices:
                 column_indices[value] = index
@@ -262,86 +288,71 @@ def _parse_ucla_workbook(ucla_workbook):
                     cell, ucla_workbook.datemode).strip()
                  for cell in sheet.row(index)]
 
-            date = row[column_indices['Date']]
-            # Rows with missing dates should be ignored, since they can't be
-            # used
-            if date in MISSING_DATE_VALUES:
-                continue
-            formatted_date = datetime.datetime.strptime(
-                date, UCLA_DATE_FORMAT).strftime(OUTPUT_DATE_FORMAT)
-
             # Extract subset of columns we care about. Not all columns are
             # present on every sheet, so some values will be None.
-            data_row = {
-                DATE_COLUMN: formatted_date,
-                STATE_COLUMN: _get_cell_value_if_present(
-                    'State', column_indices, row),
-                FACILITY_NAME_COLUMN: _get_cell_value_if_present(
-                    'Name', column_indices, row),
-                POP_TESTED_COLUMN:
-                    _get_cell_value_if_present(
-                        'Residents Tested', column_indices, row),
-                POP_TESTED_POSITIVE_COLUMN:
-                    _get_cell_value_if_present(
-                        'Residents confirmed', column_indices, row),
-                POP_DEATHS_COLUMN:
-                    _get_cell_value_if_present(
-                        'Resident Deaths', column_indices, row),
-                STAFF_TESTED_COLUMN:
-                    _get_cell_value_if_present(
-                        'Staff Tested', column_indices, row),
-                STAFF_TESTED_POSITIVE_COLUMN:
-                    _get_cell_value_if_present(
-                        'Staff Confirmed', column_indices, row),
-                STAFF_DEATHS_COLUMN:
-                    _get_cell_value_if_present(
-                        'Staff Deaths', column_indices, row),
-                SOURCE_COLUMN: _get_cell_value_if_present(
-                    'Website', column_indices, row),
-                NOTES_COLUMN: _get_cell_value_if_present(
-                    'Add\'l Notes', column_indices, row),
-            }
-
-            data.append(data_row)
-
-    return data
+            data.append(
+                [row[column_indices['Date']]]
+                + [_get_cell_value_if_present(label, column_indices, row)
+                   for label in column_labels.values()])
+
+    raw_data = pd.DataFrame(
+        data, columns=[DATE_COLUMN] + list(column_labels), dtype=object)
+
+    # Rows with missing dates should be ignored, since they can't be used
+    raw_data = raw_data[~raw_data[DATE_COLUMN].isin(MISSING_DATE_VALUES)]
+    raw_data[DATE_COLUMN] = _format_dates(
+        raw_data[DATE_COLUMN], UCLA_DATE_FORMAT)
+    return raw_data
 
 
 def _parse_recidiviz_csv(recidiviz_csv_reader):
-    """Parses the Recidiviz data CSV"""
-    data = []
+    """Parses the Recidiviz data CSV into a frame"""
+    raw_data = _read_csv_reader(recidiviz_csv_reader)
+
+    date_column = 'As of...? (Date)'
+    # Rows with missing dates should be ignored, since they can't be used
+    raw_data = raw_data[~raw_data[date_column].isin(MISSING_DATE_VALUES)]
+
+    # Extract subset of columns we care about
+    return pd.DataFrame({
+        DATE_COLUMN: _format_dates(
+            raw_data[date_column], RECIDIVIZ_DATE_FORMAT),
+        FACILITY_TYPE_COLUMN: raw_data['Facility Type'],
+        STATE_COLUMN: raw_data['State'],
+        FACILITY_NAME_COLUMN: raw_data['Facility'],
+        POP_TESTED_COLUMN: raw_data['Population Tested'],
+        POP_TESTED_POSITIVE_COLUMN: raw_data['Population Tested Positive'],
+        POP_TESTED_NEGATIVE_COLUMN: raw_data['Population Tested Negative'],
+        POP_DEATHS_COLUMN: raw_data['Population Deaths'],
+        STAFF_TESTED_COLUMN: raw_data['Staff Tested'],
+        STAFF_TESTED_POSITIVE_COLUMN: raw_data['Staff Tested Positive'],
+        STAFF_TESTED_NEGATIVE_COLUMN: raw_data['Staff Tested Negative'],
+        STAFF_DEATHS_COLUMN: raw_data['Staff Deaths'],
+        SOURCE_COLUMN: raw_data['Source'],
+        NOTES_COLUMN: raw_data['Notes']
+    })
+
+
+def _read_csv_reader(csv_reader):
+    """Reads all rows of a CSV DictReader into a frame of strings, with
+    whitespace stripped from all column names and values
+    """
+    raw_data = pd.DataFrame(list(csv_reader), columns=csv_reader.fieldnames,
+                            dtype=object)
+    raw_data.columns = [column.strip() for column in raw_data.columns]
+    for column in raw_data.columns:
+        raw_data[column] = _map_distinct_values(raw_data[column], str.strip)
+    return raw_data
 
-    for raw_row in recidiviz_csv_reader:
-        row = {k.strip(): v.strip() for (k, v) in raw_row.items()}
-
-        date = row['As of...? (Date)']
-        # Rows with missing dates should be ignored, since they can't be used
-        if date in MISSING_DATE_VALUES:
-            continue
-        formatted_date = datetime.datetime.strptime(
-            date, RECIDIVIZ_DATE_FORMAT).strftime(OUTPUT_DATE_FORMAT)
-
-        # Extract subset of columns we care about
-        data_row = {
-            DATE_COLUMN: formatted_date,
-            FACILITY_TYPE_COLUMN: row['Facility Type'],
-            STATE_COLUMN: row['State'],
-            FACILITY_NAME_COLUMN: row['Facility'],
-            POP_TESTED_COLUMN: row['Population Tested'],
-            POP_TESTED_POSITIVE_COLUMN: row['Population Tested Positive'],
-            POP_TESTED_NEGATIVE_COLUMN: row['Population Tested Negative'],
-            POP_DEATHS_COLUMN: row['Population Deaths'],
-            STAFF_TESTED_COLUMN: row['Staff Tested'],
-            STAFF_TESTED_POSITIVE_COLUMN: row['Staff Tested Positive'],
-            STAFF_TESTED_NEGATIVE_COLUMN: row['Staff Tested Negative'],
-            STAFF_DEATHS_COLUMN: row['Staff Deaths'],
-            SOURCE_COLUMN: row['Source'],
-            NOTES_COLUMN: row['Notes']
-        }
-
-        data.append(data_row)
-
-    return data
+
+def _format_dates(dates, date_format):
+    """Converts a column of dates in the provided format to the output date
+    format
+    """
+    return _map_distinct_values(
+        dates,
+        lambda date: datetime.datetime.strptime(date, date_format).strftime(
+            OUTPUT_DATE_FORMAT))
 
 
 def _fetch_facility_info_mapping():
@@ -378,286 +389,266 @@ def _fetch_facility_info_mapping():
 
 def _map_by_canonical_facility_info(source_data, facility_info_mapping):
     """Overwrites facility info with canonical facility info (if available) and
-    converts to a map keyed by facility info
+    indexes the rows by their row key, dropping rows without facility info
     """
-    mapped_data = {}
-
-    for row in source_data:
-        facility_name = row[FACILITY_NAME_COLUMN]
-        state = row[STATE_COLUMN]
-        # Every source includes name and state, but not every source includes
-        # type
-        facility_type = row.get(FACILITY_TYPE_COLUMN, 'Unknown Facility Type')
-
-        if facility_info_mapping.contains(state, facility_name):
-            facility_name = facility_info_mapping.get_canonical_facility_name(
-                state, facility_name)
-            facility_type = facility_info_mapping.get_facility_type(
-                state, facility_name)
-        else:
-            # TODO(zdg2102): write unmapped facilities and their data out to a
-            # separate file
+    canonical_facility_names = facility_info_mapping.get_canonical_facility_names(
+        source_data[STATE_COLUMN], source_data[FACILITY_NAME_COLUMN])
+
+    is_mapped = canonical_facility_names.notna()
+    if not is_mapped.all():
+        # TODO(zdg2102): write unmapped facilities and their data out to a
+        # separate file
+        unmapped_facilities = source_data.loc[
+            ~is_mapped, [STATE_COLUMN, FACILITY_NAME_COLUMN]]
+        for (state, facility_name), row_count in \
+                unmapped_facilities.groupby(
+                    [STATE_COLUMN, FACILITY_NAME_COLUMN]).size().items():
             logging.warning(
-                'No facility info for %s, %s, ignoring row',
+                'No facility info for %s, %s, ignoring %d rows',
                 state,
-                facility_name)
-            continue
-
-        # Copy row and overwrite facility name and type with canonical values
-        # before setting row key
-        output_row = dict(row)
-        output_row[FACILITY_NAME_COLUMN] = facility_name
-        output_row[FACILITY_TYPE_COLUMN] = facility_type
+                facility_name,
+                row_count)
 
-        row_key = _row_key(output_row[DATE_COLUMN],
-                           output_row[STATE_COLUMN],
-                           output_row[FACILITY_NAME_COLUMN])
-        mapped_data[row_key] = output_row
+    # Copy rows and overwrite facility name and type with canonical values
+    # before setting row keys
+    mapped_data = source_data[is_mapped].copy()
+    mapped_data[FACILITY_NAME_COLUMN] = canonical_facility_names[is_mapped]
+    mapped_data[FACILITY_TYPE_COLUMN] = facility_info_mapping.get_facility_types(
+        mapped_data[STATE_COLUMN], mapped_data[FACILITY_NAME_COLUMN])
 
-    return mapped_data
+    mapped_data.index = _row_keys(mapped_data[DATE_COLUMN],
+                                  mapped_data[STATE_COLUMN],
+                                  mapped_data[FACILITY_NAME_COLUMN])
+    # If a source has multiple rows for a facility on a date, the last one is
+    # used
+    return mapped_data[~mapped_data.index.duplicated(keep='last')]
 
 
 def _combine_by_facility(sources):
     """Creates an aggregated data set by taking the supserset of all facilities
     present in all sources and combining the available data for each facility
     """
-    all_keys = set()
+    all_keys = pd.Index([], dtype=object)
     for source in sources.values():
-        for key in source:
-            all_keys.add(key)
-
-    aggregated_data = {}
-
-    for key in all_keys:
-        # The key fields and facility info fields will be the same for any
-        # sources in which the key is present, so the first non-null value can
-        # be used
-        date = _get_first_non_null(key, DATE_COLUMN, sources)
-        facility_type = _get_first_non_null(key, FACILITY_TYPE_COLUMN, sources)
-        state = _get_first_non_null(key, STATE_COLUMN, sources)
-        facility_name = _get_first_non_null(key, FACILITY_NAME_COLUMN, sources)
-
-        source = _combine_non_null_text(key, SOURCE_COLUMN, sources)
-        notes = _combine_non_null_text(key, NOTES_COLUMN, sources)
-        aggregation_notes = _combine_non_null_text(
-            key, AGGREGATION_NOTES_COLUMN, sources)
-
-        # Create initial row data, so numeric and compilation values will have
-        # a place to go
-        combined_row = {
-            DATE_COLUMN: date,
-            FACILITY_TYPE_COLUMN: facility_type,
-            STATE_COLUMN: state,
-            FACILITY_NAME_COLUMN: facility_name,
-            SOURCE_COLUMN: source,
-            NOTES_COLUMN: notes,
-            AGGREGATION_NOTES_COLUMN: aggregation_notes
-        }
-
-        # Easier to handle the numeric fields in a loop, since we also have to
-        # keep track of the source for all of them
-        numeric_columns = [
-            POP_TESTED_COLUMN,
-            POP_TESTED_POSITIVE_COLUMN,
-            POP_TESTED_NEGATIVE_COLUMN,
-            POP_PENDING_COLUMN,
-            POP_DEATHS_COLUMN,
-            POP_ACTIVE_CASES_COLUMN,
-            POP_RECOVERED_CASES_COLUMN,
-            STAFF_TESTED_COLUMN,
-            STAFF_TESTED_POSITIVE_COLUMN,
-            STAFF_TESTED_NEGATIVE_COLUMN,
-            STAFF_PENDING_COLUMN,
-            STAFF_DEATHS_COLUMN,
-            STAFF_ACTIVE_CASES_COLUMN,
-            STAFF_RECOVERED_CASES_COLUMN
-        ]
-        numeric_value_sources = set()
-        numeric_value_present = False
-        for column in numeric_columns:
-            # For all numeric fields, the assumption is that the largest value
-            # was obtained last on the given date and so should be the most
-            # up-to-date value.
-            #
-            # Note that this step also converts all numeric fields from string
-            # to int values.
-            value, value_source = _get_max(key, column, sources)
-            # Always include value even if it's null, to ensure all required
-            # columns are present
-            combined_row[column] = value
-            # Check for None explicitly to avoid skipping 0 values
-            if value is not None:
-                numeric_value_present = True
-                numeric_value_sources.add(value_source)
-
-        # If no value was set for any numeric column in the row, the row has no
-        # useful data and should be excluded from the output
-        if not numeric_value_present:
-            continue
-
-        # Compilation column is comma-joined list of all sources from which at
-        # least one numeric value was taken. The list is sorted to enable
-        # easier comparison in the output data.
-        combined_row[COMPILATION_COLUMN] = \
-            ', '.join(sorted(numeric_value_sources))
-
-        aggregated_data[key] = combined_row
-
-    return aggregated_data
+        all_keys = all_keys.union(source.index)
+
+    # Align all sources with the full set of keys, so that values for the same
+    # key can be compared across sources column by column.
+    #
+    # Note that this step also converts all numeric fields from string
+    # to numeric values.
+    aligned_sources = {
+        source_name: _to_numeric_source(source).reindex(all_keys)
+        for source_name, source in sources.items()
+    }
+
+    aggregated_data = pd.DataFrame(index=all_keys)
+
+    # The key fields and facility info fields will be the same for any
+    # sources in which the key is present, so the first non-null value can
+    # be used
+    for column in FACILITY_INFO_COLUMNS:
+        aggregated_data[column] = _get_first_non_null(
+            column, aligned_sources.values())
+
+    for column in COMBINED_TEXT_COLUMNS:
+        aggregated_data[column] = _combine_non_null_text(
+            column, aligned_sources.values())
+
+    # Tracks, for each source, which rows have a numeric value taken from that
+    # source
+    value_taken_from_source = {
+        source_name: np.zeros(len(all_keys), dtype=bool)
+        for source_name in sources
+    }
+    for column in NUMERIC_COLUMNS:
+        # For all numeric fields, the assumption is that the largest value
+        # was obtained last on the given date and so should be the most
+        # up-to-date value.
+        values, value_sources = _get_max(column, aligned_sources)
+        # Always include values even if they're null, to ensure all required
+        # columns are present
+        aggregated_data[column] = values
+        for source_name, is_taken in value_taken_from_source.items():
+            is_taken |= (value_sources == source_name)
+
+    # If no value was set for any numeric column in the row, the row has no
+    # useful data and should be excluded from the output
+    has_numeric_value = aggregated_data[NUMERIC_COLUMNS].notna().any(axis=1)
+
+    # Compilation column is comma-joined list of all sources from which at
+    # least one numeric value was taken. The list is sorted to enable
+    # easier comparison in the output data.
+    compilation = pd.Series('', index=all_keys, dtype=object)
+    for source_name in sorted(sources):
+        compilation = _append_text(
+            compilation, value_taken_from_source[source_name], source_name)
+    aggregated_data[COMPILATION_COLUMN] = compilation
+
+    return aggregated_data[has_numeric_value]
 
 
 def _amend_data(data):
     """Performs corrections and additional calculations on aggregated data"""
-    amended_data = {}
-
-    for key, row in data.items():
-        output_row = dict(row)
-        aggregation_notes = []
-
-        # Include any existing aggregation notes, to make sure they aren't
-        # dropped
-        if row[AGGREGATION_NOTES_COLUMN]:
-            aggregation_notes.append(row[AGGREGATION_NOTES_COLUMN])
-
-        # If date can't be parsed, the date is invalid and the row should be
-        # skipped.
-        date = None
-        try:
-            date = datetime.datetime.strptime(
-                row[DATE_COLUMN], OUTPUT_DATE_FORMAT)
-        except ValueError:
-            continue
-
-        # Pull out values to be used, to make things a little more readable than
-        # bracketing into the row dict every time
-        state = row[STATE_COLUMN]
-        facility_type = row[FACILITY_TYPE_COLUMN]
-        pop_tested = row[POP_TESTED_COLUMN]
-        pop_tested_positive = row[POP_TESTED_POSITIVE_COLUMN]
-        pop_tested_negative = row[POP_TESTED_NEGATIVE_COLUMN]
-        pop_pending = row[POP_PENDING_COLUMN]
-        pop_recovered = row[POP_RECOVERED_CASES_COLUMN]
-        staff_tested = row[STAFF_TESTED_COLUMN]
-        staff_tested_positive = row[STAFF_TESTED_POSITIVE_COLUMN]
-        staff_tested_negative = row[STAFF_TESTED_NEGATIVE_COLUMN]
-        staff_pending = row[STAFF_PENDING_COLUMN]
-        staff_recovered = row[STAFF_RECOVERED_CASES_COLUMN]
-
-        # Below logic uses None identity checks because we want to distinguish
-        # missing values from zero values
-
-        # 1. If total tested is absent, sum positive and negative (and pending
-        # if available) to calculate it
-        if pop_tested is None \
-                and pop_tested_positive is not None \
-                and pop_tested_negative is not None:
-            if pop_pending is not None:
-                output_row[POP_TESTED_COLUMN] = \
-                    pop_tested_positive + pop_tested_negative + pop_pending
-                aggregation_notes.append(POP_TESTED_THREE_OPERANDS_NOTE)
-            else:
-                output_row[POP_TESTED_COLUMN] = \
-                    pop_tested_positive + pop_tested_negative
-                aggregation_notes.append(POP_TESTED_TWO_OPERANDS_NOTE)
-
-        if staff_tested is None \
-                and staff_tested_positive is not None \
-                and staff_tested_negative is not None:
-            if staff_pending is not None:
-                output_row[STAFF_TESTED_COLUMN] = \
-                    staff_tested_positive \
-                    + staff_tested_negative \
-                    + staff_pending
-                aggregation_notes.append(STAFF_TESTED_THREE_OPERANDS_NOTE)
-            else:
-                output_row[STAFF_TESTED_COLUMN] = \
-                    staff_tested_positive + staff_tested_negative
-                aggregation_notes.append(STAFF_TESTED_TWO_OPERANDS_NOTE)
-
-        # 2. If negative is absent, subtract positive (and pending if available)
-        # from total to calculate it
-        if pop_tested_negative is None \
-                and pop_tested is not None \
-                and pop_tested_positive is not None:
-            if pop_pending is not None:
-                output_row[POP_TESTED_NEGATIVE_COLUMN] = \
-                    pop_tested - (pop_tested_positive + pop_pending)
-                aggregation_notes.append(POP_NEGATIVES_THREE_OPERANDS_NOTE)
-            else:
-                output_row[POP_TESTED_NEGATIVE_COLUMN] = \
-                    pop_tested - pop_tested_positive
-                aggregation_notes.append(POP_NEGATIVES_TWO_OPERANDS_NOTE)
-
-        if staff_tested_negative is None \
-                and staff_tested is not None \
-                and staff_tested_positive is not None:
-            if staff_pending is not None:
-                output_row[STAFF_TESTED_NEGATIVE_COLUMN] = \
-                    staff_tested - (staff_tested_positive + staff_pending)
-                aggregation_notes.append(STAFF_NEGATIVES_THREE_OPERANDS_NOTE)
-            else:
-                output_row[STAFF_TESTED_NEGATIVE_COLUMN] = \
-                    staff_tested - staff_tested_positive
-                aggregation_notes.append(STAFF_NEGATIVES_TWO_OPERANDS_NOTE)
-
-        # 3. Correct rows showing active as positive
-        is_tn_oh_ok = state in ['Tennessee', 'Ohio', 'Oklahoma']
-        is_de_on_or_after_5_20 = \
-            state == 'Delaware' and date >= datetime.datetime(2020, 5, 20)
-        is_federal_facility = \
-            state == 'Federal' or facility_type == 'Federal Prisons'
-        if is_tn_oh_ok or is_de_on_or_after_5_20 or is_federal_facility:
-            if pop_tested_positive is not None:
-                # Note that fixing this erroneous column mapping intentionally
-                # does not have an aggregation note
-                output_row[POP_ACTIVE_CASES_COLUMN] = pop_tested_positive
-                output_row[POP_TESTED_POSITIVE_COLUMN] = None
-                # If recovered is also available, actual positives value can be
-                # calculated
-                if pop_recovered is not None:
-                    output_row[POP_TESTED_POSITIVE_COLUMN] = \
-                        pop_tested_positive + pop_recovered
-                    aggregation_notes.append(
-                        POP_POSITIVE_FROM_ACTIVE_AND_RECOVERED_NOTE)
-            if staff_tested_positive is not None:
-                # Note that fixing this erroneous column mapping intentionally
-                # does not have an aggregation note
-                output_row[STAFF_ACTIVE_CASES_COLUMN] = staff_tested_positive
-                output_row[STAFF_TESTED_POSITIVE_COLUMN] = None
-                # If recovered is also available, actual positives value can be
-                # calculated
-                if staff_recovered is not None:
-                    output_row[STAFF_TESTED_POSITIVE_COLUMN] = \
-                        staff_tested_positive + staff_recovered
-                    aggregation_notes.append(
-                        STAFF_POSITIVE_FROM_ACTIVE_AND_RECOVERED_NOTE)
-
-        if aggregation_notes:
-            output_row[AGGREGATION_NOTES_COLUMN] = ', '.join(aggregation_notes)
-
-        amended_data[key] = output_row
-
-    return amended_data
+    # If date can't be parsed, the date is invalid and the row should be
+    # skipped.
+    dates = _map_distinct_values(data[DATE_COLUMN], _parse_output_date)
+    data = data[dates.notna()]
+    dates = dates[dates.notna()]
+
+    output_data = data.copy()
+
+    # Include any existing aggregation notes, to make sure they aren't
+    # dropped
+    aggregation_notes = data[AGGREGATION_NOTES_COLUMN].fillna('')
+
+    # Pull out values to be used, to make things a little more readable than
+    # indexing into the frame every time
+    state = data[STATE_COLUMN]
+    facility_type = data[FACILITY_TYPE_COLUMN]
+    pop_tested = data[POP_TESTED_COLUMN]
+    pop_tested_positive = data[POP_TESTED_POSITIVE_COLUMN]
+    pop_tested_negative = data[POP_TESTED_NEGATIVE_COLUMN]
+    pop_pending = data[POP_PENDING_COLUMN]
+    pop_active = data[POP_ACTIVE_CASES_COLUMN]
+    pop_recovered = data[POP_RECOVERED_CASES_COLUMN]
+    staff_tested = data[STAFF_TESTED_COLUMN]
+    staff_tested_positive = data[STAFF_TESTED_POSITIVE_COLUMN]
+    staff_tested_negative = data[STAFF_TESTED_NEGATIVE_COLUMN]
+    staff_pending = data[STAFF_PENDING_COLUMN]
+    staff_active = data[STAFF_ACTIVE_CASES_COLUMN]
+    staff_recovered = data[STAFF_RECOVERED_CASES_COLUMN]
+
+    # Below logic uses null checks because we want to distinguish missing
+    # values from zero values. All checks are against the aggregated values,
+    # not the values amended by previous steps. Aggregation notes are added in
+    # the same order for every row.
+
+    # 1. If total tested is absent, sum positive and negative (and pending
+    # if available) to calculate it
+    calculate_pop_tested = pop_tested.isna() \
+        & pop_tested_positive.notna() \
+        & pop_tested_negative.notna()
+    output_data[POP_TESTED_COLUMN] = pop_tested \
+        .mask(calculate_pop_tested & pop_pending.isna(),
+              pop_tested_positive + pop_tested_negative) \
+        .mask(calculate_pop_tested & pop_pending.notna(),
+              pop_tested_positive + pop_tested_negative + pop_pending)
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_pop_tested & pop_pending.notna(),
+        POP_TESTED_THREE_OPERANDS_NOTE)
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_pop_tested & pop_pending.isna(),
+        POP_TESTED_TWO_OPERANDS_NOTE)
+
+    calculate_staff_tested = staff_tested.isna() \
+        & staff_tested_positive.notna() \
+        & staff_tested_negative.notna()
+    output_data[STAFF_TESTED_COLUMN] = staff_tested \
+        .mask(calculate_staff_tested & staff_pending.isna(),
+              staff_tested_positive + staff_tested_negative) \
+        .mask(calculate_staff_tested & staff_pending.notna(),
+              staff_tested_positive + staff_tested_negative + staff_pending)
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_staff_tested & staff_pending.notna(),
+        STAFF_TESTED_THREE_OPERANDS_NOTE)
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_staff_tested & staff_pending.isna(),
+        STAFF_TESTED_TWO_OPERANDS_NOTE)
+
+    # 2. If negative is absent, subtract positive (and pending if available)
+    # from total to calculate it
+    calculate_pop_negative = pop_tested_negative.isna() \
+        & pop_tested.notna() \
+        & pop_tested_positive.notna()
+    output_data[POP_TESTED_NEGATIVE_COLUMN] = pop_tested_negative \
+        .mask(calculate_pop_negative & pop_pending.isna(),
+              pop_tested - pop_tested_positive) \
+        .mask(calculate_pop_negative & pop_pending.notna(),
+              pop_tested - (pop_tested_positive + pop_pending))
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_pop_negative & pop_pending.notna(),
+        POP_NEGATIVES_THREE_OPERANDS_NOTE)
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_pop_negative & pop_pending.isna(),
+        POP_NEGATIVES_TWO_OPERANDS_NOTE)
+
+    calculate_staff_negative = staff_tested_negative.isna() \
+        & staff_tested.notna() \
+        & staff_tested_positive.notna()
+    output_data[STAFF_TESTED_NEGATIVE_COLUMN] = staff_tested_negative \
+        .mask(calculate_staff_negative & staff_pending.isna(),
+              staff_tested - staff_tested_positive) \
+        .mask(calculate_staff_negative & staff_pending.notna(),
+              staff_tested - (staff_tested_positive + staff_pending))
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_staff_negative & staff_pending.notna(),
+        STAFF_NEGATIVES_THREE_OPERANDS_NOTE)
+    aggregation_notes = _append_text(
+        aggregation_notes, calculate_staff_negative & staff_pending.isna(),
+        STAFF_NEGATIVES_TWO_OPERANDS_NOTE)
+
+    # 3. Correct rows showing active as positive
+    is_tn_oh_ok = state.isin(['Tennessee', 'Ohio', 'Oklahoma'])
+    is_de_on_or_after_5_20 = (state == 'Delaware') \
+        & (dates >= datetime.datetime(2020, 5, 20))
+    is_federal_facility = \
+        (state == 'Federal') | (facility_type == 'Federal Prisons')
+    needs_correction = is_tn_oh_ok | is_de_on_or_after_5_20 \
+        | is_federal_facility
+
+    # Note that fixing this erroneous column mapping intentionally does not
+    # have an aggregation note. If recovered is also available, actual
+    # positives value can be calculated.
+    correct_pop = needs_correction & pop_tested_positive.notna()
+    output_data[POP_ACTIVE_CASES_COLUMN] = \
+        pop_active.mask(correct_pop, pop_tested_positive)
+    output_data[POP_TESTED_POSITIVE_COLUMN] = pop_tested_positive \
+        .mask(correct_pop, np.nan) \
+        .mask(correct_pop & pop_recovered.notna(),
+              pop_tested_positive + pop_recovered)
+    aggregation_notes = _append_text(
+        aggregation_notes, correct_pop & pop_recovered.notna(),
+        POP_POSITIVE_FROM_ACTIVE_AND_RECOVERED_NOTE)
+
+    correct_staff = needs_correction & staff_tested_positive.notna()
+    output_data[STAFF_ACTIVE_CASES_COLUMN] = \
+        staff_active.mask(correct_staff, staff_tested_positive)
+    output_data[STAFF_TESTED_POSITIVE_COLUMN] = staff_tested_positive \
+        .mask(correct_staff, np.nan) \
+        .mask(correct_staff & staff_recovered.notna(),
+              staff_tested_positive + staff_recovered)
+    aggregation_notes = _append_text(
+        aggregation_notes, correct_staff & staff_recovered.notna(),
+        STAFF_POSITIVE_FROM_ACTIVE_AND_RECOVERED_NOTE)
+
+    output_data[AGGREGATION_NOTES_COLUMN] = aggregation_notes
+
+    return output_data
 
 
 def _format_output(data):
     """Sorts rows and columns and adds header"""
-    output = []
-
-    header_row = list(OUTPUT_COLUMN_ORDER)
-    output.append(header_row)
-
     # Because of the choice of output date format and key structure, sorting by
     # key will conveniently sort by date, state, and facility, in that order.
     # This is obviously brittle, so this sort will need to be made more
     # careful if either the date format or key structure needs to be changed.
-    sorted_keys = sorted(data.keys())
-
-    for key in sorted_keys:
-        row = data[key]
-        sorted_row = [row[column] for column in OUTPUT_COLUMN_ORDER]
-        output.append(sorted_row)
+    sorted_data = data.sort_index()
+
+    output_columns = []
+    for column in OUTPUT_COLUMN_ORDER:
+        values = sorted_data[column]
+        if column in NUMERIC_COLUMNS:
+            # Numeric values are written as ints, with null values left empty
+            output_columns.append(
+                pd.array(values, dtype='Int64').to_numpy(
+                    dtype=object, na_value=None))
+        else:
+            output_columns.append(
+                values.to_numpy(dtype=object, na_value=None))
 
+    output = [list(OUTPUT_COLUMN_ORDER)]
+    output.extend(zip(*output_columns))
     return output
 
 
@@ -669,48 +660,126 @@ def _to_csv_string(rows):
     return string_buffer.getvalue()
 
 
-def _row_key(date, state, facility_name):
+def _row_keys(dates, states, facility_names):
     """Key format used for matching rows that represent the same facility on the
     same date
     """
-    return '{}:{}:{}'.format(date, state, facility_name)
+    return pd.Index(dates + ':' + states + ':' + facility_names, dtype=object)
 
 
-def _get_first_non_null(key, column, sources):
-    """Returns first occurence of a non-null value in the provided column for a
-    row with the provided key in any source
+def _to_numeric_source(source):
+    """Returns a copy of the source with the values of all numeric columns
+    converted to floats, with null values for any missing values
     """
-    for source in sources.values():
-        if key in source and column in source[key] and source[key][column]:
-            return source[key][column]
-    return None
+    numeric_source = source.copy()
+    for column in NUMERIC_COLUMNS:
+        if column in numeric_source:
+            numeric_source[column] = _to_float_values(numeric_source[column])
+    return numeric_source
 
 
-def _get_max(key, column, sources):
-    """Returns max value and name of max value source over all occurences of a
-    value in the provided column for a row with the provided key in all sources
+def _get_first_non_null(column, sources):
+    """Returns the first non-null value in the provided column for each row in
+    any of the provided aligned sources
+    """
+    first_values = None
+    for source in sources:
+        values = _get_non_null_text(source, column)
+        first_values = values if first_values is None \
+            else first_values.where(first_values.notna(), values)
+    return first_values.astype(object).where(first_values.notna(), None)
+
+
+def _get_max(column, sources):
+    """Returns the max value and name of the max value source over all
+    occurrences of a value in the provided column for each row in all of the
+    provided aligned sources
     """
     current_max = None
     current_max_source = None
     for source_name, source in sources.items():
-        if key in source and column in source[key] and source[key][column]:
-            value = _int_or_none(source[key][column])
-            # Explicit None check since 0 is a valid value
-            if value is not None and (not current_max or value > current_max):
-                current_max = value
-                current_max_source = source_name
+        if column in source:
+            values = source[column]
+        else:
+            values = pd.Series(np.nan, index=source.index)
+        if current_max is None:
+            current_max = pd.Series(np.nan, index=source.index)
+            current_max_source = np.full(len(source.index), None, dtype=object)
+
+        # A value replaces the current max if there is no current max yet, or
+        # if it is larger. A current max of 0 is always replaced.
+        is_new_max = values.notna() & (
+            current_max.isna() | (current_max == 0) | (values > current_max))
+        current_max = current_max.mask(is_new_max, values)
+        current_max_source[is_new_max.to_numpy()] = source_name
     return current_max, current_max_source
 
 
-def _combine_non_null_text(key, column, sources):
-    """Returns comma-joined string of all non-null occurences of a value in the
-    provided column for a row with the provided key in all sources
+def _combine_non_null_text(column, sources):
+    """Returns comma-joined strings of all non-null occurrences of a value in the
+    provided column for each row in all of the provided aligned sources
     """
-    values = []
-    for source in sources.values():
-        if key in source and column in source[key] and source[key][column]:
-            values.append(source[key][column])
-    return ', '.join(values)
+    combined_text = None
+    for source in sources:
+        values = _get_non_null_text(source, column)
+        if combined_text is None:
+            combined_text = pd.Series('', index=source.index, dtype=object)
+        combined_text = _append_text(
+            combined_text, values.notna(), values.fillna(''))
+    return combined_text
+
+
+def _get_non_null_text(source, column):
+    """Returns the values of the column in the source, with empty values and
+    values of missing columns replaced by null values
+    """
+    if column not in source:
+        return pd.Series(None, index=source.index, dtype=object)
+    values = source[column]
+    return values.where(values.notna() & (values != ''), None)
+
+
+def _append_text(text, condition, suffix):
+    """Appends the suffix to each value of the text column for which the
+    condition holds, comma-separated from any existing text
+    """
+    appended_text = text.where(text == '', text + ', ') + suffix
+    return text.mask(condition, appended_text)
+
+
+def _to_float_values(values):
+    """Converts a column of source values to floats, with null values for any
+    values that are empty or cannot be converted to ints. Values that are
+    already numeric (e.g. summed prison deaths) are treated as empty if 0.
+    """
+    def _to_float(value):
+        int_value = _int_or_none(value) if value else None
+        return np.nan if int_value is None else int_value
+
+    return _map_distinct_values(
+        values, _to_float, dtype=np.float64, null_value=np.nan)
+
+
+def _map_distinct_values(values, fn, dtype=object, null_value=None):
+    """Applies the provided function to each distinct non-null value in the
+    column. Source columns have few distinct values relative to their number of
+    rows (e.g. a single date per daily file), so this is much faster than
+    applying the function to every row. Null values are mapped to null_value.
+    """
+    codes, distinct_values = pd.factorize(values)
+    mapped_values = np.empty(len(distinct_values) + 1, dtype=dtype)
+    mapped_values[:-1] = [fn(value) for value in distinct_values]
+    # Null values have a code of -1, which selects the trailing null value
+    mapped_values[-1] = null_value
+    return pd.Series(mapped_values[codes], index=values.index, dtype=dtype)
+
+
+def _parse_output_date(date):
+    """Parses a date in the output format, or returns None if it is invalid"""
+    try:
+        return datetime.datetime.strptime(date, OUTPUT_DATE_FORMAT)
+    except ValueError:
+        return None
 
 
 def _get_excel_cell_string_value(cell, workbook_date_mode):
@@ -785,10 +854,33 @@ class FacilityInfoMapping:
     def contains(self, state, facility_name):
         return self._key(state, facility_name) in self._map
 
+    def get_canonical_facility_names(self, states, facility_names):
+        """Returns the canonical facility name for each of the provided state
+        and facility name columns, or null for facilities without info
+        """
+        return self._keys(states, facility_names).map(
+            {key: info[0] for key, info in self._map.items()})
+
+    def get_facility_types(self, states, facility_names):
+        """Returns the facility type for each of the provided state and
+        facility name columns, or null for facilities without info
+        """
+        return self._keys(states, facility_names).map(
+            {key: info[1] for key, info in self._map.items()})
+
     def _key(self, state, facility_name):
         return '{}:{}'.format(
             state.strip().lower(), facility_name.strip().lower())
 
+    @staticmethod
+    def _keys(states, facility_names):
+        """Vectorized equivalent of _key over columns of states and names"""
+        def _normalize(value):
+            return value.strip().lower()
+
+        return _map_distinct_values(states, _normalize) + ':' \
+            + _map_distinct_values(facility_names, _normalize)
+
 
 # Convenience entry point for local testing and debugging
 # TODO(zdg2102): remove this once the aggregation logic has settled into more of
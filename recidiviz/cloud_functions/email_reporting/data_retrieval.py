@@ -24,38 +24,52 @@ Pub/Sub.
 
 import json
 import logging
-from typing import List
+from typing import List, Optional
+
+from google.cloud import pubsub_v1
+from google.cloud import storage
 
 import email_generation
 import email_reporting_utils as utils
 from available_context import get_report_context
 
 
-def start(state_code: str, report_type: str) -> str:
+def start(state_code: str,
+          report_type: str,
+          storage_client: Optional[storage.Client] = None,
+          publisher: Optional[pubsub_v1.PublisherClient] = None) -> str:
     """Begins data retrieval a new batch of email reports.
 
-    Start with collection of data from the calculation pipelines. Send messages to start chart generation.
+    Start with collection of data from the calculation pipelines, then generate the emails for all recipients as a
+    single batch.
 
     Args:
         state_code: The state for which to generate reports
         report_type: The type of report to send
+        storage_client: Optional Storage client to use. A new client is created if not provided.
+        publisher: Optional Pub/Sub publisher to use. A new publisher is created if not provided.
 
     Returns: The batch id for the newly started batch
     """
     batch_id = utils.generate_batch_id()
     logging.info("New batch started for %s and %s. Batch id = %s", state_code, report_type, batch_id)
 
-    recipient_data = retrieve_data(state_code, report_type, batch_id)
+    recipient_data = retrieve_data(state_code, report_type, batch_id, storage_client)
 
+    report_contexts = []
     for recipient in recipient_data:
         recipient[utils.KEY_BATCH_ID] = batch_id
-        report_context = get_report_context(state_code, report_type, recipient)
-        email_generation.generate(report_context)
+        report_contexts.append(get_report_context(state_code, report_type, recipient))
+
+    email_generation.generate_batch(report_contexts, storage_client=storage_client, publisher=publisher)
 
     return batch_id
 
 
-def retrieve_data(state_code: str, report_type: str, batch_id: str) -> List:
+def retrieve_data(state_code: str,
+                  report_type: str,
+                  batch_id: str,
+                  storage_client: Optional[storage.Client] = None) -> List:
     """Retrieves the data for email generation of the given report type for the given state.
 
     Get the data from Cloud Storage and return it in a list of dictionaries. Saves the data file into an archive
@@ -66,6 +80,7 @@ def retrieve_data(state_code: str, report_type: str, batch_id: str) -> List:
         state_code: State identifier used to retrieve appropriate data
         report_type: The type of report, used to determine the data file name
         batch_id: The identifier for this batch
+        storage_client: Optional Storage client to use. A new client is created if not provided.
 
     Returns:
         A list of recipient data dictionaries
@@ -78,7 +93,7 @@ def retrieve_data(state_code: str, report_type: str, batch_id: str) -> List:
     data_filename = ''
     try:
         data_filename = utils.get_data_filename(state_code, report_type)
-        file_contents_string = utils.load_string_from_storage(data_bucket, data_filename)
+        file_contents_string = utils.load_string_from_storage(data_bucket, data_filename, storage_client=storage_client)
     except:
         logging.error("Unable to load data file %s/%s", data_bucket, data_filename)
         raise
@@ -87,7 +102,8 @@ def retrieve_data(state_code: str, report_type: str, batch_id: str) -> List:
     archive_filename = ''
     try:
         archive_filename = utils.get_data_archive_filename(batch_id)
-        utils.upload_string_to_storage(archive_bucket, archive_filename, file_contents_string, "text/json")
+        utils.upload_string_to_storage(archive_bucket, archive_filename, file_contents_string, "text/json",
+                                       storage_client=storage_client)
     except Exception:
         logging.error("Unable to archive the data file to %s/%s", archive_bucket, archive_filename)
         raise
@@ -27,7 +27,10 @@ and conform to the following:
 """
 
 import logging
-from typing import Dict, Tuple
+import threading
+import time
+from concurrent import futures
+from typing import Dict, Optional, Tuple
 
 from google.cloud import storage
 from sendgrid import SendGridAPIClient
@@ -37,16 +40,48 @@ import email_reporting_utils as utils
 
 EMAIL_SUBJECT = "Your monthly Recidiviz report"
 
+# Maximum number of html files that are downloaded from Storage concurrently.
+MAX_DOWNLOAD_WORKERS = 16
 
-def deliver(batch_id: str, test_address: str = None) -> Tuple[int, int]:
+# Maximum number of emails that are sent concurrently, and the maximum rate at which they are sent.
+MAX_SEND_WORKERS = 8
+MAX_SENDS_PER_SECOND = 10
+
+
+class RateLimiter:
+    """Spaces out calls to wait() across threads so that they return at most |max_per_second| times per second."""
+
+    def __init__(self, max_per_second: float):
+        self._interval_seconds = 1.0 / max_per_second
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait_seconds = self._next_time - now
+            self._next_time = max(now, self._next_time) + self._interval_seconds
+
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+def deliver(batch_id: str,
+            test_address: str = None,
+            storage_client: Optional[storage.Client] = None,
+            sendgrid_client: Optional[SendGridAPIClient] = None) -> Tuple[int, int]:
     """Delivers emails for the given batch.
 
     Delivers emails to either the desired recipients for the batch or to a test address. Emails delivered to the test
     address are identical to a production send except that the customer email address is appended to the subject.
 
+    Emails are sent concurrently, at a rate of at most MAX_SENDS_PER_SECOND.
+
     Args:
         batch_id: The identifier for the batch
         test_address: If provided, all emails will be sent to this email address
+        storage_client: Optional Storage client to use. A new client is created if not provided.
+        sendgrid_client: Optional SendGrid client to use. A new client is created if not provided.
 
     Returns:
         A tuple with counts of successful deliveries and failures (successes, failures)
@@ -61,34 +96,48 @@ def deliver(batch_id: str, test_address: str = None) -> Tuple[int, int]:
         logging.info("Delivering emails for batch %s", batch_id)
 
     try:
-        sendgrid_api_key = utils.get_env_var('SENDGRID_API_KEY')
+        if sendgrid_client is None:
+            sendgrid_client = SendGridAPIClient(utils.get_env_var('SENDGRID_API_KEY'))
         from_email_address = utils.get_env_var('FROM_EMAIL_ADDRESS')
         from_email_name = utils.get_env_var('FROM_EMAIL_NAME')
     except KeyError:
         logging.error("Unable to get a required environment variable. Exiting.")
         raise
 
-    files = retrieve_html_files(batch_id)
+    files = retrieve_html_files(batch_id, storage_client)
     success_count = 0
     fail_count = 0
 
-    for email_address in files:
-        if test_address:
-            subject = f"[{email_address}] {EMAIL_SUBJECT}"
-            to_address = test_address
-        else:
-            subject = EMAIL_SUBJECT
-            to_address = email_address
-
-        try:
-            send_email(to_address, subject, files[email_address], sendgrid_api_key, from_email_address, from_email_name)
-        except Exception as e:
-            logging.error("Error sending the file created for %s to %s", email_address, to_address)
-            logging.error(e)
-            fail_count = fail_count + 1
-        else:
-            logging.info("Email for %s sent to %s", email_address, to_address)
-            success_count = success_count + 1
+    rate_limiter = RateLimiter(MAX_SENDS_PER_SECOND)
+
+    def _send_rate_limited(to_address: str, subject: str, body: str) -> None:
+        rate_limiter.wait()
+        send_email(to_address, subject, body, sendgrid_client, from_email_address, from_email_name)
+
+    with futures.ThreadPoolExecutor(max_workers=MAX_SEND_WORKERS) as executor:
+        future_to_addresses = {}
+        for email_address, body in files.items():
+            if test_address:
+                subject = f"[{email_address}] {EMAIL_SUBJECT}"
+                to_address = test_address
+            else:
+                subject = EMAIL_SUBJECT
+                to_address = email_address
+
+            future = executor.submit(_send_rate_limited, to_address, subject, body)
+            future_to_addresses[future] = (email_address, to_address)
+
+        for future in futures.as_completed(future_to_addresses):
+            email_address, to_address = future_to_addresses[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error("Error sending the file created for %s to %s", email_address, to_address)
+                logging.error(e)
+                fail_count = fail_count + 1
+            else:
+                logging.info("Email for %s sent to %s", email_address, to_address)
+                success_count = success_count + 1
 
     logging.info("Sent %s emails. %s emails failed to send", success_count, fail_count)
     return success_count, fail_count
@@ -97,7 +146,7 @@ def deliver(batch_id: str, test_address: str = None) -> Tuple[int, int]:
 def send_email(email_address: str,
                subject: str,
                body: str,
-               sendgrid_api_key: str,
+               sendgrid_client: SendGridAPIClient,
                from_email_address: str,
                from_email_name: str) -> None:
     """Send an email via SendGrid.
@@ -106,21 +155,19 @@ def send_email(email_address: str,
         email_address: The address to deliver to
         subject: Text for the subject line
         body: The body of the email
-        sendgrid_api_key: The SendGrid API key needed to send emails
+        sendgrid_client: The SendGrid client to send the email with
         from_email_address: The address that the delivered emails should be from
         from_email_name: The name of the person sending emails
 
     Raises:
         All errors so that calling functions can handle appropriately for their use case.
     """
-    sg = SendGridAPIClient(sendgrid_api_key)
-
     message = Mail(to_emails=email_address,
                    from_email=Email(from_email_address, from_email_name),
                    subject=subject,
                    html_content=body)
 
-    response = sg.send(message)
+    response = sendgrid_client.send(message)
     logging.info("Sent email. Status code = %s", response.status_code)
     logging.info("Email response body = %s", response.body)
 
@@ -136,14 +183,15 @@ def email_from_blob_name(blob_name: str) -> str:
     return email_address
 
 
-def retrieve_html_files(batch_id: str) -> Dict[str, str]:
+def retrieve_html_files(batch_id: str, storage_client: Optional[storage.Client] = None) -> Dict[str, str]:
     """Loads the HTML files for this batch from Storage.
 
     This function is guaranteed to either return a dictionary with 1 or more results or throw an exception if there is
-    a problem loading any of the files.
+    a problem loading any of the files. Files are downloaded concurrently, up to MAX_DOWNLOAD_WORKERS at a time.
 
     Args:
         batch_id: The identifier for this batch
+        storage_client: Optional Storage client to use. A new client is created if not provided.
 
     Returns:
         A dict whose keys are the email addresses of recipients and values are strings of the email body to send.
@@ -151,25 +199,33 @@ def retrieve_html_files(batch_id: str) -> Dict[str, str]:
     Raises:
         Passes through exceptions from Storage and raises its own if there are no results in this batch.
     """
-    storage_client = storage.Client()
+    if storage_client is None:
+        storage_client = storage.Client()
 
     html_bucket = utils.get_html_bucket_name()
     try:
-        blobs = storage_client.list_blobs(html_bucket, prefix=batch_id)
+        blobs = list(storage_client.list_blobs(html_bucket, prefix=batch_id))
     except Exception:
         logging.error("Unable to list files in html folder. Bucket = %s, folder = %s", html_bucket, batch_id)
         raise
 
     files = {}
-    for blob in blobs:
-        try:
-            body = utils.load_string_from_storage(html_bucket, blob.name)
-        except Exception:
-            logging.error("Unable to load html file %s from bucket %s", blob.name, html_bucket)
-            raise
-        else:
-            email_address = email_from_blob_name(blob.name)
-            files[email_address] = body
+    with futures.ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+        future_to_blob_name = {
+            executor.submit(utils.load_string_from_storage, html_bucket, blob.name, storage_client): blob.name
+            for blob in blobs
+        }
+
+        for future in futures.as_completed(future_to_blob_name):
+            blob_name = future_to_blob_name[future]
+            try:
+                body = future.result()
+            except Exception:
+                logging.error("Unable to load html file %s from bucket %s", blob_name, html_bucket)
+                raise
+            else:
+                email_address = email_from_blob_name(blob_name)
+                files[email_address] = body
 
     if len(files) == 0:
         msg = f"No html files found for batch {batch_id} in the bucket {html_bucket}"
@@ -22,40 +22,115 @@ Generates the HTML for email reports and stores it for later delivery.
 
 import json
 import logging
-
+import threading
+from concurrent import futures
 from string import Template
+from typing import Dict, List, Optional, Tuple
 
 from google.cloud import pubsub_v1
+from google.cloud import storage
 
 import email_reporting_utils as utils
 from report_context import ReportContext
 
+# Maximum number of recipients whose emails are generated concurrently within a batch.
+MAX_GENERATION_WORKERS = 16
+
+# Maximum number of chart generation messages that are sent to Pub/Sub in a single publish request.
+MAX_MESSAGES_PER_PUBLISH = 100
+
+
+class TemplateCache:
+    """Caches the HTML template for each state and report type for the duration of a batch, so that each template is
+    downloaded and parsed once per batch rather than once per recipient. Can be shared across threads."""
+
+    def __init__(self, storage_client: Optional[storage.Client] = None):
+        self._storage_client = storage_client
+        self._templates: Dict[Tuple[str, str], Template] = {}
+        self._lock = threading.Lock()
+
+    def get_template(self, state_code: str, report_type: str) -> Template:
+        """Returns the template for the given state and report type, loading it from Cloud Storage if this is the
+        first request for it."""
+        with self._lock:
+            template = self._templates.get((state_code, report_type))
+            if template is None:
+                template = Template(load_template(state_code, report_type, self._storage_client))
+                self._templates[(state_code, report_type)] = template
+            return template
+
+
+def generate_batch(report_contexts: List[ReportContext],
+                   storage_client: Optional[storage.Client] = None,
+                   publisher: Optional[pubsub_v1.PublisherClient] = None) -> None:
+    """Generates emails for all of the recipients in a batch.
+
+    Emails are generated concurrently, sharing a single Storage client, Pub/Sub publisher and TemplateCache. Returns
+    once every email has been stored and every chart generation message has been published.
+
+    Args:
+        report_contexts: The contexts for each recipient in the batch
+        storage_client: Optional Storage client to use. A new client is created if not provided.
+        publisher: Optional Pub/Sub publisher to use. A new publisher is created if not provided.
+
+    Raises:
+        The first error raised while generating any of the emails.
+    """
+    if storage_client is None:
+        storage_client = storage.Client()
+    if publisher is None:
+        publisher = pubsub_v1.PublisherClient(
+            batch_settings=pubsub_v1.types.BatchSettings(max_messages=MAX_MESSAGES_PER_PUBLISH))
+
+    template_cache = TemplateCache(storage_client)
+
+    with futures.ThreadPoolExecutor(max_workers=MAX_GENERATION_WORKERS) as executor:
+        generation_futures = [
+            executor.submit(generate, report_context, template_cache, publisher, storage_client)
+            for report_context in report_contexts
+        ]
+        publish_futures = [future.result() for future in generation_futures]
+
+    for publish_future in publish_futures:
+        if publish_future is not None:
+            publish_future.result()
+
+    logging.info("Generated %s emails", len(report_contexts))
 
-def generate(report_context: ReportContext) -> None:
+
+def generate(report_context: ReportContext,
+             template_cache: Optional[TemplateCache] = None,
+             publisher: Optional[pubsub_v1.PublisherClient] = None,
+             storage_client: Optional[storage.Client] = None) -> Optional[futures.Future]:
     """Generates an email for the identified recipient.
 
     Receives the full user data, applies it to the HTML template and stores the result in Cloud Storage.
 
     Args:
         report_context: The context for a single recipient
+        template_cache: Optional cache of templates shared across a batch. The template is loaded from Cloud Storage if
+            not provided.
+        publisher: Optional Pub/Sub publisher to start chart generation with. A new publisher is created if not
+            provided.
+        storage_client: Optional Storage client to use. A new client is created if not provided.
+
+    Returns:
+        The future for the chart generation message, if this report has a chart.
     """
     prepared_data = report_context.get_prepared_data()
     check_for_required_keys(prepared_data)
 
+    publish_future = None
     if report_context.has_chart():
-        start_chart_generation(report_context)
+        publish_future = start_chart_generation(report_context, publisher)
 
-    data_bucket = utils.get_data_storage_bucket_name()
-    template_filename = ''
-    try:
-        template_filename = utils.get_template_filename(report_context.state_code, report_context.get_report_type())
-        html_template = utils.load_string_from_storage(data_bucket, template_filename)
-    except Exception:
-        logging.error("Unable to load email template at %s/%s", data_bucket, template_filename)
-        raise
+    if template_cache is not None:
+        template = template_cache.get_template(report_context.state_code, report_context.get_report_type())
+    else:
+        template = Template(load_template(report_context.state_code, report_context.get_report_type(),
+                                          storage_client))
 
     try:
-        template = Template(html_template)
         final_email = template.substitute(prepared_data)
     except KeyError as err:
         logging.error("Attribute required for HTML template missing from recipient data: "
@@ -71,11 +146,26 @@ def generate(report_context: ReportContext) -> None:
     try:
         html_filename = utils.get_html_filename(prepared_data[utils.KEY_BATCH_ID],
                                                 prepared_data[utils.KEY_EMAIL_ADDRESS])
-        utils.upload_string_to_storage(html_bucket, html_filename, final_email, "text/html")
+        utils.upload_string_to_storage(html_bucket, html_filename, final_email, "text/html",
+                                       storage_client=storage_client)
     except Exception:
         logging.error("Error while attempting upload of %s/%s", html_bucket, html_filename)
         raise
 
+    return publish_future
+
+
+def load_template(state_code: str, report_type: str, storage_client: Optional[storage.Client] = None) -> str:
+    """Loads the HTML template for the given state and report type from Cloud Storage."""
+    data_bucket = utils.get_data_storage_bucket_name()
+    template_filename = ''
+    try:
+        template_filename = utils.get_template_filename(state_code, report_type)
+        return utils.load_string_from_storage(data_bucket, template_filename, storage_client=storage_client)
+    except Exception:
+        logging.error("Unable to load email template at %s/%s", data_bucket, template_filename)
+        raise
+
 
 def check_for_required_keys(recipient_data: dict) -> None:
     """Checks recipient_data for required information and raises errors.
@@ -91,7 +181,8 @@ def check_for_required_keys(recipient_data: dict) -> None:
                            f"Recipient data = {json.dumps(recipient_data)}")
 
 
-def start_chart_generation(report_context: ReportContext) -> None:
+def start_chart_generation(report_context: ReportContext,
+                           publisher: Optional[pubsub_v1.PublisherClient] = None) -> futures.Future:
     """Starts chart generation for a recipient.
 
     Uses Pub/Sub to send a message to the chart function. The message contains all of the recipient's data since the
@@ -99,11 +190,16 @@ def start_chart_generation(report_context: ReportContext) -> None:
 
     Args:
         report_context: The report context containing the data and chart type
+        publisher: Optional publisher to send the message with. A new publisher is created if not provided.
+
+    Returns:
+        The future for the published message
     """
-    publisher = pubsub_v1.PublisherClient()
+    if publisher is None:
+        publisher = pubsub_v1.PublisherClient()
 
     prepared_data = report_context.get_prepared_data()
     payload = json.dumps(prepared_data)  # no error checking here since we already validated the JSON previously
     # TODO(3260): Generalize this with report context
     topic = utils.get_chart_topic()
-    publisher.publish(topic, payload.encode("utf-8"))
+    return publisher.publish(topic, payload.encode("utf-8"))
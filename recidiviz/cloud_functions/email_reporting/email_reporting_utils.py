@@ -20,6 +20,7 @@
 from datetime import datetime
 import logging
 import os
+from typing import Optional
 
 from google.cloud import storage
 
@@ -103,12 +104,15 @@ def get_chart_topic() -> str:
     return f'projects/{get_project_id()}/topics/report_po_comparison_chart'
 
 
-def load_string_from_storage(bucket_name: str, filename: str) -> str:
+def load_string_from_storage(bucket_name: str,
+                             filename: str,
+                             storage_client: Optional[storage.Client] = None) -> str:
     """Load object from Cloud Storage and return as string.
 
     Args:
         bucket_name: The identifier of the Cloud Storage bucket
         filename: The identifier of the object within the bucket
+        storage_client: Optional client to reuse. A new client is created if not provided.
 
     Returns:
         String form of the object decoded using UTF-8
@@ -116,7 +120,8 @@ def load_string_from_storage(bucket_name: str, filename: str) -> str:
     Raises:
         All errors.  Callers are expected to handle.
     """
-    storage_client = storage.Client()
+    if storage_client is None:
+        storage_client = storage.Client()
 
     logging.debug("Downloading %s/%s...", bucket_name, filename)
 
@@ -128,7 +133,11 @@ def load_string_from_storage(bucket_name: str, filename: str) -> str:
     return contents
 
 
-def upload_string_to_storage(bucket_name: str, filename: str, contents: str, content_type: str = 'text/plain') -> None:
+def upload_string_to_storage(bucket_name: str,
+                             filename: str,
+                             contents: str,
+                             content_type: str = 'text/plain',
+                             storage_client: Optional[storage.Client] = None) -> None:
     """Upload a string into Cloud Storage.
 
     Creates a new object in the given bucket with the given filename.
@@ -138,11 +147,13 @@ def upload_string_to_storage(bucket_name: str, filename: str, contents: str, con
         filename: The identifier of the object within the bucket
         contents: A string to put in the object
         content_type: Optional parameter if the content is something other than plain text
+        storage_client: Optional client to reuse. A new client is created if not provided.
 
     Raises:
         All errors.  Callers are expected to handle.
     """
-    storage_client = storage.Client()
+    if storage_client is None:
+        storage_client = storage.Client()
 
     logging.debug("Uploading %s/%s...", bucket_name, filename)
 
@@ -0,0 +1,122 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""In-memory stand-ins for the Storage, Pub/Sub and SendGrid clients used by email reporting.
+
+These can be passed to data_retrieval.start, email_generation.generate_batch and email_delivery.deliver to run a batch
+locally or in tests without access to any external services. They are not deployed with the Cloud Functions.
+"""
+
+import threading
+from concurrent import futures
+from typing import Dict, List, Optional, Tuple
+
+import attr
+
+
+class FakeStorageClient:
+    """In-memory stand-in for a google.cloud.storage.Client, supporting the operations used by email reporting."""
+
+    def __init__(self) -> None:
+        self.files: Dict[Tuple[str, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, bucket_name: str) -> 'FakeBucket':
+        return FakeBucket(self, bucket_name)
+
+    def get_bucket(self, bucket_name: str) -> 'FakeBucket':
+        return self.bucket(bucket_name)
+
+    def list_blobs(self, bucket_name: str, prefix: Optional[str] = None) -> List['FakeBlob']:
+        with self._lock:
+            return [FakeBlob(self, bucket, name) for bucket, name in sorted(self.files)
+                    if bucket == bucket_name and name.startswith(prefix or '')]
+
+    def upload_string(self, bucket_name: str, filename: str, contents: str) -> None:
+        with self._lock:
+            self.files[(bucket_name, filename)] = contents.encode('utf-8')
+
+    def download_string(self, bucket_name: str, filename: str) -> str:
+        with self._lock:
+            if (bucket_name, filename) not in self.files:
+                raise FileNotFoundError(f'No file {bucket_name}/{filename}')
+            return self.files[(bucket_name, filename)].decode('utf-8')
+
+
+@attr.s(frozen=True)
+class FakeBucket:
+    client: FakeStorageClient = attr.ib()
+    name: str = attr.ib()
+
+    def blob(self, blob_name: str) -> 'FakeBlob':
+        return FakeBlob(self.client, self.name, blob_name)
+
+
+@attr.s(frozen=True)
+class FakeBlob:
+    client: FakeStorageClient = attr.ib()
+    bucket_name: str = attr.ib()
+    name: str = attr.ib()
+
+    def download_as_string(self) -> bytes:
+        return self.client.download_string(self.bucket_name, self.name).encode('utf-8')
+
+    def upload_from_string(self, contents: str, content_type: str = 'text/plain') -> None:
+        del content_type
+        self.client.upload_string(self.bucket_name, self.name, contents)
+
+
+class FakePublisherClient:
+    """In-memory stand-in for a google.cloud.pubsub_v1.PublisherClient that records every published message."""
+
+    def __init__(self) -> None:
+        self.messages: List[Tuple[str, bytes]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, topic: str, data: bytes) -> futures.Future:
+        with self._lock:
+            self.messages.append((topic, data))
+            future: futures.Future = futures.Future()
+            future.set_result(str(len(self.messages)))
+            return future
+
+
+@attr.s(frozen=True)
+class FakeSendGridResponse:
+    status_code: int = attr.ib()
+    body: str = attr.ib()
+
+
+class FakeSendGridClient:
+    """In-memory stand-in for a sendgrid.SendGridAPIClient that records every sent message. Raises for any message sent
+    to one of the |failing_addresses|."""
+
+    def __init__(self, failing_addresses: Optional[List[str]] = None) -> None:
+        self.failing_addresses = failing_addresses or []
+        self.sent_messages: List[dict] = []
+        self._lock = threading.Lock()
+
+    def send(self, message) -> FakeSendGridResponse:
+        message_json = message.get()
+        to_addresses = [to['email'] for personalization in message_json['personalizations']
+                        for to in personalization['to']]
+        if any(address in self.failing_addresses for address in to_addresses):
+            raise ValueError(f'Failed to send to {to_addresses}')
+
+        with self._lock:
+            self.sent_messages.append(message_json)
+        return FakeSendGridResponse(status_code=202, body='')
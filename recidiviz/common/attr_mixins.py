@@ -16,7 +16,8 @@
 # ============================================================================
 """Logic for Attr objects that can be built with a Builder."""
 
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Callable, FrozenSet, List, Tuple, Type
 import datetime
 import attr
 
@@ -99,13 +100,11 @@ class BuildableAttr:
                 1. Any field without a default/factory value is left unset
                 2. Any field is set that doesn't exist on the Attr
             """
-            required_fields = set(attr.fields_dict(self.cls).keys())
+            decoder = _get_dictionary_decoder(self.cls)
+            required_fields = set(decoder.all_fields)
 
             fields_provided = set(self.fields.keys())
-            fields_with_defaults = {field for field, attribute in
-                                    attr.fields_dict(self.cls).items() if
-                                    attribute.default is not attr.NOTHING}
-            fields_with_value = fields_provided | fields_with_defaults
+            fields_with_value = fields_provided | decoder.fields_with_defaults
 
             if not required_fields == fields_with_value:
                 raise BuilderException(
@@ -130,48 +129,99 @@ class BuildableAttr:
         if not build_dict:
             raise ValueError("build_dict cannot be empty")
 
-        cls_builder = cls.builder()
+        return _get_dictionary_decoder(cls).decode(build_dict)
 
-        for field, attribute in attr.fields_dict(cls).items():
+    @classmethod
+    def extract_enum_value(cls, build_dict, field, attribute):
+        return _enum_value_parser(get_enum_cls(attribute))(build_dict.get(field))
+
+    @classmethod
+    def extract_date_value(cls, build_dict, field):
+        return _parse_date_value(build_dict.get(field))
+
+
+class _DictionaryDecoder:
+    """Builds instances of a BuildableAttr class from dictionaries of flat values.
+
+    Everything that depends only on the class (the fields to read, how to parse each of them, and which fields are
+    required) is computed once, so that decoding a dictionary is a single pass over the fields followed by one call to
+    the class constructor.
+    """
+
+    def __init__(self, cls: Type):
+        self.cls = cls
+
+        fields = attr.fields_dict(cls)
+        self.all_fields: FrozenSet[str] = frozenset(fields)
+        self.fields_with_defaults: FrozenSet[str] = frozenset(
+            field for field, attribute in fields.items() if attribute.default is not attr.NOTHING)
+        self.required_fields: FrozenSet[str] = self.all_fields - self.fields_with_defaults
+        self.forward_ref_fields: FrozenSet[str] = frozenset(
+            field for field, attribute in fields.items() if is_forward_ref(attribute))
+
+        self.field_parsers: List[Tuple[str, Optional[Callable[[Any], Any]]]] = []
+        for field, attribute in fields.items():
+            if field in self.forward_ref_fields:
+                continue
+
+            parser: Optional[Callable[[Any], Any]] = None
+            if is_enum(attribute):
+                parser = _enum_value_parser(get_enum_cls(attribute))
+            elif is_date(attribute):
+                parser = _parse_date_value
+            self.field_parsers.append((field, parser))
+
+    def decode(self, build_dict: Dict[str, Any]) -> Any:
+        """Builds an instance of the class from the values in |build_dict|. Values for fields that are not on the
+        class are ignored."""
+        if not self.forward_ref_fields.isdisjoint(build_dict):
+            # TODO(1886): Implement detection of non-ForwardRefs
+            # ForwardRef fields are expected to be references to other
+            # BuildableAttrs
+            raise ValueError("build_dict should be a dictionary of "
+                             "flat values. Should not contain any "
+                             f"ForwardRef fields: {build_dict}")
+
+        kwargs = {}
+        for field, parser in self.field_parsers:
             if field in build_dict:
-                if is_forward_ref(attribute):
-                    # TODO(1886): Implement detection of non-ForwardRefs
-                    # ForwardRef fields are expected to be references to other
-                    # BuildableAttrs
-                    raise ValueError("build_dict should be a dictionary of "
-                                     "flat values. Should not contain any "
-                                     f"ForwardRef fields: {build_dict}")
+                value = build_dict[field]
+                kwargs[field] = parser(value) if parser else value
 
-                if is_enum(attribute):
-                    value = cls.extract_enum_value(build_dict, field, attribute)
-                elif is_date(attribute):
-                    value = cls.extract_date_value(build_dict, field)
-                else:
-                    value = build_dict.get(field)
+        if not self.required_fields.issubset(kwargs):
+            raise BuilderException(self.cls, set(self.all_fields), set(kwargs) | self.fields_with_defaults)
 
-                setattr(cls_builder, field, value)
+        return self.cls(**kwargs)
 
-        return cls_builder.build()
 
-    @classmethod
-    def extract_enum_value(cls, build_dict, field, attribute):
-        enum_cls = get_enum_cls(attribute)
+@lru_cache(maxsize=None)
+def _get_dictionary_decoder(cls: Type) -> _DictionaryDecoder:
+    return _DictionaryDecoder(cls)
 
-        value = build_dict.get(field)
 
+def _enum_value_parser(enum_cls) -> Callable[[Any], Any]:
+    def _parse_enum_value(value):
         return enum_cls(value) if value else None
 
-    @classmethod
-    def extract_date_value(cls, build_dict, field):
-        value = build_dict.get(field)
+    return _parse_enum_value
+
+
+def _parse_date_value(value):
+    if value and isinstance(value, str):
+        if _is_iso_date_str(value):
+            # Dates are almost always in this format, which can be parsed much more cheaply than with strptime
+            value = datetime.date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+        elif is_yyyymmdd_date(value):
+            value = parse_yyyymmdd_date(value)
+        else:
+            value = datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+    return value
 
-        if value and isinstance(value, str):
-            if is_yyyymmdd_date(value):
-                value = parse_yyyymmdd_date(value)
-            else:
-                value = datetime.datetime.strptime(value, '%Y-%m-%d').date()
 
-        return value
+def _is_iso_date_str(value: str) -> bool:
+    return len(value) == 10 and value[4] == '-' and value[7] == '-' and value.isascii() \
+        and (value[0:4] + value[5:7] + value[8:10]).isdigit()
 
 
 class BuilderException(Exception):
@@ -29,13 +29,20 @@ def get_non_flat_property_class_name(obj, property_name) -> Optional[str]:
     """Returns the class name of the property with |property_name| on obj, or
     None if the property is a flat field.
     """
-    if is_property_flat_field(obj, property_name):
-        return None
-
     attribute = attr.fields_dict(obj.__class__).get(property_name)
     if not attribute:
         return None
 
+    return get_non_flat_attribute_class_name(attribute)
+
+
+def get_non_flat_attribute_class_name(attribute) -> Optional[str]:
+    """Returns the class name of the type referenced by the provided
+    |attribute|, or None if the attribute is a flat field.
+    """
+    if not is_list(attribute) and not is_forward_ref(attribute):
+        return None
+
     attr_type = attribute.type
 
     if _is_list(attr_type):
@@ -57,8 +64,8 @@ def get_non_flat_property_class_name(obj, property_name) -> Optional[str]:
         return _get_type_name_from_type(attr_type)
 
     raise ValueError(
-        f'Non-flat field [{property_name}] on class [{obj.__class__}] should '
-        f'either correspond to list or union.')
+        f'Non-flat field [{attribute.name}] should either correspond to list '
+        f'or union.')
 
 
 def is_property_list(obj, property_name) -> bool:
@@ -18,7 +18,9 @@
 """Contains logic related to EntityEnums."""
 
 import re
-from typing import Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
 
 from aenum import Enum, EnumMeta
 from opencensus.stats import aggregation, measure, view
@@ -34,7 +36,29 @@ enum_errors_view = view.View("recidiviz/converter/enum_error_count",
                              [monitoring.TagKey.REGION,
                               monitoring.TagKey.ENTITY_TYPE],
                              m_enum_errors, aggregation.SumAggregation())
-monitoring.register_views([enum_errors_view])
+m_enum_parse_cache_hits = measure.MeasureInt(
+    "converter/enum_parse_cache_hits",
+    "The number of enum parses served from the enum parse cache", "1")
+m_enum_parse_cache_misses = measure.MeasureInt(
+    "converter/enum_parse_cache_misses",
+    "The number of enum parses not served from the enum parse cache", "1")
+enum_parse_cache_hits_view = view.View(
+    "recidiviz/converter/enum_parse_cache_hits",
+    "The sum of enum parse cache hits",
+    [monitoring.TagKey.REGION],
+    m_enum_parse_cache_hits, aggregation.SumAggregation())
+enum_parse_cache_misses_view = view.View(
+    "recidiviz/converter/enum_parse_cache_misses",
+    "The sum of enum parse cache misses",
+    [monitoring.TagKey.REGION],
+    m_enum_parse_cache_misses, aggregation.SumAggregation())
+monitoring.register_views([enum_errors_view,
+                           enum_parse_cache_hits_view,
+                           enum_parse_cache_misses_view])
+
+# The maximum number of parsed labels held by the enum parse cache. Raw labels
+# repeat heavily within a region, so this is far more than a region needs.
+ENUM_PARSE_CACHE_MAX_SIZE = 100000
 
 
 class EnumParsingError(Exception):
@@ -44,9 +68,129 @@ class EnumParsingError(Exception):
         msg = "Could not parse {0} when building {1}".format(string_to_parse,
                                                              cls)
         self.entity_type = cls
+        self.string_to_parse = string_to_parse
         super().__init__(msg)
 
 
+class EnumParseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class _EnumParseCacheEntry(NamedTuple):
+    # Held so that an entry is never returned for a different EnumOverrides
+    # object that has been allocated with the same id.
+    enum_overrides: 'EnumOverrides'
+    value: Optional['EntityEnum']
+    parsing_error: Optional[EnumParsingError]
+
+
+class _EnumParseCache:
+    """A bounded, least-recently-used cache of the results of parsing a raw
+    label into an enum class with a given EnumOverrides object, shared by all
+    converters in the process.
+
+    Parsing is deterministic for a given enum class, label and overrides
+    object, since EnumOverrides are immutable once built. Labels that fail to
+    parse are cached as well, so that they raise without being parsed again.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: 'OrderedDict[Tuple[EntityEnumMeta, str, int], _EnumParseCacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._unrecorded_hits = 0
+        self._unrecorded_misses = 0
+
+    def parse(self,
+              cls: 'EntityEnumMeta',
+              label: str,
+              enum_overrides: 'EnumOverrides',
+              parse_fn: Callable[[], Optional['EntityEnum']]) -> Optional['EntityEnum']:
+        """Returns the cached result of parsing |label| into |cls| with
+        |enum_overrides|, calling |parse_fn| to parse it on a miss. Raises an
+        EnumParsingError if the label does not parse."""
+        key = (cls, label, id(enum_overrides))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.enum_overrides is enum_overrides:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                self._unrecorded_hits += 1
+            else:
+                entry = None
+                self._misses += 1
+                self._unrecorded_misses += 1
+
+        if entry is None:
+            # Parsing happens outside of the lock so that converters running
+            # in parallel do not wait on each other's mappers. Two threads may
+            # parse the same label at once, which only costs a second parse.
+            try:
+                entry = _EnumParseCacheEntry(enum_overrides, parse_fn(), None)
+            except EnumParsingError as e:
+                entry = _EnumParseCacheEntry(enum_overrides, None, e)
+
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+        if entry.parsing_error is not None:
+            raise EnumParsingError(entry.parsing_error.entity_type, entry.parsing_error.string_to_parse)
+        return entry.value
+
+    def info(self) -> EnumParseCacheInfo:
+        with self._lock:
+            return EnumParseCacheInfo(hits=self._hits, misses=self._misses, size=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._unrecorded_hits = 0
+            self._unrecorded_misses = 0
+
+    def pop_unrecorded_counts(self) -> Tuple[int, int]:
+        """Returns the number of hits and misses since this was last called."""
+        with self._lock:
+            counts = (self._unrecorded_hits, self._unrecorded_misses)
+            self._unrecorded_hits = 0
+            self._unrecorded_misses = 0
+            return counts
+
+
+_enum_parse_cache = _EnumParseCache(ENUM_PARSE_CACHE_MAX_SIZE)
+
+
+def enum_parse_cache_info() -> EnumParseCacheInfo:
+    """Returns the hit and miss counts and current size of the enum parse
+    cache shared by all converters."""
+    return _enum_parse_cache.info()
+
+
+def clear_enum_parse_cache() -> None:
+    _enum_parse_cache.clear()
+
+
+def record_enum_parse_cache_stats() -> None:
+    """Records the enum parse cache hits and misses since the last call to
+    this function to monitoring. Stats are recorded in aggregate rather than on
+    every parse, since recording a measurement costs far more than a cache
+    lookup."""
+    hits, misses = _enum_parse_cache.pop_unrecorded_counts()
+    if not hits and not misses:
+        return
+    with monitoring.measurements({}) as m:
+        m.measure_int_put(m_enum_parse_cache_hits, hits)
+        m.measure_int_put(m_enum_parse_cache_misses, misses)
+
+
 class EntityEnumMeta(EnumMeta):
     """Metaclass for mappable enums."""
 
@@ -58,7 +202,7 @@ class EntityEnumMeta(EnumMeta):
               label: str,
               enum_overrides: 'EnumOverrides') -> Optional['EntityEnum']:
         try:
-            return cls._parse_to_enum(label, enum_overrides)
+            return cls._cached_parse_to_enum(label, enum_overrides)
         except EnumParsingError:
             with monitoring.measurements(
                     {monitoring.TagKey.ENTITY_TYPE: cls.__name__}) as m:
@@ -72,7 +216,7 @@ class EntityEnumMeta(EnumMeta):
         string should be used for this field.
         """
         try:
-            cls._parse_to_enum(label, enum_overrides)
+            cls._cached_parse_to_enum(label, enum_overrides)
             return True
         except EnumParsingError:
             return False
@@ -85,6 +229,9 @@ class EntityEnumMeta(EnumMeta):
                 return inst
         return None
 
+    def _cached_parse_to_enum(cls, label: str, enum_overrides: 'EnumOverrides') -> Optional['EntityEnum']:
+        return _enum_parse_cache.parse(cls, label, enum_overrides, lambda: cls._parse_to_enum(label, enum_overrides))
+
     def _parse_to_enum(cls, label: str, enum_overrides: 'EnumOverrides') -> Optional['EntityEnum']:
         """Attempts to parse |label| using the default map of |cls| and the
         provided |override_map|. Ignores punctuation by treating punctuation as
@@ -57,7 +57,8 @@ class EnumOverrides:
         if direct_lookup:
             return direct_lookup
 
-        matches = {mapper(label) for mapper in self._mappers_dict[enum_class] if mapper(label) is not None}
+        mapped_values = (mapper(label) for mapper in self._mappers_dict[enum_class])
+        matches = {value for value in mapped_values if value is not None}
         if len(matches) > 1:
             raise ValueError("Overrides map matched too many values from label {}: [{}]".format(label, matches))
         if matches:
@@ -66,11 +67,17 @@ class EnumOverrides:
 
     # pylint: disable=protected-access
     def to_builder(self) -> 'Builder':
+        """Returns a Builder with all of the overrides in this object. The builder holds copies of the overrides, so
+        that adding to it never changes this object, whose parse results are cached by EntityEnumMeta.parse."""
         builder = self.Builder()
-        builder._str_mappings_dict = self._str_mappings_dict
-        builder._mappers_dict = self._mappers_dict
-        builder._ignores = self._ignores
-        builder._ignore_predicates_dict = self._ignore_predicates_dict
+        for enum_class, str_mappings in self._str_mappings_dict.items():
+            builder._str_mappings_dict[enum_class].update(str_mappings)
+        for enum_class, mappers in self._mappers_dict.items():
+            builder._mappers_dict[enum_class].update(mappers)
+        for enum_class, ignores in self._ignores.items():
+            builder._ignores[enum_class].update(ignores)
+        for enum_class, predicates in self._ignore_predicates_dict.items():
+            builder._ignore_predicates_dict[enum_class].update(predicates)
         return builder
 
     @classmethod
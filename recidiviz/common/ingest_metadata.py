@@ -18,6 +18,7 @@
 
 import enum
 from datetime import datetime
+from typing import Optional
 
 import attr
 
@@ -52,3 +53,8 @@ class IngestMetadata(DefaultableAttr):
 
     # The system level from which data is being ingested, e.g. COUNTY or STATE
     system_level: SystemLevel = attr.ib(default=SystemLevel.COUNTY)
+
+    # If set, the name of the RelationshipLoadingStrategy used to load the
+    # relationships of DB people that lead to ingested entity types when
+    # reading people for entity matching. Only supported for STATE ingest.
+    entity_matching_loading_strategy: Optional[str] = attr.ib(default=None)
@@ -23,13 +23,66 @@ import datetime
 import locale
 import re
 import string
+import threading
 from distutils.util import strtobool  # pylint: disable=no-name-in-module
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
 
 import dateparser
 from dateutil.relativedelta import relativedelta
+from opencensus.stats import aggregation, measure, view
 
 from recidiviz.common.date import munge_date_string
+from recidiviz.utils import monitoring
+
+m_date_parse_cache_hits = measure.MeasureInt(
+    "converter/date_parse_cache_hits",
+    "The number of date strings parsed from the date parse cache", "1")
+m_date_parse_fast_path_parses = measure.MeasureInt(
+    "converter/date_parse_fast_path_parses",
+    "The number of date strings parsed with a known date format", "1")
+m_date_parse_dateparser_parses = measure.MeasureInt(
+    "converter/date_parse_dateparser_parses",
+    "The number of date strings parsed with dateparser", "1")
+date_parse_views = [
+    view.View("recidiviz/" + m.name, "The sum of " + m.description[0].lower() + m.description[1:],
+              [monitoring.TagKey.REGION], m, aggregation.SumAggregation())
+    for m in (m_date_parse_cache_hits, m_date_parse_fast_path_parses, m_date_parse_dateparser_parses)
+]
+monitoring.register_views(date_parse_views)
+
+# The maximum number of date strings held by the date parse cache.
+DATE_PARSE_CACHE_MAX_SIZE = 100000
+
+# Formats that parse_datetime tries before falling back to dateparser. Each produces the same datetime that dateparser
+# does for strings in that format, so that which tier parses a string never changes the result.
+FAST_PATH_DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%m/%d/%y',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %I:%M:%S %p',
+    '%m/%d/%Y %I:%M %p',
+    '%m-%d-%Y',
+    '%m.%d.%Y',
+    '%Y/%m/%d',
+    '%Y-%m',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%d-%b-%y',
+    '%d-%b-%Y',
+]
+
+# Matches strings that dateparser may parse relative to the current date, or to the |from_dt| passed to
+# parse_datetime, whose results therefore cannot be cached.
+_RELATIVE_DATE_REGEX = re.compile(
+    r'ago|now|today|tomorrow|yesterday|year|month|week|day|hour|minute|second|\bin\b', re.IGNORECASE)
+
+# Matches strings containing a four digit year. dateparser fills a missing year in with the current year.
+_FOUR_DIGIT_YEAR_REGEX = re.compile(r'(?<!\d)\d{4}(?!\d)')
 
 
 def parse_dollars(dollar_string: str) -> int:
@@ -181,40 +234,171 @@ def _is_str_field_zeros(str_field: str) -> bool:
     return False
 
 
+class DateParseTierCounts(NamedTuple):
+    cache_hits: int
+    fast_path_parses: int
+    dateparser_parses: int
+
+
+class _DateParser:
+    """Parses date strings in tiers, from cheapest to most expensive:
+        - a bounded cache of date strings that have already been parsed, for strings whose parsed value does not depend
+          on the current date,
+        - strptime with each of the FAST_PATH_DATE_FORMATS, and
+        - dateparser.
+
+    Date columns in a file are almost always written in a single format, so the fast path formats are tried in order
+    of most recent success. The format of a column is then inferred after its first value, and each later value in the
+    column takes a single strptime call.
+    """
+
+    def __init__(self, cache_max_size: int):
+        self._cache_max_size = cache_max_size
+        self._cache: Dict[str, Optional[datetime.datetime]] = {}
+        self._formats = list(FAST_PATH_DATE_FORMATS)
+        self._lock = threading.Lock()
+        self._counts = [0, 0, 0]
+        self._unrecorded_counts = [0, 0, 0]
+
+    def parse(self, date_string: str, from_dt: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+        """Parses |date_string| as described in parse_datetime."""
+        try:
+            parsed = self._cache[date_string]
+            self._count(0)
+            return parsed
+        except KeyError:
+            pass
+
+        fast_path_parsed = self._parse_fast_path(date_string)
+        if fast_path_parsed is not None:
+            parsed, is_cacheable = fast_path_parsed
+            self._count(1)
+        else:
+            self._count(2)
+            parsed, is_cacheable = self._parse_dateparser(date_string, from_dt)
+
+        if is_cacheable:
+            with self._lock:
+                if len(self._cache) >= self._cache_max_size:
+                    # Evicts the oldest entry, since dicts are insertion ordered.
+                    self._cache.pop(next(iter(self._cache)), None)
+                self._cache[date_string] = parsed
+        return parsed
+
+    def _parse_fast_path(self, date_string: str) -> Optional[Tuple[Optional[datetime.datetime], bool]]:
+        """Returns the parsed value of |date_string| and whether it can be cached, or None if it must be parsed with
+        dateparser."""
+        if date_string == '' or date_string.isspace() or _is_str_field_zeros(date_string) \
+                or is_str_field_none(date_string):
+            return None, True
+
+        if is_yyyymmdd_date(date_string):
+            as_date = parse_yyyymmdd_date(date_string)
+            if not as_date:
+                raise ValueError(f'Parsed date for string [{date_string}] is unexpectedly None.')
+            return datetime.datetime(year=as_date.year, month=as_date.month, day=as_date.day), True
+
+        munged_date_string = munge_date_string(date_string)
+        formats = self._formats
+        for i, date_format in enumerate(formats):
+            try:
+                parsed = datetime.datetime.strptime(munged_date_string, date_format)
+            except ValueError:
+                continue
+            if i:
+                with self._lock:
+                    if date_format in formats:
+                        formats.remove(date_format)
+                        formats.insert(0, date_format)
+            return parsed, True
+        return None
+
+    @staticmethod
+    def _parse_dateparser(date_string: str, from_dt: Optional[datetime.datetime]) \
+            -> Tuple[Optional[datetime.datetime], bool]:
+        """Returns the value of |date_string| parsed with dateparser and whether it can be cached."""
+        settings: Dict[str, Any] = {'PREFER_DAY_OF_MONTH': 'first'}
+        if from_dt:
+            settings['RELATIVE_BASE'] = from_dt
+
+        date_string = munge_date_string(date_string)
+
+        # Only special-case strings that start with a - (to avoid parsing regular
+        # timestamps like '2016-05-14') and that include non punctuation (to avoid
+        # ingested values like '--')
+        if date_string.startswith('-') and _has_non_punctuation(date_string):
+            parsed = parse_datetime_with_negative_component(date_string, settings)
+            is_cacheable = False
+        else:
+            parsed = dateparser.parse(
+                date_string, languages=['en'], settings=settings)
+            is_cacheable = not _RELATIVE_DATE_REGEX.search(date_string) \
+                and _FOUR_DIGIT_YEAR_REGEX.search(date_string) is not None
+        if parsed:
+            return parsed, is_cacheable
+
+        raise ValueError("cannot parse date: %s" % date_string)
+
+    def _count(self, tier: int) -> None:
+        # Unlocked, so counts may be slightly off when dates are parsed on many threads at once.
+        self._counts[tier] += 1
+        self._unrecorded_counts[tier] += 1
+
+    def tier_counts(self) -> DateParseTierCounts:
+        return DateParseTierCounts(*self._counts)
+
+    def pop_unrecorded_tier_counts(self) -> DateParseTierCounts:
+        """Returns the number of dates parsed by each tier since this was last called."""
+        with self._lock:
+            counts = DateParseTierCounts(*self._unrecorded_counts)
+            self._unrecorded_counts = [0, 0, 0]
+            return counts
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._formats = list(FAST_PATH_DATE_FORMATS)
+            self._counts = [0, 0, 0]
+            self._unrecorded_counts = [0, 0, 0]
+
+
+_date_parser = _DateParser(DATE_PARSE_CACHE_MAX_SIZE)
+
+
+def date_parse_tier_counts() -> DateParseTierCounts:
+    """Returns the number of date strings parse_datetime has parsed with each of its tiers."""
+    return _date_parser.tier_counts()
+
+
+def clear_date_parse_cache() -> None:
+    _date_parser.clear()
+
+
+def record_date_parse_stats() -> None:
+    """Records the number of date strings parsed with each tier since the last call to this function to monitoring.
+    Stats are recorded in aggregate rather than on every parse, since recording a measurement costs more than parsing
+    most dates."""
+    counts = _date_parser.pop_unrecorded_tier_counts()
+    if not any(counts):
+        return
+    with monitoring.measurements({}) as m:
+        m.measure_int_put(m_date_parse_cache_hits, counts.cache_hits)
+        m.measure_int_put(m_date_parse_fast_path_parses, counts.fast_path_parses)
+        m.measure_int_put(m_date_parse_dateparser_parses, counts.dateparser_parses)
+
+
 def parse_datetime(
         date_string: str, from_dt: Optional[datetime.datetime] = None
     ) -> Optional[datetime.datetime]:
     """
     Parses a string into a datetime.datetime object, using |from_dt| as a base
     for any relative dates.
-    """
-    if date_string == '' or date_string.isspace() or _is_str_field_zeros(date_string) or is_str_field_none(date_string):
-        return None
-
-    if is_yyyymmdd_date(date_string):
-        as_date = parse_yyyymmdd_date(date_string)
-        if not as_date:
-            raise ValueError(f'Parsed date for string [{date_string}] is unexpectedly None.')
-        return datetime.datetime(year=as_date.year, month=as_date.month, day=as_date.day)
-
-    settings: Dict[str, Any] = {'PREFER_DAY_OF_MONTH': 'first'}
-    if from_dt:
-        settings['RELATIVE_BASE'] = from_dt
-
-    date_string = munge_date_string(date_string)
-
-    # Only special-case strings that start with a - (to avoid parsing regular
-    # timestamps like '2016-05-14') and that include non punctuation (to avoid
-    # ingested values like '--')
-    if date_string.startswith('-') and _has_non_punctuation(date_string):
-        parsed = parse_datetime_with_negative_component(date_string, settings)
-    else:
-        parsed = dateparser.parse(
-            date_string, languages=['en'], settings=settings)
-    if parsed:
-        return parsed
 
-    raise ValueError("cannot parse date: %s" % date_string)
+    Strings in one of the FAST_PATH_DATE_FORMATS are parsed with strptime, and
+    all others with dateparser. Parsed values that do not depend on |from_dt| or
+    the current date are cached.
+    """
+    return _date_parser.parse(date_string, from_dt)
 
 
 def _has_non_punctuation(date_string: str) -> bool:
@@ -275,12 +459,6 @@ def parse_date(
     Parses a string into a datetime.date object, using |from_dt| as a base for
     any relative dates.
     """
-    if _is_str_field_zeros(date_string):
-        return None
-
-    if is_yyyymmdd_date(date_string):
-        return parse_yyyymmdd_date(date_string)
-
     parsed = parse_datetime(date_string, from_dt=from_dt)
     return parsed.date() if parsed else None
 
@@ -34,6 +34,8 @@ from recidiviz.ingest.direct.errors import DirectIngestError, \
 from recidiviz.ingest.ingestor import Ingestor
 from recidiviz.ingest.scrape import ingest_utils
 from recidiviz.persistence import persistence
+from recidiviz.persistence.entity_matching.state.matched_person_tree_cache \
+    import MatchedPersonTreeCache
 from recidiviz.utils import regions
 
 
@@ -43,6 +45,13 @@ class BaseDirectIngestController(Ingestor,
     """Parses and persists individual-level info from direct ingest partners.
     """
 
+    # Maximum number of jobs run in a single logical ingest job.
+    _MAX_JOBS_PER_INGEST_RUN = 10
+
+    # Time after which a logical ingest job stops starting new jobs, so that the task finishes well within the request
+    # deadline even when individual jobs are slow.
+    _MAX_INGEST_RUN_DURATION = datetime.timedelta(minutes=10)
+
     def __init__(self, region_name, system_level: SystemLevel):
         """Initialize the controller.
 
@@ -195,12 +204,56 @@ class BaseDirectIngestController(Ingestor,
         Runs the full ingest process for this controller - reading and parsing
         raw input data, transforming it to our schema, then writing to the
         database.
+
+        If the region has a |split_file_person_tree_cache_size|, any jobs
+        returned by _get_continuation_job_args() are run as part of the same
+        logical job, with person trees matched by earlier jobs cached in
+        memory. No new job is started once _MAX_JOBS_PER_INGEST_RUN jobs have
+        run or the logical job has run for _MAX_INGEST_RUN_DURATION.
         Returns:
             True if we should try to schedule the next job on completion. False,
              otherwise.
         """
         check_is_region_launched_in_env(self.region)
 
+        person_tree_cache = self._create_person_tree_cache()
+        run_start_time = datetime.datetime.now()
+        num_jobs_run = 0
+        while True:
+            should_schedule = self._run_single_ingest_job(
+                args, person_tree_cache)
+            num_jobs_run += 1
+
+            if not should_schedule or person_tree_cache is None or \
+                    num_jobs_run >= self._MAX_JOBS_PER_INGEST_RUN:
+                return should_schedule
+
+            run_duration = datetime.datetime.now() - run_start_time
+            if run_duration >= self._MAX_INGEST_RUN_DURATION:
+                logging.info(
+                    "Ingest run [%s] has run for [%s] - not continuing with "
+                    "another job.", self._job_tag(args), run_duration)
+                return should_schedule
+
+            # Pre-ingest tasks always run before the next ingest job, as they
+            # would if the next job were scheduled on its own.
+            if self._schedule_any_pre_ingest_tasks():
+                return should_schedule
+
+            next_args = self._get_continuation_job_args(args)
+            if not next_args or next_args == args:
+                return should_schedule
+
+            logging.info("Continuing ingest run [%s] with job [%s]",
+                         self._job_tag(args), self._job_tag(next_args))
+            args = next_args
+
+    def _run_single_ingest_job(
+            self,
+            args: IngestArgsType,
+            person_tree_cache: Optional[MatchedPersonTreeCache]) -> bool:
+        """Runs the full ingest process for a single job. See _run_ingest_job.
+        """
         start_time = datetime.datetime.now()
         logging.info("Starting ingest for ingest run [%s]", self._job_tag(args))
 
@@ -230,7 +283,8 @@ class BaseDirectIngestController(Ingestor,
                      self._job_tag(args))
 
         if not self._are_contents_empty(args, contents_handle):
-            self._parse_and_persist_contents(args, contents_handle)
+            self._parse_and_persist_contents(
+                args, contents_handle, person_tree_cache)
         else:
             logging.warning(
                 "Contents are empty for ingest run [%s] - skipping parse and "
@@ -244,9 +298,26 @@ class BaseDirectIngestController(Ingestor,
 
         return True
 
-    def _parse_and_persist_contents(self,
-                                    args: IngestArgsType,
-                                    contents_handle: ContentsHandleType):
+    def _create_person_tree_cache(self) -> Optional[MatchedPersonTreeCache]:
+        cache_size = self.region.split_file_person_tree_cache_size
+        if self.system_level != SystemLevel.STATE or not cache_size:
+            return None
+        return MatchedPersonTreeCache(max_size=cache_size)
+
+    @abc.abstractmethod
+    def _get_continuation_job_args(
+            self, args: IngestArgsType) -> Optional[IngestArgsType]:
+        """Should be overridden to return the args for the next job if it
+        continues the logical ingest job that the job for |args| is part of
+        (e.g. the next split of the same file) and can run immediately, or None
+        if the next job should be scheduled on its own.
+        """
+
+    def _parse_and_persist_contents(
+            self,
+            args: IngestArgsType,
+            contents_handle: ContentsHandleType,
+            person_tree_cache: Optional[MatchedPersonTreeCache] = None):
         """
         Runs the full ingest process for this controller for files with
         non-empty contents.
@@ -268,7 +339,8 @@ class BaseDirectIngestController(Ingestor,
                      "run [%s]", self._job_tag(args))
 
         ingest_metadata = self._get_ingest_metadata(args)
-        persist_success = persistence.write(ingest_info_proto, ingest_metadata)
+        persist_success = persistence.write(
+            ingest_info_proto, ingest_metadata, person_tree_cache)
 
         if not persist_success:
             raise DirectIngestError(
@@ -283,7 +355,8 @@ class BaseDirectIngestController(Ingestor,
                               self.region.jurisdiction_id,
                               args.ingest_time,
                               self.get_enum_overrides(),
-                              self.system_level)
+                              self.system_level,
+                              self.region.entity_matching_loading_strategy)
 
     @abc.abstractmethod
     def _job_tag(self, args: IngestArgsType) -> str:
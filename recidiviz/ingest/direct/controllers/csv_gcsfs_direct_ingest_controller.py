@@ -19,7 +19,10 @@ GCSFileSystem.
 """
 
 import abc
+import codecs
 import inspect
+import itertools
+import logging
 import os
 from typing import List, Optional, Callable
 
@@ -37,7 +40,8 @@ from recidiviz.ingest.direct.controllers.direct_ingest_gcs_file_system import Gc
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_utils import \
     GcsfsIngestArgs, filename_parts_from_path, GcsfsDirectIngestFileType
 from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath, GcsfsDirectoryPath
-from recidiviz.ingest.direct.controllers.gcsfs_csv_reader import GcsfsCsvReader
+from recidiviz.ingest.direct.controllers.csv_row_scanner import CsvRowScanError
+from recidiviz.ingest.direct.controllers.gcsfs_csv_reader import GcsfsCsvReader, COMMON_RAW_FILE_ENCODINGS
 from recidiviz.ingest.direct.controllers.gcsfs_csv_reader_delegates import ReadOneGcsfsCsvReaderDelegate, \
     SplittingGcsfsCsvReaderDelegate
 from recidiviz.ingest.direct.errors import DirectIngestError, \
@@ -46,6 +50,15 @@ from recidiviz.ingest.extractor.csv_data_extractor import CsvDataExtractor
 from recidiviz.utils import metadata
 
 
+def _split_file_output_path(path: GcsfsFilePath,
+                            output_directory_path: GcsfsDirectoryPath,
+                            chunk_num: int) -> GcsfsFilePath:
+    name, _extension = os.path.splitext(path.file_name)
+
+    return GcsfsFilePath.from_directory_and_file_name(output_directory_path,
+                                                      f'temp_direct_ingest_{name}_{chunk_num}.csv')
+
+
 class DirectIngestFileSplittingGcsfsCsvReaderDelegate(SplittingGcsfsCsvReaderDelegate):
     def __init__(self, path: GcsfsFilePath, fs: DirectIngestGCSFileSystem, output_directory_path: GcsfsDirectoryPath):
         super().__init__(path, fs, include_header=True)
@@ -55,10 +68,7 @@ class DirectIngestFileSplittingGcsfsCsvReaderDelegate(SplittingGcsfsCsvReaderDel
         return df
 
     def get_output_path(self, chunk_num: int):
-        name, _extension = os.path.splitext(self.path.file_name)
-
-        return GcsfsFilePath.from_directory_and_file_name(self.output_directory_path,
-                                                          f'temp_direct_ingest_{name}_{chunk_num}.csv')
+        return _split_file_output_path(self.path, self.output_directory_path, chunk_num)
 
 
 class CsvGcsfsDirectIngestController(GcsfsDirectIngestController):
@@ -89,18 +99,21 @@ class CsvGcsfsDirectIngestController(GcsfsDirectIngestController):
             self,
             line_limit: int,
             path: GcsfsFilePath) -> bool:
-        delegate = ReadOneGcsfsCsvReaderDelegate()
-
-        # Read a chunk up to one line bigger than the acceptable size
-        self.csv_reader.streaming_read(path, delegate=delegate, chunk_size=(line_limit + 1))
-
-        if delegate.df is None:
-            # If the file is empty, it's fine.
-            return True
-
-        # If length of the only chunk is less than or equal to the acceptable
-        # size, file meets line limit.
-        return len(delegate.df) <= line_limit
+        rows = self.csv_reader.streaming_read_rows(path)
+        try:
+            # Count rows up to one more than the acceptable number of rows, plus the header row
+            num_rows = sum(1 for _ in itertools.islice(rows, line_limit + 2))
+        except CsvRowScanError as e:
+            # The file will be split, which falls back to parsing the file if it cannot be split into rows
+            logging.warning('Unable to count rows in [%s], assuming it does not meet line limit: %s',
+                            path.abs_path(), e)
+            return False
+        finally:
+            rows.close()
+
+        # If the file is empty or the number of rows after the header is less than or equal to the acceptable size,
+        # file meets line limit.
+        return num_rows - 1 <= line_limit
 
     def _split_file(self, path: GcsfsFilePath) -> List[GcsfsFilePath]:
         parts = filename_parts_from_path(path)
@@ -108,12 +121,69 @@ class CsvGcsfsDirectIngestController(GcsfsDirectIngestController):
         if parts.file_type == GcsfsDirectIngestFileType.RAW_DATA:
             raise ValueError(f'Splitting raw files unsupported. Attempting to split [{path.abs_path()}]')
 
+        encoding = self.csv_reader.detect_encoding(path, COMMON_RAW_FILE_ENCODINGS)
+        if encoding is None:
+            raise ValueError(f'Unable to read path [{path.abs_path()}] for any of these encodings: '
+                             f'{COMMON_RAW_FILE_ENCODINGS}')
+
+        try:
+            return self._split_file_at_row_boundaries(path, encoding)
+        except CsvRowScanError as e:
+            logging.warning('Unable to split [%s] into rows, falling back to parsing the file: %s',
+                            path.abs_path(), e)
+
         delegate = DirectIngestFileSplittingGcsfsCsvReaderDelegate(path, self.fs, self.temp_output_directory_path)
-        self.csv_reader.streaming_read(path, delegate=delegate, chunk_size=self.ingest_file_split_line_limit)
+        self.csv_reader.streaming_read(path,
+                                       delegate=delegate,
+                                       chunk_size=self.ingest_file_split_line_limit,
+                                       encodings_to_try=[encoding],
+                                       detect_encoding=False)
         output_paths = [path for path, _ in delegate.output_paths_with_columns]
 
         return output_paths
 
+    def _split_file_at_row_boundaries(self, path: GcsfsFilePath, encoding: str) -> List[GcsfsFilePath]:
+        """Splits the file at |path| into files of at most ingest_file_split_line_limit rows each, copying the contents
+        of each row as is rather than parsing and re-serializing its values. Raises a CsvRowScanError if the file cannot
+        be split into rows, in which case no split files are left behind.
+        """
+        output_paths: List[GcsfsFilePath] = []
+
+        def _upload_chunk(header: bytes, chunk_rows: List[bytes]) -> None:
+            output_path = _split_file_output_path(path, self.temp_output_directory_path, len(output_paths))
+            contents = (header + b''.join(chunk_rows)).decode(encoding)
+            self.fs.upload_from_string(output_path, contents, 'text/csv')
+            output_paths.append(output_path)
+
+        rows = self.csv_reader.streaming_read_rows(path)
+        try:
+            header = next(rows, None)
+            if header is None:
+                return output_paths
+
+            if codecs.lookup(encoding).name == 'utf-8' and header.startswith(codecs.BOM_UTF8):
+                header = header[len(codecs.BOM_UTF8):]
+            if not header.endswith(b'\n'):
+                header += b'\n'
+
+            chunk_rows: List[bytes] = []
+            for row in rows:
+                chunk_rows.append(row)
+                if len(chunk_rows) == self.ingest_file_split_line_limit:
+                    _upload_chunk(header, chunk_rows)
+                    chunk_rows = []
+
+            if chunk_rows or not output_paths:
+                _upload_chunk(header, chunk_rows)
+        except Exception:
+            for output_path in output_paths:
+                self.fs.delete(output_path)
+            raise
+        finally:
+            rows.close()
+
+        return output_paths
+
     def _yaml_filepath(self, file_tag):
         return os.path.join(os.path.dirname(inspect.getfile(self.__class__)),
                             f'{self.region.region_code}_{file_tag}.yaml')
@@ -182,7 +252,8 @@ class CsvGcsfsDirectIngestController(GcsfsDirectIngestController):
          rows.
          """
         delegate = ReadOneGcsfsCsvReaderDelegate()
-        self.csv_reader.streaming_read(args.file_path, delegate=delegate, chunk_size=1, skiprows=1)
+        self.csv_reader.streaming_read(args.file_path, delegate=delegate, chunk_size=1, detect_encoding=False,
+                                       skiprows=1)
         return delegate.df is None
 
     def _get_row_pre_processors_for_file(self, _file_tag) -> List[Callable]:
@@ -0,0 +1,121 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Functionality for splitting the raw bytes of a CSV file into rows without parsing the values in each row.
+
+Rows are found the way the pandas read_csv() C parser finds them with its default settings: fields may be quoted with
+double quotes, quotes are escaped by doubling them, quoted fields may contain separators and newlines, a quote that is
+not at the start of a field is a literal character, rows end with \\n or \\r\\n, and rows that only contain spaces and
+tabs are skipped. Files with carriage returns that are not followed by a newline outside of quoted fields are not
+supported, since pandas does not handle them consistently.
+
+This only works for files in encodings where these characters are always encoded as the corresponding single ASCII bytes
+and those bytes never appear inside the encoding of other characters, e.g. UTF-8 and ISO-8859-1, but not UTF-16.
+"""
+import re
+from typing import BinaryIO, Iterator, Pattern
+
+# The number of bytes read at a time when scanning a file for rows.
+ROW_SCAN_BLOCK_SIZE_BYTES = 1024 * 1024
+
+_BLANK_ROW_REGEX = re.compile(rb'[ \t]*(?:\r?\n)?')
+_BLANK_ROW_FIRST_BYTES = frozenset(b' \t\r\n')
+
+
+class CsvRowScanError(ValueError):
+    """Raised when the contents of a CSV file cannot be split into rows, e.g. because a quoted field is never
+    closed."""
+
+
+def _row_regex(separator: str) -> Pattern[bytes]:
+    """Returns a regex that matches a single row starting at the current position, including its line terminator. The
+    regex only matches where the row is unambiguous, so a match never ends partway through a quoted field."""
+    separator_bytes = separator.encode('ascii')
+    if len(separator_bytes) != 1 or separator_bytes in (b'"', b'\r', b'\n'):
+        raise ValueError(f'Unsupported separator for row scanning: [{separator}]')
+    sep = re.escape(separator_bytes)
+
+    # A quoted field, in which quotes are escaped by doubling them. The closing quote may not be followed by another
+    # quote, otherwise they would be an escaped quote. Any characters after the closing quote, up to the next separator,
+    # are appended to the field.
+    quoted_field = rb'"[^"]*(?:""[^"]*)*"(?!")[^' + sep + rb'\r\n]*'
+
+    # An unquoted field, which may contain quotes after its first character.
+    unquoted_field = rb'[^' + sep + rb'\r\n"][^' + sep + rb'\r\n]*'
+
+    field = rb'(?:' + quoted_field + rb'|' + unquoted_field + rb')?'
+    return re.compile(field + rb'(?:' + sep + field + rb')*(\r\n|\n|\r|\Z)')
+
+
+def iter_csv_rows(fp: BinaryIO, separator: str = ',') -> Iterator[bytes]:
+    """Yields the raw bytes of each row of the CSV file in |fp|, including its line terminator (which the last row may
+    not have), in file order. The first row yielded is the header row. Blank rows are skipped.
+
+    Raises a CsvRowScanError if the file ends inside a quoted field, or if a row ends with a carriage return that is not
+    followed by a newline.
+    """
+    row_regex = _row_regex(separator)
+
+    buffer = b''
+    pos = 0
+    read_size = ROW_SCAN_BLOCK_SIZE_BYTES
+    is_eof = False
+    while True:
+        if is_eof and pos == len(buffer):
+            return
+
+        # Rows up to the last newline before the next quote cannot contain quoted fields, so they are split all at once
+        next_quote = buffer.find(b'"', pos)
+        plain_rows_end = buffer.rfind(b'\n', pos, next_quote if next_quote != -1 else len(buffer)) + 1
+        if plain_rows_end > pos:
+            plain_rows = buffer[pos:plain_rows_end]
+            if plain_rows.count(b'\r') != plain_rows.count(b'\r\n'):
+                raise CsvRowScanError(f'Found carriage return without newline in rows [{plain_rows[:100]!r}]')
+            pos = plain_rows_end
+            for row in plain_rows.splitlines(keepends=True):
+                if not _is_blank_row(row):
+                    yield row
+            continue
+
+        match = row_regex.match(buffer, pos)
+
+        # A match that reaches the end of the buffer may continue in the part of the file that has not been read yet
+        if match is None or (match.end() == len(buffer) and not is_eof):
+            if is_eof:
+                raise CsvRowScanError(f'Unable to find the end of the row starting at [{buffer[pos:pos + 100]!r}]')
+
+            # If no row has been found in the whole buffer, the current row is longer than a block. Reading increasingly
+            # larger blocks keeps the cost of rescanning the start of the row linear in its length.
+            read_size = read_size * 2 if pos == 0 and buffer else ROW_SCAN_BLOCK_SIZE_BYTES
+            block = fp.read(read_size)
+            is_eof = not block
+            buffer = buffer[pos:] + block
+            pos = 0
+            continue
+
+        if match.group(1) == b'\r':
+            # pandas handles carriage returns that are not followed by a newline inconsistently, so these files are
+            # not split into rows here.
+            raise CsvRowScanError(f'Found carriage return without newline in row [{match.group(0)[:100]!r}]')
+
+        pos = match.end()
+        row = match.group(0)
+        if not _is_blank_row(row):
+            yield row
+
+
+def _is_blank_row(row: bytes) -> bool:
+    return row[0] in _BLANK_ROW_FIRST_BYTES and _BLANK_ROW_REGEX.fullmatch(row) is not None
@@ -17,7 +17,7 @@
 """A class that handles writing metadata about each direct ingest file to disk."""
 import abc
 import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_utils import GcsfsIngestViewExportArgs
 from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath
@@ -49,6 +49,17 @@ class DirectIngestFileMetadataManager:
         """Writes a new row to the appropriate metadata table for a new, unprocessed raw file, or updates the existing
         metadata row for this path with the appropriate file discovery time."""
 
+    @abc.abstractmethod
+    def have_files_been_discovered(self, paths: List[GcsfsFilePath]) -> Dict[GcsfsFilePath, bool]:
+        """Checks whether the files at each of these paths have already been marked as discovered, looking up
+        metadata for all paths at once. Returns a map of each path to whether it has been discovered."""
+
+    @abc.abstractmethod
+    def mark_files_as_discovered(self, paths: List[GcsfsFilePath]) -> None:
+        """Writes new rows to the appropriate metadata tables for new, unprocessed raw files, and updates the existing
+        metadata rows for ingest view files with the appropriate file discovery time, for all paths in a single
+        transaction."""
+
     @abc.abstractmethod
     def get_file_metadata(self,
                           path: GcsfsFilePath) -> DirectIngestFileMetadata:
@@ -16,9 +16,11 @@
 # =============================================================================
 """Logic related to exporting ingest views to a region's direct ingest bucket."""
 import datetime
+import hashlib
 import logging
+import re
 from collections import defaultdict
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Set
 
 import attr
 from google.cloud import bigquery
@@ -45,6 +47,21 @@ LOWER_BOUND_TIMESTAMP_PARAM_NAME = 'update_timestamp_lower_bound_exclusive'
 SELECT_SUBQUERY = 'SELECT * FROM `{project_id}.{dataset_id}.{table_name}`;'
 TABLE_NAME_DATE_FORMAT = '%Y_%m_%d_%H_%M_%S'
 
+# Snapshot tables hold the results of an ingest view's date parametrized query on a given upper bound date. They are
+# retained after an export so that the upper bound snapshot of one export can be reused as the lower bound snapshot of
+# the next export of that view. Snapshot tables are named by the view, the date bound and a hash of the query, so that a
+# change to the view query never reuses a snapshot of the old query.
+SNAPSHOT_TABLE_SUFFIX = 'snapshot'
+SNAPSHOT_TABLE_QUERY_HASH_LENGTH = 16
+_SNAPSHOT_TABLE_NAME_REGEX = re.compile(
+    rf'^(?P<ingest_view_name>\w+)_(?P<date_bound>\d{{4}}(?:_\d{{2}}){{5}})_'
+    rf'[0-9a-f]{{{SNAPSHOT_TABLE_QUERY_HASH_LENGTH}}}_{SNAPSHOT_TABLE_SUFFIX}$')
+
+# Snapshot tables that are no longer needed by a pending export of their view are deleted after each export of that
+# view. Any other snapshot table of the view, e.g. one for a query that has since changed, is deleted by an export of
+# the view once it is older than this.
+SNAPSHOT_TABLE_RETENTION = datetime.timedelta(days=7)
+
 
 @attr.s(frozen=True)
 class _IngestViewExportState:
@@ -164,6 +181,86 @@ class DirectIngestIngestViewExportManager:
             overwrite=True)
         return query_job
 
+    @staticmethod
+    def _snapshot_table_name(ingest_view: DirectIngestPreProcessedIngestView, date_bound: datetime.datetime) -> str:
+        """Returns the name of the table that holds the results of the |ingest_view| query on the given |date_bound|."""
+        query = ingest_view.date_parametrized_view_query(UPDATE_TIMESTAMP_PARAM_NAME)
+        query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:SNAPSHOT_TABLE_QUERY_HASH_LENGTH]
+        return f'{ingest_view.file_tag}_{date_bound.strftime(TABLE_NAME_DATE_FORMAT)}_{query_hash}_' \
+               f'{SNAPSHOT_TABLE_SUFFIX}'
+
+    def _get_or_create_snapshot_table(
+            self,
+            ingest_view: DirectIngestPreProcessedIngestView,
+            date_bound: datetime.datetime,
+            snapshot_table_creation_times: Dict[str, datetime.datetime]) -> Tuple[str, Optional[bigquery.QueryJob]]:
+        """Returns the name of the snapshot table for the |ingest_view| on the given |date_bound|, along with the
+        potentially in progress QueryJob that is loading it, or None if an existing snapshot table can be reused.
+        Records the creation time of any new snapshot table in |snapshot_table_creation_times|.
+        """
+        table_name = self._snapshot_table_name(ingest_view, date_bound)
+        creation_time = snapshot_table_creation_times.get(table_name)
+        if creation_time and self._is_snapshot_current(ingest_view, date_bound, creation_time):
+            logging.info('Reusing snapshot table [%s]', table_name)
+            return table_name, None
+
+        export_job = self._generate_export_job_for_date(
+            table_name=table_name,
+            ingest_view=ingest_view,
+            date_bound=date_bound)
+        snapshot_table_creation_times[table_name] = datetime.datetime.now(tz=datetime.timezone.utc)
+        return table_name, export_job
+
+    def _is_snapshot_current(self,
+                             ingest_view: DirectIngestPreProcessedIngestView,
+                             date_bound: datetime.datetime,
+                             creation_time: datetime.datetime) -> bool:
+        """Returns whether a snapshot table for the |ingest_view| on the given |date_bound| that was created at
+        |creation_time| still matches the raw data. Raw files are all imported before ingest views are exported, so the
+        snapshot is out of date only if a raw file with data on or before the bound was discovered after the snapshot
+        was created, e.g. because raw data was backfilled.
+        """
+        creation_time = creation_time.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        for raw_file_tag in {config.file_tag for config in ingest_view.raw_table_dependency_configs}:
+            raw_file_metadata_list = \
+                self.file_metadata_manager.get_metadata_for_raw_files_discovered_after_datetime(raw_file_tag,
+                                                                                                creation_time)
+            for raw_file_metadata in raw_file_metadata_list:
+                if raw_file_metadata.datetimes_contained_upper_bound_inclusive <= date_bound:
+                    return False
+        return True
+
+    def _get_snapshot_table_creation_times(self, dataset_id: str) -> Dict[str, datetime.datetime]:
+        return {table.table_id: table.created
+                for table in self.big_query_client.list_tables(dataset_id)
+                if _SNAPSHOT_TABLE_NAME_REGEX.match(table.table_id)}
+
+    def _delete_unused_snapshot_tables(self,
+                                       ingest_view: DirectIngestPreProcessedIngestView,
+                                       exported_upper_bound: datetime.datetime,
+                                       snapshot_table_creation_times: Dict[str, datetime.datetime],
+                                       reused_table_names: Set[str]) -> None:
+        """Deletes snapshot tables for the |ingest_view| with date bounds before the upper bound that was just exported,
+        since exports of a view happen in date order and those snapshots cannot be the lower bound of a later export.
+        Also deletes any snapshot table for the |ingest_view| that is older than SNAPSHOT_TABLE_RETENTION.
+
+        Snapshot tables of other views are never deleted, since a concurrent export of another view may be reading
+        them. Neither are the tables in |reused_table_names|, which this export found already existing and reused,
+        since another export may have found and reused them as well. A superseded reused table is deleted by the next
+        export of the view instead.
+        """
+        retention_cutoff = datetime.datetime.now(tz=datetime.timezone.utc) - SNAPSHOT_TABLE_RETENTION
+        exported_upper_bound_str = exported_upper_bound.strftime(TABLE_NAME_DATE_FORMAT)
+        for table_id, creation_time in snapshot_table_creation_times.items():
+            match = _SNAPSHOT_TABLE_NAME_REGEX.match(table_id)
+            if not match or match.group('ingest_view_name') != ingest_view.file_tag or table_id in reused_table_names:
+                continue
+            # Date bounds in table names sort in date order, since each component is zero padded.
+            is_superseded = match.group('date_bound') < exported_upper_bound_str
+            if is_superseded or creation_time < retention_cutoff:
+                self.big_query_client.delete_table(dataset_id=ingest_view.dataset_id, table_id=table_id)
+                logging.info('Deleted snapshot table [%s]', table_id)
+
     def export_view_for_args(self, ingest_view_export_args: GcsfsIngestViewExportArgs) -> bool:
         """Performs an Cloud Storage export of a single ingest view with date bounds specified in the provided args. If
         the provided args contain an upper and lower bound date, the exported view contains only the delta between the
@@ -172,8 +269,9 @@ class DirectIngestIngestViewExportManager:
 
         Note: In order to prevent resource exhaustion in BigQuery, the ultimate query in this method is broken down
         into distinct parts. This method first persists the results of historical queries for each given bound date
-        (upper and lower) into temporary tables. The delta between those tables is then queried separately using
-        SQL's `EXCEPT DISTINCT` and those final results are exported to Cloud Storage.
+        (upper and lower) into snapshot tables, reusing any snapshot tables retained from previous exports. The delta
+        between those tables is then queried separately using SQL's `EXCEPT DISTINCT` and those final results are
+        exported to Cloud Storage.
         """
         if not self.region.are_ingest_view_exports_enabled_in_env():
             raise ValueError(f'Ingest view exports not enabled for region [{self.region.region_code}]')
@@ -194,19 +292,18 @@ class DirectIngestIngestViewExportManager:
             self.file_metadata_manager.register_ingest_view_export_file_name(metadata, output_path)
 
         ingest_view = self.ingest_views_by_tag[ingest_view_export_args.ingest_view_name]
-        single_date_table_ids = []
+        snapshot_table_creation_times = self._get_snapshot_table_creation_times(ingest_view.dataset_id)
         single_date_table_export_jobs = []
+        reused_table_names = set()
 
-        upper_bound_table_name = \
-            f'{ingest_view_export_args.ingest_view_name}_' \
-            f'{ingest_view_export_args.upper_bound_datetime_to_export.strftime(TABLE_NAME_DATE_FORMAT)}_' \
-            f'upper_bound'
-        export_job = self._generate_export_job_for_date(
-            table_name=upper_bound_table_name,
+        upper_bound_table_name, export_job = self._get_or_create_snapshot_table(
             ingest_view=ingest_view,
-            date_bound=ingest_view_export_args.upper_bound_datetime_to_export)
-        single_date_table_ids.append(upper_bound_table_name)
-        single_date_table_export_jobs.append(export_job)
+            date_bound=ingest_view_export_args.upper_bound_datetime_to_export,
+            snapshot_table_creation_times=snapshot_table_creation_times)
+        if export_job is not None:
+            single_date_table_export_jobs.append(export_job)
+        else:
+            reused_table_names.add(upper_bound_table_name)
 
         query = SELECT_SUBQUERY.format(
             project_id=self.big_query_client.project_id,
@@ -214,16 +311,14 @@ class DirectIngestIngestViewExportManager:
             table_name=upper_bound_table_name)
 
         if ingest_view_export_args.upper_bound_datetime_prev:
-            lower_bound_table_name = \
-                f'{ingest_view_export_args.ingest_view_name}_' \
-                f'{ingest_view_export_args.upper_bound_datetime_prev.strftime(TABLE_NAME_DATE_FORMAT)}_' \
-                f'lower_bound'
-            export_job = self._generate_export_job_for_date(
-                table_name=lower_bound_table_name,
+            lower_bound_table_name, export_job = self._get_or_create_snapshot_table(
                 ingest_view=ingest_view,
-                date_bound=ingest_view_export_args.upper_bound_datetime_prev)
-            single_date_table_export_jobs.append(export_job)
-            single_date_table_ids.append(lower_bound_table_name)
+                date_bound=ingest_view_export_args.upper_bound_datetime_prev,
+                snapshot_table_creation_times=snapshot_table_creation_times)
+            if export_job is not None:
+                single_date_table_export_jobs.append(export_job)
+            else:
+                reused_table_names.add(lower_bound_table_name)
 
             filter_query = SELECT_SUBQUERY.format(
                 project_id=self.big_query_client.project_id,
@@ -238,7 +333,7 @@ class DirectIngestIngestViewExportManager:
         # Wait for completion of all async date queries
         for query_job in single_date_table_export_jobs:
             query_job.result()
-        logging.info('Completed loading results of individual date queries into intermediate tables.')
+        logging.info('Completed loading results of individual date queries into snapshot tables.')
 
         logging.info('Generated final export query [%s]', str(query))
 
@@ -257,9 +352,11 @@ class DirectIngestIngestViewExportManager:
         self.big_query_client.export_query_results_to_cloud_storage(export_configs=export_configs)
         logging.info('Export to cloud storage complete.')
 
-        for table_id in single_date_table_ids:
-            self.big_query_client.delete_table(dataset_id=ingest_view.dataset_id, table_id=table_id)
-            logging.info('Deleted intermediate table [%s]', table_id)
+        self._delete_unused_snapshot_tables(
+            ingest_view=ingest_view,
+            exported_upper_bound=ingest_view_export_args.upper_bound_datetime_to_export,
+            snapshot_table_creation_times=snapshot_table_creation_times,
+            reused_table_names=reused_table_names)
 
         self.file_metadata_manager.mark_ingest_view_exported(metadata)
 
@@ -19,7 +19,6 @@ import csv
 import logging
 import os
 import string
-import time
 from typing import List, Dict, Any, Set, Optional, Tuple
 
 import attr
@@ -171,11 +170,6 @@ _FILE_ID_COL_NAME = 'file_id'
 _UPDATE_DATETIME_COL_NAME = 'update_datetime'
 _DEFAULT_BQ_UPLOAD_CHUNK_SIZE = 250000
 
-# The number of seconds of spacing we need to have between each table load operation to avoid going over the
-# "5 operations every 10 seconds per table" rate limit (with a little buffer): https://cloud.google.com/bigquery/quotas
-_PER_TABLE_UPDATE_RATE_LIMITING_SEC = 2.5
-
-
 class DirectIngestRawFileImportManager:
     """Class that stores raw data import configs for a region, with functionality for executing an import of a specific
     file.
@@ -286,54 +280,60 @@ class DirectIngestRawFileImportManager:
     def _load_contents_to_bigquery(self,
                                    path: GcsfsFilePath,
                                    temp_paths_with_columns: List[Tuple[GcsfsFilePath, List[str]]]):
-        """Loads the contents in the given handle to the appropriate table in BigQuery."""
+        """Loads the contents in the given handle to the appropriate table in BigQuery.
+
+        All chunks are loaded in a single load job, which is a single update to the destination table, so no spacing
+        between loads is needed to stay under the per-table update rate quotas: https://cloud.google.com/bigquery/quotas
+        """
 
-        logging.info('Starting chunked load of contents to BigQuery')
         temp_output_paths = [path for path, _ in temp_paths_with_columns]
-        temp_path_to_load_job: Dict[GcsfsFilePath, bigquery.LoadJob] = {}
+        if not temp_output_paths:
+            logging.info('No chunks to load to BigQuery')
+            return
+
+        logging.info('Starting load of [%d] chunks to BigQuery', len(temp_output_paths))
         dataset_id = self.raw_tables_dataset_for_region(self.region.region_code)
 
         try:
-            for i, (temp_output_path, columns) in enumerate(temp_paths_with_columns):
-                if i > 0:
-                    # Note: If this sleep becomes a serious performance issue, we could refactor to intersperse reading
-                    # chunks to temp paths with starting each load job. In this case, we'd have to be careful to delete
-                    # any partially uploaded uploaded portion of the file if we fail to parse a chunk in the middle.
-                    logging.info('Sleeping for [%s] seconds to avoid exceeding per-table update rate quotas.',
-                                 _PER_TABLE_UPDATE_RATE_LIMITING_SEC)
-                    time.sleep(_PER_TABLE_UPDATE_RATE_LIMITING_SEC)
-
-                parts = filename_parts_from_path(path)
-                load_job = self.big_query_client.insert_into_table_from_cloud_storage_async(
-                    source_uri=temp_output_path.uri(),
-                    destination_dataset_ref=self.big_query_client.dataset_ref_for_id(dataset_id),
-                    destination_table_id=parts.file_tag,
-                    destination_table_schema=self._create_raw_table_schema_from_columns(columns),
-                )
-                logging.info('Load job [%s] for chunk [%d] started', load_job.job_id, i)
-
-                temp_path_to_load_job[temp_output_path] = load_job
+            columns = self._get_chunk_columns(temp_paths_with_columns)
+            parts = filename_parts_from_path(path)
+            load_job = self.big_query_client.insert_into_table_from_cloud_storage_async(
+                source_uris=[temp_output_path.uri() for temp_output_path in temp_output_paths],
+                destination_dataset_ref=self.big_query_client.dataset_ref_for_id(dataset_id),
+                destination_table_id=parts.file_tag,
+                destination_table_schema=self._create_raw_table_schema_from_columns(columns),
+            )
+            logging.info('Load job [%s] for [%d] chunks started', load_job.job_id, len(temp_output_paths))
         except Exception as e:
-            logging.error('Failed to start load jobs - cleaning up temp paths')
+            logging.error('Failed to start load job - cleaning up temp paths')
             self._delete_temp_output_paths(temp_output_paths)
             raise e
 
         try:
-            self._wait_for_jobs(temp_path_to_load_job)
+            self._wait_for_job(path, load_job)
         finally:
             self._delete_temp_output_paths(temp_output_paths)
 
     @staticmethod
-    def _wait_for_jobs(temp_path_to_load_job: Dict[GcsfsFilePath, bigquery.LoadJob]) -> None:
-        for temp_output_path, load_job in temp_path_to_load_job.items():
-            try:
-                logging.info('Waiting for load of [%s]', temp_output_path.abs_path())
-                load_job.result()
-                logging.info('BigQuery load of [%s] complete', temp_output_path.abs_path())
-            except BadRequest as e:
-                logging.error('Insert job [%s] for path [%s] failed with errors: [%s]',
-                              load_job.job_id, temp_output_path, load_job.errors)
-                raise e
+    def _get_chunk_columns(temp_paths_with_columns: List[Tuple[GcsfsFilePath, List[str]]]) -> List[str]:
+        """Returns the columns shared by all chunks of a file, which must all be loaded with the same schema."""
+        _, columns = temp_paths_with_columns[0]
+        for temp_output_path, chunk_columns in temp_paths_with_columns[1:]:
+            if list(chunk_columns) != list(columns):
+                raise ValueError(f'Columns of chunk [{temp_output_path.abs_path()}] do not match the columns of the '
+                                 f'first chunk: [{chunk_columns}] != [{columns}]')
+        return columns
+
+    @staticmethod
+    def _wait_for_job(path: GcsfsFilePath, load_job: bigquery.LoadJob) -> None:
+        try:
+            logging.info('Waiting for load of [%s]', path.abs_path())
+            load_job.result()
+            logging.info('BigQuery load of [%s] complete', path.abs_path())
+        except BadRequest as e:
+            logging.error('Insert job [%s] for path [%s] failed with errors: [%s]',
+                          load_job.job_id, path, load_job.errors)
+            raise e
 
     def _delete_temp_output_paths(self, temp_output_paths: List[GcsfsFilePath]) -> None:
         for temp_output_path in temp_output_paths:
@@ -363,7 +363,7 @@ class DirectIngestRawFileImportManager:
         # to gracefully any raw data re-imports where a new column gets introduced in a later file.
 
         delegate = ReadOneGcsfsCsvReaderDelegate()
-        self.csv_reader.streaming_read(path, delegate=delegate, chunk_size=1, nrows=1,
+        self.csv_reader.streaming_read(path, delegate=delegate, chunk_size=1, detect_encoding=False, nrows=1,
                                        **self._common_read_csv_kwargs(file_config))
         df = delegate.df
 
@@ -434,8 +434,10 @@ class DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(SplittingGcsfsCsvReader
         self.temp_output_directory_path = temp_output_directory_path
 
     def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        # Stripping white space from all fields
-        df = df.applymap(lambda x: x.strip())
+        # Stripping white space from all fields. Every column is read as strings, so str.strip is mapped directly over
+        # the values of each column, which avoids the per-cell dispatch of DataFrame.applymap.
+        df = pd.DataFrame({column: list(map(str.strip, values)) for column, values in df.items()},
+                          index=df.index, columns=df.columns)
 
         augmented_df = self._augment_raw_data_with_metadata_columns(path=self.path,
                                                                     file_metadata=self.file_metadata,
@@ -16,11 +16,14 @@
 # =============================================================================
 """Streaming read functionality for Google Cloud Storage CSV files."""
 import abc
-from typing import Iterator, List, Optional
+import codecs
+import logging
+from typing import Dict, Iterator, List, Optional
 
 import gcsfs
 import pandas as pd
 
+from recidiviz.ingest.direct.controllers.csv_row_scanner import iter_csv_rows
 from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath
 from recidiviz.utils import environment
 
@@ -29,6 +32,13 @@ COMMON_RAW_FILE_ENCODINGS = [
     'ISO-8859-1'  # Also known as 'latin-1', used in the census and lots of other government data
 ]
 
+# The number of bytes read at a time when detecting the encoding of a file.
+ENCODING_DETECTION_BLOCK_SIZE_BYTES = 1024 * 1024
+
+# Names (as returned by codecs.lookup()) of encodings that map every possible byte to a character, and so can decode
+# any file.
+_DECODE_ANY_BYTES_CODEC_NAMES = {'iso8859-1'}
+
 
 class GcsfsCsvReaderDelegate:
     """A delegate for handling various events that happen during a GcsfsCsvReader streaming_read() call."""
@@ -89,11 +99,65 @@ class GcsfsCsvReader:
         token = 'google_default' if not environment.in_gae() else 'cloud'
         return self.gcs_file_system.open(path.uri(), encoding=encoding, token=token)
 
+    def _binary_file_pointer_for_path(self, path: GcsfsFilePath):
+        """Returns a file pointer for reading the raw bytes of the given path."""
+        token = 'google_default' if not environment.in_gae() else 'cloud'
+        return self.gcs_file_system.open(path.uri(), mode='rb', token=token)
+
+    def detect_encoding(self, path: GcsfsFilePath, encodings_to_try: List[str]) -> Optional[str]:
+        """Returns the first encoding in |encodings_to_try| that can decode the entire file at the given path, or None
+        if none can.
+
+        All candidate encodings are validated against the raw bytes of the file in a single streaming pass, which stops
+        early once the result is known: when all candidates before an encoding that can decode any bytes have failed,
+        or when all candidates have failed.
+        """
+        # Incremental decoders for the candidate encodings that have not yet failed, in priority order
+        decoders: Dict[str, codecs.IncrementalDecoder] = {}
+
+        # The first encoding to try that can decode any bytes, which is chosen if all candidates before it fail
+        fallback_encoding: Optional[str] = None
+
+        for encoding in encodings_to_try:
+            if codecs.lookup(encoding).name in _DECODE_ANY_BYTES_CODEC_NAMES:
+                fallback_encoding = encoding
+                break
+            decoders[encoding] = codecs.getincrementaldecoder(encoding)()
+
+        if not decoders:
+            return fallback_encoding
+
+        with self._binary_file_pointer_for_path(path) as fp:
+            while decoders:
+                block = fp.read(ENCODING_DETECTION_BLOCK_SIZE_BYTES)
+                is_final_block = not block
+                for encoding, decoder in list(decoders.items()):
+                    try:
+                        decoder.decode(block, final=is_final_block)
+                    except UnicodeError:
+                        logging.info('File [%s] cannot be decoded with encoding [%s]', path.abs_path(), encoding)
+                        del decoders[encoding]
+
+                if is_final_block:
+                    break
+
+        return next(iter(decoders), fallback_encoding)
+
+    def streaming_read_rows(self, path: GcsfsFilePath) -> Iterator[bytes]:
+        """Yields the raw bytes of each row of the CSV at the provided path, header first, without parsing the values in
+        the rows. Only supports files in the encodings in COMMON_RAW_FILE_ENCODINGS, see csv_row_scanner for details.
+
+        Raises a CsvRowScanError if the file cannot be split into rows.
+        """
+        with self._binary_file_pointer_for_path(path) as fp:
+            yield from iter_csv_rows(fp)
+
     def streaming_read(self,
                        path: GcsfsFilePath,
                        delegate: GcsfsCsvReaderDelegate,
                        chunk_size: int,
                        encodings_to_try: Optional[List[str]] = None,
+                       detect_encoding: bool = True,
                        **kwargs):
         """
         Performs a streaming read of the CSV at the provided path. Will attempt to decode file with multiple encoding
@@ -105,12 +169,26 @@ class GcsfsCsvReader:
             delegate: A delegate for handling read chunks one by one.
             chunk_size: The max number of rows each chunk of the CSV should have.
             encodings_to_try: If provided, the ordered list of file encodings we should try for the given file.
+            detect_encoding: If True, the encoding of the file is detected from its raw bytes before it is parsed, so
+                that a file that cannot be decoded with an earlier encoding is only parsed once. Reads that only need
+                the start of the file should pass False, since restarting a short read is cheaper than a pass over the
+                whole file.
             kwargs: Key-value args passed through to the pandas read_csv() call.
         """
 
         if not encodings_to_try:
             encodings_to_try = COMMON_RAW_FILE_ENCODINGS
 
+        if detect_encoding:
+            detected_encoding = self.detect_encoding(path, encodings_to_try)
+            if detected_encoding is None:
+                raise ValueError(
+                    f'Unable to read path [{path.abs_path()}] for any of these encodings: {encodings_to_try}')
+            logging.info('Detected encoding [%s] for path [%s]', detected_encoding, path.abs_path())
+
+            # Later encodings are still tried if the file unexpectedly fails to parse with the detected encoding.
+            encodings_to_try = encodings_to_try[encodings_to_try.index(detected_encoding):]
+
         for encoding in encodings_to_try:
             delegate.on_start_read_with_encoding(encoding)
             try:
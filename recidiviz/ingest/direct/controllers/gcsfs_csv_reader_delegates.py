@@ -19,7 +19,8 @@
 import abc
 import csv
 import logging
-from typing import List, Tuple
+from concurrent import futures
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
@@ -27,6 +28,10 @@ from recidiviz.ingest.direct.controllers.direct_ingest_gcs_file_system import Di
 from recidiviz.ingest.direct.controllers.gcsfs_csv_reader import GcsfsCsvReaderDelegate
 from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath
 
+# The maximum number of chunks that a SplittingGcsfsCsvReaderDelegate writes to Google Cloud Storage at once while
+# later chunks are read. This also bounds the number of chunks that are held in memory.
+MAX_CONCURRENT_CHUNK_UPLOADS = 4
+
 
 class SimpleGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
     """A simple, base implementation of the GcsfsCsvReaderDelegate that allows the GcsfsCsvReader to cycle through all
@@ -67,6 +72,10 @@ class ReadOneGcsfsCsvReaderDelegate(SimpleGcsfsCsvReaderDelegate):
 class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
     """An implementation of the GcsfsCsvReaderDelegate that uploads each CSV chunk to a separate Google Cloud Storage
     path.
+
+    Chunks are serialized and uploaded on background threads, so that reading and transforming the next chunk overlaps
+    with writing the previous ones. At most MAX_CONCURRENT_CHUNK_UPLOADS chunks are uploaded at once, and all uploads
+    have completed by the time the read finishes.
     """
 
     def __init__(self, path: GcsfsFilePath, fs: DirectIngestGCSFileSystem, include_header: bool):
@@ -76,8 +85,14 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
 
         self.output_paths_with_columns: List[Tuple[GcsfsFilePath, List[str]]] = []
 
+        self._upload_executor: Optional[futures.ThreadPoolExecutor] = None
+
+        # Upload futures for each entry in |output_paths_with_columns|, in the same order
+        self._upload_futures: List[futures.Future] = []
+
     def on_start_read_with_encoding(self, encoding: str):
         logging.info('Attempting to do chunked upload of [%s] with encoding [%s]', self.path.abs_path(), encoding)
+        self._upload_executor = futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CHUNK_UPLOADS)
 
     def on_dataframe(self, encoding: str, chunk_num: int, df: pd.DataFrame) -> bool:
         logging.info('Loaded DataFrame chunk [%d] has [%d] rows', chunk_num, df.shape[0])
@@ -87,17 +102,14 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
         logging.info('Transformed DataFrame chunk [%d] has [%d] rows', chunk_num, transformed_df.shape[0])
         output_path = self.get_output_path(chunk_num=chunk_num)
 
-        logging.info('Writing DataFrame chunk [%d] to output path [%s]',
-                     chunk_num, output_path.abs_path())
+        self._wait_for_upload_capacity()
 
-        # We cannot use QUOTE_ALL as it results in empty values being written as "" in our temp file csv.
-        # When uploading the temp file to BQ this results in empty strings being uploaded instead of NULLs.
-        quoting = csv.QUOTE_MINIMAL
-        self.fs.upload_from_string(output_path,
-                                   transformed_df.to_csv(header=self.include_header, index=False, quoting=quoting),
-                                   'text/csv')
-        logging.info('Done writing to output path')
+        if not self._upload_executor:
+            raise ValueError('Expected upload executor to be started before reading chunks.')
 
+        logging.info('Writing DataFrame chunk [%d] to output path [%s]',
+                     chunk_num, output_path.abs_path())
+        self._upload_futures.append(self._upload_executor.submit(self._upload_chunk, output_path, transformed_df))
         self.output_paths_with_columns.append((output_path, transformed_df.columns))
         return True
 
@@ -112,13 +124,51 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
         return True
 
     def on_file_read_success(self, encoding: str):
+        logging.info('Waiting for [%d] chunk uploads of [%s] to complete',
+                     len(self._upload_futures), self.path.abs_path())
+        # Raises the error of the first failed upload, if any, which the reader hands back to this delegate.
+        for upload_future in self._upload_futures:
+            upload_future.result()
+        self._shutdown_upload_executor()
         logging.info('Successfully read file [%s] with encoding [%s]', self.path.abs_path(), encoding)
 
+    def _upload_chunk(self, output_path: GcsfsFilePath, transformed_df: pd.DataFrame) -> None:
+        # We cannot use QUOTE_ALL as it results in empty values being written as "" in our temp file csv.
+        # When uploading the temp file to BQ this results in empty strings being uploaded instead of NULLs.
+        quoting = csv.QUOTE_MINIMAL
+        self.fs.upload_from_string(output_path,
+                                   transformed_df.to_csv(header=self.include_header, index=False, quoting=quoting),
+                                   'text/csv')
+        logging.info('Done writing to output path [%s]', output_path.abs_path())
+
+    def _wait_for_upload_capacity(self) -> None:
+        """Blocks until fewer than MAX_CONCURRENT_CHUNK_UPLOADS uploads are in progress. Raises the error of any upload
+        that has failed, so that the read stops early."""
+        in_progress = [upload_future for upload_future in self._upload_futures if not upload_future.done()]
+        while len(in_progress) >= MAX_CONCURRENT_CHUNK_UPLOADS:
+            _, not_done = futures.wait(in_progress, return_when=futures.FIRST_COMPLETED)
+            in_progress = list(not_done)
+
+        for upload_future in self._upload_futures:
+            if upload_future.done() and upload_future.exception() is not None:
+                upload_future.result()
+
+    def _shutdown_upload_executor(self) -> None:
+        if self._upload_executor:
+            self._upload_executor.shutdown(wait=True)
+            self._upload_executor = None
+
     def _delete_temp_output_paths(self) -> None:
-        for temp_output_path in [path for path, _ in self.output_paths_with_columns]:
+        # Wait for in-progress uploads so that no upload writes a temp file after it has been cleaned up.
+        self._shutdown_upload_executor()
+        for (temp_output_path, _), upload_future in zip(self.output_paths_with_columns, self._upload_futures):
+            if upload_future.exception() is not None:
+                # Nothing was written to this path
+                continue
             logging.info('Deleting temp file [%s].', temp_output_path.abs_path())
             self.fs.delete(temp_output_path)
         self.output_paths_with_columns.clear()
+        self._upload_futures.clear()
 
     @abc.abstractmethod
     def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
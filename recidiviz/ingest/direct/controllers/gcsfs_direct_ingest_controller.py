@@ -148,9 +148,10 @@ class GcsfsDirectIngestController(
             can_start_ingest=start_ingest)
 
     def _register_all_new_paths_in_metadata(self, paths: List[GcsfsFilePath]):
-        for path in paths:
-            if not self.file_metadata_manager.has_file_been_discovered(path):
-                self.file_metadata_manager.mark_file_as_discovered(path)
+        discovered_by_path = self.file_metadata_manager.have_files_been_discovered(paths)
+        undiscovered_paths = [path for path in paths if not discovered_by_path[path]]
+        if undiscovered_paths:
+            self.file_metadata_manager.mark_files_as_discovered(undiscovered_paths)
 
     def handle_new_files(self, can_start_ingest: bool):
         """Searches the ingest directory for new/unprocessed files. Normalizes
@@ -414,6 +415,23 @@ class GcsfsDirectIngestController(
     def _on_job_scheduled(self, ingest_args: GcsfsIngestArgs):
         pass
 
+    def _get_continuation_job_args(self, args: GcsfsIngestArgs) -> Optional[GcsfsIngestArgs]:
+        """Returns the args for the next job if it is for the next split of the same original file as |args| and it
+        can run immediately, None otherwise."""
+        next_args = self._get_next_job_args()
+        if not next_args or self._wait_time_sec_for_next_args(next_args):
+            return None
+
+        parts = filename_parts_from_path(args.file_path)
+        next_parts = filename_parts_from_path(next_args.file_path)
+        if not parts.is_file_split or not next_parts.is_file_split:
+            return None
+
+        if (parts.file_tag, parts.utc_upload_datetime) != (next_parts.file_tag, next_parts.utc_upload_datetime):
+            return None
+
+        return next_args
+
     # =================== #
     # SINGLE JOB RUN CODE #
     # =================== #
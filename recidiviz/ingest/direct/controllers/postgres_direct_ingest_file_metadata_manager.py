@@ -18,7 +18,11 @@
 Postgres table.
 """
 import datetime
-from typing import Optional, List
+from collections import defaultdict
+from typing import Optional, List, Dict, Union
+
+from more_itertools import chunked, one
+from sqlalchemy import func
 
 from recidiviz.ingest.direct.controllers.direct_ingest_file_metadata_manager import DirectIngestFileMetadataManager
 from recidiviz.ingest.direct.controllers.direct_ingest_gcs_file_system import DIRECT_INGEST_UNPROCESSED_PREFIX
@@ -29,10 +33,14 @@ from recidiviz.persistence.database.base_schema import OperationsBase
 from recidiviz.persistence.database.schema.operations import schema, dao
 from recidiviz.persistence.database.schema_entity_converter.schema_entity_converter import \
     convert_schema_object_to_entity
+from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.entity.operations.entities import DirectIngestRawFileMetadata, \
     DirectIngestIngestFileMetadata, DirectIngestFileMetadata
 
+# The maximum number of rows written by a single statement when marking many files as discovered at once.
+_MAX_ROWS_PER_STATEMENT = 1000
+
 
 class PostgresDirectIngestFileMetadataManager(DirectIngestFileMetadataManager):
     """An implementation for a class that handles writing metadata about each direct ingest file to the operations
@@ -97,57 +105,84 @@ class PostgresDirectIngestFileMetadataManager(DirectIngestFileMetadataManager):
         return metadata_entity
 
     def has_file_been_discovered(self, path: GcsfsFilePath) -> bool:
-        parts = filename_parts_from_path(path)
+        return self.have_files_been_discovered([path])[path]
+
+    def mark_file_as_discovered(self, path: GcsfsFilePath) -> None:
+        self.mark_files_as_discovered([path])
+
+    def have_files_been_discovered(self, paths: List[GcsfsFilePath]) -> Dict[GcsfsFilePath, bool]:
+        if not paths:
+            return {}
+
+        paths_by_file_type = self._paths_by_file_type(paths)
+        session = SessionFactory.for_schema_base(OperationsBase)
 
         try:
-            metadata = self.get_file_metadata(path)
-        except ValueError as e:
-            if parts.file_type != GcsfsDirectIngestFileType.RAW_DATA:
-                raise e
-            return False
+            discovered_by_path = {}
+            for file_type, file_type_paths in paths_by_file_type.items():
+                metadata_by_file_name = self._metadata_rows_by_file_name(session, file_type, file_type_paths)
 
-        if not metadata:
-            raise ValueError(f'Metadata unexpectedly None for path [{path.abs_path()}]')
+                for path in file_type_paths:
+                    metadata_rows = metadata_by_file_name[path.file_name]
 
-        # TODO(3020): Design/handle/write tests for case where this is a file we've moved from storage for a
-        #  rerun. How do we accurately detect when this is happening?
-        if isinstance(metadata, DirectIngestRawFileMetadata):
-            return True
+                    # TODO(3020): Design/handle/write tests for case where this is a file we've moved from storage for
+                    #  a rerun. How do we accurately detect when this is happening?
+                    if file_type == GcsfsDirectIngestFileType.RAW_DATA:
+                        discovered_by_path[path] = bool(metadata_rows)
+                        continue
 
-        if isinstance(metadata, DirectIngestIngestFileMetadata):
-            if metadata.discovery_time is None:
-                return False
-            return True
+                    metadata = self._one_metadata_row_for_path(path, metadata_rows)
+                    discovered_by_path[path] = metadata.discovery_time is not None
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
 
-        raise ValueError(f'Unexpected metadata type [{type(metadata)}] for path [{path.abs_path()}]')
+        return discovered_by_path
 
-    def mark_file_as_discovered(self, path: GcsfsFilePath) -> None:
-        if not path.file_name.startswith(DIRECT_INGEST_UNPROCESSED_PREFIX):
-            raise ValueError('Expect only unprocessed paths in this function.')
+    def mark_files_as_discovered(self, paths: List[GcsfsFilePath]) -> None:
+        if not paths:
+            return
+
+        for path in paths:
+            if not path.file_name.startswith(DIRECT_INGEST_UNPROCESSED_PREFIX):
+                raise ValueError('Expect only unprocessed paths in this function.')
 
-        parts = filename_parts_from_path(path)
+        paths_by_file_type = self._paths_by_file_type(paths)
         session = SessionFactory.for_schema_base(OperationsBase)
 
         try:
-            if parts.file_type == GcsfsDirectIngestFileType.INGEST_VIEW:
-                metadata = dao.get_file_metadata_row_for_path(session, self.region_code, path)
-                dt = datetime.datetime.utcnow()
-                if not metadata.export_time:
-                    metadata.export_time = dt
-                metadata.discovery_time = dt
-            elif parts.file_type == GcsfsDirectIngestFileType.RAW_DATA:
-                session.add(
-                    schema.DirectIngestRawFileMetadata(
-                        region_code=self.region_code,
-                        file_tag=parts.file_tag,
-                        normalized_file_name=path.file_name,
-                        discovery_time=datetime.datetime.utcnow(),
-                        processed_time=None,
-                        datetimes_contained_upper_bound_inclusive=parts.utc_upload_datetime
-                    )
-                )
-            else:
-                raise ValueError(f'Unexpected path type: {parts.file_type}')
+            dt = datetime.datetime.utcnow()
+
+            ingest_view_paths = paths_by_file_type.get(GcsfsDirectIngestFileType.INGEST_VIEW, [])
+            metadata_by_file_name = self._metadata_rows_by_file_name(
+                session, GcsfsDirectIngestFileType.INGEST_VIEW, ingest_view_paths)
+            file_ids = [self._one_metadata_row_for_path(path, metadata_by_file_name[path.file_name]).file_id
+                        for path in ingest_view_paths]
+            for file_ids_batch in chunked(file_ids, _MAX_ROWS_PER_STATEMENT):
+                session.query(schema.DirectIngestIngestFileMetadata) \
+                    .filter(schema.DirectIngestIngestFileMetadata.file_id.in_(file_ids_batch)) \
+                    .update({
+                        schema.DirectIngestIngestFileMetadata.export_time:
+                            func.coalesce(schema.DirectIngestIngestFileMetadata.export_time, dt),
+                        schema.DirectIngestIngestFileMetadata.discovery_time: dt,
+                    }, synchronize_session=False)
+
+            raw_file_rows = []
+            for path in paths_by_file_type.get(GcsfsDirectIngestFileType.RAW_DATA, []):
+                parts = filename_parts_from_path(path)
+                raw_file_rows.append({
+                    'region_code': self.region_code,
+                    'file_tag': parts.file_tag,
+                    'normalized_file_name': path.file_name,
+                    'discovery_time': dt,
+                    'processed_time': None,
+                    'datetimes_contained_upper_bound_inclusive': parts.utc_upload_datetime,
+                })
+            for raw_file_rows_batch in chunked(raw_file_rows, _MAX_ROWS_PER_STATEMENT):
+                session.execute(schema.DirectIngestRawFileMetadata.__table__.insert().values(raw_file_rows_batch))
+
             session.commit()
         except Exception as e:
             session.rollback()
@@ -343,3 +378,36 @@ class PostgresDirectIngestFileMetadataManager(DirectIngestFileMetadataManager):
             raise ValueError(f'Unexpected metadata entity type: {type(entity_metadata)}')
 
         return entity_metadata
+
+    @staticmethod
+    def _paths_by_file_type(paths: List[GcsfsFilePath]) -> Dict[GcsfsDirectIngestFileType, List[GcsfsFilePath]]:
+        paths_by_file_type: Dict[GcsfsDirectIngestFileType, List[GcsfsFilePath]] = defaultdict(list)
+        for path in paths:
+            file_type = filename_parts_from_path(path).file_type
+            if file_type not in (GcsfsDirectIngestFileType.INGEST_VIEW, GcsfsDirectIngestFileType.RAW_DATA):
+                raise ValueError(f'Unexpected path type: {file_type}')
+            paths_by_file_type[file_type].append(path)
+        return paths_by_file_type
+
+    def _metadata_rows_by_file_name(
+            self,
+            session: Session,
+            file_type: GcsfsDirectIngestFileType,
+            paths: List[GcsfsFilePath]
+    ) -> Dict[str, List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]]]:
+        metadata_by_file_name: Dict[
+            str, List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]]
+        ] = defaultdict(list)
+        for metadata in dao.get_file_metadata_rows_for_paths(session, self.region_code, file_type, paths):
+            metadata_by_file_name[metadata.normalized_file_name].append(metadata)
+        return metadata_by_file_name
+
+    @staticmethod
+    def _one_metadata_row_for_path(
+            path: GcsfsFilePath,
+            metadata_rows: List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]]
+    ) -> Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]:
+        if len(metadata_rows) != 1:
+            raise ValueError(f'Unexpected number of metadata results for path {path.abs_path()}: '
+                             f'[{len(metadata_rows)}]')
+        return one(metadata_rows)
@@ -22,9 +22,10 @@ model and returned.
 import collections
 import csv
 import logging
-from collections import defaultdict, OrderedDict
-from typing import Dict, Set, List, Callable, Optional, Iterable, Union
+from collections import defaultdict
+from typing import Dict, Set, List, Callable, Optional, Iterable, Union, Iterator
 
+import attr
 import more_itertools
 
 from recidiviz.common.ingest_metadata import SystemLevel
@@ -60,6 +61,31 @@ class IngestFieldCoordinates:
 _DUMMY_KEY_PREFIX = 'CSV_EXTRACTOR_DUMMY_KEY'
 
 
+@attr.s(frozen=True)
+class _ColumnPlan:
+    """Describes how values in a single CSV column are extracted, precomputed
+    from the key mappings once per extractor rather than once per row."""
+
+    # The '<class_name>.<field_name>' this column is set on, or None if the
+    # column is only used as an ancestor / primary key or is ignored.
+    cls_and_field: Optional[str] = attr.ib()
+
+    # The class and field names parsed from |cls_and_field|.
+    class_name: Optional[str] = attr.ib()
+    field_name: Optional[str] = attr.ib()
+
+    # Set if this column sets a field on a child of the row's primary object.
+    child_class_name: Optional[str] = attr.ib()
+
+
+@attr.s(frozen=True)
+class _KeyMappingCoordinates:
+    """A single parsed entry of an ancestor or primary key mapping."""
+    column: str = attr.ib()
+    class_name: str = attr.ib()
+    field_name: str = attr.ib()
+
+
 class CsvDataExtractor(DataExtractor):
     """Data extractor for CSV text."""
 
@@ -129,6 +155,23 @@ class CsvDataExtractor(DataExtractor):
             self.child_keys.keys()) | set(self.keys_to_ignore) | set(
                 self.ancestor_keys.keys()) | set(self.primary_key.keys())
 
+        self._column_plans: Dict[str, _ColumnPlan] = {
+            key: self._build_column_plan(key) for key in self.all_keys}
+
+        # For each child class, the (stripped) columns that set fields on that
+        # class, sorted by column name. Used to build dummy child primary keys.
+        child_key_columns_by_class: Dict[str, List[str]] = defaultdict(list)
+        for col in sorted(self.child_keys):
+            child_class_name, _ = self.child_keys[col].split('.')
+            child_key_columns_by_class[child_class_name].append(col.strip())
+        self._child_key_columns_by_class: Dict[str, List[str]] = \
+            dict(child_key_columns_by_class)
+
+        self._ancestor_key_coordinates: List[_KeyMappingCoordinates] = \
+            self._parse_key_mapping(self.ancestor_keys)
+        self._primary_key_coordinates: List[_KeyMappingCoordinates] = \
+            self._parse_key_mapping(self.primary_key)
+
     def extract_and_populate_data(self,
                                   content: Union[str, Iterable[str]],
                                   ingest_info: IngestInfo = None) -> IngestInfo:
@@ -153,48 +196,84 @@ class CsvDataExtractor(DataExtractor):
         self._run_file_post_hooks(ingest_info)
         return ingest_info.prune()
 
+    def _build_column_plan(self, key: str) -> _ColumnPlan:
+        cls_and_field = self.keys.get(key)
+        class_name, field_name = cls_and_field.split('.') \
+            if cls_and_field else (None, None)
+        child_class_name = self.child_keys[key].split('.')[0] \
+            if key in self.child_keys else None
+        return _ColumnPlan(cls_and_field=cls_and_field,
+                           class_name=class_name,
+                           field_name=field_name,
+                           child_class_name=child_class_name)
+
     def _extract(self,
                  content: Union[str, Iterable[str]],
                  ingest_info: IngestInfo):
         """Converts entries in |content| and adds data to |ingest_info|."""
         if isinstance(content, str):
-            rows = csv.DictReader(content.splitlines())
+            lines: Iterable[str] = content.splitlines()
         elif isinstance(content, collections.abc.Iterable):
-            rows = csv.DictReader(content)
+            lines = content
         else:
             logging.error("%r is not a string or an Iterable", content)
             return
 
-        self._extract_rows(rows, ingest_info)
+        self._extract_rows(self._rows_from_lines(lines), ingest_info)
+
+    @staticmethod
+    def _rows_from_lines(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+        """Lazily parses CSV |lines| into one dict per row, keyed by column
+        names with surrounding whitespace stripped. The header is only
+        normalized once, and rows are parsed as |lines| are consumed, so large
+        files do not need to be read into memory before extraction starts.
+        Blank rows are skipped and missing trailing values are set to None, as
+        with csv.DictReader.
+        """
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = [col.strip() for col in header]
+        num_columns = len(columns)
+        for values in reader:
+            if not values:
+                continue
+            if len(values) > num_columns:
+                raise ValueError(
+                    f'Found row with [{len(values)}] values, but header only '
+                    f'has [{num_columns}] columns: {values}')
+            row = dict(zip(columns, values))
+            if len(values) < num_columns:
+                for col in columns[len(values):]:
+                    row.setdefault(col, None)  # type: ignore
+            yield row
 
     def _extract_rows(self,
-                      rows: Iterable[OrderedDict],
+                      rows: Iterable[Dict[str, str]],
                       ingest_info: IngestInfo):
-        """Converts entries in |rows| and adds data to |ingest_info|."""
+        """Converts entries in |rows|, which must have stripped column names,
+        and adds data to |ingest_info|."""
 
         if self.ingest_object_cache is None:
             raise ValueError('Ingest object cache unexpectedly None')
 
         seen_map: Dict[int, Set[str]] = defaultdict(set)
         for row in rows:
-            row_with_stripped_cols = OrderedDict()
-            for key in row:
-                row_with_stripped_cols[key.strip()] = row[key]
-            row = row_with_stripped_cols
-
             self._pre_process_row(row)
             primary_coordinates = self._primary_coordinates(row)
             ancestor_chain: Dict[str, str] = self._ancestor_chain(row)
 
             extracted_objects_for_row = []
             for k, v in row.items():
-                k = k.strip()
-                if k not in self.all_keys:
+                column_plan = self._column_plans.get(k)
+                if column_plan is None:
                     raise ValueError("Unmapped key: [%s]" % k)
 
-                if k in self.keys:
-                    cls, field = self.keys[k].split('.')
-                    if cls == primary_coordinates.class_name and field == primary_coordinates.field_name:
+                if column_plan.cls_and_field:
+                    if column_plan.class_name == primary_coordinates.class_name and \
+                            column_plan.field_name == primary_coordinates.field_name:
                         # It's possible that the primary key field has been listed in key_mappings in the YAML to make
                         # it so that section is not empty. However, if there is a primary coordinates override, we want
                         # the value to match the overridden value so we don't skip this field if the row value is empty.
@@ -203,25 +282,27 @@ class CsvDataExtractor(DataExtractor):
                 if not v and not self.set_with_empty_value:
                     continue
 
+                if not column_plan.cls_and_field:
+                    # Ignored, ancestor and primary key columns do not set any
+                    # values themselves.
+                    continue
+
                 column_ancestor_chain = ancestor_chain.copy()
-                if k in self.child_keys:
-                    child_class_to_set, _ = self.child_keys[k].split('.')
+                if column_plan.child_class_name:
                     self._update_column_ancestor_chain_for_child_object(
                         row,
                         primary_coordinates,
-                        child_class_to_set,
+                        column_plan.child_class_name,
                         column_ancestor_chain)
 
-                create_args = self._get_creation_args(row,
-                                                      k,
-                                                      column_ancestor_chain)
+                create_args = self._get_creation_args_for_column(
+                    row, column_plan, primary_coordinates,
+                    column_ancestor_chain)
 
-                extracted_objects_for_column = \
-                    self._set_value_if_key_exists(k, v,
-                                                  ingest_info,
-                                                  seen_map,
-                                                  column_ancestor_chain,
-                                                  **create_args)
+                extracted_objects_for_column = self._set_or_create_object(
+                    ingest_info, column_plan.cls_and_field, [v], seen_map,
+                    column_ancestor_chain, self.enforced_ancestor_types,
+                    **create_args)
                 extracted_objects_for_row.extend(extracted_objects_for_column)
 
             self._post_process_row(row, extracted_objects_for_row)
@@ -280,21 +361,6 @@ class CsvDataExtractor(DataExtractor):
         for post_hook in self.file_post_hooks:
             post_hook(ingest_info, self.ingest_object_cache)
 
-    def _set_value_if_key_exists(self,
-                                 lookup_key: str, value: str,
-                                 ingest_info: IngestInfo,
-                                 seen_map: Dict[int, Set[str]],
-                                 ancestor_chain: Dict[str, str] = None,
-                                 **create_args) -> List[IngestObject]:
-        """If the column key is one we want to set on the object, set it on the
-        appropriate object instance."""
-        if lookup_key in self.keys:
-            return self._set_or_create_object(
-                ingest_info, self.keys[lookup_key], [value], seen_map,
-                ancestor_chain, self.enforced_ancestor_types, **create_args)
-
-        return []
-
     def _instantiate_person(self, ingest_info: IngestInfo):
         if self.system_level == SystemLevel.COUNTY:
             ingest_info.create_person()
@@ -335,12 +401,9 @@ class CsvDataExtractor(DataExtractor):
 
         # Append all values in this row that are relevant to this child object,
         # ordered by CSV column name
-        cols_for_id = []
-        for col, field in self.child_keys.items():
-            this_col_class_name, _ = field.split('.')
-            if child_class_name == this_col_class_name:
-                cols_for_id.append(col)
-        child_primary_key_parts += [row[col.strip()] for col in sorted(cols_for_id)]
+        child_primary_key_parts += [
+            row[col] for col in
+            self._child_key_columns_by_class.get(child_class_name, [])]
 
         return '|'.join(child_primary_key_parts)
 
@@ -367,21 +430,30 @@ class CsvDataExtractor(DataExtractor):
         row contains data for multiple entities.
         """
 
-        current_field = self.keys.get(lookup_key, None)
-        if not current_field:
+        column_plan = self._column_plans.get(lookup_key)
+        if not column_plan or not column_plan.cls_and_field:
             return {}
 
-        primary_coordinates = self._primary_coordinates(row)
+        return self._get_creation_args_for_column(
+            row, column_plan, self._primary_coordinates(row),
+            column_ancestor_chain)
 
-        current_class_name, _current_field_name = current_field.split('.')
-        if current_class_name == primary_coordinates.class_name:
+    def _get_creation_args_for_column(
+            self,
+            row: Dict[str, str],
+            column_plan: _ColumnPlan,
+            primary_coordinates: IngestFieldCoordinates,
+            column_ancestor_chain: Dict[str, str]) -> Dict[str, str]:
+        """Same as _get_creation_args, for a column with a field mapping and
+        the already computed |primary_coordinates| for the |row|."""
+        if column_plan.class_name == primary_coordinates.class_name:
             return {
                 primary_coordinates.field_name: primary_coordinates.field_value
             }
 
         child_primary_key_coords = \
             self._child_primary_coordinates(row,
-                                            current_class_name,
+                                            column_plan.class_name,
                                             column_ancestor_chain)
 
         return {
@@ -400,11 +472,9 @@ class CsvDataExtractor(DataExtractor):
         """
         ancestor_chain = {}
 
-        if self.ancestor_keys:
-            ancestor_coordinates = self._get_coordinates_from_mapping(
-                self.ancestor_keys, row)
-            for coordinate in ancestor_coordinates:
-                ancestor_chain[coordinate.class_name] = coordinate.field_value
+        for coordinate in self._get_coordinates_from_mapping(
+                self._ancestor_key_coordinates, row):
+            ancestor_chain[coordinate.class_name] = coordinate.field_value
 
         if self.ancestor_chain_overrides_callback:
             ancestor_addition = self.ancestor_chain_overrides_callback(row)
@@ -425,10 +495,10 @@ class CsvDataExtractor(DataExtractor):
         if self.primary_key_override_callback:
             return self.primary_key_override_callback(row)
 
-        if self.primary_key:
-            coordinates = self._get_coordinates_from_mapping(self.primary_key,
-                                                             row)
-            coordinates = more_itertools.one(coordinates)
+        if self._primary_key_coordinates:
+            coordinates = more_itertools.one(
+                self._get_coordinates_from_mapping(
+                    self._primary_key_coordinates, row))
             if not coordinates.field_value:
                 raise ValueError(
                     f"Found empty primary coordinates mapping in col [{self.primary_key}] for "
@@ -440,17 +510,20 @@ class CsvDataExtractor(DataExtractor):
             'but neither found.')
 
     @staticmethod
-    def _get_coordinates_from_mapping(
-            key_mapping: Dict[str, str], row: Dict[str, str]) -> List[IngestFieldCoordinates]:
-        coordinates = []
-
+    def _parse_key_mapping(
+            key_mapping: Dict[str, str]) -> List[_KeyMappingCoordinates]:
+        parsed_mapping = []
         for lookup_key, cls_and_field in key_mapping.items():
             if not cls_and_field:
                 raise TypeError(f"Expected truthy key mapping [{key_mapping}] to have a value inside")
 
             cls, field = cls_and_field.split('.')
-            id_value = row[lookup_key.strip()]
+            parsed_mapping.append(
+                _KeyMappingCoordinates(lookup_key.strip(), cls, field))
+        return parsed_mapping
 
-            coordinates.append(IngestFieldCoordinates(cls, field, id_value))
-
-        return coordinates
+    @staticmethod
+    def _get_coordinates_from_mapping(
+            key_mapping: List[_KeyMappingCoordinates], row: Dict[str, str]) -> List[IngestFieldCoordinates]:
+        return [IngestFieldCoordinates(mapping.class_name, mapping.field_name, row[mapping.column])
+                for mapping in key_mapping]
@@ -16,6 +16,7 @@
 # =============================================================================
 
 """Represents data scraped for a single individual."""
+import hashlib
 from abc import abstractmethod
 from typing import List, Optional
 
@@ -62,6 +63,9 @@ class IngestObject:
     def __repr__(self):
         return to_repr(self)
 
+    def fingerprint(self) -> str:
+        return fingerprint(self)
+
     @abstractmethod
     def __setattr__(self, key, value):
         """Implement using restricted_setattr"""
@@ -89,6 +93,9 @@ class IngestInfo(IngestObject):
     def __repr__(self):
         return to_repr(self, exclude=['_state_people_by_id'])
 
+    def fingerprint(self) -> str:
+        return fingerprint(self, exclude=['_state_people_by_id'])
+
     def __setattr__(self, name, value):
         restricted_setattr(self, '_state_people_by_id', name, value)
 
@@ -1660,6 +1667,28 @@ def to_repr(obj, exclude=None):
     return '{}({})'.format(obj.__class__.__name__, ', '.join(args))
 
 
+def fingerprint(obj, exclude=None) -> str:
+    """Returns a stable content hash of |obj| and all of its children.
+
+    Repeated child objects are hashed independent of their order, so two
+    objects have the same fingerprint when they are equal after sort(). Unlike
+    hash(), the fingerprint is stable across processes.
+    """
+    if exclude is None:
+        exclude = []
+    hasher = hashlib.sha256(obj.__class__.__name__.encode())
+    for key, val in sorted(vars(obj).items()):
+        if key in exclude:
+            continue
+        if isinstance(val, IngestObject):
+            val = fingerprint(val)
+        elif isinstance(val, list) and val and \
+                isinstance(val[0], IngestObject):
+            val = sorted(fingerprint(elem) for elem in val)
+        hasher.update(repr((key, val)).encode())
+    return hasher.hexdigest()
+
+
 def restricted_setattr(self, last_field, name, value):
     if isinstance(value, str) and (value == '' or value.isspace()):
         value = None
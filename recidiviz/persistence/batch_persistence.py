@@ -129,19 +129,27 @@ def _get_batch_ingest_info_list(region_code: str,
 
 def _dedup_people(ingest_infos: List[IngestInfo]) -> IngestInfo:
     """Combines a list of IngestInfo objects into a single IngestInfo with
-    duplicate People objects removed."""
+    duplicate People objects removed.
+
+    People are compared by their fingerprint, so this is a single pass over
+    all people rather than a pairwise comparison."""
 
     unique_people: List[Person] = []
     duplicate_people: List[Person] = []
+    seen_fingerprints: Set[str] = set()
+    duplicate_fingerprints: Set[str] = set()
 
     for ingest_info in ingest_infos:
         for person in ingest_info.people:
-            # Sort deeply so that repeated fields are compared in a consistent
+            # Sort deeply so that repeated fields are written in a consistent
             # order.
             person.sort()
-            if person not in unique_people:
+            person_fingerprint = person.fingerprint()
+            if person_fingerprint not in seen_fingerprints:
+                seen_fingerprints.add(person_fingerprint)
                 unique_people.append(person)
-            elif person not in duplicate_people:
+            elif person_fingerprint not in duplicate_fingerprints:
+                duplicate_fingerprints.add(person_fingerprint)
                 duplicate_people.append(person)
     if duplicate_people:
         logging.info("Removed %d duplicate people: %s", len(duplicate_people),
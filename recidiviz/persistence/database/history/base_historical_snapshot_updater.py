@@ -27,11 +27,15 @@ import logging
 from collections import defaultdict
 
 from types import ModuleType
-from typing import List, Generic, Type, Set, Callable, Optional, Dict
+from typing import List, Generic, Type, Set, Callable, Optional, Dict, Any
 
 import attr
+from more_itertools import one
 
-from sqlalchemy import text
+from sqlalchemy import text, select, or_, any_, bindparam, literal, Integer, \
+    Table
+from sqlalchemy import inspect as sqlalchemy_inspect
+from sqlalchemy.dialects import postgresql
 
 from recidiviz.persistence.database.session import Session
 from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
@@ -45,6 +49,11 @@ from recidiviz.persistence.database.schema_utils import \
 from recidiviz.persistence.entity.entity_utils import SchemaEdgeDirectionChecker
 
 
+# Maximum number of new snapshots inserted by a single multi-row INSERT when
+# writing snapshots in bulk.
+_BULK_INSERT_ROWS_PER_STATEMENT = 1000
+
+
 class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
     """
     Base class for updating historical snapshots for all entities in all record
@@ -134,6 +143,12 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         logging.info("%s master entities registered for snapshot check",
                      len(context_registry.all_contexts()))
 
+        if _supports_bulk_snapshot_updates(session):
+            self._bulk_write_snapshots(session, root_people, context_registry,
+                                       ingest_metadata.ingest_time, schema)
+            logging.info("All historical snapshots written in bulk")
+            return
+
         most_recent_snapshots = \
             self._fetch_most_recent_snapshots_for_all_entities(
                 session, root_entities, schema)
@@ -159,6 +174,76 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
 
         logging.info("All historical snapshots written")
 
+    def _bulk_write_snapshots(self,
+                              session: Session,
+                              root_people: List[SchemaPersonType],
+                              context_registry: '_SnapshotContextRegistry',
+                              snapshot_time: datetime,
+                              schema: ModuleType) -> None:
+        """Writes snapshots for all registered entities with a fixed number of
+        set-based statements per entity type, rather than by loading and
+        comparing the most recent snapshot of each entity in Python.
+
+        Entities whose master row differs from their open snapshot have that
+        snapshot closed by a single UPDATE ... FROM, which returns their ids,
+        and have their new snapshots copied from their master rows by a single
+        INSERT ... SELECT. Entities without an open snapshot are treated as new
+        entities, and their snapshots are inserted with multi-row INSERTs.
+        Master entity ids are passed to each statement as a single array
+        parameter.
+        """
+        # Snapshots are copied from the master tables, so those must reflect
+        # the current state of every entity.
+        session.flush()
+
+        for type_name, contexts_by_id in \
+                context_registry.snapshot_contexts.items():
+            master_class = getattr(schema, type_name)
+            for master_id, in session.execute(
+                    _select_open_snapshot_master_ids_query(
+                        master_class.__table__,
+                        _get_historical_class(master_class, schema).__table__,
+                        list(contexts_by_id.keys()))):
+                contexts_by_id[master_id].has_open_snapshot = True
+
+        # Provided start and end times depend on which entities are new, so
+        # can only be set once open snapshots have been found.
+        self.set_provided_start_and_end_times(root_people, context_registry)
+
+        for type_name, contexts_by_id in \
+                context_registry.snapshot_contexts.items():
+            master_class = getattr(schema, type_name)
+            historical_class = _get_historical_class(master_class, schema)
+            master_table = master_class.__table__
+            history_table = historical_class.__table__
+            master_ids = list(contexts_by_id.keys())
+
+            changed_master_ids = {
+                master_id for master_id, in session.execute(
+                    _close_changed_snapshots_query(
+                        master_table, history_table, master_ids,
+                        snapshot_time))}
+            if changed_master_ids:
+                session.execute(_insert_snapshots_from_master_query(
+                    master_table, history_table, list(changed_master_ids),
+                    snapshot_time))
+
+            new_contexts = [context for context in contexts_by_id.values()
+                            if not context.has_open_snapshot]
+            new_snapshot_rows = []
+            for context in new_contexts:
+                for snapshot in self._build_snapshots_for_new_entity(
+                        context, snapshot_time, schema):
+                    new_snapshot_rows.append(_get_column_values(snapshot))
+            for i in range(0, len(new_snapshot_rows),
+                           _BULK_INSERT_ROWS_PER_STATEMENT):
+                session.execute(history_table.insert().values(
+                    new_snapshot_rows[i:i + _BULK_INSERT_ROWS_PER_STATEMENT]))
+
+            logging.info(
+                "[%s] Wrote snapshots for %s changed and %s new entities",
+                type_name, len(changed_master_ids), len(new_contexts))
+
     def _fetch_most_recent_snapshots_for_all_entities(
             self,
             session: Session,
@@ -304,6 +389,22 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         """Writes snapshots for any new entities, including any required manual
         adjustments based on provided start and end times
         """
+        # Snapshots must be merged separately from record tree, as they are not
+        # included in the ORM model relationships (to avoid needing to load
+        # the entire snapshot chain at once)
+        for snapshot in self._build_snapshots_for_new_entity(
+                context, snapshot_time, schema):
+            session.merge(snapshot)
+
+    def _build_snapshots_for_new_entity(
+            self,
+            context: '_SnapshotContext',
+            snapshot_time: datetime,
+            schema) -> List[DatabaseEntity]:
+        """Returns the snapshots to write for an entity with no existing
+        snapshots, including any required manual adjustments based on provided
+        start and end times. The open snapshot is always returned first.
+        """
         historical_class = _get_historical_class(type(context.schema_object),
                                                  schema)
         new_historical_snapshot = historical_class()
@@ -333,10 +434,7 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         else:
             new_historical_snapshot.valid_from = snapshot_time
 
-        # Snapshot must be merged separately from record tree, as they are not
-        # included in the ORM model relationships (to avoid needing to load
-        # the entire snapshot chain at once)
-        session.merge(new_historical_snapshot)
+        snapshots = [new_historical_snapshot]
 
         # If both start and end time were provided, an earlier snapshot needs to
         # be created, reflecting the state of the entity before its current
@@ -350,7 +448,9 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
 
             self.post_process_initial_snapshot(context, initial_snapshot)
 
-            session.merge(initial_snapshot)
+            snapshots.append(initial_snapshot)
+
+        return snapshots
 
     def _write_snapshots_for_existing_entities(
             self,
@@ -532,6 +632,102 @@ def _get_master_class(historical_class: Type[DatabaseEntity],
     return getattr(schema, master_class_name)
 
 
+def _supports_bulk_snapshot_updates(session: Session) -> bool:
+    """Returns True if snapshots can be written with the set-based statements
+    in BaseHistoricalSnapshotUpdater._bulk_write_snapshots, which rely on
+    Postgres array parameters, UPDATE ... FROM and RETURNING. Otherwise (e.g. in
+    SQLite tests), snapshots are written one entity at a time.
+    """
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+def _master_ids_param(master_ids: List[int]):
+    return any_(bindparam('master_ids', value=master_ids,
+                          type_=postgresql.ARRAY(Integer)))
+
+
+def _master_key_column_name(master_table: Table) -> str:
+    # See module assumption #2
+    return one(master_table.primary_key.columns).name
+
+
+def _shared_column_names(master_table: Table,
+                         history_table: Table) -> List[str]:
+    """Returns the names of all columns present on both |master_table| and
+    |history_table|, including the master key column.
+    """
+    return [column.name for column in master_table.columns
+            if column.name in history_table.columns]
+
+
+def _select_open_snapshot_master_ids_query(master_table: Table,
+                                           history_table: Table,
+                                           master_ids: List[int]):
+    history_master_key = \
+        history_table.columns[_master_key_column_name(master_table)]
+    return select([history_master_key]).distinct() \
+        .where(history_master_key == _master_ids_param(master_ids)) \
+        .where(history_table.columns.valid_to.is_(None))
+
+
+def _close_changed_snapshots_query(master_table: Table,
+                                   history_table: Table,
+                                   master_ids: List[int],
+                                   snapshot_time: datetime):
+    """Returns an UPDATE that closes the open snapshot of every master row in
+    |master_ids| whose values differ from that snapshot, returning the ids of
+    those master rows.
+    """
+    master_key_column_name = _master_key_column_name(master_table)
+    master_key = master_table.columns[master_key_column_name]
+    history_master_key = history_table.columns[master_key_column_name]
+    compared_column_names = [
+        name for name in _shared_column_names(master_table, history_table)
+        if name != master_key_column_name]
+
+    return history_table.update() \
+        .where(history_master_key == master_key) \
+        .where(history_master_key == _master_ids_param(master_ids)) \
+        .where(history_table.columns.valid_to.is_(None)) \
+        .where(or_(*[history_table.columns[name].is_distinct_from(
+            master_table.columns[name]) for name in compared_column_names])) \
+        .values(valid_to=snapshot_time) \
+        .returning(history_master_key)
+
+
+def _insert_snapshots_from_master_query(master_table: Table,
+                                        history_table: Table,
+                                        master_ids: List[int],
+                                        snapshot_time: datetime):
+    """Returns an INSERT ... SELECT that opens a new snapshot with the current
+    values of every master row in |master_ids|.
+    """
+    column_names = _shared_column_names(master_table, history_table)
+    master_key = master_table.columns[_master_key_column_name(master_table)]
+    valid_from = literal(snapshot_time,
+                         type_=history_table.columns.valid_from.type)
+    return history_table.insert().from_select(
+        column_names + ['valid_from'],
+        select([master_table.columns[name] for name in column_names] +
+               [valid_from])
+        .where(master_key == _master_ids_param(master_ids)))
+
+
+def _get_column_values(schema_object: DatabaseEntity) -> Dict[str, Any]:
+    """Returns a dictionary of the values of all columns of |schema_object|,
+    keyed by column name, omitting an unset primary key so that it is generated
+    by the database.
+    """
+    column_values = {}
+    for column_property in sqlalchemy_inspect(type(schema_object)).column_attrs:
+        value = getattr(schema_object, column_property.key)
+        column = one(column_property.columns)
+        if column.primary_key and value is None:
+            continue
+        column_values[column.name] = value
+    return column_values
+
+
 @attr.s
 class _SnapshotContext:
     """Container for all data required for snapshot operations for a single
@@ -539,6 +735,9 @@ class _SnapshotContext:
     """
     schema_object: DatabaseEntity = attr.ib(default=None)
     most_recent_snapshot: Optional[DatabaseEntity] = attr.ib(default=None)
+    # Whether the entity has an open snapshot. This is set without loading
+    # |most_recent_snapshot| when snapshots are written in bulk.
+    has_open_snapshot: bool = attr.ib(default=False)
     provided_start_time: Optional[datetime] = attr.ib(default=None)
     provided_end_time: Optional[datetime] = attr.ib(default=None)
 
@@ -604,5 +803,6 @@ class _SnapshotContextRegistry:
                 "{type} and primary key {primary_key}".format(
                     type=master_type_name, primary_key=master_entity_id))
 
-        self.snapshot_contexts[master_type_name][master_entity_id] \
-            .most_recent_snapshot = snapshot
+        context = self.snapshot_contexts[master_type_name][master_entity_id]
+        context.most_recent_snapshot = snapshot
+        context.has_open_snapshot = True
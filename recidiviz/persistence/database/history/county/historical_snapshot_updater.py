@@ -109,8 +109,8 @@ class CountyHistoricalSnapshotUpdater(
                 # (otherwise new entities added to an existing booking would be
                 # incorrectly backdated)
                 booking_start_date_for_descendants = None
-                if context_registry.snapshot_context(booking)\
-                        .most_recent_snapshot is None:
+                if not context_registry.snapshot_context(booking)\
+                        .has_open_snapshot:
                     booking_start_date_for_descendants = booking_start_date
 
                 self._execute_action_for_all_entities(
@@ -0,0 +1,63 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Instrumentation for counting the queries issued and rows returned through a Session."""
+from contextlib import contextmanager
+from typing import Iterator
+
+import attr
+from sqlalchemy import event
+
+from recidiviz.persistence.database.session import Session
+
+
+@attr.s
+class QueryStats:
+    """Counts of the database work done through a Session while QueryStats were being recorded."""
+
+    # Number of statements executed on the Session's connection
+    query_count: int = attr.ib(default=0)
+
+    # Number of rows returned by the database for the statements executed, as reported by the DBAPI cursor. Drivers
+    # that do not report a row count for SELECT statements (e.g. sqlite3) do not contribute to this count.
+    rows_loaded: int = attr.ib(default=0)
+
+
+@contextmanager
+def record_query_stats(session: Session) -> Iterator[QueryStats]:
+    """Records the number of queries issued and rows returned through the provided |session| for the duration of the
+    context, which must be entered within a single transaction on the |session|.
+
+    Example:
+        with record_query_stats(session) as stats:
+            dao.read_people(session)
+        logging.info('Issued [%d] queries', stats.query_count)
+    """
+    stats = QueryStats()
+    connection = session.connection()
+
+    def _after_cursor_execute(_connection, cursor, *_args, **_kwargs):
+        stats.query_count += 1
+        # Only statements that return rows have a cursor description. A negative row count means the driver does not
+        # know how many rows the statement returned.
+        if cursor.description is not None and cursor.rowcount > 0:
+            stats.rows_loaded += cursor.rowcount
+
+    event.listen(connection, 'after_cursor_execute', _after_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(connection, 'after_cursor_execute', _after_cursor_execute)
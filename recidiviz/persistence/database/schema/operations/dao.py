@@ -16,9 +16,9 @@
 # =============================================================================
 """Data Access Object (DAO) with logic for accessing operations DB information from a SQL Database."""
 import datetime
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Dict
 
-from more_itertools import one
+from more_itertools import one, chunked
 
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_utils import GcsfsDirectIngestFileType, \
     filename_parts_from_path
@@ -26,6 +26,9 @@ from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath
 from recidiviz.persistence.database.schema.operations import schema
 from recidiviz.persistence.database.session import Session
 
+# The maximum number of file names passed to a single IN (...) clause when reading metadata for many paths at once.
+_MAX_IN_CLAUSE_SIZE = 1000
+
 
 def get_file_metadata_row(
         session: Session,
@@ -75,6 +78,38 @@ def get_file_metadata_row_for_path(
     return one(results)
 
 
+def get_file_metadata_rows_for_paths(
+        session: Session,
+        region_code: str,
+        file_type: GcsfsDirectIngestFileType,
+        paths: List[GcsfsFilePath]
+) -> List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]]:
+    """Returns metadata rows for all of the provided paths, which must all be of the provided |file_type|, in no
+    particular order. Paths that have not yet been registered in the appropriate metadata table have no rows in the
+    result. File names are queried in batches of at most _MAX_IN_CLAUSE_SIZE.
+    """
+
+    if file_type == GcsfsDirectIngestFileType.INGEST_VIEW:
+        query = session.query(schema.DirectIngestIngestFileMetadata).filter_by(
+            region_code=region_code,
+            is_invalidated=False
+        )
+        file_name_column = schema.DirectIngestIngestFileMetadata.normalized_file_name
+    elif file_type == GcsfsDirectIngestFileType.RAW_DATA:
+        query = session.query(schema.DirectIngestRawFileMetadata).filter_by(
+            region_code=region_code
+        )
+        file_name_column = schema.DirectIngestRawFileMetadata.normalized_file_name
+    else:
+        raise ValueError(f'Unexpected path type: {file_type}')
+
+    results = []
+    for file_names_batch in chunked([path.file_name for path in paths], _MAX_IN_CLAUSE_SIZE):
+        results.extend(query.filter(file_name_column.in_(file_names_batch)).all())
+
+    return results
+
+
 def get_ingest_view_metadata_for_export_job(
         session: Session,
         region_code: str,
@@ -149,3 +184,22 @@ def get_metadata_for_raw_files_discovered_after_datetime(
         query = query.filter(schema.DirectIngestRawFileMetadata.discovery_time > discovery_time_lower_bound_exclusive)
 
     return query.all()
+
+
+def get_export_watermarks(session: Session, schema_type_value: str) -> Dict[str, datetime.datetime]:
+    """Returns the Cloud SQL to BigQuery export watermark of every table in the schema with the provided SchemaType
+    value that has one, keyed by table name."""
+    results = session.query(schema.CloudSqlToBQExportWatermark).filter_by(schema_type=schema_type_value).all()
+    return {result.table_name: result.watermark_time for result in results}
+
+
+def update_export_watermark(
+        session: Session,
+        schema_type_value: str,
+        table_name: str,
+        watermark_time: datetime.datetime
+) -> None:
+    """Sets the Cloud SQL to BigQuery export watermark of the provided table, creating it if it does not exist."""
+    session.merge(schema.CloudSqlToBQExportWatermark(schema_type=schema_type_value,
+                                                     table_name=table_name,
+                                                     watermark_time=watermark_time))
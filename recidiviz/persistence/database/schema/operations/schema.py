@@ -91,3 +91,16 @@ class DirectIngestIngestFileMetadata(OperationsBase, _DirectIngestFileMetadataRo
 
     # Time of the actual view export (when the file is done writing to GCS), set at same time as normalized_file_name
     export_time = Column(DateTime)
+
+
+class CloudSqlToBQExportWatermark(OperationsBase):
+    """Records, for each table exported from Cloud SQL to BigQuery, the time from which the next incremental export of
+    that table must read changes."""
+    __tablename__ = 'cloud_sql_to_bq_export_watermark'
+
+    # The SchemaType value of the schema the table lives in.
+    schema_type = Column(String(255), primary_key=True)
+    table_name = Column(String(255), primary_key=True)
+
+    # All changes to the table that were written at or after this time may not yet be reflected in BigQuery.
+    watermark_time = Column(DateTime, nullable=False)
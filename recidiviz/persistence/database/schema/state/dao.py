@@ -19,7 +19,9 @@
 from a SQL Database."""
 from collections import defaultdict
 import logging
-from typing import Dict, List, Type, Iterable
+from typing import Dict, List, Type, Iterable, Set, Optional
+
+from more_itertools import chunked
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -27,8 +29,13 @@ from sqlalchemy.orm import Session
 from recidiviz.persistence.database.base_schema import StateBase
 from recidiviz.persistence.entity.state import entities
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
 from recidiviz.persistence.errors import PersistenceError
 
+# The maximum number of values passed to a single IN (...) clause when reading
+# people by external id.
+_MAX_IN_CLAUSE_SIZE = 1000
+
 
 def check_not_dirty(session: Session):
     if session.dirty:
@@ -36,40 +43,78 @@ def check_not_dirty(session: Session):
             "Session unexpectedly dirty - flush before querying the database.")
 
 
-def read_people_by_cls_external_ids(
+def read_person_ids_by_cls_external_ids(
         session: Session,
         state_code: str,
         schema_cls: Type[StateBase],
-        cls_external_ids: Iterable[str]) -> List[schema.StatePerson]:
-    """Reads all people in the given |state_code| who have an entity of type
-    |schema_cls| with an external id in |cls_external_ids| somewhere in their
-    entity tree.
+        cls_external_ids: Iterable[str]
+) -> Dict[str, Set[int]]:
+    """Returns the ids of all people in the given |state_code| who have an
+    entity of type |schema_cls| with an external id in |cls_external_ids|
+    somewhere in their entity tree, keyed by that external id. Only ids are
+    read, not the person trees. Ids are queried in batches of at most
+    _MAX_IN_CLAUSE_SIZE.
     """
     check_not_dirty(session)
 
     if schema_cls == schema.StatePerson:
         schema_cls = schema.StatePersonExternalId
 
+    person_ids_by_external_id: Dict[str, Set[int]] = defaultdict(set)
+    for external_ids_batch in chunked(cls_external_ids, _MAX_IN_CLAUSE_SIZE):
+        results = session.query(schema_cls.external_id, schema_cls.person_id) \
+            .filter(schema_cls.external_id.in_(external_ids_batch)) \
+            .filter(schema_cls.state_code == state_code.upper()).all()
+        for external_id, person_id in results:
+            person_ids_by_external_id[external_id].add(person_id)
+    return person_ids_by_external_id
+
+
+def read_people_by_cls_external_ids(
+        session: Session,
+        state_code: str,
+        schema_cls: Type[StateBase],
+        cls_external_ids: Iterable[str],
+        loading_profile: Optional[StatePersonLoadingProfile] = None
+) -> List[schema.StatePerson]:
+    """Reads all people in the given |state_code| who have an entity of type
+    |schema_cls| with an external id in |cls_external_ids| somewhere in their
+    entity tree. Ids are queried in batches of at most _MAX_IN_CLAUSE_SIZE.
+
+    If a |loading_profile| is provided, person tree relationships are loaded
+    according to that profile instead of the schema defaults.
+    """
+    check_not_dirty(session)
+
     logging.info("[DAO] Starting read of external ids of class [%s]",
                  schema_cls.__name__)
-    person_ids_result = session.query(schema_cls.person_id) \
-        .filter(schema_cls.external_id.in_(cls_external_ids)) \
-        .filter(schema_cls.state_code == state_code.upper()).all()
-    person_ids = [res[0] for res in person_ids_result]
+    person_ids: Set[int] = set()
+    for external_id_person_ids in read_person_ids_by_cls_external_ids(
+            session, state_code, schema_cls, cls_external_ids).values():
+        person_ids.update(external_id_person_ids)
     logging.info("[DAO] Finished read of external ids of class [%s]. "
                  "Found [%s] person ids.",
                  schema_cls.__name__,
                  len(person_ids))
 
-    query = session.query(schema.StatePerson) \
-        .filter(schema.StatePerson.person_id.in_(person_ids))
-    schema_persons = query.all()
+    schema_persons: List[schema.StatePerson] = []
+    for person_ids_batch in chunked(sorted(person_ids), _MAX_IN_CLAUSE_SIZE):
+        query = session.query(schema.StatePerson) \
+            .filter(schema.StatePerson.person_id.in_(person_ids_batch))
+        if loading_profile:
+            query = query.options(*loading_profile.loader_options())
+        schema_persons.extend(query.all())
     logging.info("[DAO] Finished read of [%s] persons.", len(schema_persons))
     return _normalize_record_trees(schema_persons)
 
 
-def read_placeholder_persons(session: Session) -> List[schema.StatePerson]:
-    """Reads all placeholder people from the DB."""
+def read_placeholder_persons(
+        session: Session,
+        loading_profile: Optional[StatePersonLoadingProfile] = None
+) -> List[schema.StatePerson]:
+    """Reads all placeholder people from the DB. If a |loading_profile| is
+    provided, person tree relationships are loaded according to that profile
+    instead of the schema defaults."""
     check_not_dirty(session)
 
     logging.info("[DAO] Starting read of placeholder person ids")
@@ -81,6 +126,8 @@ def read_placeholder_persons(session: Session) -> List[schema.StatePerson]:
                  "Found [%s] person ids.", len(person_ids))
     query = session.query(schema.StatePerson) \
         .filter(schema.StatePerson.person_id.in_(person_ids))
+    if loading_profile:
+        query = query.options(*loading_profile.loader_options())
     schema_persons = query.all()
     logging.info("[DAO] Finished read of [%s] persons.", len(schema_persons))
     return _normalize_record_trees(schema_persons)
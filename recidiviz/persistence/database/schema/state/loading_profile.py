@@ -0,0 +1,118 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Loading profiles that control how the relationships of a StatePerson tree are eagerly loaded when StatePersons are
+read from the DB."""
+from enum import Enum
+from functools import lru_cache
+from typing import FrozenSet, Type, List, Dict, Optional, Iterable
+
+import attr
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload, subqueryload, lazyload
+from sqlalchemy.orm.interfaces import MapperOption
+from sqlalchemy.orm.relationships import RelationshipProperty
+from sqlalchemy.orm.strategy_options import Load
+
+from recidiviz.persistence.database.base_schema import StateBase
+from recidiviz.persistence.database.database_entity import DatabaseEntity
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.entity.entity_utils import SchemaEdgeDirectionChecker
+
+
+class RelationshipLoadingStrategy(Enum):
+    """SQLAlchemy eager loading strategies that can be used to load StatePerson tree relationships."""
+
+    # One additional SELECT ... WHERE <parent id> IN (...) query per relationship, issued in chunks of parent ids.
+    SELECTIN = 'selectin'
+
+    # One additional query per relationship that joins against a subquery which re-runs the original parent query.
+    SUBQUERY = 'subquery'
+
+
+@attr.s(frozen=True)
+class StatePersonLoadingProfile:
+    """Describes how the relationships on every path from StatePerson to any of the |ingested_classes| are loaded when
+    a StatePerson is read. Relationships that do not lead to any of the |ingested_classes| are not loaded with the
+    query and are instead lazily loaded if they are accessed later.
+    """
+
+    # Schema classes of the non-placeholder entities in the ingested StatePerson trees
+    ingested_classes: FrozenSet[Type[DatabaseEntity]] = attr.ib(converter=frozenset)
+
+    # Strategy used to load relationships on paths to the |ingested_classes|
+    strategy: RelationshipLoadingStrategy = attr.ib(default=RelationshipLoadingStrategy.SELECTIN)
+
+    def loader_options(self) -> List[MapperOption]:
+        """Returns the query options that apply this profile to a query for schema.StatePerson."""
+        return _loader_options(self.ingested_classes, self.strategy)
+
+
+def get_state_person_loading_profile(
+        ingested_classes: Iterable[Type[DatabaseEntity]],
+        strategy_name: Optional[str]) -> Optional[StatePersonLoadingProfile]:
+    """Returns the loading profile for reading the DB people that may match people with entities of the provided
+    |ingested_classes|, or None if no |strategy_name| is configured and schema defaults should be used."""
+    if not strategy_name:
+        return None
+    return StatePersonLoadingProfile(ingested_classes=ingested_classes,
+                                     strategy=RelationshipLoadingStrategy(strategy_name))
+
+
+def _forward_relationships(cls: Type[StateBase]) -> List[RelationshipProperty]:
+    direction_checker = SchemaEdgeDirectionChecker.state_direction_checker()
+    return [relationship for relationship in inspect(cls).relationships
+            if not direction_checker.is_back_edge_for_class(cls, relationship.key)]
+
+
+@lru_cache(maxsize=None)
+def _loader_options(ingested_classes: FrozenSet[Type[DatabaseEntity]],
+                    strategy: RelationshipLoadingStrategy) -> List[MapperOption]:
+    """Builds one loader option per path from StatePerson along forward edges that leads to any of the
+    |ingested_classes|, plus a wildcard lazyload option on StatePerson and on each class along those paths so that
+    every other relationship is deferred instead of loaded with its schema loading strategy. Options are cached, as the
+    set of ingested classes is the same for every read in a given run.
+    """
+    leads_to_ingested_cls: Dict[Type[StateBase], bool] = {}
+
+    def _leads_to_ingested_cls(cls: Type[StateBase]) -> bool:
+        if cls not in leads_to_ingested_cls:
+            leads_to_ingested_cls[cls] = cls in ingested_classes or any(
+                _leads_to_ingested_cls(relationship.mapper.class_) for relationship in _forward_relationships(cls))
+        return leads_to_ingested_cls[cls]
+
+    options: List[MapperOption] = []
+
+    def _add_options(cls: Type[StateBase], parent_option: Optional[Load]):
+        # Specific relationship options take precedence over the wildcard, whatever order they are applied in
+        options.append(parent_option.lazyload('*') if parent_option else lazyload('*'))
+        for relationship in _forward_relationships(cls):
+            child_cls = relationship.mapper.class_
+            if not _leads_to_ingested_cls(child_cls):
+                continue
+
+            relationship_attribute = relationship.class_attribute
+            if strategy is RelationshipLoadingStrategy.SUBQUERY:
+                option = parent_option.subqueryload(relationship_attribute) if parent_option \
+                    else subqueryload(relationship_attribute)
+            else:
+                option = parent_option.selectinload(relationship_attribute) if parent_option \
+                    else selectinload(relationship_attribute)
+            options.append(option)
+            _add_options(child_cls, option)
+
+    _add_options(schema.StatePerson, None)
+    return options
@@ -22,12 +22,13 @@ import logging
 from collections import defaultdict
 from enum import Enum, auto
 from types import ModuleType
-from typing import Dict, List, Set, Type, Sequence, Optional, Union, cast, Iterable
+from typing import Dict, List, Set, Type, Sequence, Optional, Union, cast, Iterable, FrozenSet, Tuple
 from functools import lru_cache
 
 import attr
+from sqlalchemy.orm.attributes import instance_state
 
-from recidiviz.common.attr_utils import get_non_flat_property_class_name
+from recidiviz.common.attr_utils import get_non_flat_attribute_class_name, is_forward_ref, is_list
 from recidiviz.common.constants.state.state_agent import StateAgentType
 from recidiviz.common.constants.state.state_court_case import StateCourtType
 from recidiviz.common.constants.state.state_incarceration import \
@@ -93,11 +94,18 @@ class SchemaEdgeDirectionChecker:
         self._class_hierarchy_map: Dict[str, int] = \
             _build_class_hierarchy_map(class_hierarchy, module)
 
+        # Cache of back edge decisions, keyed by (from_class, to_field_name).
+        # Whether an edge is a back edge only depends on the class of the
+        # origin object, so this is computed at most once per class and field.
+        self._back_edges_by_class_and_field: Dict[Tuple[type, str], bool] = {}
+
     @classmethod
+    @lru_cache(maxsize=None)
     def state_direction_checker(cls):
         return cls(_STATE_CLASS_HIERARCHY, state_entities)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def county_direction_checker(cls):
         return cls(_COUNTY_CLASS_HIERARCHY, county_entities)
 
@@ -117,16 +125,30 @@ class SchemaEdgeDirectionChecker:
                 to_field_name is a back edge, i.e. it travels in a direction
                 opposite to the class hierarchy.
         """
-        from_class_name = from_obj.__class__.__name__
+        return self.is_back_edge_for_class(from_obj.__class__, to_field_name)
+
+    def is_back_edge_for_class(self, from_cls: type, to_field_name: str) -> bool:
+        """Same as is_back_edge, but for an edge originating from any object
+        of class |from_cls|. Decisions are cached per class and field name.
+        """
+        key = (from_cls, to_field_name)
+        if key not in self._back_edges_by_class_and_field:
+            self._back_edges_by_class_and_field[key] = \
+                self._is_back_edge_for_class(from_cls, to_field_name)
+        return self._back_edges_by_class_and_field[key]
 
-        if isinstance(from_obj, DatabaseEntity):
+    def _is_back_edge_for_class(self, from_cls: type, to_field_name: str) -> bool:
+        from_class_name = from_cls.__name__
+
+        if issubclass(from_cls, DatabaseEntity):
             to_class_name = \
-                from_obj.get_relationship_property_class_name(to_field_name)
-        elif isinstance(from_obj, Entity):
-            to_class_name = get_non_flat_property_class_name(from_obj,
-                                                             to_field_name)
+                from_cls.get_relationship_property_class_name(to_field_name)
+        elif issubclass(from_cls, Entity):
+            attribute = attr.fields_dict(from_cls).get(to_field_name)
+            to_class_name = get_non_flat_attribute_class_name(attribute) \
+                if attribute else None
         else:
-            raise ValueError(f'Unexpected type [{type(from_obj)}]')
+            raise ValueError(f'Unexpected type [{from_cls}]')
 
         if to_class_name is None:
             return False
@@ -276,72 +298,162 @@ def get_all_core_entity_field_names(
     """Returns a set of field_names that correspond to any set fields on the
     provided |entity| that match the provided |entity_field_type|.
     """
-    if entity.get_entity_name().startswith('state_'):
-        direction_checker = SchemaEdgeDirectionChecker.state_direction_checker()
-    else:
-        direction_checker = \
-            SchemaEdgeDirectionChecker.county_direction_checker()
-
     if isinstance(entity, DatabaseEntity):
         return _get_all_database_entity_field_names(entity,
-                                                    entity_field_type,
-                                                    direction_checker)
+                                                    entity_field_type)
     if isinstance(entity, Entity):
         return _get_all_entity_field_names(entity,
-                                           entity_field_type,
-                                           direction_checker)
+                                           entity_field_type)
 
     raise ValueError(f"Invalid entity type [{type(entity)}]")
 
 
-def _get_all_database_entity_field_names(entity: DatabaseEntity,
-                                         entity_field_type: EntityFieldType,
-                                         direction_checker):
-    """Returns a set of field_names that correspond to any set fields on the
-    provided DatabaseEntity |entity| that match the provided
-    |entity_field_type|.
+@attr.s(frozen=True)
+class EntityFieldClassification:
+    """The classification of all fields on a single CoreEntity class.
+
+    The classification only depends on the class (and its schema), so it is
+    computed once per class by get_entity_field_classification and shared by
+    all entity tree traversal helpers.
     """
+
+    # All field names on the class, in attribute definition order
+    field_names: Tuple[str, ...] = attr.ib()
+
+    flat_fields: FrozenSet[str] = attr.ib()
+    foreign_keys: FrozenSet[str] = attr.ib()
+
+    # Fields which may reference another entity. For Entity classes, whether
+    # a given field is an edge can only be fully determined from its value.
+    forward_edges: FrozenSet[str] = attr.ib()
+    back_edges: FrozenSet[str] = attr.ib()
+
+    # Flat fields which are never considered when determining whether an
+    # entity is a placeholder.
+    placeholder_ignored_fields: FrozenSet[str] = attr.ib()
+
+    # Enum fields which are not considered when determining whether an entity
+    # is a placeholder if they hold their default value, mapped to that
+    # default value. A value of None means the field is a status field, whose
+    # default is checked with has_default_status().
+    default_enum_fields: Dict[str, Optional[Enum]] = attr.ib()
+
+    def field_names_of_type(
+            self, entity_field_type: EntityFieldType) -> FrozenSet[str]:
+        if entity_field_type is EntityFieldType.FLAT_FIELD:
+            return self.flat_fields
+        if entity_field_type is EntityFieldType.FOREIGN_KEYS:
+            return self.foreign_keys
+        if entity_field_type is EntityFieldType.FORWARD_EDGE:
+            return self.forward_edges
+        if entity_field_type is EntityFieldType.BACK_EDGE:
+            return self.back_edges
+        if entity_field_type is EntityFieldType.ALL:
+            return self.flat_fields | self.foreign_keys | \
+                self.forward_edges | self.back_edges
+        raise ValueError(
+            f"Unrecognized EntityFieldType [{entity_field_type}]")
+
+
+_DEFAULT_ENUM_FIELD_VALUES: Dict[str, Optional[Enum]] = {
+    'status': None,
+    'incarceration_type': StateIncarcerationType.STATE_PRISON,
+    'court_type': StateCourtType.PRESENT_WITHOUT_INFO,
+    'agent_type': StateAgentType.PRESENT_WITHOUT_INFO,
+}
+
+
+def _direction_checker_for_class(
+        entity_cls: Type[CoreEntity]) -> SchemaEdgeDirectionChecker:
+    if entity_cls.get_entity_name().startswith('state_'):
+        return SchemaEdgeDirectionChecker.state_direction_checker()
+    return SchemaEdgeDirectionChecker.county_direction_checker()
+
+
+@lru_cache(maxsize=None)
+def get_entity_field_classification(
+        entity_cls: Type[CoreEntity]) -> EntityFieldClassification:
+    """Returns the EntityFieldClassification for the provided CoreEntity
+    class, computing it on first access.
+    """
+    direction_checker = _direction_checker_for_class(entity_cls)
+
     back_edges = set()
     forward_edges = set()
     flat_fields = set()
-    foreign_keys = set()
-
-    for relationship_field_name in entity.get_relationship_property_names():
-        if direction_checker.is_back_edge(entity, relationship_field_name):
-            back_edges.add(relationship_field_name)
-        else:
-            forward_edges.add(relationship_field_name)
-
-    for foreign_key_name in entity.get_foreign_key_names():
-        foreign_keys.add(foreign_key_name)
+    foreign_keys: Set[str] = set()
+
+    if issubclass(entity_cls, DatabaseEntity):
+        for relationship_field_name in \
+                entity_cls.get_relationship_property_names():
+            if direction_checker.is_back_edge_for_class(
+                    entity_cls, relationship_field_name):
+                back_edges.add(relationship_field_name)
+            else:
+                forward_edges.add(relationship_field_name)
+
+        foreign_keys.update(entity_cls.get_foreign_key_names())
+
+        for column_field_name in entity_cls.get_column_property_names():
+            if column_field_name not in foreign_keys:
+                flat_fields.add(column_field_name)
+
+        field_names = tuple(sorted(
+            flat_fields | foreign_keys | forward_edges | back_edges))
+    elif issubclass(entity_cls, Entity):
+        fields_dict = attr.fields_dict(entity_cls)
+        field_names = tuple(fields_dict.keys())
+        for field_name, attribute in fields_dict.items():
+            if not is_list(attribute) and not is_forward_ref(attribute):
+                flat_fields.add(field_name)
+            elif direction_checker.is_back_edge_for_class(entity_cls,
+                                                          field_name):
+                back_edges.add(field_name)
+            else:
+                forward_edges.add(field_name)
+    else:
+        raise ValueError(f"Invalid entity class [{entity_cls}]")
+
+    placeholder_ignored_fields = \
+        {entity_cls.get_primary_key_column_name(), 'state_code'} & \
+        flat_fields
+    default_enum_fields = {
+        field_name: default_value
+        for field_name, default_value in _DEFAULT_ENUM_FIELD_VALUES.items()
+        if field_name in flat_fields
+    }
+
+    return EntityFieldClassification(
+        field_names=field_names,
+        flat_fields=frozenset(flat_fields),
+        foreign_keys=frozenset(foreign_keys),
+        forward_edges=frozenset(forward_edges),
+        back_edges=frozenset(back_edges),
+        placeholder_ignored_fields=frozenset(placeholder_ignored_fields),
+        default_enum_fields=default_enum_fields)
 
-    for column_field_name in entity.get_column_property_names():
-        if column_field_name not in foreign_keys:
-            flat_fields.add(column_field_name)
 
-    if entity_field_type is EntityFieldType.FLAT_FIELD:
-        return flat_fields
-    if entity_field_type is EntityFieldType.FOREIGN_KEYS:
-        return foreign_keys
-    if entity_field_type is EntityFieldType.FORWARD_EDGE:
-        return forward_edges
-    if entity_field_type is EntityFieldType.BACK_EDGE:
-        return back_edges
-    if entity_field_type is EntityFieldType.ALL:
-        return flat_fields | foreign_keys | forward_edges | back_edges
-    raise ValueError(f"Unrecognized EntityFieldType [{entity_field_type}] on entity [{entity}]")
+def _get_all_database_entity_field_names(entity: DatabaseEntity,
+                                         entity_field_type: EntityFieldType):
+    """Returns a set of field_names that correspond to any set fields on the
+    provided DatabaseEntity |entity| that match the provided
+    |entity_field_type|.
+    """
+    classification = get_entity_field_classification(entity.__class__)
+    return set(classification.field_names_of_type(entity_field_type))
 
 
 def _get_all_entity_field_names(entity: Entity,
-                                entity_field_type: EntityFieldType,
-                                direction_checker):
+                                entity_field_type: EntityFieldType):
     """Returns a set of field_names that correspond to any set fields on the
     provided Entity |entity| that match the provided |entity_field_type|.
     """
+    classification = get_entity_field_classification(entity.__class__)
+
     back_edges = set()
     forward_edges = set()
     flat_fields = set()
-    for field, _ in attr.fields_dict(entity.__class__).items():
+    for field in classification.field_names:
         v = getattr(entity, field)
 
         if v is None:
@@ -350,8 +462,7 @@ def _get_all_entity_field_names(entity: Entity,
         # TODO(1908): Update traversal logic if relationship fields can be
         # different types aside from Entity and List
         if issubclass(type(v), Entity):
-            is_back_edge = direction_checker.is_back_edge(entity, field)
-            if is_back_edge:
+            if field in classification.back_edges:
                 back_edges.add(field)
             else:
                 forward_edges.add(field)
@@ -359,8 +470,7 @@ def _get_all_entity_field_names(entity: Entity,
             # Disregard empty lists
             if not v:
                 continue
-            is_back_edge = direction_checker.is_back_edge(entity, field)
-            if is_back_edge:
+            if field in classification.back_edges:
                 back_edges.add(field)
             else:
                 forward_edges.add(field)
@@ -426,33 +536,22 @@ def is_placeholder(entity: CoreEntity) -> bool:
     set_flat_fields = get_set_entity_field_names(
         entity, EntityFieldType.FLAT_FIELD)
 
-    primary_key_name = entity.get_primary_key_column_name()
-    if primary_key_name in set_flat_fields:
-        set_flat_fields.remove(primary_key_name)
+    classification = get_entity_field_classification(entity.__class__)
 
     # TODO(2244): Change this to a general approach so we don't need to check
     # explicit columns
-    if 'state_code' in set_flat_fields:
-        set_flat_fields.remove('state_code')
-
-    if 'status' in set_flat_fields:
-        if entity.has_default_status():
-            set_flat_fields.remove('status')
-
-    if 'incarceration_type' in set_flat_fields:
-        if entity.has_default_enum(
-                'incarceration_type', StateIncarcerationType.STATE_PRISON):
-            set_flat_fields.remove('incarceration_type')
+    set_flat_fields -= classification.placeholder_ignored_fields
 
-    if 'court_type' in set_flat_fields:
-        if entity.has_default_enum('court_type',
-                                   StateCourtType.PRESENT_WITHOUT_INFO):
-            set_flat_fields.remove('court_type')
+    for field_name, default_value in \
+            classification.default_enum_fields.items():
+        if field_name not in set_flat_fields:
+            continue
 
-    if 'agent_type' in set_flat_fields:
-        if entity.has_default_enum('agent_type',
-                                   StateAgentType.PRESENT_WITHOUT_INFO):
-            set_flat_fields.remove('agent_type')
+        if default_value is None:
+            if entity.has_default_status():
+                set_flat_fields.remove(field_name)
+        elif entity.has_default_enum(field_name, default_value):
+            set_flat_fields.remove(field_name)
 
     return not bool(set_flat_fields)
 
@@ -600,6 +699,14 @@ def get_all_db_objs_from_trees(db_objs: Sequence[DatabaseEntity], result=None):
 
 def get_all_db_objs_from_tree(db_obj: DatabaseEntity,
                               result=None) -> Set[DatabaseEntity]:
+    """Returns all objects in the tree below |db_obj|, including |db_obj|
+    itself.
+
+    Relationships that have not been loaded, e.g. ones left unloaded by a
+    StatePersonLoadingProfile, are not followed. Nothing in them can have been
+    added or changed without loading them, and following them would issue a
+    lazy load query for every object in the tree.
+    """
     if result is None:
         result = set()
 
@@ -608,9 +715,12 @@ def get_all_db_objs_from_tree(db_obj: DatabaseEntity,
 
     result.add(db_obj)
 
-    set_fields = get_set_entity_field_names(
+    unloaded_fields = instance_state(db_obj).unloaded
+    fields = get_all_core_entity_field_names(
         db_obj, EntityFieldType.FORWARD_EDGE)
-    for field in set_fields:
+    for field in fields:
+        if field in unloaded_fields:
+            continue
         child = db_obj.get_field_as_list(field)
         get_all_db_objs_from_trees(child, result)
 
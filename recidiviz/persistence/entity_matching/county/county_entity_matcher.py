@@ -39,7 +39,7 @@ from recidiviz.persistence.entity_matching.county import county_matching_utils
 from recidiviz.persistence.entity_matching.county.county_matching_utils import \
     is_booking_match, is_hold_match, is_charge_match_with_children, \
     is_charge_match, get_best_match, get_next_available_match, \
-    generate_id_from_obj
+    generate_id_from_obj, PersonBlockingIndex
 from recidiviz.persistence.entity_matching.entity_matching_types import \
     MatchedEntities
 from recidiviz.persistence.entity_matching.entity_matching_utils import \
@@ -95,13 +95,14 @@ def match_people_and_return_error_count(
     orphaned_entities = []
     error_count = 0
     matched_people_by_db_id: Dict[int, entities.Person] = {}
+    db_people_index = PersonBlockingIndex(db_people)
 
     for ingested_person in ingested_people:
         try:
             ingested_person_orphans: List[Entity] = []
             match_person(
                 ingested_person=ingested_person,
-                db_people=db_people,
+                db_people=db_people_index.candidates(ingested_person),
                 orphaned_entities=ingested_person_orphans,
                 matched_people_by_db_id=matched_people_by_db_id)
 
@@ -17,10 +17,11 @@
 """Contains utils for match database entities with ingested entities."""
 import datetime
 import logging
+from collections import defaultdict
 from typing import Optional, Sequence, Callable, Iterable, Set, Dict, Any, \
-    cast, List
+    cast, List, Tuple
 
-import deepdiff
+import attr
 from more_itertools import pairwise
 
 from recidiviz.common.constants.county.booking import CustodyStatus
@@ -210,20 +211,141 @@ def is_sentence_match(
     return is_match(db_entity, ingested_entity, _SENTENCE_MATCH_FIELDS)
 
 
+class PersonBlockingIndex:
+    """Index over database people that returns, for a given ingested person,
+    only the database people that could possibly satisfy is_person_match.
+
+    People are blocked by external_id, or, for people without an external_id,
+    by full_name and birthdate. People with inferred birthdates are bucketed by
+    birth year so that the +/- 1 year window used by is_birthdate_match only
+    needs to look at three buckets. Candidates are always returned in the
+    order they appear in |db_people|, so matching against the candidates
+    produces the same results as matching against all |db_people|.
+    """
+
+    def __init__(self, db_people: Sequence[entities.Person]):
+        self._by_external_id: Dict[str, List[Tuple[int, entities.Person]]] = \
+            defaultdict(list)
+        self._by_name_and_birthdate: \
+            Dict[Tuple[str, bool, Any], List[Tuple[int, entities.Person]]] = \
+            defaultdict(list)
+
+        for position, db_person in enumerate(db_people):
+            if db_person.external_id:
+                self._by_external_id[db_person.external_id].append(
+                    (position, db_person))
+                continue
+
+            key = _name_and_birthdate_key(db_person)
+            if key:
+                self._by_name_and_birthdate[key].append((position, db_person))
+
+    def candidates(self, ingested_person: entities.Person) \
+            -> List[entities.Person]:
+        """Returns all indexed people that may match the |ingested_person|."""
+        if ingested_person.external_id:
+            return [db_person for _, db_person in
+                    self._by_external_id.get(ingested_person.external_id, [])]
+
+        key = _name_and_birthdate_key(ingested_person)
+        if not key:
+            return []
+
+        full_name, birthdate_inferred, birthdate_key = key
+        if not birthdate_inferred:
+            return [db_person for _, db_person in
+                    self._by_name_and_birthdate.get(key, [])]
+
+        matches: List[Tuple[int, entities.Person]] = []
+        for year in (birthdate_key - 1, birthdate_key, birthdate_key + 1):
+            matches.extend(self._by_name_and_birthdate.get(
+                (full_name, True, year), []))
+        return [db_person for _, db_person in sorted(matches,
+                                                     key=lambda m: m[0])]
+
+
+def _name_and_birthdate_key(person: entities.Person) \
+        -> Optional[Tuple[str, bool, Any]]:
+    """Returns the PersonBlockingIndex key for a person without an
+    external_id, or None if the person cannot be matched by name."""
+    if not person.full_name:
+        return None
+
+    if person.birthdate_inferred_from_age:
+        if not person.birthdate:
+            return None
+        return person.full_name, True, person.birthdate.year
+
+    return person.full_name, False, person.birthdate
+
+
 def diff_count(entity_a: Entity, entity_b: Entity) -> int:
     """Counts the number of differences between two entities, including
-    their descendants."""
-    ddiff = deepdiff.DeepDiff(entity_a, entity_b,
-                              ignore_order=True, report_repetition=True)
-    diff_types = ('values_changed', 'type_changes', 'iterable_item_added',
-                  'iterable_item_removed', 'repetition_change')
-    if not any(diff_type in ddiff for diff_type in diff_types):
-        logging.warning("DeepDiff did not return any of the expected diff "
-                        "report fields. Maybe the API changed?\nDiff output:%s",
-                        ddiff)
-
-    return sum(len(diffs) for diff_type, diffs in ddiff.items()
-               if diff_type in diff_types)
+    their descendants.
+
+    Each differing flat field counts as one difference. Child entities with
+    the same id are compared field by field, and any other child that does
+    not have an equal counterpart counts as one added or removed item.
+    """
+    return _diff_count(entity_a, entity_b, set())
+
+
+def _diff_count(entity_a: Entity, entity_b: Entity,
+                visited: Set[Tuple[int, int]]) -> int:
+    if type(entity_a) is not type(entity_b):
+        return 1
+
+    # Entity graphs may have cycles, e.g. through Sentence.related_sentences
+    if (id(entity_a), id(entity_b)) in visited:
+        return 0
+    visited.add((id(entity_a), id(entity_b)))
+
+    count = 0
+    for field in attr.fields_dict(entity_a.__class__):
+        value_a = getattr(entity_a, field)
+        value_b = getattr(entity_b, field)
+        if isinstance(value_a, list) or isinstance(value_b, list):
+            count += _list_diff_count(value_a or [], value_b or [], visited)
+        elif isinstance(value_a, Entity) and isinstance(value_b, Entity):
+            count += _diff_count(value_a, value_b, visited)
+        elif value_a != value_b:
+            count += 1
+    return count
+
+
+def _list_diff_count(list_a: List[Any], list_b: List[Any],
+                     visited: Set[Tuple[int, int]]) -> int:
+    """Counts the number of differences between two lists, ignoring order."""
+    unmatched_b = list(list_b)
+    unmatched_a = []
+    count = 0
+
+    for item_a in list_a:
+        item_id = item_a.get_id() if isinstance(item_a, Entity) else None
+        same_id_index = None
+        if item_id is not None:
+            same_id_index = next(
+                (i for i, item_b in enumerate(unmatched_b)
+                 if type(item_b) is type(item_a)
+                 and item_b.get_id() == item_id),
+                None)
+
+        if same_id_index is None:
+            unmatched_a.append(item_a)
+        else:
+            count += _diff_count(item_a, unmatched_b.pop(same_id_index),
+                                 visited)
+
+    for item_a in unmatched_a:
+        equal_index = next(
+            (i for i, item_b in enumerate(unmatched_b) if item_a == item_b),
+            None)
+        if equal_index is None:
+            count += 1
+        else:
+            del unmatched_b[equal_index]
+
+    return count + len(unmatched_b)
 
 
 def get_best_match(
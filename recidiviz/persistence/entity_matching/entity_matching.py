@@ -32,6 +32,8 @@ from recidiviz.persistence.entity_matching.county.county_entity_matcher import \
     CountyEntityMatcher
 from recidiviz.persistence.entity_matching.state.state_entity_matcher import \
     StateEntityMatcher
+from recidiviz.persistence.entity_matching.state.matched_person_tree_cache \
+    import MatchedPersonTreeCache
 from recidiviz.persistence.entity_matching.state.\
     state_matching_delegate_factory import StateMatchingDelegateFactory
 from recidiviz.utils import monitoring
@@ -57,8 +59,12 @@ _EMPTY_MATCH_OUTPUT = MatchedEntities(people=[],
 
 def match(session: Session,
           region: str,
-          ingested_people: List[EntityPersonType]) -> MatchedEntities:
-    matcher = _get_matcher(ingested_people, region)
+          ingested_people: List[EntityPersonType],
+          loading_strategy: Optional[str] = None,
+          person_tree_cache: Optional[MatchedPersonTreeCache] = None) \
+        -> MatchedEntities:
+    matcher = _get_matcher(ingested_people, region, loading_strategy,
+                           person_tree_cache)
     if not matcher:
         return _EMPTY_MATCH_OUTPUT
 
@@ -66,7 +72,9 @@ def match(session: Session,
 
 
 def _get_matcher(ingested_people: List[EntityPersonType],
-                 region_code: str) \
+                 region_code: str,
+                 loading_strategy: Optional[str],
+                 person_tree_cache: Optional[MatchedPersonTreeCache]) \
         -> Optional[BaseEntityMatcher]:
     sample = next(iter(ingested_people), None)
     if not sample:
@@ -78,7 +86,9 @@ def _get_matcher(ingested_people: List[EntityPersonType],
     if isinstance(sample, state_entities.StatePerson):
         state_matching_delegate = \
             StateMatchingDelegateFactory.build(region_code=region_code)
-        return StateEntityMatcher(state_matching_delegate)
+        return StateEntityMatcher(state_matching_delegate,
+                                  loading_strategy=loading_strategy,
+                                  person_tree_cache=person_tree_cache)
 
     raise ValueError('Invalid person type of [{}]'
                      .format(sample.__class__.__name__))
@@ -20,6 +20,7 @@ from typing import List, Optional, Type, Callable
 
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
 from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
 from recidiviz.persistence.entity_matching.state.state_matching_utils import default_merge_flat_fields
@@ -43,9 +44,10 @@ class BaseStateMatchingDelegate:
 
     @abc.abstractmethod
     def read_potential_match_db_persons(
-            self, session: Session, ingested_persons: List[schema.StatePerson]) -> List[schema.StatePerson]:
+            self, session: Session, ingested_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile] = None) -> List[schema.StatePerson]:
         """Reads and returns all persons from the DB that are needed for entity matching in this state, given the
-        |ingested_persons|.
+        |ingested_persons|. If |loading_profile| is provided, the person trees are loaded according to that profile.
         """
 
     def merge_flat_fields(self, from_entity: DatabaseEntity, to_entity: DatabaseEntity) -> DatabaseEntity:
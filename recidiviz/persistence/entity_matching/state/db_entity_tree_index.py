@@ -0,0 +1,76 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""An index over DB EntityTrees used to find candidate matches for ingested entities during state entity matching."""
+from collections import defaultdict
+from typing import List, Dict
+
+from recidiviz.persistence.database.database_entity import DatabaseEntity
+from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
+from recidiviz.persistence.entity_matching.state.state_matching_utils import get_match_index_keys, MatchIndexKey
+
+
+class DbEntityTreeIndex:
+    """Indexes a list of DB EntityTrees by the keys returned by get_match_index_keys, so that the is_match candidates
+    for an ingested entity can be found without comparing the ingested entity to every DB tree.
+
+    Candidates returned by the index are a superset of the DB trees that match a given ingested entity and are always
+    returned in the order they appear in the original list of DB trees.
+    """
+
+    def __init__(self, db_entity_trees: List[EntityTree]):
+        self.db_entity_trees: List[EntityTree] = db_entity_trees
+
+        # Maps the id of each EntityTree to its position in |db_entity_trees|.
+        self._positions_by_tree_id: Dict[int, int] = {}
+
+        # Maps each match key to the trees whose entity has that key, keyed by tree id.
+        self._trees_by_key: Dict[MatchIndexKey, Dict[int, EntityTree]] = defaultdict(dict)
+
+        # Trees whose entity can only be matched via is_match. These are candidates for every ingested entity.
+        self._unkeyed_trees: Dict[int, EntityTree] = {}
+
+        for position, db_entity_tree in enumerate(db_entity_trees):
+            self._positions_by_tree_id[id(db_entity_tree)] = position
+            self.add_tree(db_entity_tree)
+
+    def add_tree(self, db_entity_tree: EntityTree) -> None:
+        """Indexes the provided |db_entity_tree| by the current keys of its entity. Must be called again for any DB
+        tree whose entity's external ids change during matching (e.g. when duplicate DB persons are merged or when
+        ingested information is merged onto a matched DB entity). Keys the tree was previously indexed by are kept,
+        since extra candidates do not break the superset guarantee."""
+        keys = get_match_index_keys(db_entity_tree.entity)
+        if keys is None:
+            self._unkeyed_trees[id(db_entity_tree)] = db_entity_tree
+            return
+
+        for key in keys:
+            self._trees_by_key[key][id(db_entity_tree)] = db_entity_tree
+
+    def get_match_candidates(self, ingested_entity: DatabaseEntity) -> List[EntityTree]:
+        """Returns all DB trees that could match the provided |ingested_entity| according to is_match."""
+        keys = get_match_index_keys(ingested_entity)
+        if keys is None:
+            return self.db_entity_trees
+
+        candidates_by_tree_id: Dict[int, EntityTree] = dict(self._unkeyed_trees)
+        for key in keys:
+            candidates_by_tree_id.update(self._trees_by_key.get(key, {}))
+
+        return sorted(candidates_by_tree_id.values(), key=self._position)
+
+    def _position(self, db_entity_tree: EntityTree) -> int:
+        return self._positions_by_tree_id.get(id(db_entity_tree), len(self.db_entity_trees))
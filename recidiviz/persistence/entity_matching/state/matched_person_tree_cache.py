@@ -0,0 +1,193 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""An in-memory cache of StatePerson trees that have already been matched and committed, so that consecutive writes
+that touch the same people do not have to re-read those trees from the DB."""
+import logging
+from collections import OrderedDict
+from typing import Dict, Set, List, Optional, Type, Tuple
+
+from sqlalchemy.orm.util import identity_key
+
+from recidiviz.persistence.database.database_entity import DatabaseEntity
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.session import Session
+from recidiviz.persistence.entity_matching.state.state_matching_utils import get_all_entities_of_cls, \
+    get_external_ids_from_entity
+
+
+class MatchedPersonTreeCache:
+    """LRU cache of committed schema.StatePerson trees, indexed by the external ids of their root entities.
+
+    An external id is only indexed once the DB persons read for that id have been matched and committed, at which point
+    the cache holds every person in the DB with a root entity that has that id. Persons are stored detached from any
+    Session and are merged into the Session they are used in without issuing any queries. The cache is only valid for
+    as long as nothing other than the writes that populate it modifies the persons it holds.
+
+    Usage within a single write:
+        db_persons, uncached_ingested_persons = cache.get_persons(session, ingested_persons, root_entity_cls)
+        ... read |uncached_ingested_persons| matches from the DB and match ...
+        cache.stage(matched_and_db_persons, queried_external_ids)
+        ... commit, with session.expire_on_commit = False ...
+        cache.commit_staged()
+    """
+
+    def __init__(self, max_size: int):
+        if max_size <= 0:
+            raise ValueError(f'Expected positive max_size, found [{max_size}]')
+        self.max_size = max_size
+
+        # Root entity class the indexed external ids belong to.
+        self.root_entity_cls: Optional[Type[DatabaseEntity]] = None
+
+        # Cached persons keyed by person_id, least recently used first.
+        self._persons: 'OrderedDict[int, schema.StatePerson]' = OrderedDict()
+
+        # Maps each indexed root entity external id to the ids of all persons that have a root entity with that id.
+        self._person_ids_by_external_id: Dict[str, Set[int]] = {}
+
+        # Reverse of |_person_ids_by_external_id|.
+        self._external_ids_by_person_id: Dict[int, Set[str]] = {}
+
+        # Persons and queried external ids from the current, not yet committed, write.
+        self._staged_persons: List[schema.StatePerson] = []
+        self._staged_external_ids: Set[str] = set()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._persons)
+
+    def get_persons(self,
+                    session: Session,
+                    ingested_persons: List[schema.StatePerson],
+                    root_entity_cls: Type[DatabaseEntity]) \
+            -> Tuple[List[schema.StatePerson], List[schema.StatePerson]]:
+        """Returns a tuple of the cached DB persons that match any of the |ingested_persons|, merged into the provided
+        |session|, and the list of |ingested_persons| that have root entity external ids that are not indexed. DB
+        matches for the latter must be read from the DB.
+        """
+        if root_entity_cls != self.root_entity_cls:
+            self.clear()
+            self.root_entity_cls = root_entity_cls
+
+        person_ids: Set[int] = set()
+        uncached_ingested_persons = []
+        for ingested_person in ingested_persons:
+            external_ids = _get_root_external_ids(ingested_person, root_entity_cls)
+            if external_ids and all(external_id in self._person_ids_by_external_id for external_id in external_ids):
+                self.hits += 1
+                for external_id in external_ids:
+                    person_ids.update(self._person_ids_by_external_id[external_id])
+            else:
+                self.misses += 1
+                uncached_ingested_persons.append(ingested_person)
+
+        db_persons = []
+        for person_id in sorted(person_ids):
+            self._persons.move_to_end(person_id)
+            in_session_person = session.identity_map.get(identity_key(schema.StatePerson, person_id))
+            if in_session_person is not None:
+                db_persons.append(in_session_person)
+            else:
+                db_persons.append(session.merge(self._persons[person_id], load=False))
+
+        return db_persons, uncached_ingested_persons
+
+    def stage(self, persons: List[schema.StatePerson], queried_external_ids: Set[str]) -> None:
+        """Stages the provided |persons|, which must include every DB person that was read for the
+        |queried_external_ids| as well as any matched persons, to be cached once the current write is committed.
+        """
+        self._staged_persons.extend(persons)
+        self._staged_external_ids.update(queried_external_ids)
+
+    def commit_staged(self) -> None:
+        """Caches all staged persons. Must only be called once the Session the staged persons belong to has been
+        committed without expiring its objects.
+        """
+        root_entity_cls = self.root_entity_cls
+        if root_entity_cls is None:
+            self.discard_staged()
+            return
+
+        complete_external_ids = self._staged_external_ids.union(self._person_ids_by_external_id)
+        for external_id in self._staged_external_ids:
+            self._person_ids_by_external_id.setdefault(external_id, set())
+
+        seen_person_ids: Set[int] = set()
+        for person in self._staged_persons:
+            person_id = person.person_id
+            if person_id is None or person_id in seen_person_ids:
+                continue
+            seen_person_ids.add(person_id)
+
+            self._remove_from_index(person_id)
+            self._persons.pop(person_id, None)
+
+            external_ids = complete_external_ids.intersection(_get_root_external_ids(person, root_entity_cls))
+            if not external_ids:
+                continue
+
+            self._persons[person_id] = person
+            self._external_ids_by_person_id[person_id] = external_ids
+            for external_id in external_ids:
+                self._person_ids_by_external_id[external_id].add(person_id)
+
+        self.discard_staged()
+
+        while len(self._persons) > self.max_size:
+            self._evict(next(iter(self._persons)))
+
+        logging.info("[Entity matching] Person tree cache holds [%d] persons for [%d] external ids",
+                     len(self._persons), len(self._person_ids_by_external_id))
+
+    def discard_staged(self) -> None:
+        self._staged_persons = []
+        self._staged_external_ids = set()
+
+    def clear(self) -> None:
+        self._persons.clear()
+        self._person_ids_by_external_id.clear()
+        self._external_ids_by_person_id.clear()
+        self.discard_staged()
+
+    def _remove_from_index(self, person_id: int) -> None:
+        for external_id in self._external_ids_by_person_id.pop(person_id, set()):
+            self._person_ids_by_external_id[external_id].discard(person_id)
+
+    def _evict(self, person_id: int) -> None:
+        """Removes the person with the provided |person_id| from the cache. Since the cache no longer holds every
+        person with the evicted person's external ids, those ids are no longer indexed, and any other persons that are
+        no longer reachable through an indexed id are also removed.
+        """
+        del self._persons[person_id]
+        for external_id in self._external_ids_by_person_id.pop(person_id, set()):
+            for other_person_id in self._person_ids_by_external_id.pop(external_id):
+                other_external_ids = self._external_ids_by_person_id.get(other_person_id)
+                if other_external_ids is None:
+                    continue
+                other_external_ids.discard(external_id)
+                if not other_external_ids:
+                    del self._external_ids_by_person_id[other_person_id]
+                    del self._persons[other_person_id]
+
+
+def _get_root_external_ids(person: schema.StatePerson, root_entity_cls: Type[DatabaseEntity]) -> Set[str]:
+    external_ids: Set[str] = set()
+    for entity in get_all_entities_of_cls([person], root_entity_cls):
+        external_ids.update(get_external_ids_from_entity(entity))
+    return external_ids
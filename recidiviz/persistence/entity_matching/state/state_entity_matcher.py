@@ -28,7 +28,11 @@ from more_itertools import one
 
 from recidiviz.common.common_utils import check_all_objs_have_type
 from recidiviz.persistence.database.database_entity import DatabaseEntity
+from recidiviz.persistence.database.query_stats import record_query_stats
+from recidiviz.persistence.database.schema.state import dao
 from recidiviz.persistence.database.schema.state.dao import check_not_dirty
+from recidiviz.persistence.database.schema.state.loading_profile import \
+    get_state_person_loading_profile, StatePersonLoadingProfile
 from recidiviz.persistence.database.schema_entity_converter.\
     schema_entity_converter import convert_entity_people_to_schema_people
 from recidiviz.persistence.database.session import Session
@@ -39,6 +43,10 @@ from recidiviz.persistence.entity_matching.base_entity_matcher import \
     BaseEntityMatcher, increment_error
 from recidiviz.persistence.entity_matching.state.\
     base_state_matching_delegate import BaseStateMatchingDelegate
+from recidiviz.persistence.entity_matching.state.db_entity_tree_index import \
+    DbEntityTreeIndex
+from recidiviz.persistence.entity_matching.state.matched_person_tree_cache \
+    import MatchedPersonTreeCache
 from recidiviz.persistence.entity_matching.state.state_matching_utils import \
     EntityFieldType, generate_child_entity_trees, remove_child_from_entity, \
     add_child_to_entity, is_match, \
@@ -47,7 +55,7 @@ from recidiviz.persistence.entity_matching.state.state_matching_utils import \
     convert_to_placeholder, is_multiple_id_entity, \
     get_external_id_keys_from_multiple_id_entity, get_multiple_id_classes, \
     read_db_entity_trees_of_cls_to_merge, get_multiparent_classes, \
-    db_id_or_object_id
+    db_id_or_object_id, get_external_ids_of_cls
 from recidiviz.persistence.entity.entity_utils import is_placeholder, \
     get_set_entity_field_names, get_all_core_entity_field_names, \
     get_all_db_objs_from_tree, get_all_db_objs_from_trees, \
@@ -86,7 +94,10 @@ class _EntityWithParentInfo:
 class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
     """Class that handles entity matching for all state data."""
 
-    def __init__(self, state_matching_delegate: BaseStateMatchingDelegate):
+    def __init__(self,
+                 state_matching_delegate: BaseStateMatchingDelegate,
+                 loading_strategy: Optional[str] = None,
+                 person_tree_cache: Optional[MatchedPersonTreeCache] = None):
         self.all_ingested_db_objs: Set[DatabaseEntity] = set()
         self.ingest_obj_id_to_person_id: Dict[int, int] = defaultdict()
         self.person_id_to_ingest_objs: Dict[int, Set[DatabaseEntity]] = \
@@ -119,6 +130,16 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         # Delegate object with all state specific logic
         self.state_matching_delegate = state_matching_delegate
 
+        # If set, the name of the RelationshipLoadingStrategy used to load
+        # relationships that lead to ingested entity types when reading DB
+        # persons. Otherwise, the schema defaults are used.
+        self.loading_strategy = loading_strategy
+
+        # If set, DB persons that were matched in previous writes are taken
+        # from this cache instead of being read from the DB, and all persons
+        # read and matched here are staged to be cached once committed.
+        self.person_tree_cache = person_tree_cache
+
         self.session: Optional[Session] = None
 
     def set_session(self, session: Session):
@@ -239,7 +260,8 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
             -> MatchedEntities:
         """Attempts to match all persons from |ingested_persons| with
         corresponding persons in our database. Returns a MatchedEntities object
-        that contains the results of matching.
+        that contains the results of matching. The number of queries issued
+        and rows loaded while matching are logged once matching completes.
         """
         self.set_session(session)
         logging.info(
@@ -258,10 +280,34 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
             "at time [%s].", datetime.datetime.now().isoformat())
 
         check_all_objs_have_type(ingested_db_persons, schema.StatePerson)
-        db_persons = \
-            self.state_matching_delegate.read_potential_match_db_persons(
-                session=session,
-                ingested_persons=ingested_db_persons)
+
+        loading_profile = get_state_person_loading_profile(
+            self.non_placeholder_ingest_types, self.loading_strategy)
+
+        with record_query_stats(session) as query_stats:
+            matched_entities = self._read_and_match_persons(
+                session, ingested_db_persons, loading_profile).build()
+
+        logging.info(
+            "[Entity matching] Issued [%d] queries and loaded [%d] rows "
+            "while matching [%d] ingested persons",
+            query_stats.query_count, query_stats.rows_loaded,
+            len(ingested_db_persons))
+        return matched_entities
+
+    def _read_and_match_persons(
+            self,
+            session: Session,
+            ingested_db_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile]) \
+            -> MatchedEntities.Builder:
+        """Reads the DB persons that potentially match |ingested_db_persons|
+        according to the |loading_profile| and matches them. Matched persons
+        are added to the |session|, which is flushed before returning.
+        """
+        db_persons, queried_external_ids = \
+            self._read_potential_match_db_persons(
+                session, ingested_db_persons, loading_profile)
 
         if self.log_entity_counts:
             logging.info('Entity counts for all people read from the DB:')
@@ -299,7 +345,62 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         # entity matching
         check_not_dirty(session)
 
-        return matched_entities_builder.build()
+        if self.person_tree_cache is not None:
+            self.person_tree_cache.stage(
+                db_persons + matched_entities_builder.people,
+                queried_external_ids)
+
+        return matched_entities_builder
+
+    def _read_potential_match_db_persons(
+            self,
+            session: Session,
+            ingested_db_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile]) \
+            -> Tuple[List[schema.StatePerson], Set[str]]:
+        """Returns the DB persons that potentially match
+        |ingested_db_persons|, along with the root entity external ids that
+        were read from the DB to find them. If there is a
+        |person_tree_cache|, only the matches for ingested persons that are
+        not covered by the cache are read from the DB.
+        """
+        if self.person_tree_cache is None:
+            db_persons = \
+                self.state_matching_delegate.read_potential_match_db_persons(
+                    session=session,
+                    ingested_persons=ingested_db_persons,
+                    loading_profile=loading_profile)
+            return db_persons, set()
+
+        cached_db_persons, uncached_ingested_persons = \
+            self.person_tree_cache.get_persons(
+                session, ingested_db_persons, self.root_entity_cls)
+        logging.info(
+            "[Entity matching] Found [%d] DB persons in the person tree cache "
+            "for [%d] of [%d] ingested persons", len(cached_db_persons),
+            len(ingested_db_persons) - len(uncached_ingested_persons),
+            len(ingested_db_persons))
+
+        queried_external_ids: Set[str] = set()
+        if uncached_ingested_persons:
+            queried_external_ids = get_external_ids_of_cls(
+                uncached_ingested_persons, self.root_entity_cls)
+            read_db_persons = \
+                self.state_matching_delegate.read_potential_match_db_persons(
+                    session=session,
+                    ingested_persons=uncached_ingested_persons,
+                    loading_profile=loading_profile)
+        else:
+            read_db_persons = dao.read_placeholder_persons(
+                session, loading_profile=loading_profile)
+
+        db_persons = []
+        seen_person_ids: Set[int] = set()
+        for person in cached_db_persons + read_db_persons:
+            if person.person_id not in seen_person_ids:
+                seen_person_ids.add(person.person_id)
+                db_persons.append(person)
+        return db_persons, queried_external_ids
 
     def _run_match(self,
                    ingested_persons: List[schema.StatePerson],
@@ -717,11 +818,13 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         individual_match_results: List[IndividualMatchResult] = []
         matched_entities_by_db_id: Dict[int, List[DatabaseEntity]] = {}
         error_count = 0
+        db_entity_tree_index = DbEntityTreeIndex(db_entity_trees)
         for ingested_entity_tree in ingested_entity_trees:
             try:
                 match_result = self._match_entity_tree(
                     ingested_entity_tree=ingested_entity_tree,
                     db_entity_trees=db_entity_trees,
+                    db_entity_tree_index=db_entity_tree_index,
                     matched_entities_by_db_ids=matched_entities_by_db_id,
                     root_entity_cls=root_entity_cls)
                 individual_match_results.append(match_result)
@@ -773,10 +876,12 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
             self,
             *, ingested_entity_tree: EntityTree,
             db_entity_trees: List[EntityTree],
+            db_entity_tree_index: DbEntityTreeIndex,
             matched_entities_by_db_ids: Dict[int, List[DatabaseEntity]],
             root_entity_cls: Type) -> IndividualMatchResult:
         """Attempts to match the provided |ingested_entity_tree| to one of the
-        provided |db_entity_trees|. If a successful match is found, merges the
+        provided |db_entity_trees|, which are indexed in
+        |db_entity_tree_index|. If a successful match is found, merges the
         ingested entity onto the matching database entity and performs entity
         matching on all children of the matched entities.
         Returns the results of matching as an IndividualMatchResult.
@@ -790,7 +895,8 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
                 root_entity_cls=root_entity_cls)
 
         db_match_tree = self._get_match(ingested_entity_tree,
-                                        db_entity_trees)
+                                        db_entity_trees,
+                                        db_entity_tree_index)
 
         if not db_match_tree:
             return self._match_unmatched_tree(
@@ -798,12 +904,20 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
                 db_entity_trees=db_entity_trees,
                 root_entity_cls=root_entity_cls)
 
-        return self._match_matched_tree(
+        match_result = self._match_matched_tree(
             ingested_entity_tree=ingested_entity_tree,
             db_match_tree=db_match_tree,
             matched_entities_by_db_ids=matched_entities_by_db_ids,
             root_entity_cls=root_entity_cls)
 
+        # Merging may have changed the external ids of the DB entity (e.g.
+        # when duplicate DB persons are merged or when US_ND merges incomplete
+        # incarceration periods), so it must be re-indexed for later ingested
+        # entities to find it.
+        db_entity_tree_index.add_tree(db_match_tree)
+
+        return match_result
+
     def _match_placeholder_tree(
             self,
             *,
@@ -1220,16 +1334,27 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
     def _get_match(
             self,
             ingested_entity_tree: EntityTree,
-            db_entity_trees: List[EntityTree]
+            db_entity_trees: List[EntityTree],
+            db_entity_tree_index: Optional[DbEntityTreeIndex] = None
     ) -> Optional[EntityTree]:
         """With the provided |ingested_entity_tree|, this attempts to find a
         match among the provided |db_entity_trees|. If a match is found, it is
         returned.
+
+        If provided, |db_entity_tree_index| is used to narrow down the DB trees
+        that are compared against the ingested entity via is_match. Matches
+        that are not based on external ids still consider all
+        |db_entity_trees|.
         """
-        db_match_candidates = db_entity_trees
         if isinstance(ingested_entity_tree.entity, self.root_entity_cls):
             db_match_candidates = self.get_cached_matches(
                 ingested_entity_tree.entity)
+            db_entity_tree_index = None
+        elif db_entity_tree_index:
+            db_match_candidates = db_entity_tree_index.get_match_candidates(
+                ingested_entity_tree.entity)
+        else:
+            db_match_candidates = db_entity_trees
 
         # Entities that can have multiple external IDs need special casing to
         # handle the fact that multiple DB entities could match the provided
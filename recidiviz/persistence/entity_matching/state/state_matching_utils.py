@@ -17,7 +17,7 @@
 """State specific utils for entity matching. Utils in this file are generic to any DatabaseEntity."""
 import logging
 from collections import defaultdict
-from typing import List, cast, Optional, Set, Type, Dict, Sequence
+from typing import List, cast, Optional, Set, Type, Dict, Sequence, Tuple
 
 from recidiviz.common.constants import enum_canonical_strings
 from recidiviz.common.constants.state.state_agent import StateAgentType
@@ -27,6 +27,8 @@ from recidiviz.common.constants.state.state_incarceration import \
 from recidiviz.persistence.database.base_schema import StateBase
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.schema.state import schema, dao
+from recidiviz.persistence.database.schema.state.loading_profile import \
+    StatePersonLoadingProfile
 from recidiviz.persistence.database.schema_utils import \
     get_non_history_state_database_entities
 from recidiviz.persistence.database.session import Session
@@ -114,6 +116,48 @@ def _is_match(*,
     return ingested_entity.get_external_id() == db_entity.get_external_id()
 
 
+# Classes for which is_match compares fields other than the external id(s).
+_NON_EXTERNAL_ID_MATCH_CLASSES: Tuple[Type[DatabaseEntity], ...] = (
+    schema.StatePersonAlias,
+    schema.StatePersonRace,
+    schema.StatePersonEthnicity,
+    schema.StateSupervisionViolationResponseDecisionEntry,
+    schema.StateSupervisionViolatedConditionEntry,
+    schema.StateSupervisionViolationTypeEntry,
+    schema.StateSupervisionCaseTypeEntry,
+)
+
+MatchIndexKey = Tuple[Optional[str], ...]
+
+
+def get_match_index_keys(entity: DatabaseEntity) -> Optional[Set[MatchIndexKey]]:
+    """Returns the keys that the provided |entity| can be looked up by when finding is_match candidates. Two entities
+    with keys are a match according to is_match if and only if their key sets intersect.
+
+    Returns None if the entity can only be matched by calling is_match directly, i.e. if it is a placeholder without
+    an external id or its class is matched on fields other than external ids.
+    """
+    if isinstance(entity, _NON_EXTERNAL_ID_MATCH_CLASSES):
+        return None
+
+    if isinstance(entity, schema.StatePerson):
+        keys: Set[MatchIndexKey] = set()
+        for external_id in entity.external_ids:
+            external_id_keys = get_match_index_keys(external_id)
+            if external_id_keys is None:
+                return None
+            keys.update(external_id_keys)
+        return keys
+
+    if entity.get_external_id() is None:
+        return None
+
+    if isinstance(entity, schema.StatePersonExternalId):
+        return {(entity.state_code, entity.id_type, entity.external_id)}
+
+    return {(entity.get_field('state_code'), entity.get_external_id())}
+
+
 def nonnull_fields_entity_match(
         ingested_entity: EntityTree,
         db_entity: EntityTree,
@@ -514,12 +558,14 @@ def read_persons_by_root_entity_cls(
         region: str,
         ingested_people: List[schema.StatePerson],
         allowed_root_entity_classes: Optional[List[Type[DatabaseEntity]]],
+        loading_profile: Optional[StatePersonLoadingProfile] = None
 ) -> List[schema.StatePerson]:
     """Looks up all people necessary for entity matching based on the provided
     |region| and |ingested_people|.
 
     If |allowed_root_entity_classes| is provided, throw an error if any
-    unexpected root entity class is found.
+    unexpected root entity class is found. If |loading_profile| is provided,
+    the person trees are loaded according to that profile.
     """
     root_entity_cls = get_root_entity_cls(ingested_people)
     if allowed_root_entity_classes and root_entity_cls not in allowed_root_entity_classes:
@@ -530,8 +576,10 @@ def read_persons_by_root_entity_cls(
     logging.info("[Entity Matching] Reading [%s] external ids of class [%s]",
                  len(root_external_ids), root_entity_cls.__name__)
     persons_by_root_entity = dao.read_people_by_cls_external_ids(
-        session, region, root_entity_cls, root_external_ids)
-    placeholder_persons = dao.read_placeholder_persons(session)
+        session, region, root_entity_cls, root_external_ids,
+        loading_profile=loading_profile)
+    placeholder_persons = dao.read_placeholder_persons(
+        session, loading_profile=loading_profile)
 
     # When the |root_entity_cls| is not StatePerson, it is possible for both
     # persons_by_root_entity and placeholder_persons to contain the same
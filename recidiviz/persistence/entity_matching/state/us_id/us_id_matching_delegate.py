@@ -16,10 +16,11 @@
 # =============================================================================
 """Contains logic for US_ID specific entity matching overrides."""
 import logging
-from typing import List, Type
+from typing import List, Type, Optional
 
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
 from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.entity_matching.state.base_state_matching_delegate import BaseStateMatchingDelegate
 from recidiviz.persistence.entity_matching.state.state_matching_utils import read_persons_by_root_entity_cls
@@ -36,14 +37,15 @@ class UsIdMatchingDelegate(BaseStateMatchingDelegate):
     def read_potential_match_db_persons(
             self,
             session: Session,
-            ingested_persons: List[schema.StatePerson]
+            ingested_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile] = None
     ) -> List[schema.StatePerson]:
         """Reads and returns all persons from the DB that are needed for entity matching in this state, given the
         |ingested_persons|.
         """
         allowed_root_entity_classes: List[Type[DatabaseEntity]] = [schema.StatePerson]
         db_persons = read_persons_by_root_entity_cls(
-            session, self.region_code, ingested_persons, allowed_root_entity_classes)
+            session, self.region_code, ingested_persons, allowed_root_entity_classes, loading_profile=loading_profile)
         return db_persons
 
     def perform_match_postprocessing(self, matched_persons: List[schema.StatePerson]):
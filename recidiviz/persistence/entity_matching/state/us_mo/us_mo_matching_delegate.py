@@ -22,6 +22,7 @@ from typing import Type, List, Optional
 from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
 from recidiviz.persistence.entity_matching import entity_matching_utils
 from recidiviz.persistence.entity_matching.entity_matching_types import \
     EntityTree
@@ -44,7 +45,8 @@ class UsMoMatchingDelegate(BaseStateMatchingDelegate):
     def read_potential_match_db_persons(
             self,
             session: Session,
-            ingested_persons: List[schema.StatePerson]
+            ingested_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile] = None
     ) -> List[schema.StatePerson]:
         """Reads and returns all persons from the DB that are needed for
         entity matching in this state, given the |ingested_persons|.
@@ -52,7 +54,7 @@ class UsMoMatchingDelegate(BaseStateMatchingDelegate):
         allowed_root_entity_classes: List[Type[DatabaseEntity]] = [schema.StatePerson]
         db_persons = read_persons_by_root_entity_cls(
             session, self.region_code, ingested_persons,
-            allowed_root_entity_classes)
+            allowed_root_entity_classes, loading_profile=loading_profile)
         return db_persons
 
     def perform_match_preprocessing(
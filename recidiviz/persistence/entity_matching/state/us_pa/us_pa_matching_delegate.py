@@ -21,6 +21,7 @@ from typing import List, Type, Optional
 
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
 from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.entity_matching import entity_matching_utils
 from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
@@ -39,14 +40,15 @@ class UsPaMatchingDelegate(BaseStateMatchingDelegate):
     def read_potential_match_db_persons(
             self,
             session: Session,
-            ingested_persons: List[schema.StatePerson]
+            ingested_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile] = None
     ) -> List[schema.StatePerson]:
         """Reads and returns all persons from the DB that are needed for entity matching in this state, given the
         |ingested_persons|.
         """
         allowed_root_entity_classes: List[Type[DatabaseEntity]] = [schema.StatePerson, schema.StateSentenceGroup]
         db_persons = read_persons_by_root_entity_cls(
-            session, self.region_code, ingested_persons, allowed_root_entity_classes)
+            session, self.region_code, ingested_persons, allowed_root_entity_classes, loading_profile=loading_profile)
         return db_persons
 
     def get_non_external_id_match(
@@ -24,9 +24,10 @@ from typing import List, Generic
 
 import attr
 
-from recidiviz.common.constants.entity_enum import EnumParsingError
+from recidiviz.common.constants.entity_enum import EnumParsingError, record_enum_parse_cache_stats
 from recidiviz.common.constants.person_characteristics import PROTECTED_CLASSES
 from recidiviz.common.ingest_metadata import IngestMetadata
+from recidiviz.common.str_field_utils import record_date_parse_stats
 from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo
 from recidiviz.persistence.entity.entities import EntityPersonType
 
@@ -65,6 +66,9 @@ class BaseConverter(Generic[EntityPersonType]):
                 general_parsing_errors += 1
                 raise e
 
+        record_enum_parse_cache_stats()
+        record_date_parse_stats()
+
         return IngestInfoConversionResult(
             people=people,
             enum_parsing_errors=enum_parsing_errors,
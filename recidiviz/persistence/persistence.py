@@ -17,7 +17,7 @@
 """Contains logic for communicating with the persistence layer."""
 import datetime
 import logging
-from typing import List
+from typing import List, Optional
 
 from opencensus.stats import aggregation, measure, view
 
@@ -40,6 +40,8 @@ from recidiviz.persistence.database.schema_entity_converter import (
     schema_entity_converter as converter,
 )
 from recidiviz.persistence.entity_matching import entity_matching
+from recidiviz.persistence.entity_matching.state.matched_person_tree_cache \
+    import MatchedPersonTreeCache
 from recidiviz.persistence.entity_validator import entity_validator
 from recidiviz.persistence.database import database
 from recidiviz.persistence.ingest_info_converter import ingest_info_converter
@@ -197,13 +199,18 @@ def _should_abort(
     return False
 
 
-def write(ingest_info, metadata):
+def write(ingest_info, metadata,
+          person_tree_cache: Optional[MatchedPersonTreeCache] = None):
     """
     If in prod or if 'PERSIST_LOCALLY' is set to true, persist each person in
     the ingest_info. If a person with the given surname/birthday already exists,
     then update that person.
 
     Otherwise, simply log the given ingest_infos for debugging
+
+    If a |person_tree_cache| is provided, state entity matching reuses the
+    person trees cached by previous writes and the trees of all persons
+    matched in this write are cached once it has been committed.
     """
     ingest_info_validator.validate(ingest_info)
 
@@ -245,12 +252,18 @@ def write(ingest_info, metadata):
 
         session = SessionFactory.for_schema_base(
             schema_base_for_system_level(metadata.system_level))
+        if person_tree_cache is not None:
+            # Cached person trees are used after this session is closed, so
+            # their loaded state must not be expired on commit.
+            session.expire_on_commit = False
 
         try:
             logging.info("Starting entity matching")
 
             entity_matching_output = entity_matching.match(
-                session, metadata.region, people)
+                session, metadata.region, people,
+                loading_strategy=metadata.entity_matching_loading_strategy,
+                person_tree_cache=person_tree_cache)
             people = entity_matching_output.people
             total_root_entities = total_people \
                 if metadata.system_level == SystemLevel.COUNTY \
@@ -276,6 +289,8 @@ def write(ingest_info, metadata):
                 orphaned_entities=entity_matching_output.orphaned_entities)
             logging.info("Successfully wrote to the database")
             session.commit()
+            if person_tree_cache is not None:
+                person_tree_cache.commit_staged()
 
             persisted = True
             mtags[monitoring.TagKey.PERSISTED] = True
@@ -288,6 +303,8 @@ def write(ingest_info, metadata):
             session.rollback()
             raise
         finally:
+            if person_tree_cache is not None:
+                person_tree_cache.discard_staged()
             session.close()
         return persisted
 
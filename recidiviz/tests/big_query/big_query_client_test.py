@@ -98,6 +98,10 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.mock_client.update_table.assert_called()
         self.mock_client.create_table.assert_not_called()
 
+        updated_view, updated_fields = self.mock_client.update_table.call_args[0]
+        self.assertEqual(['view_query', 'labels'], updated_fields)
+        self.assertEqual({'view_query_hash': self.mock_view.view_query_hash}, updated_view.labels)
+
     def test_export_to_cloud_storage(self):
         """export_to_cloud_storage extracts the table corresponding to the
         view."""
@@ -216,10 +220,12 @@ class BigQueryClientImplTest(unittest.TestCase):
             destination_dataset_ref=self.mock_dataset,
             destination_table_id=self.mock_table_id,
             destination_table_schema=[SchemaField('my_column', 'STRING', 'NULLABLE', None, ())],
-            source_uri='gs://bucket/export-uri')
+            source_uris=['gs://bucket/export-uri-0', 'gs://bucket/export-uri-1'])
 
         self.mock_client.create_dataset.assert_called()
-        self.mock_client.load_table_from_uri.assert_called()
+        self.mock_client.load_table_from_uri.assert_called_once()
+        self.assertEqual(['gs://bucket/export-uri-0', 'gs://bucket/export-uri-1'],
+                         self.mock_client.load_table_from_uri.call_args[0][0])
 
     def test_delete_from_table(self):
         """Tests that the delete_from_table function runs a query."""
@@ -90,3 +90,26 @@ class BigQueryViewTest(unittest.TestCase):
                 some_dataset='a_dataset',
                 select_col_2='date'
             )
+
+    def test_view_query_hash(self):
+        view = BigQueryView(
+            dataset_id='view_dataset',
+            view_id='my_view',
+            view_query_template='SELECT * FROM `{project_id}.some_dataset.table`'
+        )
+        same_query_view = BigQueryView(
+            dataset_id='other_dataset',
+            view_id='other_view',
+            view_query_template='SELECT * FROM `{project_id}.{some_dataset}.table`',
+            some_dataset='some_dataset'
+        )
+        other_project_view = BigQueryView(
+            project_id='other-project',
+            dataset_id='view_dataset',
+            view_id='my_view',
+            view_query_template='SELECT * FROM `{project_id}.some_dataset.table`'
+        )
+
+        self.assertEqual(view.view_query_hash, same_query_view.view_query_hash)
+        self.assertNotEqual(view.view_query_hash, other_project_view.view_query_hash)
+        self.assertLessEqual(len(view.view_query_hash), 63)
@@ -64,7 +64,7 @@ class ViewManagerTest(unittest.TestCase):
         self.mock_client.dataset_ref_for_id.assert_called_with(_DATASET_NAME)
         self.mock_client.create_dataset_if_necessary.assert_called_with(dataset)
         self.mock_client.create_or_update_view.assert_has_calls(
-            [mock.call(dataset, view_builder.build()) for view_builder in mock_view_builders])
+            [mock.call(dataset, view_builder.build()) for view_builder in mock_view_builders], any_order=True)
 
     def test_create_dataset_and_update_views(self):
         """Test that create_dataset_and_update_views creates a dataset if necessary, and updates all views."""
@@ -83,4 +83,71 @@ class ViewManagerTest(unittest.TestCase):
 
         self.mock_client.dataset_ref_for_id.assert_called_with(_DATASET_NAME)
         self.mock_client.create_dataset_if_necessary.assert_called_with(dataset)
-        self.mock_client.create_or_update_view.assert_has_calls([mock.call(dataset, view) for view in mock_views])
+        self.mock_client.create_or_update_view.assert_has_calls([mock.call(dataset, view) for view in mock_views],
+                                                                any_order=True)
+
+    def test_create_dataset_and_update_views_dependencies(self):
+        """Test that views are only updated after the views that they query have been updated."""
+        dataset = bigquery.dataset.DatasetReference(_PROJECT_ID, _DATASET_NAME)
+        other_dataset = bigquery.dataset.DatasetReference(_PROJECT_ID, 'other_dataset')
+
+        parent_view = BigQueryView(dataset_id=_DATASET_NAME, view_id='parent_view',
+                                   view_query_template='SELECT * FROM `{project_id}.source_dataset.table`')
+        child_view = BigQueryView(dataset_id='other_dataset', view_id='child_view',
+                                  view_query_template='SELECT * FROM `{project_id}.my_views_dataset.parent_view`')
+        grandchild_view = BigQueryView(dataset_id=_DATASET_NAME, view_id='grandchild_view',
+                                       view_query_template='SELECT * FROM `{project_id}.other_dataset.child_view` '
+                                                           'JOIN `{project_id}.my_views_dataset.parent_view`')
+
+        self.mock_client.dataset_ref_for_id.side_effect = \
+            lambda dataset_id: dataset if dataset_id == _DATASET_NAME else other_dataset
+
+        updated_view_ids = []
+        self.mock_client.create_or_update_view.side_effect = \
+            lambda _dataset_ref, view: updated_view_ids.append(view.view_id)
+
+        # pylint: disable=protected-access
+        view_manager._create_dataset_and_update_views({
+            _DATASET_NAME: [grandchild_view, parent_view],
+            'other_dataset': [child_view],
+        })
+
+        self.assertEqual(['parent_view', 'child_view', 'grandchild_view'], updated_view_ids)
+        self.mock_client.create_or_update_view.assert_has_calls([
+            mock.call(dataset, parent_view), mock.call(other_dataset, child_view), mock.call(dataset, grandchild_view)])
+
+    def test_create_dataset_and_update_views_circular_dependency(self):
+        view = BigQueryView(dataset_id=_DATASET_NAME, view_id='view',
+                            view_query_template='SELECT * FROM `{project_id}.my_views_dataset.other_view`')
+        other_view = BigQueryView(dataset_id=_DATASET_NAME, view_id='other_view',
+                                  view_query_template='SELECT * FROM `{project_id}.my_views_dataset.view`')
+
+        with self.assertRaises(ValueError):
+            # pylint: disable=protected-access
+            view_manager._create_dataset_and_update_views({_DATASET_NAME: [view, other_view]})
+
+        self.mock_client.create_or_update_view.assert_not_called()
+
+    def test_create_dataset_and_update_views_skips_unchanged_views(self):
+        """Test that views that are already deployed with the same query are not updated."""
+        dataset = bigquery.dataset.DatasetReference(_PROJECT_ID, _DATASET_NAME)
+
+        unchanged_view = BigQueryView(dataset_id=_DATASET_NAME, view_id='unchanged_view',
+                                      view_query_template='SELECT NULL LIMIT 0')
+        changed_view = BigQueryView(dataset_id=_DATASET_NAME, view_id='changed_view',
+                                    view_query_template='SELECT 1')
+        new_view = BigQueryView(dataset_id=_DATASET_NAME, view_id='new_view', view_query_template='SELECT 2')
+
+        self.mock_client.dataset_ref_for_id.return_value = dataset
+        self.mock_client.list_tables.return_value = [
+            mock.Mock(table_id='unchanged_view', labels={'view_query_hash': unchanged_view.view_query_hash}),
+            mock.Mock(table_id='changed_view', labels={'view_query_hash': new_view.view_query_hash}),
+            mock.Mock(table_id='unlabeled_table', labels={}),
+        ]
+
+        # pylint: disable=protected-access
+        view_manager._create_dataset_and_update_views({_DATASET_NAME: [unchanged_view, changed_view, new_view]})
+
+        self.mock_client.list_tables.assert_called_with(_DATASET_NAME)
+        self.assertCountEqual([mock.call(dataset, changed_view), mock.call(dataset, new_view)],
+                              self.mock_client.create_or_update_view.call_args_list)
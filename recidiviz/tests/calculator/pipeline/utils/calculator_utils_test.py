@@ -23,6 +23,7 @@ import pytest
 
 from recidiviz.calculator.pipeline.utils import calculator_utils
 from recidiviz.calculator.pipeline.utils.calculator_utils import add_demographic_characteristics
+from recidiviz.calculator.pipeline.utils.metric_utils import MetricMethodologyType
 from recidiviz.common.constants.person_characteristics import Gender
 from recidiviz.common.constants.state.state_supervision_violation import StateSupervisionViolationType
 from recidiviz.common.constants.state.state_supervision_violation_response import \
@@ -99,6 +100,20 @@ def test_augment_combination():
     assert augmented != combo
 
 
+def test_augmented_combo_for_calculations():
+    combo = {'age': '<25', 'methodology': MetricMethodologyType.EVENT}
+
+    augmented = calculator_utils.augmented_combo_for_calculations(
+        combo, 'US_XX', 2020, None, MetricMethodologyType.PERSON, metric_period_months=0)
+
+    assert augmented == {'age': '<25',
+                         'state_code': 'US_XX',
+                         'methodology': MetricMethodologyType.PERSON,
+                         'year': 2020,
+                         'metric_period_months': 0}
+    assert combo == {'age': '<25', 'methodology': MetricMethodologyType.EVENT}
+
+
 class TestRelevantMetricPeriods(unittest.TestCase):
     """Tests the relevant_metric_periods function."""
 
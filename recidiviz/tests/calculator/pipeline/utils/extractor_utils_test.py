@@ -30,7 +30,7 @@ from apache_beam.testing.test_pipeline import TestPipeline
 
 from datetime import date
 import pytest
-from mock import patch
+from mock import MagicMock, patch
 
 from recidiviz.calculator.pipeline.utils import extractor_utils
 from recidiviz.common.constants.state.state_assessment import (
@@ -91,6 +91,55 @@ class TestBuildRootEntity(unittest.TestCase):
 
             test_pipeline.run()
 
+    def testBuildRootEntity_SharedBigQueryReadCache(self):
+        """Tests that root entities built with a shared BigQueryReadCache only read each table once."""
+
+        fake_person = schema.StatePerson(
+            person_id=12345, current_address='123 Street',
+            full_name='Jack Smith', birthdate=date(1970, 1, 1),
+            gender=Gender.MALE,
+            residency_status=ResidencyStatus.PERMANENT
+        )
+
+        fake_person_data = [normalized_database_base_dict(fake_person)]
+
+        data_dict = {schema.StatePerson.__tablename__: fake_person_data}
+
+        fake_person_entity = StateSchemaToEntityConverter().convert(fake_person)
+        dataset = 'recidiviz-123.state'
+
+        fake_bq_source_constructor = MagicMock(
+            side_effect=self.fake_bq_source_factory.create_fake_bq_source_constructor(dataset, data_dict))
+
+        with patch('recidiviz.calculator.pipeline.utils.extractor_utils.ReadFromBigQuery', fake_bq_source_constructor):
+            test_pipeline = TestPipeline()
+            bq_read_cache = extractor_utils.BigQueryReadCache()
+
+            output = (test_pipeline
+                      | 'Load Persons' >>
+                      extractor_utils.BuildRootEntity(
+                          dataset=dataset,
+                          root_entity_class=entities.StatePerson,
+                          unifying_id_field=entities.StatePerson.get_class_id_name(),
+                          build_related_entities=False,
+                          bq_read_cache=bq_read_cache))
+
+            output_2 = (test_pipeline
+                        | 'Load Persons Again' >>
+                        extractor_utils.BuildRootEntity(
+                            dataset=dataset,
+                            root_entity_class=entities.StatePerson,
+                            unifying_id_field=entities.StatePerson.get_class_id_name(),
+                            build_related_entities=False,
+                            bq_read_cache=bq_read_cache))
+
+            assert_that(output, equal_to([(12345, fake_person_entity)]), label='Assert output')
+            assert_that(output_2, equal_to([(12345, fake_person_entity)]), label='Assert output_2')
+
+            test_pipeline.run()
+
+        fake_bq_source_constructor.assert_called_once()
+
     def testBuildRootEntity_HydratedRelationshipProperties(self):
         """Tests the extraction of a valid StatePerson entity with cross-entity
         relationship properties hydrated."""
@@ -0,0 +1,97 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for state_entity_encoding.py."""
+import datetime
+import pickle
+import unittest
+
+import attr
+
+from recidiviz.calculator.pipeline.utils.state_entity_encoding import encode_entity_graph, decode_entity_graph, \
+    UnencodableEntityError
+from recidiviz.common.constants.state.state_incarceration_period import StateIncarcerationPeriodStatus
+from recidiviz.common.constants.state.state_sentence import StateSentenceStatus
+from recidiviz.persistence.entity.state import entities
+from recidiviz.tests.persistence.entity.state.entities_test_utils import generate_full_graph_state_person
+
+
+class TestStateEntityEncoding(unittest.TestCase):
+    """Tests for encode_entity_graph and decode_entity_graph."""
+
+    def test_roundTrip_fullGraph(self):
+        person = generate_full_graph_state_person(set_back_edges=True)
+
+        encoded = encode_entity_graph(person)
+        decoded = decode_entity_graph(pickle.loads(pickle.dumps(encoded)))
+
+        self.assertEqual(person, decoded)
+        self.assertLess(len(pickle.dumps(encoded)), len(pickle.dumps(person)))
+
+    def test_roundTrip_sharedEntitiesAndCycles(self):
+        person = entities.StatePerson.new_with_defaults(person_id=1)
+        sentence_group = entities.StateSentenceGroup.new_with_defaults(
+            sentence_group_id=2, state_code='US_XX', status=StateSentenceStatus.SERVING, person=person)
+        incarceration_period = entities.StateIncarcerationPeriod.new_with_defaults(
+            incarceration_period_id=3, state_code='US_XX', status=StateIncarcerationPeriodStatus.IN_CUSTODY,
+            admission_date=datetime.date(2010, 1, 1), person=person)
+        sentences = [
+            entities.StateIncarcerationSentence.new_with_defaults(
+                incarceration_sentence_id=4 + i, state_code='US_XX', status=StateSentenceStatus.SERVING,
+                person=person, sentence_group=sentence_group, incarceration_periods=[incarceration_period])
+            for i in range(2)
+        ]
+        incarceration_period.incarceration_sentences = sentences
+        sentence_group.incarceration_sentences = sentences
+        person.sentence_groups = [sentence_group]
+
+        encoded = encode_entity_graph(person)
+        decoded = decode_entity_graph(encoded)
+
+        self.assertEqual(5, len(encoded))
+        self.assertEqual(person, decoded)
+        decoded_sentences = decoded.sentence_groups[0].incarceration_sentences
+        decoded_period = decoded_sentences[0].incarceration_periods[0]
+        self.assertIs(decoded_period, decoded_sentences[1].incarceration_periods[0])
+        self.assertIs(decoded, decoded_period.person)
+        self.assertEqual(StateIncarcerationPeriodStatus.IN_CUSTODY, decoded_period.status)
+        self.assertEqual(datetime.date(2010, 1, 1), decoded_period.admission_date)
+
+    def test_encode_unexpectedEntityClass(self):
+        @attr.s(eq=False)
+        class _StateSpecificIncarcerationPeriod(entities.StateIncarcerationPeriod):
+            pass
+
+        period = _StateSpecificIncarcerationPeriod.new_with_defaults(
+            state_code='US_XX', status=StateIncarcerationPeriodStatus.IN_CUSTODY)
+
+        with self.assertRaises(UnencodableEntityError):
+            encode_entity_graph(period)
+
+    def test_encode_unexpectedValueType(self):
+        incarceration_period = entities.StateIncarcerationPeriod.new_with_defaults(
+            state_code='US_XX', status=StateIncarcerationPeriodStatus.IN_CUSTODY,
+            admission_date=datetime.datetime(2010, 1, 1, 12))
+
+        with self.assertRaises(UnencodableEntityError):
+            encode_entity_graph(incarceration_period)
+
+    def test_encode_unexpectedEnumValue(self):
+        incarceration_period = entities.StateIncarcerationPeriod.new_with_defaults(
+            state_code='US_XX', status=StateSentenceStatus.SERVING)
+
+        with self.assertRaises(UnencodableEntityError):
+            encode_entity_graph(incarceration_period)
@@ -0,0 +1,138 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for supervision_time_bucket_index.py."""
+
+import unittest
+from datetime import date
+
+from recidiviz.calculator.pipeline.supervision.supervision_case_compliance import SupervisionCaseCompliance
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
+    NonRevocationReturnSupervisionTimeBucket, RevocationReturnSupervisionTimeBucket, SupervisionTerminationBucket, \
+    ProjectedSupervisionCompletionBucket
+from recidiviz.calculator.pipeline.utils.supervision_time_bucket_index import SupervisionTimeBucketIndex
+from recidiviz.common.constants.state.state_supervision_period import StateSupervisionPeriodSupervisionType
+
+
+class TestSupervisionTimeBucketIndex(unittest.TestCase):
+    """Tests the SupervisionTimeBucketIndex class."""
+    def setUp(self):
+        self.population_bucket_march = NonRevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=3,
+            bucket_date=date(2018, 3, 31),
+            is_on_supervision_last_day_of_month=True,
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION,
+            case_compliance=SupervisionCaseCompliance(
+                date_of_evaluation=date(2018, 3, 31),
+                assessment_count=0,
+                face_to_face_count=1
+            )
+        )
+
+        self.revocation_bucket_april = RevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=4,
+            bucket_date=date(2018, 4, 10),
+            is_on_supervision_last_day_of_month=False,
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION
+        )
+
+        self.population_bucket_april = NonRevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=4,
+            bucket_date=date(2018, 4, 10),
+            is_on_supervision_last_day_of_month=False,
+            supervision_type=StateSupervisionPeriodSupervisionType.PAROLE
+        )
+
+        self.termination_bucket_april = SupervisionTerminationBucket(
+            state_code='US_ND', year=2018, month=4,
+            bucket_date=date(2018, 4, 10),
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION
+        )
+
+        self.supervision_time_buckets = [
+            self.termination_bucket_april,
+            self.revocation_bucket_april,
+            self.population_bucket_march,
+            self.population_bucket_april,
+        ]
+
+    def test_supervision_time_buckets_converter(self):
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=self.supervision_time_buckets)
+
+        self.assertEqual([self.population_bucket_march,
+                          self.termination_bucket_april,
+                          self.revocation_bucket_april,
+                          self.population_bucket_april],
+                         index.supervision_time_buckets)
+
+    def test_population_buckets_on_date(self):
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=self.supervision_time_buckets)
+
+        self.assertEqual([self.revocation_bucket_april, self.population_bucket_april],
+                         index.population_buckets_on_date(date(2018, 4, 10)))
+        self.assertEqual([self.population_bucket_march], index.population_buckets_on_date(date(2018, 3, 31)))
+        self.assertEqual([], index.population_buckets_on_date(date(2018, 4, 11)))
+
+    def test_buckets_of_type_in_month(self):
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=self.supervision_time_buckets)
+
+        self.assertEqual([self.revocation_bucket_april],
+                         index.buckets_of_type_in_month(RevocationReturnSupervisionTimeBucket, 2018, 4))
+        self.assertEqual([self.termination_bucket_april],
+                         index.buckets_of_type_in_month(SupervisionTerminationBucket, 2018, 4))
+        self.assertEqual([], index.buckets_of_type_in_month(SupervisionTerminationBucket, 2018, 3))
+        self.assertEqual([], index.buckets_of_type_in_month(ProjectedSupervisionCompletionBucket, 2018, 4))
+
+    def test_compliance_buckets_on_evaluation_date(self):
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=self.supervision_time_buckets)
+
+        self.assertEqual([self.population_bucket_march],
+                         index.compliance_buckets_on_evaluation_date(date(2018, 3, 31)))
+        self.assertEqual([], index.compliance_buckets_on_evaluation_date(date(2018, 4, 10)))
+
+    def test_metric_periods_not_set(self):
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=self.supervision_time_buckets)
+
+        self.assertEqual({}, index.buckets_by_metric_period)
+        self.assertFalse(index.bucket_in_metric_period(self.revocation_bucket_april, 1))
+        self.assertEqual([], index.buckets_of_type_in_metric_period(RevocationReturnSupervisionTimeBucket, 1))
+
+    def test_metric_periods(self):
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=self.supervision_time_buckets,
+                                           metric_period_end_date=date(2018, 4, 30))
+
+        self.assertEqual({36, 12, 6, 3}, set(index.buckets_by_metric_period.keys()))
+        self.assertTrue(index.bucket_in_metric_period(self.revocation_bucket_april, 3))
+        self.assertTrue(index.bucket_in_metric_period(self.population_bucket_march, 3))
+        self.assertFalse(index.bucket_in_metric_period(self.population_bucket_march, 1))
+        self.assertEqual([self.revocation_bucket_april],
+                         index.buckets_of_type_in_metric_period(RevocationReturnSupervisionTimeBucket, 3))
+        self.assertEqual([self.termination_bucket_april],
+                         index.buckets_of_type_in_metric_period(SupervisionTerminationBucket, 36))
+
+    def test_metric_periods_equal_buckets_indexed_by_identity(self):
+        duplicate_revocation_bucket = RevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=4,
+            bucket_date=date(2018, 4, 10),
+            is_on_supervision_last_day_of_month=False,
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION
+        )
+
+        index = SupervisionTimeBucketIndex(supervision_time_buckets=[self.revocation_bucket_april],
+                                           metric_period_end_date=date(2018, 4, 30))
+
+        self.assertTrue(index.bucket_in_metric_period(self.revocation_bucket_april, 3))
+        self.assertFalse(index.bucket_in_metric_period(duplicate_revocation_bucket, 3))
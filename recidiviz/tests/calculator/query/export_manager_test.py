@@ -17,6 +17,7 @@
 """Tests for export_manager.py."""
 
 import collections
+import datetime
 from http import HTTPStatus
 import json
 import unittest
@@ -28,7 +29,11 @@ from google.cloud.bigquery import DatasetReference
 
 from recidiviz.calculator.query import export_manager
 from recidiviz.calculator.query.county import dataset_config
+from recidiviz.persistence.database.base_schema import OperationsBase
+from recidiviz.persistence.database.schema.operations import dao as operations_dao
+from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.database.sqlalchemy_engine_manager import SchemaType
+from recidiviz.tests.utils import fakes
 from recidiviz.ingest.direct.direct_ingest_cloud_task_manager import \
     CloudTaskQueueInfo
 
@@ -287,3 +292,90 @@ class ExportManagerTestCounty(unittest.TestCase):
             assert_not_called()
         mock_pubsub_helper.publish_message_to_topic.assert_called_with(
             message=message, topic=topic)
+
+
+class ExportManagerTestStateIncremental(unittest.TestCase):
+    """Tests for export_manager.export_changed_then_merge_all_state_tables."""
+
+    def setUp(self):
+        fakes.use_in_memory_sqlite_database(OperationsBase)
+
+        self.bq_load_patcher = mock.patch('recidiviz.calculator.query.export_manager.bq_load')
+        self.mock_bq_load = self.bq_load_patcher.start()
+
+        self.cloudsql_export_patcher = mock.patch('recidiviz.calculator.query.export_manager.cloudsql_export')
+        self.mock_cloudsql_export = self.cloudsql_export_patcher.start()
+        self.mock_cloudsql_export.export_table.return_value = True
+
+        Table = collections.namedtuple('Table', ['name'])
+        self.new_table = Table('new_table')
+        self.exported_table = Table('exported_table')
+        export_config_values = {
+            'STATE_TABLES_TO_EXPORT': [self.new_table, self.exported_table],
+            'STATE_TABLE_EXPORT_QUERIES': {'new_table': 'SELECT new', 'exported_table': 'SELECT exported'}
+        }
+        self.export_config_patcher = mock.patch(
+            'recidiviz.calculator.query.export_manager.export_config', **export_config_values)
+        self.export_config_patcher.start()
+
+        self.incremental_export_patcher = mock.patch(
+            'recidiviz.calculator.query.export_manager.incremental_export.state_table_incremental_export_query',
+            return_value='SELECT changed')
+        self.mock_incremental_export_query = self.incremental_export_patcher.start()
+        self.merge_query_patcher = mock.patch(
+            'recidiviz.calculator.query.export_manager.incremental_export.merge_incremental_export_query',
+            return_value='MERGE')
+        self.merge_query_patcher.start()
+
+        self.mock_client = mock.MagicMock()
+        self.mock_client.dataset_ref_for_id.return_value = DatasetReference('project', 'state')
+
+        self.watermark_time = datetime.datetime(2020, 5, 1)
+        session = SessionFactory.for_schema_base(OperationsBase)
+        operations_dao.update_export_watermark(session, SchemaType.STATE.value, 'exported_table', self.watermark_time)
+        session.commit()
+        session.close()
+
+    def tearDown(self):
+        self.bq_load_patcher.stop()
+        self.cloudsql_export_patcher.stop()
+        self.export_config_patcher.stop()
+        self.incremental_export_patcher.stop()
+        self.merge_query_patcher.stop()
+        fakes.teardown_in_memory_sqlite_databases()
+
+    def _get_watermarks(self):
+        session = SessionFactory.for_schema_base(OperationsBase)
+        watermarks = operations_dao.get_export_watermarks(session, SchemaType.STATE.value)
+        session.close()
+        return watermarks
+
+    def test_export_changed_then_merge_all_state_tables(self):
+        export_manager.export_changed_then_merge_all_state_tables(self.mock_client)
+
+        self.mock_incremental_export_query.assert_called_once_with(self.exported_table, self.watermark_time)
+        self.mock_cloudsql_export.export_table.assert_has_calls([
+            mock.call(SchemaType.STATE, 'new_table', 'SELECT new'),
+            mock.call(SchemaType.STATE, 'exported_table_incremental', 'SELECT changed'),
+        ])
+        self.mock_bq_load.start_table_load.assert_has_calls([
+            mock.call(self.mock_client, DatasetReference('project', 'state'), 'new_table', SchemaType.STATE),
+            mock.call(self.mock_client, DatasetReference('project', 'state'), 'exported_table', SchemaType.STATE,
+                      destination_table_id='exported_table_incremental'),
+        ])
+        self.mock_client.run_query_async.assert_called_once_with('MERGE')
+
+        watermarks = self._get_watermarks()
+        self.assertEqual({'new_table', 'exported_table'}, set(watermarks))
+        self.assertGreater(watermarks['exported_table'], self.watermark_time)
+        self.assertEqual(watermarks['new_table'], watermarks['exported_table'])
+
+    def test_export_changed_then_merge_all_state_tables_failedLoad(self):
+        self.mock_bq_load.wait_for_table_load.side_effect = [True, False]
+
+        export_manager.export_changed_then_merge_all_state_tables(self.mock_client)
+
+        self.mock_client.run_query_async.assert_not_called()
+        watermarks = self._get_watermarks()
+        self.assertEqual(self.watermark_time, watermarks['exported_table'])
+        self.assertIn('new_table', watermarks)
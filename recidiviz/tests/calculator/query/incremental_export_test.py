@@ -0,0 +1,83 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for incremental_export.py."""
+import datetime
+import unittest
+
+from recidiviz.calculator.query import incremental_export
+from recidiviz.persistence.database.schema.state import schema
+
+_WATERMARK_TIME = datetime.datetime(2020, 5, 1, 12, 30)
+
+
+class IncrementalExportTest(unittest.TestCase):
+    """Tests for incremental_export.py."""
+
+    def test_state_table_incremental_export_query(self):
+        query = incremental_export.state_table_incremental_export_query(
+            schema.StatePersonRace.__table__, _WATERMARK_TIME)
+
+        self.assertEqual(
+            'SELECT state_code, race, race_raw_text, person_race_id, person_id '
+            'FROM state_person_race '
+            'WHERE person_race_id IN ('
+            'SELECT person_race_id FROM state_person_race_history '
+            "WHERE valid_from >= '2020-05-01 12:30:00')", query)
+
+    def test_state_table_incremental_export_query_historyTable(self):
+        query = incremental_export.state_table_incremental_export_query(
+            schema.StatePersonHistory.__table__, _WATERMARK_TIME)
+
+        self.assertTrue(query.startswith('SELECT '))
+        self.assertTrue(query.endswith(
+            "FROM state_person_history "
+            "WHERE valid_from >= '2020-05-01 12:30:00' "
+            "OR valid_to >= '2020-05-01 12:30:00'"))
+
+    def test_state_table_incremental_export_query_associationTable(self):
+        self.assertIsNone(
+            incremental_export.state_table_incremental_export_query(
+                schema.state_charge_incarceration_sentence_association_table,
+                _WATERMARK_TIME))
+
+    def test_merge_incremental_export_query(self):
+        query = incremental_export.merge_incremental_export_query(
+            'project', 'state', schema.StatePersonRace.__table__)
+
+        self.assertEqual(
+            'MERGE `project.state.state_person_race` base\n'
+            'USING `project.state.state_person_race_incremental` changes\n'
+            'ON base.person_race_id = changes.person_race_id\n'
+            'WHEN MATCHED THEN UPDATE SET state_code = changes.state_code, '
+            'race = changes.race, race_raw_text = changes.race_raw_text, '
+            'person_id = changes.person_id\n'
+            'WHEN NOT MATCHED THEN INSERT '
+            '(state_code, race, race_raw_text, person_race_id, person_id) '
+            'VALUES (changes.state_code, changes.race, changes.race_raw_text, '
+            'changes.person_race_id, changes.person_id)', query)
+
+    def test_merge_incremental_export_query_associationTable(self):
+        with self.assertRaises(ValueError):
+            incremental_export.merge_incremental_export_query(
+                'project', 'state',
+                schema.state_charge_incarceration_sentence_association_table)
+
+    def test_next_watermark_time(self):
+        export_start_time = datetime.datetime(2020, 5, 20)
+        self.assertEqual(
+            export_start_time - incremental_export.INCREMENTAL_EXPORT_LOOKBACK,
+            incremental_export.next_watermark_time(export_start_time))
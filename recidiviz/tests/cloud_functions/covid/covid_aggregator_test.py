@@ -0,0 +1,137 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for covid_aggregator.py."""
+import csv
+import os
+from typing import Dict, List
+from unittest import TestCase, mock
+
+from xlrd.sheet import Cell
+
+from recidiviz.cloud_functions.covid import covid_aggregator
+
+_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+_UCLA_SHEET_NAMES = ['5.1.20', '5.20.20']
+
+
+def _fixture_path(filename: str) -> str:
+    return os.path.join(_FIXTURES_DIR, filename)
+
+
+def _read_fixture(filename: str) -> str:
+    with open(_fixture_path(filename), newline='') as fixture_file:
+        return fixture_file.read()
+
+
+class _FakeSheet:
+    """Stand-in for an xlrd Sheet with text cells, supporting the operations used by the aggregator."""
+
+    def __init__(self, name: str, rows: List[List[str]]):
+        self.name = name
+        self._rows = [[Cell(1, value) if value else Cell(0, '') for value in row] for row in rows]
+        self.nrows = len(rows)
+
+    def row(self, index: int) -> List[Cell]:
+        return self._rows[index]
+
+
+class _FakeWorkbook:
+    """Stand-in for an xlrd Book, supporting the operations used by the aggregator."""
+
+    def __init__(self, sheets: List[_FakeSheet]):
+        self._sheets = sheets
+        self.datemode = 0
+
+    def sheets(self) -> List[_FakeSheet]:
+        return self._sheets
+
+
+class CovidAggregatorTest(TestCase):
+    """Tests for covid_aggregator.py, run over a small set of fixture sources."""
+
+    def setUp(self) -> None:
+        self.requests_patcher = mock.patch.object(covid_aggregator, 'requests')
+        mock_requests = self.requests_patcher.start()
+        mock_requests.get.return_value.content = _read_fixture('facility_info_mapping.csv').encode('utf-8')
+
+    def tearDown(self) -> None:
+        self.requests_patcher.stop()
+
+    @staticmethod
+    def _aggregate() -> str:
+        ucla_sheets = [_FakeSheet('Summary', [['Summary']])]
+        for sheet_name in _UCLA_SHEET_NAMES:
+            with open(_fixture_path(f'ucla_{sheet_name}.csv'), newline='') as sheet_file:
+                ucla_sheets.append(_FakeSheet(sheet_name, list(csv.reader(sheet_file))))
+
+        return covid_aggregator.aggregate(
+            csv.DictReader(_read_fixture('prison_data.csv').splitlines(), delimiter=','),
+            _FakeWorkbook(ucla_sheets),
+            csv.DictReader(_read_fixture('recidiviz_data.csv').splitlines(), delimiter=','))
+
+    def _aggregate_rows_by_facility(self) -> Dict[str, Dict[str, str]]:
+        return {f'{row["date"]}:{row["facility_name"]}': row
+                for row in csv.DictReader(self._aggregate().splitlines())}
+
+    def test_aggregate(self) -> None:
+        self.assertEqual(_read_fixture('expected_output.csv').splitlines(), self._aggregate().splitlines())
+
+    def test_aggregate_mapsToCanonicalFacilities(self) -> None:
+        rows = self._aggregate_rows_by_facility()
+
+        # Rows for alternate names from every source are combined under the canonical name and facility type, and
+        # rows for unmapped facilities, without a date or without any numeric values are dropped
+        self.assertEqual(['2020-05-01:Alabama Central Prison',
+                          '2020-05-01:FCI Big Spring',
+                          '2020-05-20:Delaware Correctional Center',
+                          '2020-05-20:Ohio Penitentiary'],
+                         sorted(rows))
+        self.assertEqual('State Prisons', rows['2020-05-01:Alabama Central Prison']['facility_type'])
+        # Federal facilities are mapped when reported with a state of 'Federal'
+        self.assertEqual('Federal Prisons', rows['2020-05-01:FCI Big Spring']['facility_type'])
+        self.assertEqual('Federal', rows['2020-05-01:FCI Big Spring']['location_state'])
+
+    def test_aggregate_combinesSourceValues(self) -> None:
+        rows = self._aggregate_rows_by_facility()
+
+        alabama = rows['2020-05-01:Alabama Central Prison']
+        # The max value over all sources is used
+        self.assertEqual('120', alabama['pop_tested_to_date'])
+        self.assertEqual('11', alabama['pop_positives_to_date'])
+        # A max of 0 is replaced by a value from a later source
+        self.assertEqual('0', alabama['staff_deaths_to_date'])
+        # Text values from all sources are joined
+        self.assertEqual('https://ucla.example.com/al, https://recidiviz.example.org/al', alabama['source'])
+        self.assertEqual('Resident deaths under review, Reported by phone', alabama['notes'])
+
+        # The last row for a facility and date in a source is used
+        big_spring = rows['2020-05-01:FCI Big Spring']
+        self.assertEqual('30', big_spring['pop_negatives_to_date'])
+        self.assertEqual('15', big_spring['staff_tested_to_date'])
+
+    def test_aggregate_tracksValueSources(self) -> None:
+        rows = self._aggregate_rows_by_facility()
+
+        # Sources are only listed if at least one numeric value was taken from them
+        self.assertEqual('Recidiviz, UCLA Law Behind Bars, covidprisondata.com',
+                         rows['2020-05-01:Alabama Central Prison']['compilation'])
+        self.assertEqual('covidprisondata.com', rows['2020-05-01:FCI Big Spring']['compilation'])
+        self.assertEqual('UCLA Law Behind Bars, covidprisondata.com',
+                         rows['2020-05-20:Ohio Penitentiary']['compilation'])
+        self.assertEqual('Recidiviz, UCLA Law Behind Bars',
+                         rows['2020-05-20:Delaware Correctional Center']['compilation'])
@@ -0,0 +1,41 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for the email reporting Cloud Functions."""
+import importlib
+import os
+import sys
+from types import ModuleType
+from typing import Tuple
+from unittest import mock
+
+_EMAIL_REPORTING_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'cloud_functions', 'email_reporting'))
+
+
+def import_email_reporting_modules(*module_names: str) -> Tuple[ModuleType, ...]:
+    """Imports and returns the given email reporting modules.
+
+    The email reporting modules are deployed as the root of their Cloud Function and import one another as top-level
+    modules, so their directory is only on the path, and they are only registered as top-level modules, while they are
+    being imported here. This keeps their generic module names from shadowing other modules for the rest of the tests.
+    """
+    with mock.patch.object(sys, 'path', [_EMAIL_REPORTING_DIR] + sys.path):
+        modules = tuple(importlib.import_module(module_name) for module_name in module_names)
+    for module_name, module in list(sys.modules.items()):
+        if getattr(module, '__file__', None) and module.__file__.startswith(_EMAIL_REPORTING_DIR + os.sep):
+            del sys.modules[module_name]
+    return modules
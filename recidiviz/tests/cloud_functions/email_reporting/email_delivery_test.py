@@ -0,0 +1,156 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for email_delivery.py."""
+import threading
+import time
+from typing import List
+from unittest import TestCase, mock
+
+from recidiviz.tests.cloud_functions.email_reporting import import_email_reporting_modules
+
+email_delivery, fakes = import_email_reporting_modules('email_delivery', 'fakes')
+
+_PROJECT_ID = 'recidiviz-test'
+_BATCH_ID = '20201105123033'
+
+
+@mock.patch.dict('os.environ', {'GCP_PROJECT': _PROJECT_ID,
+                                'FROM_EMAIL_ADDRESS': 'reports@recidiviz.org',
+                                'FROM_EMAIL_NAME': 'Recidiviz Reports'})
+@mock.patch.object(email_delivery, 'MAX_SENDS_PER_SECOND', 1000)
+class DeliverTest(TestCase):
+    """Tests for deliver."""
+
+    def setUp(self) -> None:
+        self.storage_client = fakes.FakeStorageClient()
+        self.addresses = [f'officer_{i}@recidiviz.org' for i in range(25)]
+        for address in self.addresses:
+            self.storage_client.upload_string(f'{_PROJECT_ID}-report-html', f'{_BATCH_ID}/{address}.html',
+                                              f'<html>Report for {address}</html>')
+        # Html files from another batch are not delivered
+        self.storage_client.upload_string(f'{_PROJECT_ID}-report-html', '20201001000000/other@recidiviz.org.html',
+                                          '<html>Old report</html>')
+
+    @staticmethod
+    def _to_addresses(sent_message: dict) -> List[str]:
+        return [to['email'] for personalization in sent_message['personalizations'] for to in personalization['to']]
+
+    def test_deliver(self) -> None:
+        sendgrid_client = fakes.FakeSendGridClient()
+
+        result = email_delivery.deliver(_BATCH_ID, storage_client=self.storage_client, sendgrid_client=sendgrid_client)
+
+        self.assertEqual((25, 0), result)
+        self.assertCountEqual(self.addresses,
+                              [address for message in sendgrid_client.sent_messages
+                               for address in self._to_addresses(message)])
+        for message in sendgrid_client.sent_messages:
+            [to_address] = self._to_addresses(message)
+            self.assertEqual(email_delivery.EMAIL_SUBJECT, message['subject'])
+            self.assertEqual({'email': 'reports@recidiviz.org', 'name': 'Recidiviz Reports'}, message['from'])
+            self.assertEqual([{'type': 'text/html', 'value': f'<html>Report for {to_address}</html>'}],
+                             message['content'])
+
+    def test_deliver_withFailures(self) -> None:
+        failing_addresses = self.addresses[3:6]
+        sendgrid_client = fakes.FakeSendGridClient(failing_addresses=failing_addresses)
+
+        result = email_delivery.deliver(_BATCH_ID, storage_client=self.storage_client, sendgrid_client=sendgrid_client)
+
+        self.assertEqual((22, 3), result)
+        self.assertCountEqual([address for address in self.addresses if address not in failing_addresses],
+                              [address for message in sendgrid_client.sent_messages
+                               for address in self._to_addresses(message)])
+
+    def test_deliver_testAddress(self) -> None:
+        sendgrid_client = fakes.FakeSendGridClient()
+
+        result = email_delivery.deliver(_BATCH_ID, test_address='tester@recidiviz.org',
+                                        storage_client=self.storage_client, sendgrid_client=sendgrid_client)
+
+        self.assertEqual((25, 0), result)
+        self.assertEqual(25, len(sendgrid_client.sent_messages))
+        for message in sendgrid_client.sent_messages:
+            self.assertEqual(['tester@recidiviz.org'], self._to_addresses(message))
+        self.assertCountEqual([f'[{address}] {email_delivery.EMAIL_SUBJECT}' for address in self.addresses],
+                              [message['subject'] for message in sendgrid_client.sent_messages])
+
+    def test_deliver_testAddressFails(self) -> None:
+        sendgrid_client = fakes.FakeSendGridClient(failing_addresses=['tester@recidiviz.org'])
+
+        result = email_delivery.deliver(_BATCH_ID, test_address='tester@recidiviz.org',
+                                        storage_client=self.storage_client, sendgrid_client=sendgrid_client)
+
+        self.assertEqual((0, 25), result)
+        self.assertEqual([], sendgrid_client.sent_messages)
+
+    def test_deliver_noFiles(self) -> None:
+        with self.assertRaises(IndexError):
+            email_delivery.deliver('20200101000000', storage_client=self.storage_client,
+                                   sendgrid_client=fakes.FakeSendGridClient())
+
+
+class RateLimiterTest(TestCase):
+    """Tests for RateLimiter."""
+
+    def test_wait_spacesOutCalls(self) -> None:
+        clock = [100.0]
+        sleeps = []
+
+        def _sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        with mock.patch.object(email_delivery.time, 'monotonic', side_effect=lambda: clock[0]), \
+                mock.patch.object(email_delivery.time, 'sleep', side_effect=_sleep):
+            rate_limiter = email_delivery.RateLimiter(max_per_second=4)
+            return_times = []
+            for _ in range(5):
+                rate_limiter.wait()
+                return_times.append(clock[0])
+
+            self.assertEqual([100.0, 100.25, 100.5, 100.75, 101.0], return_times)
+            self.assertEqual([0.25] * 4, sleeps)
+
+            # No waiting is needed once a full interval has passed since the last call
+            clock[0] += 10
+            sleeps.clear()
+            rate_limiter.wait()
+            self.assertEqual([], sleeps)
+
+    def test_wait_spacesOutCallsAcrossThreads(self) -> None:
+        max_per_second = 50
+        rate_limiter = email_delivery.RateLimiter(max_per_second=max_per_second)
+        return_times = []
+        lock = threading.Lock()
+
+        def _wait() -> None:
+            rate_limiter.wait()
+            with lock:
+                return_times.append(time.monotonic())
+
+        threads = [threading.Thread(target=_wait) for _ in range(11)]
+        start_time = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # However the threads are scheduled, the k-th call to return does so no earlier than k intervals after the
+        # first call was made
+        for k, return_time in enumerate(sorted(return_times)):
+            self.assertGreaterEqual(return_time - start_time, k / max_per_second - 0.001)
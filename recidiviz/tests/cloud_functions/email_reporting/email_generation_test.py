@@ -0,0 +1,137 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for email_generation.py."""
+import json
+from typing import List
+from unittest import TestCase, mock
+
+from recidiviz.tests.cloud_functions.email_reporting import import_email_reporting_modules
+
+email_generation, utils, fakes, report_context = import_email_reporting_modules(
+    'email_generation', 'email_reporting_utils', 'fakes', 'report_context')
+ReportContext = report_context.ReportContext
+
+_PROJECT_ID = 'recidiviz-test'
+_BATCH_ID = '20201105123033'
+
+
+class _TestReportContext(ReportContext):
+    """Report context whose prepared data is the recipient data as-is."""
+
+    def __init__(self, state_code: str, recipient_data: dict, report_type: str, chart: bool):
+        super().__init__(state_code, recipient_data)
+        self.report_type = report_type
+        self.chart = chart
+
+    def get_report_type(self) -> str:
+        return self.report_type
+
+    def has_chart(self) -> bool:
+        return self.chart
+
+    def prepare_for_generation(self) -> dict:
+        self.prepared_data = dict(self.recipient_data)
+        return self.prepared_data
+
+
+@mock.patch.dict('os.environ', {'GCP_PROJECT': _PROJECT_ID})
+class EmailGenerationTest(TestCase):
+    """Tests for generate_batch and generate."""
+
+    def setUp(self) -> None:
+        self.storage_client = fakes.FakeStorageClient()
+        self.publisher = fakes.FakePublisherClient()
+
+    def _add_template(self, state_code: str, report_type: str, contents: str) -> None:
+        self.storage_client.upload_string(f'{_PROJECT_ID}-report-data',
+                                          f'{report_type}/{state_code}/template.html',
+                                          contents)
+
+    @staticmethod
+    def _report_contexts(state_code: str, report_type: str, count: int, chart: bool) -> List[ReportContext]:
+        return [
+            _TestReportContext(state_code,
+                               {
+                                   utils.KEY_BATCH_ID: _BATCH_ID,
+                                   utils.KEY_EMAIL_ADDRESS: f'{state_code.lower()}_{i}@recidiviz.org',
+                                   utils.KEY_STATE_CODE: state_code,
+                                   'name': f'Officer {i}',
+                               },
+                               report_type,
+                               chart)
+            for i in range(count)
+        ]
+
+    def test_generate_batch(self) -> None:
+        self._add_template('US_ID', 'po_monthly_report', 'ID report for $name')
+        self._add_template('US_ND', 'po_monthly_report', 'ND report for $name')
+        report_contexts = self._report_contexts('US_ID', 'po_monthly_report', 30, chart=True) + \
+            self._report_contexts('US_ND', 'po_monthly_report', 20, chart=False)
+
+        with mock.patch.object(self.storage_client, 'download_string',
+                               wraps=self.storage_client.download_string) as mock_download:
+            email_generation.generate_batch(report_contexts, storage_client=self.storage_client,
+                                            publisher=self.publisher)
+
+        # Each template is downloaded once for the whole batch
+        self.assertCountEqual(
+            [mock.call(f'{_PROJECT_ID}-report-data', 'po_monthly_report/US_ID/template.html'),
+             mock.call(f'{_PROJECT_ID}-report-data', 'po_monthly_report/US_ND/template.html')],
+            mock_download.call_args_list)
+
+        html_files = {name: contents.decode('utf-8') for (bucket, name), contents in self.storage_client.files.items()
+                      if bucket == f'{_PROJECT_ID}-report-html'}
+        self.assertEqual(50, len(html_files))
+        self.assertEqual('ID report for Officer 3', html_files[f'{_BATCH_ID}/us_id_3@recidiviz.org.html'])
+        self.assertEqual('ND report for Officer 19', html_files[f'{_BATCH_ID}/us_nd_19@recidiviz.org.html'])
+
+        # Only the reports with charts publish a chart generation message
+        self.assertEqual(30, len(self.publisher.messages))
+        self.assertEqual({f'projects/{_PROJECT_ID}/topics/report_po_comparison_chart'},
+                         {topic for topic, _ in self.publisher.messages})
+        self.assertCountEqual([f'us_id_{i}@recidiviz.org' for i in range(30)],
+                              [json.loads(data)[utils.KEY_EMAIL_ADDRESS] for _, data in self.publisher.messages])
+
+    def test_generate_batch_missingTemplate(self) -> None:
+        self._add_template('US_ID', 'po_monthly_report', 'ID report for $name')
+        report_contexts = self._report_contexts('US_ID', 'po_monthly_report', 5, chart=False) + \
+            self._report_contexts('US_ND', 'po_monthly_report', 5, chart=False)
+
+        with self.assertRaises(FileNotFoundError):
+            email_generation.generate_batch(report_contexts, storage_client=self.storage_client,
+                                            publisher=self.publisher)
+
+    def test_generate_batch_missingTemplateValue(self) -> None:
+        self._add_template('US_ID', 'po_monthly_report', 'ID report for $name in $district')
+        report_contexts = self._report_contexts('US_ID', 'po_monthly_report', 5, chart=False)
+
+        with self.assertRaises(KeyError):
+            email_generation.generate_batch(report_contexts, storage_client=self.storage_client,
+                                            publisher=self.publisher)
+
+    def test_template_cache(self) -> None:
+        self._add_template('US_ID', 'po_monthly_report', 'ID report for $name')
+        template_cache = email_generation.TemplateCache(self.storage_client)
+
+        with mock.patch.object(self.storage_client, 'download_string',
+                               wraps=self.storage_client.download_string) as mock_download:
+            first = template_cache.get_template('US_ID', 'po_monthly_report')
+            second = template_cache.get_template('US_ID', 'po_monthly_report')
+
+        self.assertIs(first, second)
+        self.assertEqual('ID report for Officer 1', first.substitute({'name': 'Officer 1'}))
+        mock_download.assert_called_once()
@@ -304,3 +304,30 @@ class BuildableAttrTests(unittest.TestCase):
 
             # Build from dictionary
             _ = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
+
+    def testBuildFromDictionary_MissingRequiredArgs_RaisesBuilderException(self):
+        with self.assertRaises(BuilderException) as e:
+            FakeBuildableAttrDeluxe.build_from_dictionary({'required_field': 'value'})
+
+        self.assertIn("Missing Fields: {", str(e.exception))
+        self.assertIn("'another_required_field'", str(e.exception))
+        self.assertIn("'enum_nonnull_field'", str(e.exception))
+
+    def testBuildFromDictionary_MatchesBuilder(self):
+        subject_dict = {'required_field': 'value',
+                        'another_required_field': 'another_value',
+                        'enum_nonnull_field': FakeEnum.A.value,
+                        'enum_field': None,
+                        'date_field': '20010108',
+                        'field_list': ['a']}
+
+        builder = FakeBuildableAttrDeluxe.builder()
+        builder.required_field = 'value'
+        builder.another_required_field = 'another_value'
+        builder.enum_nonnull_field = FakeEnum.A
+        builder.enum_field = None
+        builder.date_field = date(2001, 1, 8)
+        builder.field_list = ['a']
+
+        self.assertEqual(builder.build(), FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict))
+        self.assertEqual(builder.build(), FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict))
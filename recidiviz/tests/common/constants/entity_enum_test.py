@@ -19,7 +19,8 @@
 import unittest
 from typing import Optional
 
-from recidiviz.common.constants.entity_enum import EntityEnum, EnumParsingError
+from recidiviz.common.constants.entity_enum import EntityEnum, EnumParsingError, clear_enum_parse_cache, \
+    enum_parse_cache_info
 from recidiviz.common.constants.enum_overrides import EnumOverrides
 
 
@@ -38,6 +39,12 @@ class FakeEntityEnum(EntityEnum):
 class EntityEnumTest(unittest.TestCase):
     """Tests for EntityEnum class."""
 
+    def setUp(self) -> None:
+        clear_enum_parse_cache()
+
+    def tearDown(self) -> None:
+        clear_enum_parse_cache()
+
     def testParse_InvalidString_throwsEnumParsingError(self):
         with self.assertRaises(EnumParsingError):
             FakeEntityEnum.parse('invalid', EnumOverrides.empty())
@@ -117,3 +124,44 @@ class EntityEnumTest(unittest.TestCase):
 
         with self.assertRaises(EnumParsingError):
             FakeEntityEnum.parse('A STRING TO PARSE', overrides)
+
+    def testParse_RepeatedLabel_ParsesOnce(self):
+        mapped_labels = []
+
+        def _mapper(label: str) -> Optional[FakeEntityEnum]:
+            mapped_labels.append(label)
+            return FakeEntityEnum.BANANA if label == 'BAN' else None
+
+        overrides_builder = EnumOverrides.Builder()
+        overrides_builder.add_mapper(_mapper, FakeEntityEnum)
+        overrides = overrides_builder.build()
+
+        for _ in range(3):
+            self.assertEqual(FakeEntityEnum.parse('ban', overrides), FakeEntityEnum.BANANA)
+            self.assertEqual(FakeEntityEnum.parse('strawberry', overrides), FakeEntityEnum.STRAWBERRY)
+
+        self.assertEqual(['BAN', 'STRAWBERRY'], mapped_labels)
+        cache_info = enum_parse_cache_info()
+        self.assertEqual(4, cache_info.hits)
+        self.assertEqual(2, cache_info.misses)
+        self.assertEqual(2, cache_info.size)
+
+    def testParse_RepeatedInvalidLabel_RaisesEachTime(self):
+        overrides = EnumOverrides.empty()
+        for _ in range(2):
+            with self.assertRaises(EnumParsingError) as e:
+                FakeEntityEnum.parse('"invalid"', overrides)
+            self.assertEqual(FakeEntityEnum, e.exception.entity_type)
+            self.assertIn('INVALID', str(e.exception))
+
+        self.assertEqual(1, enum_parse_cache_info().hits)
+
+    def testParse_DifferentOverrides_NotShared(self):
+        overrides_builder = EnumOverrides.Builder()
+        overrides_builder.add('BAN', FakeEntityEnum.BANANA)
+        overrides = overrides_builder.build()
+
+        self.assertEqual(FakeEntityEnum.parse('ban', overrides), FakeEntityEnum.BANANA)
+        with self.assertRaises(EnumParsingError):
+            FakeEntityEnum.parse('ban', EnumOverrides.empty())
+        self.assertEqual(0, enum_parse_cache_info().hits)
@@ -73,3 +73,28 @@ class EnumOverridesTest(unittest.TestCase):
         overrides = overrides_builder.build()
 
         self.assertTrue(overrides.should_ignore('NONE', ChargeClass))
+
+    def test_parse_callsEachMapperOnce(self):
+        mapped_labels = []
+
+        def _mapper(label):
+            mapped_labels.append(label)
+            return BondStatus.PENDING
+
+        overrides_builder = EnumOverrides.Builder()
+        overrides_builder.add_mapper(_mapper, BondStatus)
+        overrides = overrides_builder.build()
+
+        self.assertEqual(overrides.parse('PENDING', BondStatus), BondStatus.PENDING)
+        self.assertEqual(['PENDING'], mapped_labels)
+
+    def test_toBuilder_doesNotChangeOriginal(self):
+        overrides_builder = EnumOverrides.Builder()
+        overrides_builder.add('A', Race.ASIAN)
+        overrides = overrides_builder.build()
+
+        extended_overrides = overrides.to_builder().add('B', Race.BLACK).build()
+
+        self.assertEqual(extended_overrides.parse('A', Race), Race.ASIAN)
+        self.assertEqual(extended_overrides.parse('B', Race), Race.BLACK)
+        self.assertIsNone(overrides.parse('B', Race))
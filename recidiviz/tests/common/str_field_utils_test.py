@@ -22,12 +22,18 @@ import pytest
 
 from recidiviz.common.str_field_utils import parse_days, parse_dollars, \
     parse_bool, parse_date, parse_datetime, parse_days_from_duration_pieces, parse_int, parse_date_from_date_pieces, \
-    safe_parse_date_from_date_pieces
+    safe_parse_date_from_date_pieces, clear_date_parse_cache, date_parse_tier_counts, DateParseTierCounts
 
 
 class TestStrFieldUtils(TestCase):
     """Test conversion util methods."""
 
+    def setUp(self) -> None:
+        clear_date_parse_cache()
+
+    def tearDown(self) -> None:
+        clear_date_parse_cache()
+
     def test_parseInt(self):
         assert parse_int('123') == 123
 
@@ -176,3 +182,32 @@ class TestStrFieldUtils(TestCase):
     def test_parseBadDate(self):
         with pytest.raises(ValueError):
             parse_datetime('ABC')
+
+    def test_parseDateTime_cachesRepeatedStrings(self):
+        for _ in range(3):
+            assert parse_datetime('Jan 1, 2018 1:40') == \
+                   datetime.datetime(year=2018, month=1, day=1, hour=1, minute=40)
+            assert parse_datetime('01/02/2018') == datetime.datetime(year=2018, month=1, day=2)
+
+        assert date_parse_tier_counts() == \
+               DateParseTierCounts(cache_hits=4, fast_path_parses=1, dateparser_parses=1)
+
+    def test_parseDateTime_fastPathFormats(self):
+        assert parse_datetime('2018-01-02') == datetime.datetime(year=2018, month=1, day=2)
+        assert parse_datetime('1/2/2018 1:05 PM') == \
+               datetime.datetime(year=2018, month=1, day=2, hour=13, minute=5)
+        assert parse_datetime('2018-01-02 03:04:05') == \
+               datetime.datetime(year=2018, month=1, day=2, hour=3, minute=4, second=5)
+        assert parse_datetime('1/2/2018 00:00 AM') == datetime.datetime(year=2018, month=1, day=2)
+
+        assert date_parse_tier_counts() == \
+               DateParseTierCounts(cache_hits=0, fast_path_parses=4, dateparser_parses=0)
+
+    def test_parseDateTime_relativeNotCached(self):
+        assert parse_datetime('1y 1m 1d', from_dt=datetime.datetime(2000, 1, 1)) == \
+               datetime.datetime(year=1998, month=11, day=30)
+        assert parse_datetime('1y 1m 1d', from_dt=datetime.datetime(2001, 1, 1)) == \
+               datetime.datetime(year=1999, month=11, day=30)
+
+        assert date_parse_tier_counts() == \
+               DateParseTierCounts(cache_hits=0, fast_path_parses=0, dateparser_parses=2)
@@ -0,0 +1,122 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for csv_row_scanner.py."""
+import io
+import unittest
+from typing import List
+
+import pandas as pd
+from mock import patch
+
+from recidiviz.ingest.direct.controllers import csv_row_scanner
+from recidiviz.ingest.direct.controllers.csv_row_scanner import iter_csv_rows, CsvRowScanError
+
+
+def _scan(contents: bytes, separator: str = ',') -> List[bytes]:
+    return list(iter_csv_rows(io.BytesIO(contents), separator=separator))
+
+
+class TestIterCsvRows(unittest.TestCase):
+    """Tests for iter_csv_rows."""
+
+    def _assert_matches_pandas(self, contents: bytes, separator: str = ',') -> None:
+        rows = _scan(contents, separator=separator)
+
+        expected_df = pd.read_csv(io.BytesIO(contents), sep=separator, dtype=str, keep_default_na=False)
+        for i, row in enumerate(rows[1:]):
+            row_df = pd.read_csv(io.BytesIO(rows[0] + row), sep=separator, dtype=str, keep_default_na=False)
+            self.assertEqual(1, len(row_df))
+            self.assertEqual(expected_df.iloc[i].tolist(), row_df.iloc[0].tolist())
+        self.assertEqual(len(expected_df), len(rows) - 1)
+
+    def test_empty(self):
+        self.assertEqual([], _scan(b''))
+        self.assertEqual([], _scan(b'\n\n  \n'))
+
+    def test_header_only(self):
+        self.assertEqual([b'a,b,c'], _scan(b'a,b,c'))
+        self.assertEqual([b'a,b,c\n'], _scan(b'a,b,c\n'))
+
+    def test_plain_rows(self):
+        contents = b'a,b,c\n1,2,3\r\n4,,6\n7,8,9'
+        self.assertEqual([b'a,b,c\n', b'1,2,3\r\n', b'4,,6\n', b'7,8,9'], _scan(contents))
+        self._assert_matches_pandas(contents)
+
+    def test_blank_rows_skipped(self):
+        contents = b'a,b\n\n1,2\n \t\r\n3,4\n\n'
+        self.assertEqual([b'a,b\n', b'1,2\n', b'3,4\n'], _scan(contents))
+        self._assert_matches_pandas(contents)
+
+    def test_quoted_fields(self):
+        contents = (b'a,b,c\n'
+                    b'"1,1","multi\nline\r\nvalue",3\n'
+                    b'"escaped ""quote""",mid"field "quote,"closed" then text\n'
+                    b'"",x,""""\n'
+                    b'"\n",,"\n\n"')
+        self.assertEqual([
+            b'a,b,c\n',
+            b'"1,1","multi\nline\r\nvalue",3\n',
+            b'"escaped ""quote""",mid"field "quote,"closed" then text\n',
+            b'"",x,""""\n',
+            b'"\n",,"\n\n"',
+        ], _scan(contents))
+        self._assert_matches_pandas(contents)
+
+    def test_other_separator(self):
+        contents = b'a|b\n"1|\n"|2\n3,|4\n'
+        self.assertEqual([b'a|b\n', b'"1|\n"|2\n', b'3,|4\n'], _scan(contents, separator='|'))
+        self._assert_matches_pandas(contents, separator='|')
+
+    def test_unsupported_separator(self):
+        with self.assertRaises(ValueError):
+            _scan(b'a\n', separator='"')
+        with self.assertRaises(ValueError):
+            _scan(b'a\n', separator='||')
+
+    def test_unterminated_quote(self):
+        with self.assertRaises(CsvRowScanError):
+            _scan(b'a,b\n1,"2\n3,4\n')
+
+    def test_carriage_return_without_newline(self):
+        with self.assertRaises(CsvRowScanError):
+            _scan(b'a,b\r1,2\r')
+        with self.assertRaises(CsvRowScanError):
+            _scan(b'a,b\n"1",2\r3,4\n')
+
+        # Carriage returns inside quoted fields are part of the value
+        self.assertEqual([b'a,b\n', b'"1\r",2\n'], _scan(b'a,b\n"1\r",2\n'))
+
+    @patch.object(csv_row_scanner, 'ROW_SCAN_BLOCK_SIZE_BYTES', 1)
+    def test_small_blocks(self):
+        contents = (b'a,b,c\n'
+                    b'1,2,3\r\n'
+                    b'"long quoted\nvalue ""with"" quotes","x",y\r\n'
+                    b'\n'
+                    b'4,"5\r\n",6')
+        self.assertEqual([
+            b'a,b,c\n',
+            b'1,2,3\r\n',
+            b'"long quoted\nvalue ""with"" quotes","x",y\r\n',
+            b'4,"5\r\n",6',
+        ], _scan(contents))
+        self._assert_matches_pandas(contents)
+
+    @patch.object(csv_row_scanner, 'ROW_SCAN_BLOCK_SIZE_BYTES', 2)
+    def test_small_blocks_quoted_fields_split_across_blocks(self):
+        contents = b'a\n""""\n"""a"""\n""\n'
+        self.assertEqual([b'a\n', b'""""\n', b'"""a"""\n', b'""\n'], _scan(contents))
+        self._assert_matches_pandas(contents)
@@ -16,6 +16,7 @@
 # =============================================================================
 """Tests for direct_ingest_ingest_view_export_manager.py."""
 import datetime
+import hashlib
 import unittest
 from typing import List
 
@@ -52,6 +53,7 @@ _DATE_1 = datetime.datetime(year=2019, month=7, day=20)
 _DATE_2 = datetime.datetime(year=2020, month=7, day=20)
 _DATE_3 = datetime.datetime(year=2021, month=7, day=20)
 _DATE_4 = datetime.datetime(year=2022, month=7, day=20)
+_DATASET_ID = 'us_xx_ingest_views'
 
 
 class _ViewCollector(BigQueryViewCollector[DirectIngestPreProcessedIngestView]):
@@ -91,6 +93,7 @@ class DirectIngestIngestViewExportManagerTest(unittest.TestCase):
         self.mock_client = self.client_patcher.start().return_value
         project_id_mock = mock.PropertyMock(return_value='recidiviz-456')
         type(self.mock_client).project_id = project_id_mock
+        self.mock_client.list_tables.return_value = []
 
     def tearDown(self) -> None:
         self.client_patcher.stop()
@@ -116,6 +119,35 @@ class DirectIngestIngestViewExportManagerTest(unittest.TestCase):
             file_metadata_manager=metadata_manager,
             view_collector=_ViewCollector(region, controller_file_tags=['ingest_view']))
 
+    @staticmethod
+    def snapshot_table_name(export_manager, date_bound):
+        query = export_manager.ingest_views_by_tag['ingest_view'].date_parametrized_view_query('update_timestamp')
+        query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+        return f'ingest_view_{date_bound.strftime("%Y_%m_%d_%H_%M_%S")}_{query_hash}_snapshot'
+
+    @staticmethod
+    def table_list_item(table_id, created):
+        table = mock.Mock(table_id=table_id, created=created)
+        return table
+
+    @staticmethod
+    def add_pending_export_metadata(region, export_args):
+        session = SessionFactory.for_schema_base(OperationsBase)
+        session.add(schema.DirectIngestIngestFileMetadata(
+            file_id=_ID,
+            region_code=region.region_code,
+            file_tag=export_args.ingest_view_name,
+            normalized_file_name='normalized_file_name',
+            is_invalidated=False,
+            is_file_split=False,
+            job_creation_time=_DATE_1,
+            export_time=None,
+            datetimes_contained_lower_bound_exclusive=export_args.upper_bound_datetime_prev,
+            datetimes_contained_upper_bound_inclusive=export_args.upper_bound_datetime_to_export
+        ))
+        session.commit()
+        session.close()
+
     @staticmethod
     def generate_query_params_for_date(date_param):
         return ScalarQueryParameter('update_timestamp', 'DATETIME', date_param)
@@ -236,20 +268,21 @@ class DirectIngestIngestViewExportManagerTest(unittest.TestCase):
             export_manager.export_view_for_args(export_args)
 
         # Assert
+        upper_bound_table_name = self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_to_export)
         self.mock_client.create_table_from_query_async.assert_has_calls([
             mock.call(
                 dataset_id='us_xx_ingest_views',
                 overwrite=True,
                 query=mock.ANY,
                 query_parameters=[self.generate_query_params_for_date(export_args.upper_bound_datetime_to_export)],
-                table_id='ingest_view_2020_07_20_00_00_00_upper_bound'),
+                table_id=upper_bound_table_name),
         ])
         expected_query = \
-            'SELECT * FROM `recidiviz-456.us_xx_ingest_views.ingest_view_2020_07_20_00_00_00_upper_bound` ' \
+            f'SELECT * FROM `recidiviz-456.us_xx_ingest_views.{upper_bound_table_name}` ' \
             'ORDER BY colA, colC;'
         self.assert_exported_to_gcs_with_query(expected_query)
-        self.mock_client.delete_table.assert_has_calls([
-            mock.call(dataset_id='us_xx_ingest_views', table_id='ingest_view_2020_07_20_00_00_00_upper_bound')])
+        # The upper bound snapshot is retained to be the lower bound of the next export
+        self.mock_client.delete_table.assert_not_called()
         assert_session = SessionFactory.for_schema_base(OperationsBase)
         found_metadata = self.to_entity(one(assert_session.query(schema.DirectIngestIngestFileMetadata).all()))
         self.assertEqual(expected_metadata, found_metadata)
@@ -287,32 +320,145 @@ class DirectIngestIngestViewExportManagerTest(unittest.TestCase):
             export_manager.export_view_for_args(export_args)
 
         # Assert
+        upper_bound_table_name = self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_to_export)
+        lower_bound_table_name = self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_prev)
         self.mock_client.create_table_from_query_async.assert_has_calls([
             mock.call(
                 dataset_id='us_xx_ingest_views',
                 overwrite=True,
                 query=mock.ANY,
                 query_parameters=[self.generate_query_params_for_date(export_args.upper_bound_datetime_to_export)],
-                table_id='ingest_view_2020_07_20_00_00_00_upper_bound'),
+                table_id=upper_bound_table_name),
             mock.call(
                 dataset_id='us_xx_ingest_views',
                 overwrite=True,
                 query=mock.ANY,
                 query_parameters=[self.generate_query_params_for_date(export_args.upper_bound_datetime_prev)],
-                table_id='ingest_view_2019_07_20_00_00_00_lower_bound'),
+                table_id=lower_bound_table_name),
         ])
         expected_query = \
-            '(SELECT * FROM `recidiviz-456.us_xx_ingest_views.ingest_view_2020_07_20_00_00_00_upper_bound`) ' \
+            f'(SELECT * FROM `recidiviz-456.us_xx_ingest_views.{upper_bound_table_name}`) ' \
             'EXCEPT DISTINCT ' \
-            '(SELECT * FROM `recidiviz-456.us_xx_ingest_views.ingest_view_2019_07_20_00_00_00_lower_bound`) ' \
+            f'(SELECT * FROM `recidiviz-456.us_xx_ingest_views.{lower_bound_table_name}`) ' \
             'ORDER BY colA, colC;'
         self.assert_exported_to_gcs_with_query(expected_query)
-        self.mock_client.delete_table.assert_has_calls([
-            mock.call(dataset_id='us_xx_ingest_views', table_id='ingest_view_2020_07_20_00_00_00_upper_bound'),
-            mock.call(dataset_id='us_xx_ingest_views', table_id='ingest_view_2019_07_20_00_00_00_lower_bound'),
-        ])
+        self.mock_client.delete_table.assert_called_once_with(
+            dataset_id='us_xx_ingest_views', table_id=lower_bound_table_name)
 
         assert_session = SessionFactory.for_schema_base(OperationsBase)
         found_metadata = self.to_entity(one(assert_session.query(schema.DirectIngestIngestFileMetadata).all()))
         self.assertEqual(expected_metadata, found_metadata)
         assert_session.close()
+
+    def test_exportViewForArgs_reusesLowerBoundSnapshot(self):
+        # Arrange
+        region = self.create_fake_region()
+        export_manager = self.create_export_manager(region)
+        export_args = GcsfsIngestViewExportArgs(
+            ingest_view_name='ingest_view',
+            upper_bound_datetime_prev=_DATE_1,
+            upper_bound_datetime_to_export=_DATE_2)
+        self.add_pending_export_metadata(region, export_args)
+
+        lower_bound_table_name = self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_prev)
+        self.mock_client.list_tables.return_value = [
+            self.table_list_item(lower_bound_table_name, created=_DATE_4.replace(tzinfo=datetime.timezone.utc)),
+            self.table_list_item('other_table', created=_DATE_1.replace(tzinfo=datetime.timezone.utc)),
+        ]
+
+        # Act
+        with freeze_time(_DATE_4.isoformat()):
+            export_manager.export_view_for_args(export_args)
+
+        # Assert
+        upper_bound_table_name = self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_to_export)
+        self.mock_client.list_tables.assert_called_once_with(_DATASET_ID)
+        self.mock_client.create_table_from_query_async.assert_called_once_with(
+            dataset_id=_DATASET_ID,
+            overwrite=True,
+            query=mock.ANY,
+            query_parameters=[self.generate_query_params_for_date(export_args.upper_bound_datetime_to_export)],
+            table_id=upper_bound_table_name)
+        expected_query = \
+            f'(SELECT * FROM `recidiviz-456.us_xx_ingest_views.{upper_bound_table_name}`) ' \
+            'EXCEPT DISTINCT ' \
+            f'(SELECT * FROM `recidiviz-456.us_xx_ingest_views.{lower_bound_table_name}`) ' \
+            'ORDER BY colA, colC;'
+        self.assert_exported_to_gcs_with_query(expected_query)
+        # The reused lower bound may also have been reused by a concurrent export, so it is left for the next export
+        self.mock_client.delete_table.assert_not_called()
+
+    def test_exportViewForArgs_rebuildsSnapshotAfterRawDataBackfill(self):
+        # Arrange
+        region = self.create_fake_region()
+        export_manager = self.create_export_manager(region)
+        export_args = GcsfsIngestViewExportArgs(
+            ingest_view_name='ingest_view',
+            upper_bound_datetime_prev=_DATE_2,
+            upper_bound_datetime_to_export=_DATE_3)
+        self.add_pending_export_metadata(region, export_args)
+
+        lower_bound_table_name = self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_prev)
+        self.mock_client.list_tables.return_value = [
+            self.table_list_item(lower_bound_table_name, created=_DATE_3.replace(tzinfo=datetime.timezone.utc)),
+        ]
+
+        # A raw file with data from before the lower bound was discovered after the lower bound snapshot was created
+        session = SessionFactory.for_schema_base(OperationsBase)
+        session.add(schema.DirectIngestRawFileMetadata(
+            region_code=region.region_code,
+            file_tag='file_tag_first',
+            discovery_time=_DATE_3 + datetime.timedelta(days=1),
+            normalized_file_name='raw_file_name',
+            datetimes_contained_upper_bound_inclusive=_DATE_1))
+        session.commit()
+        session.close()
+
+        # Act
+        with freeze_time(_DATE_4.isoformat()):
+            export_manager.export_view_for_args(export_args)
+
+        # Assert
+        self.mock_client.create_table_from_query_async.assert_has_calls([
+            mock.call(
+                dataset_id=_DATASET_ID,
+                overwrite=True,
+                query=mock.ANY,
+                query_parameters=[self.generate_query_params_for_date(export_args.upper_bound_datetime_to_export)],
+                table_id=self.snapshot_table_name(export_manager, export_args.upper_bound_datetime_to_export)),
+            mock.call(
+                dataset_id=_DATASET_ID,
+                overwrite=True,
+                query=mock.ANY,
+                query_parameters=[self.generate_query_params_for_date(export_args.upper_bound_datetime_prev)],
+                table_id=lower_bound_table_name),
+        ])
+
+    def test_exportViewForArgs_deletesSnapshotsPastRetention(self):
+        # Arrange
+        region = self.create_fake_region()
+        export_manager = self.create_export_manager(region)
+        export_args = GcsfsIngestViewExportArgs(
+            ingest_view_name='ingest_view',
+            upper_bound_datetime_prev=None,
+            upper_bound_datetime_to_export=_DATE_2)
+        self.add_pending_export_metadata(region, export_args)
+
+        expired_table_name = 'ingest_view_2021_07_20_00_00_00_0123456789abcdef_snapshot'
+        retained_table_name = 'ingest_view_2021_07_20_00_00_00_fedcba9876543210_snapshot'
+        other_view_expired_table_name = 'other_view_2019_07_20_00_00_00_0123456789abcdef_snapshot'
+        self.mock_client.list_tables.return_value = [
+            self.table_list_item(expired_table_name,
+                                 created=(_DATE_4 - datetime.timedelta(days=8)).replace(tzinfo=datetime.timezone.utc)),
+            self.table_list_item(retained_table_name,
+                                 created=(_DATE_4 - datetime.timedelta(days=1)).replace(tzinfo=datetime.timezone.utc)),
+            self.table_list_item(other_view_expired_table_name,
+                                 created=(_DATE_4 - datetime.timedelta(days=8)).replace(tzinfo=datetime.timezone.utc)),
+        ]
+
+        # Act
+        with freeze_time(_DATE_4.isoformat()):
+            export_manager.export_view_for_args(export_args)
+
+        # Assert
+        self.mock_client.delete_table.assert_called_once_with(dataset_id=_DATASET_ID, table_id=expired_table_name)
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Tests for DirectIngestRawFileImportManager."""
+import os
 import unittest
 from typing import List
 from unittest import mock
@@ -116,39 +117,42 @@ class DirectIngestRawFileImportManagerTest(unittest.TestCase):
         )
         self.import_manager.csv_reader = TestSafeGcsCsvReader(self.fs)
 
-        self.time_patcher = patch('recidiviz.ingest.direct.controllers.direct_ingest_raw_file_import_manager.time')
-        self.mock_time = self.time_patcher.start()
-
         def fake_get_dataset_ref(dataset_id: str) -> bigquery.DatasetReference:
             return bigquery.DatasetReference(project=self.project_id, dataset_id=dataset_id)
 
         self.mock_big_query_client.dataset_ref_for_id = fake_get_dataset_ref
 
-    def tearDown(self) -> None:
-        self.time_patcher.stop()
-
     def mock_import_raw_file_to_big_query(self,
                                           *,
-                                          source_uri: str,
+                                          source_uris: List[str],
                                           destination_table_schema: List[bigquery.SchemaField],
                                           **_kwargs):
         col_names = [schema_field.name for schema_field in destination_table_schema]
-        temp_path = GcsfsFilePath.from_absolute_path(source_uri)
-        local_temp_path = self.fs.uploaded_test_path_to_actual[temp_path.abs_path()]
+        for source_uri in source_uris:
+            temp_path = GcsfsFilePath.from_absolute_path(source_uri)
+            local_temp_path = self.fs.uploaded_test_path_to_actual[temp_path.abs_path()]
+
+            df = pd.read_csv(local_temp_path, header=None, dtype=str)
+            for value in df.values:
+                for cell in value:
+                    if isinstance(cell, str):
+                        stripped_cell = cell.strip()
+                        if stripped_cell != cell:
+                            raise ValueError('Did not strip white space from raw data cell')
+
+                    if cell in col_names:
+                        raise ValueError(f'Wrote column row to output file: {value}')
+            self.num_lines_uploaded += len(df)
 
-        df = pd.read_csv(local_temp_path, header=None, dtype=str)
-        for value in df.values:
-            for cell in value:
-                if isinstance(cell, str):
-                    stripped_cell = cell.strip()
-                    if stripped_cell != cell:
-                        raise ValueError('Did not strip white space from raw data cell')
+        return mock.MagicMock()
 
-                if cell in col_names:
-                    raise ValueError(f'Wrote column row to output file: {value}')
-        self.num_lines_uploaded += len(df)
+    def _uploaded_chunk_uris(self) -> List[str]:
+        """Returns the URIs of all uploaded temp chunk files, in chunk order."""
+        def chunk_num(path: str) -> int:
+            name, _extension = os.path.splitext(path)
+            return int(name.rsplit('_', 1)[1])
 
-        return mock.MagicMock()
+        return [f'gs://{path}' for path in sorted(self.fs.uploaded_test_path_to_actual, key=chunk_num)]
 
     def _metadata_for_unprocessed_file_path(self, path: GcsfsFilePath) -> DirectIngestFileMetadata:
         parts = filename_parts_from_path(path)
@@ -250,7 +254,7 @@ class DirectIngestRawFileImportManagerTest(unittest.TestCase):
 
         path = one(self.fs.uploaded_test_path_to_actual.keys())
         self.mock_big_query_client.insert_into_table_from_cloud_storage_async.assert_called_with(
-            source_uri=f'gs://{path}',
+            source_uris=[f'gs://{path}'],
             destination_dataset_ref=bigquery.DatasetReference(self.project_id, 'us_xx_raw_data'),
             destination_table_id='tagC',
             destination_table_schema=[bigquery.SchemaField('COL1', 'STRING', 'NULLABLE'),
@@ -277,7 +281,7 @@ class DirectIngestRawFileImportManagerTest(unittest.TestCase):
 
         path = one(self.fs.uploaded_test_path_to_actual.keys())
         self.mock_big_query_client.insert_into_table_from_cloud_storage_async.assert_called_with(
-            source_uri=f'gs://{path}',
+            source_uris=[f'gs://{path}'],
             destination_dataset_ref=bigquery.DatasetReference(self.project_id, 'us_xx_raw_data'),
             destination_table_id='tagPipeSeparatedNonUTF8',
             destination_table_schema=[bigquery.SchemaField('PRIMARY_COL1', 'STRING', 'NULLABLE'),
@@ -308,20 +312,19 @@ class DirectIngestRawFileImportManagerTest(unittest.TestCase):
 
         expected_insert_calls = [
             call.insert_into_table_from_cloud_storage_async(
-                source_uri=f'gs://{uploaded_path}',
-                destination_dataset_ref=bigquery.DatasetReference(self.project_id, 'us_xx_raw_data'),
-                destination_table_id='tagPipeSeparatedNonUTF8',
-                destination_table_schema=[bigquery.SchemaField('PRIMARY_COL1', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('COL2', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('COL3', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('COL4', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('file_id', 'INTEGER', 'REQUIRED'),
-                                          bigquery.SchemaField('update_datetime', 'DATETIME', 'REQUIRED')]
-            ) for uploaded_path in self.fs.uploaded_test_path_to_actual
+                source_uris=self._uploaded_chunk_uris(),
+            destination_dataset_ref=bigquery.DatasetReference(self.project_id, 'us_xx_raw_data'),
+            destination_table_id='tagPipeSeparatedNonUTF8',
+            destination_table_schema=[bigquery.SchemaField('PRIMARY_COL1', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('COL2', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('COL3', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('COL4', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('file_id', 'INTEGER', 'REQUIRED'),
+                                      bigquery.SchemaField('update_datetime', 'DATETIME', 'REQUIRED')]
+            )
         ]
 
         self.assertEqual(expected_insert_calls, self.mock_big_query_client.method_calls)
-        self.assertEqual(len(expected_insert_calls) - 1, self.mock_time.sleep.call_count)
         self.assertEqual(5, self.num_lines_uploaded)
         self._check_no_temp_files_remain()
 
@@ -344,19 +347,44 @@ class DirectIngestRawFileImportManagerTest(unittest.TestCase):
 
         expected_insert_calls = [
             call.insert_into_table_from_cloud_storage_async(
-                source_uri=f'gs://{uploaded_path}',
-                destination_dataset_ref=bigquery.DatasetReference(self.project_id, 'us_xx_raw_data'),
-                destination_table_id='tagPipeSeparatedNonUTF8',
-                destination_table_schema=[bigquery.SchemaField('PRIMARY_COL1', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('COL2', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('COL3', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('COL4', 'STRING', 'NULLABLE'),
-                                          bigquery.SchemaField('file_id', 'INTEGER', 'REQUIRED'),
-                                          bigquery.SchemaField('update_datetime', 'DATETIME', 'REQUIRED')]
-            ) for uploaded_path in self.fs.uploaded_test_path_to_actual
+                source_uris=self._uploaded_chunk_uris(),
+            destination_dataset_ref=bigquery.DatasetReference(self.project_id, 'us_xx_raw_data'),
+            destination_table_id='tagPipeSeparatedNonUTF8',
+            destination_table_schema=[bigquery.SchemaField('PRIMARY_COL1', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('COL2', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('COL3', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('COL4', 'STRING', 'NULLABLE'),
+                                      bigquery.SchemaField('file_id', 'INTEGER', 'REQUIRED'),
+                                      bigquery.SchemaField('update_datetime', 'DATETIME', 'REQUIRED')]
+            )
         ]
 
         self.assertEqual(expected_insert_calls, self.mock_big_query_client.method_calls)
-        self.assertEqual(len(expected_insert_calls) - 1, self.mock_time.sleep.call_count)
         self.assertEqual(5, self.num_lines_uploaded)
         self._check_no_temp_files_remain()
+
+    def test_import_bq_file_multiple_chunks_upload_fails(self):
+        self.import_manager.upload_chunk_size = 1
+
+        file_path = path_for_fixture_file_in_test_gcs_directory(
+            directory=self.ingest_directory_path,
+            filename='tagPipeSeparatedNonUTF8.txt',
+            should_normalize=True,
+            file_type=GcsfsDirectIngestFileType.RAW_DATA)
+
+        self.fs.test_add_path(file_path)
+
+        real_upload_from_string = self.fs.upload_from_string
+
+        def fail_third_chunk_upload(path: GcsfsFilePath, contents: str, content_type: str) -> None:
+            if path.file_name.endswith('_2.csv'):
+                raise ValueError('Upload failed')
+            real_upload_from_string(path, contents, content_type)
+
+        with patch.object(self.fs, 'upload_from_string', side_effect=fail_third_chunk_upload):
+            with self.assertRaises(ValueError):
+                self.import_manager.import_raw_file_to_big_query(file_path,
+                                                                 self._metadata_for_unprocessed_file_path(file_path))
+
+        self.mock_big_query_client.insert_into_table_from_cloud_storage_async.assert_not_called()
+        self._check_no_temp_files_remain()
@@ -16,11 +16,14 @@
 # =============================================================================
 """Tests for the GcsfsCsvReader."""
 
+import os
+import tempfile
 import unittest
+from typing import Optional
 
 import gcsfs
 import pandas as pd
-from mock import create_autospec
+from mock import create_autospec, patch
 
 from recidiviz.ingest.direct.controllers.gcsfs_csv_reader import GcsfsCsvReader, GcsfsCsvReaderDelegate, \
     COMMON_RAW_FILE_ENCODINGS
@@ -62,14 +65,15 @@ class TestGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
 def _fake_gcsfs_open(
         path_str: str,
         *,
-        encoding: str,
+        mode: str = 'r',
+        encoding: Optional[str] = None,
         # pylint: disable=unused-argument
         token: str):
     if not path_str.startswith('gs://'):
         raise ValueError(f'Expected gs:// path URI, got this instead: {path_str}')
 
     # Convert to local absolute path
-    return open('/' + path_str[len('gs://'):], encoding=encoding)
+    return open('/' + path_str[len('gs://'):], mode=mode, encoding=encoding)
 
 
 class GcsfsCsvReaderTest(unittest.TestCase):
@@ -141,6 +145,22 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path),
                                        delegate=delegate, chunk_size=10, encodings_to_try=encodings_to_try)
+
+        # No encoding can decode the file, so it is never parsed
+        self.assertEqual([], delegate.encodings_attempted)
+        self.assertIsNone(delegate.successful_encoding)
+        self.assertEqual(0, len(delegate.dataframes))
+        self.assertEqual(0, delegate.decode_errors)
+        self.assertEqual(0, delegate.exceptions)
+
+    def test_read_no_encodings_match_no_detection(self):
+        file_path = fixtures.as_filepath('encoded_latin_1.csv')
+        delegate = TestGcsfsCsvReaderDelegate()
+        encodings_to_try = ['UTF-8', 'UTF-16']
+        with self.assertRaises(ValueError):
+            self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path),
+                                       delegate=delegate, chunk_size=10, encodings_to_try=encodings_to_try,
+                                       detect_encoding=False)
         self.assertEqual(encodings_to_try, delegate.encodings_attempted)
         self.assertEqual(2, len(delegate.encodings_attempted))
         self.assertIsNone(delegate.successful_encoding)
@@ -153,6 +173,20 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         delegate = TestGcsfsCsvReaderDelegate()
         self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path), delegate=delegate, chunk_size=1)
 
+        # The file is only parsed with the encoding that can decode it
+        self.assertEqual(['ISO-8859-1'], delegate.encodings_attempted)
+        self.assertEqual('ISO-8859-1', delegate.successful_encoding)
+        self.assertEqual(4, len(delegate.dataframes))
+        self.assertEqual({'ISO-8859-1'}, {encoding for encoding, df in delegate.dataframes})
+        self.assertEqual(0, delegate.decode_errors)
+        self.assertEqual(0, delegate.exceptions)
+
+    def test_read_with_failure_first_no_detection(self):
+        file_path = fixtures.as_filepath('encoded_latin_1.csv')
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path), delegate=delegate, chunk_size=1,
+                                   detect_encoding=False)
+
         index = COMMON_RAW_FILE_ENCODINGS.index('ISO-8859-1')
         self.assertEqual(index + 1, len(delegate.encodings_attempted))
         self.assertEqual(COMMON_RAW_FILE_ENCODINGS[:(index+1)], delegate.encodings_attempted)
@@ -162,6 +196,45 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         self.assertEqual(1, delegate.decode_errors)
         self.assertEqual(0, delegate.exceptions)
 
+    def test_read_with_late_failure(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'late_latin_1.csv')
+            with open(file_path, 'wb') as f:
+                f.write(b'symbol,name\n')
+                for i in range(1000):
+                    f.write(f'{i},number\n'.encode('utf-8'))
+                f.write('\u00a3,pound\n'.encode('ISO-8859-1'))
+
+            delegate = TestGcsfsCsvReaderDelegate()
+            self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path), delegate=delegate, chunk_size=100)
+
+        self.assertEqual(['ISO-8859-1'], delegate.encodings_attempted)
+        self.assertEqual('ISO-8859-1', delegate.successful_encoding)
+        self.assertEqual(11, len(delegate.dataframes))
+        self.assertEqual('\u00a3', delegate.dataframes[-1][1].iloc[-1]['symbol'])
+        self.assertEqual(0, delegate.decode_errors)
+        self.assertEqual(0, delegate.exceptions)
+
+    def test_detect_encoding(self):
+        utf_8_path = GcsfsFilePath.from_absolute_path(fixtures.as_filepath('encoded_utf_8.csv'))
+        latin_1_path = GcsfsFilePath.from_absolute_path(fixtures.as_filepath('encoded_latin_1.csv'))
+
+        # Multi-byte characters are split across blocks
+        with patch('recidiviz.ingest.direct.controllers.gcsfs_csv_reader.ENCODING_DETECTION_BLOCK_SIZE_BYTES', 1):
+            self.assertEqual('UTF-8', self.reader.detect_encoding(utf_8_path, ['UTF-8', 'ISO-8859-1']))
+            self.assertEqual('ISO-8859-1', self.reader.detect_encoding(latin_1_path, ['UTF-8', 'ISO-8859-1']))
+            self.assertEqual('latin-1', self.reader.detect_encoding(latin_1_path, ['UTF-8', 'latin-1', 'UTF-16']))
+            self.assertIsNone(self.reader.detect_encoding(latin_1_path, ['UTF-8', 'UTF-16']))
+
+    def test_detect_encoding_first_encoding_decodes_any_bytes(self):
+        self.mock_gcsfs.open = create_autospec(_fake_gcsfs_open)
+        path = GcsfsFilePath.from_absolute_path(fixtures.as_filepath('encoded_utf_8.csv'))
+
+        self.assertEqual('ISO-8859-1', self.reader.detect_encoding(path, ['ISO-8859-1', 'UTF-8']))
+
+        # No need to read the file
+        self.mock_gcsfs.open.assert_not_called()
+
     def test_read_with_no_failure(self):
         file_path = fixtures.as_filepath('encoded_utf_8.csv')
         delegate = TestGcsfsCsvReaderDelegate()
@@ -199,3 +272,17 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         self.assertEqual({'UTF-8'}, {encoding for encoding, df in delegate.dataframes})
         self.assertEqual(0, delegate.decode_errors)
         self.assertEqual(1, delegate.exceptions)
+
+    def test_streaming_read_rows(self):
+        file_path = fixtures.as_filepath('encoded_utf_8.csv')
+
+        rows = list(self.reader.streaming_read_rows(GcsfsFilePath.from_absolute_path(file_path)))
+
+        self.assertEqual(5, len(rows))
+        with open(file_path, mode='rb') as f:
+            self.assertEqual(f.read(), b''.join(rows))
+
+    def test_streaming_read_rows_empty_file(self):
+        empty_file_path = fixtures.as_filepath('tagA.csv')
+
+        self.assertEqual([], list(self.reader.streaming_read_rows(GcsfsFilePath.from_absolute_path(empty_file_path))))
@@ -23,12 +23,14 @@ import unittest
 from collections import defaultdict
 from typing import List, Optional, Set, Tuple
 
+import attr
 from freezegun import freeze_time
 from mock import patch, Mock
 
 from recidiviz.common.ingest_metadata import SystemLevel
 from recidiviz.common.serialization import attr_to_json_dict, \
     datetime_to_serializable, serializable_to_datetime, attr_from_json_dict
+from recidiviz.ingest.direct.controllers.base_direct_ingest_controller import BaseDirectIngestController
 from recidiviz.ingest.direct.controllers.csv_gcsfs_direct_ingest_controller \
     import CsvGcsfsDirectIngestController
 from recidiviz.ingest.direct.controllers.direct_ingest_gcs_file_system import \
@@ -46,7 +48,7 @@ from recidiviz.persistence.database.schema.operations import schema
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.tests.ingest.direct.direct_ingest_util import \
     build_gcsfs_controller_for_tests, add_paths_with_tags_and_process, \
-    path_for_fixture_file, \
+    path_for_fixture_file, ingest_args_for_fixture_file, \
     run_task_queues_to_empty, check_all_paths_processed, FakeDirectIngestRawFileImportManager
 from recidiviz.tests.ingest.direct.fake_direct_ingest_big_query_client import FakeDirectIngestBigQueryClient
 from recidiviz.tests.ingest.direct.fake_direct_ingest_gcs_file_system import FakeDirectIngestGCSFileSystem
@@ -126,6 +128,23 @@ class SingleTagStateTestGcsfsDirectIngestController(
         return ['tagC']
 
 
+class SplitTagFirstStateTestGcsfsDirectIngestController(
+        BaseTestCsvGcsfsDirectIngestController):
+    def __init__(self,
+                 ingest_directory_path: str,
+                 storage_directory_path: str,
+                 max_delay_sec_between_files: int = 0):
+        super().__init__(TEST_STATE_REGION.region_code,
+                         SystemLevel.STATE,
+                         ingest_directory_path,
+                         storage_directory_path,
+                         max_delay_sec_between_files)
+
+    @classmethod
+    def get_file_tag_rank_list(cls) -> List[str]:
+        return ['tagC', 'tagB']
+
+
 class CountyTestGcsfsDirectIngestController(
         BaseTestCsvGcsfsDirectIngestController):
     def __init__(self,
@@ -143,6 +162,10 @@ class CountyTestGcsfsDirectIngestController(
         return ['tagA', 'tagB']
 
 
+def _next_continuation_args(args: GcsfsIngestArgs) -> GcsfsIngestArgs:
+    return attr.evolve(args, ingest_time=args.ingest_time + datetime.timedelta(seconds=1))
+
+
 @patch('recidiviz.utils.metadata.project_id',
        Mock(return_value='recidiviz-staging'))
 class TestGcsfsDirectIngestController(unittest.TestCase):
@@ -163,6 +186,11 @@ class TestGcsfsDirectIngestController(unittest.TestCase):
         are_ingest_view_exports_enabled_in_env=True
     )
 
+    TEST_SPLIT_FILE_CACHE_REGION = fake_region(
+        region_code='us_xx',
+        split_file_person_tree_cache_size=10
+    )
+
     @classmethod
     def setUpClass(cls) -> None:
         fakes.start_on_disk_postgresql_database()
@@ -636,6 +664,28 @@ class TestGcsfsDirectIngestController(unittest.TestCase):
 
         self.validate_file_metadata(controller)
 
+    @staticmethod
+    def _record_ingest_runs(controller: GcsfsDirectIngestController) -> List[List[Tuple[str, Optional[str]]]]:
+        """Wraps the ingest job methods of |controller| so that the (file tag, filename suffix) of each job is recorded,
+        grouped by the ingest task that ran it. Returns the list the runs are recorded into."""
+        runs: List[List[Tuple[str, Optional[str]]]] = []
+        # pylint:disable=protected-access
+        run_ingest_job = controller._run_ingest_job
+        run_single_ingest_job = controller._run_single_ingest_job
+
+        def _run_ingest_job(args: GcsfsIngestArgs) -> bool:
+            runs.append([])
+            return run_ingest_job(args)
+
+        def _run_single_ingest_job(args: GcsfsIngestArgs, person_tree_cache) -> bool:
+            parts = filename_parts_from_path(args.file_path)
+            runs[-1].append((parts.file_tag, parts.filename_suffix))
+            return run_single_ingest_job(args, person_tree_cache)
+
+        setattr(controller, '_run_ingest_job', _run_ingest_job)
+        setattr(controller, '_run_single_ingest_job', _run_single_ingest_job)
+        return runs
+
     @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_STATE_REGION))
     def test_process_already_normalized_paths(self):
         controller = build_gcsfs_controller_for_tests(
@@ -863,6 +913,170 @@ class TestGcsfsDirectIngestController(unittest.TestCase):
 
         self.validate_file_metadata(controller)
 
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    def test_split_file_jobs_run_in_one_ingest_task(self):
+        controller = build_gcsfs_controller_for_tests(
+            StateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        controller.ingest_file_split_line_limit = 1
+        runs = self._record_ingest_runs(controller)
+
+        file_tags = list(sorted(controller.get_file_tag_rank_list()))
+        add_paths_with_tags_and_process(self,
+                                        controller,
+                                        file_tags,
+                                        pre_normalize_filename=True)
+
+        # Both splits of tagC are run by the same ingest task
+        self.assertEqual([[('tagA', None)],
+                          [('tagB', None)],
+                          [('tagC', '00001_file_split_size1'), ('tagC', '00002_file_split_size1')]],
+                         runs)
+        self.validate_file_metadata(controller)
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_STATE_REGION))
+    def test_split_file_jobs_run_in_separate_ingest_tasks_without_cache(self):
+        controller = build_gcsfs_controller_for_tests(
+            StateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        controller.ingest_file_split_line_limit = 1
+        runs = self._record_ingest_runs(controller)
+
+        file_tags = list(sorted(controller.get_file_tag_rank_list()))
+        add_paths_with_tags_and_process(self,
+                                        controller,
+                                        file_tags,
+                                        pre_normalize_filename=True)
+
+        self.assertEqual([[('tagA', None)],
+                          [('tagB', None)],
+                          [('tagC', '00001_file_split_size1')],
+                          [('tagC', '00002_file_split_size1')]],
+                         runs)
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    @patch.object(BaseDirectIngestController, '_MAX_JOBS_PER_INGEST_RUN', 1)
+    def test_split_file_jobs_stop_at_max_jobs_per_ingest_run(self):
+        controller = build_gcsfs_controller_for_tests(
+            SingleTagStateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        controller.ingest_file_split_line_limit = 1
+        runs = self._record_ingest_runs(controller)
+
+        add_paths_with_tags_and_process(self,
+                                        controller,
+                                        ['tagC'],
+                                        pre_normalize_filename=True)
+
+        self.assertEqual([[('tagC', '00001_file_split_size1')],
+                          [('tagC', '00002_file_split_size1')]],
+                         runs)
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    def test_split_file_jobs_stop_at_non_split_file(self):
+        controller = build_gcsfs_controller_for_tests(
+            SplitTagFirstStateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        controller.ingest_file_split_line_limit = 1
+        runs = self._record_ingest_runs(controller)
+
+        add_paths_with_tags_and_process(self,
+                                        controller,
+                                        ['tagC', 'tagB'],
+                                        pre_normalize_filename=True)
+
+        # tagB is not split, so it is run by its own ingest task
+        self.assertEqual([[('tagC', '00001_file_split_size1'), ('tagC', '00002_file_split_size1')],
+                          [('tagB', None)]],
+                         runs)
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    def test_split_file_jobs_stop_at_split_of_different_file(self):
+        controller = build_gcsfs_controller_for_tests(
+            SingleTagStateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        controller.ingest_file_split_line_limit = 1
+        runs = self._record_ingest_runs(controller)
+
+        for dt_str in ('2019-09-19', '2019-09-20'):
+            file_path = path_for_fixture_file(
+                controller,
+                'tagC.csv',
+                should_normalize=True,
+                dt=datetime.datetime.fromisoformat(dt_str))
+            controller.fs.test_add_path(file_path)
+
+        run_task_queues_to_empty(controller)
+
+        # Splits of the two tagC files are run by separate ingest tasks
+        self.assertEqual([[('tagC', '00001_file_split_size1'), ('tagC', '00002_file_split_size1')],
+                          [('tagC', '00001_file_split_size1'), ('tagC', '00002_file_split_size1')]],
+                         runs)
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    def test_run_ingest_job_continues_until_max_jobs_per_ingest_run(self):
+        controller = build_gcsfs_controller_for_tests(
+            StateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        args = ingest_args_for_fixture_file(controller, 'tagC.csv')
+
+        with patch.object(controller, '_run_single_ingest_job', return_value=True) as mock_run_single_ingest_job, \
+                patch.object(controller, '_schedule_any_pre_ingest_tasks', return_value=False), \
+                patch.object(controller, '_get_continuation_job_args', side_effect=_next_continuation_args):
+            # pylint:disable=protected-access
+            self.assertTrue(controller._run_ingest_job(args))
+
+        # pylint:disable=protected-access
+        self.assertEqual(BaseDirectIngestController._MAX_JOBS_PER_INGEST_RUN,
+                         mock_run_single_ingest_job.call_count)
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    def test_run_ingest_job_stops_when_pre_ingest_tasks_scheduled(self):
+        controller = build_gcsfs_controller_for_tests(
+            StateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        args = ingest_args_for_fixture_file(controller, 'tagC.csv')
+
+        with patch.object(controller, '_run_single_ingest_job', return_value=True) as mock_run_single_ingest_job, \
+                patch.object(controller, '_schedule_any_pre_ingest_tasks', return_value=True), \
+                patch.object(controller, '_get_continuation_job_args',
+                             side_effect=_next_continuation_args) as mock_get_continuation_job_args:
+            # pylint:disable=protected-access
+            self.assertTrue(controller._run_ingest_job(args))
+
+        mock_run_single_ingest_job.assert_called_once()
+        mock_get_continuation_job_args.assert_not_called()
+
+    @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_SPLIT_FILE_CACHE_REGION))
+    def test_run_ingest_job_stops_after_max_ingest_run_duration(self):
+        controller = build_gcsfs_controller_for_tests(
+            StateTestGcsfsDirectIngestController,
+            self.FIXTURE_PATH_PREFIX,
+            run_async=False)
+        args = ingest_args_for_fixture_file(controller, 'tagC.csv')
+
+        with freeze_time('2020-01-01') as frozen_time:
+            def _run_single_ingest_job(_args, _person_tree_cache) -> bool:
+                frozen_time.tick(datetime.timedelta(minutes=4))
+                return True
+
+            with patch.object(controller, '_run_single_ingest_job',
+                              side_effect=_run_single_ingest_job) as mock_run_single_ingest_job, \
+                    patch.object(controller, '_schedule_any_pre_ingest_tasks', return_value=False), \
+                    patch.object(controller, '_get_continuation_job_args', side_effect=_next_continuation_args):
+                # pylint:disable=protected-access
+                self.assertTrue(controller._run_ingest_job(args))
+
+        # The third job ends 12 minutes into the run, past the 10 minute limit
+        self.assertEqual(3, mock_run_single_ingest_job.call_count)
+
     @patch("recidiviz.utils.regions.get_region", Mock(return_value=TEST_STATE_REGION))
     def test_move_files_from_previous_days_to_storage(self):
         controller = build_gcsfs_controller_for_tests(
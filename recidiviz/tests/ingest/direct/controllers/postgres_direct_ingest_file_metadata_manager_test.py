@@ -28,11 +28,12 @@ from recidiviz.ingest.direct.controllers.direct_ingest_gcs_file_system import Di
     to_normalized_unprocessed_file_path
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_utils import GcsfsDirectIngestFileType, \
     GcsfsIngestViewExportArgs
+from recidiviz.ingest.direct.controllers import postgres_direct_ingest_file_metadata_manager
 from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath
 from recidiviz.ingest.direct.controllers.postgres_direct_ingest_file_metadata_manager import \
     PostgresDirectIngestFileMetadataManager
 from recidiviz.persistence.database.base_schema import OperationsBase
-from recidiviz.persistence.database.schema.operations import schema
+from recidiviz.persistence.database.schema.operations import schema, dao
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.entity.base_entity import entity_graph_eq
 from recidiviz.persistence.entity.operations.entities import DirectIngestRawFileMetadata, DirectIngestIngestFileMetadata
@@ -218,6 +219,85 @@ class PostgresDirectIngestFileMetadataManagerTest(unittest.TestCase):
             self.metadata_manager.get_metadata_for_raw_files_discovered_after_datetime(
                 'file_tag', discovery_time_lower_bound_exclusive=datetime.datetime(2015, 1, 2, 3, 7, 0)))
 
+    def test_have_files_been_discovered_empty(self):
+        self.assertEqual({}, self.metadata_manager.have_files_been_discovered([]))
+
+    def test_mark_files_as_discovered_processed_path_crashes(self):
+        raw_unprocessed_path = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                           GcsfsDirectIngestFileType.RAW_DATA)
+        raw_processed_path = self._make_processed_path('bucket/other_tag.csv',
+                                                       GcsfsDirectIngestFileType.RAW_DATA)
+
+        with self.assertRaises(ValueError):
+            self.metadata_manager.mark_files_as_discovered([raw_unprocessed_path, raw_processed_path])
+
+        # No paths are registered if any path is invalid
+        self.assertEqual({raw_unprocessed_path: False},
+                         self.metadata_manager.have_files_been_discovered([raw_unprocessed_path]))
+
+    @patch(f'{postgres_direct_ingest_file_metadata_manager.__name__}._MAX_ROWS_PER_STATEMENT', 2)
+    @patch(f'{dao.__name__}._MAX_IN_CLAUSE_SIZE', 2)
+    def test_mark_files_as_discovered_bulk(self):
+        # Arrange
+        raw_unprocessed_paths = [
+            self._make_unprocessed_path(f'bucket/file_tag_{i}.csv', GcsfsDirectIngestFileType.RAW_DATA)
+            for i in range(5)
+        ]
+
+        ingest_view_unprocessed_paths = []
+        for i in range(3):
+            args = GcsfsIngestViewExportArgs(
+                ingest_view_name=f'file_tag_{i}',
+                upper_bound_datetime_prev=datetime.datetime(2015, 1, 2, 2, 2, 2, 2),
+                upper_bound_datetime_to_export=datetime.datetime(2015, 1, 2, 3, 3, 3, 3)
+            )
+            path = self._make_unprocessed_path(f'bucket/file_tag_{i}.csv', GcsfsDirectIngestFileType.INGEST_VIEW)
+            with freeze_time('2015-01-02T03:05:05'):
+                metadata = self.metadata_manager.register_ingest_file_export_job(args)
+                self.metadata_manager.register_ingest_view_export_file_name(metadata, path)
+                if i == 0:
+                    self.metadata_manager.mark_ingest_view_exported(metadata)
+            ingest_view_unprocessed_paths.append(path)
+
+        self.metadata_manager_other_region.mark_file_as_discovered(raw_unprocessed_paths[0])
+        self.metadata_manager.mark_file_as_discovered(raw_unprocessed_paths[1])
+
+        all_paths = raw_unprocessed_paths + ingest_view_unprocessed_paths
+        expected_discovered = {path: False for path in all_paths}
+        expected_discovered[raw_unprocessed_paths[1]] = True
+        self.assertEqual(expected_discovered, self.metadata_manager.have_files_been_discovered(all_paths))
+
+        # Act
+        with freeze_time('2015-01-02T03:06:06'):
+            self.metadata_manager.mark_files_as_discovered(
+                [path for path, discovered in expected_discovered.items() if not discovered])
+
+        # Assert
+        self.assertEqual({path: True for path in all_paths},
+                         self.metadata_manager.have_files_been_discovered(all_paths))
+
+        for path in raw_unprocessed_paths[2:]:
+            metadata = self.metadata_manager.get_file_metadata(path)
+            self.assertIsInstance(metadata, DirectIngestRawFileMetadata)
+            self.assertEqual(datetime.datetime(2015, 1, 2, 3, 6, 6), metadata.discovery_time)
+            self.assertEqual(datetime.datetime(2015, 1, 2, 3, 3, 3, 3),
+                             metadata.datetimes_contained_upper_bound_inclusive)
+
+        for i, path in enumerate(ingest_view_unprocessed_paths):
+            metadata = self.metadata_manager.get_file_metadata(path)
+            self.assertIsInstance(metadata, DirectIngestIngestFileMetadata)
+            self.assertEqual(datetime.datetime(2015, 1, 2, 3, 6, 6), metadata.discovery_time)
+            expected_export_time = datetime.datetime(2015, 1, 2, 3, 5, 5) if i == 0 \
+                else datetime.datetime(2015, 1, 2, 3, 6, 6)
+            self.assertEqual(expected_export_time, metadata.export_time)
+
+    def test_have_files_been_discovered_unregistered_ingest_view_path_crashes(self):
+        ingest_view_unprocessed_path = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                                   GcsfsDirectIngestFileType.INGEST_VIEW)
+
+        with self.assertRaises(ValueError):
+            self.metadata_manager.have_files_been_discovered([ingest_view_unprocessed_path])
+
     def test_ingest_view_file_progression(self):
         args = GcsfsIngestViewExportArgs(
             ingest_view_name='file_tag',
@@ -58,7 +58,7 @@ class FakeDirectIngestBigQueryClient(BigQueryClient):
         raise ValueError('Must be implemented for use in tests.')
 
     def list_tables(self, dataset_id: str) -> Iterator[bigquery.table.TableListItem]:
-        raise ValueError('Must be implemented for use in tests.')
+        return iter([])
 
     def create_table(self, table: bigquery.Table) -> bigquery.Table:
         raise ValueError('Must be implemented for use in tests.')
@@ -106,7 +106,7 @@ class FakeDirectIngestBigQueryClient(BigQueryClient):
         raise ValueError('Must be implemented for use in tests.')
 
     def insert_into_table_from_cloud_storage_async(
-            self, source_uri: str,
+            self, source_uris: List[str],
             destination_dataset_ref: bigquery.DatasetReference,
             destination_table_id: str, destination_table_schema: List[bigquery.SchemaField]) -> bigquery.job.LoadJob:
         raise ValueError('Must be implemented for use in tests.')
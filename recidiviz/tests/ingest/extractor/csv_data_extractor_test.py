@@ -194,6 +194,20 @@ class CsvDataExtractorTest(unittest.TestCase):
         self.assertIsNotNone(ingest_info)
         self.assertFalse(ingest_info)
 
+    def test_rows_from_lines(self):
+        lines = [' a ,b,c', '1,2,3', '', '4,5']
+
+        rows = list(CsvDataExtractor._rows_from_lines(lines))  # pylint: disable=protected-access
+
+        self.assertEqual([{'a': '1', 'b': '2', 'c': '3'},
+                          {'a': '4', 'b': '5', 'c': None}], rows)
+
+    def test_rows_from_lines_too_many_values(self):
+        lines = ['a,b', '1,2,3']
+
+        with self.assertRaises(ValueError):
+            list(CsvDataExtractor._rows_from_lines(lines))  # pylint: disable=protected-access
+
 
 def _instantiate_extractor(yaml_filename: str,
                            primary_key_override: Callable = None) \
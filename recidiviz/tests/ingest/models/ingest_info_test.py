@@ -17,6 +17,7 @@
 
 """Tests for ingest_info"""
 
+import copy
 import unittest
 
 from recidiviz.ingest.models import ingest_info
@@ -242,3 +243,38 @@ class TestIngestInfo(unittest.TestCase):
         ii.sort()
         ii_reversed.sort()
         self.assertEqual(ii, ii_reversed)
+
+    def test_fingerprint(self):
+        b1 = ingest_info.Booking(admission_date='1')
+        b2 = ingest_info.Booking(admission_date='2')
+
+        person = ingest_info.Person(person_id='1', bookings=[b1, b2])
+        person_reversed = ingest_info.Person(person_id='1', bookings=[b2, b1])
+        person_different = ingest_info.Person(person_id='1', bookings=[b1])
+
+        self.assertEqual(person.fingerprint(),
+                         person_reversed.fingerprint())
+        self.assertEqual(person.fingerprint(),
+                         copy.deepcopy(person).fingerprint())
+        self.assertNotEqual(person.fingerprint(),
+                            person_different.fingerprint())
+        self.assertNotEqual(person.fingerprint(),
+                            ingest_info.Person(person_id='2').fingerprint())
+
+    def test_fingerprint_ignoresStatePeopleById(self):
+        ii = IngestInfo(state_people=[ingest_info.StatePerson(state_person_id='1')])
+        ii_with_index = IngestInfo(state_people=[ingest_info.StatePerson(state_person_id='1')])
+        ii_with_index._state_people_by_id = {'1': ii_with_index.state_people[0]}  # pylint: disable=protected-access
+
+        self.assertEqual(ii, ii_with_index)
+        self.assertEqual(ii.fingerprint(), ii_with_index.fingerprint())
+
+    def test_fingerprint_nestedChild(self):
+        charge = ingest_info.Charge(bond=ingest_info.Bond(amount='100'))
+        charge_other_bond = ingest_info.Charge(
+            bond=ingest_info.Bond(amount='200'))
+
+        self.assertNotEqual(charge.fingerprint(),
+                            charge_other_bond.fingerprint())
+        self.assertNotEqual(ingest_info.Bond().fingerprint(),
+                            ingest_info.Hold().fingerprint())
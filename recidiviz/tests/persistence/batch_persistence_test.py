@@ -444,6 +444,36 @@ class TestBatchPersistence(TestCase):
         self.assertEqual(result_proto, expected_proto)
 
 
+class TestDedupPeople(TestCase):
+    """Tests for deduplicating people across ingest infos"""
+
+    def test_dedup_people(self):
+        ii = IngestInfo()
+        person = ii.create_person(person_id=TEST_ID, full_name=TEST_NAME)
+        person.create_booking(booking_id=TEST_ID)
+        person.create_booking(booking_id=TEST_ID2)
+        ii.create_person(person_id=TEST_ID2, full_name=TEST_NAME2)
+
+        # Same people, with bookings in a different order.
+        ii_dup = IngestInfo()
+        person_dup = ii_dup.create_person(person_id=TEST_ID,
+                                          full_name=TEST_NAME)
+        person_dup.create_booking(booking_id=TEST_ID2)
+        person_dup.create_booking(booking_id=TEST_ID)
+        ii_dup.create_person(person_id=TEST_ID2, full_name=TEST_NAME2)
+
+        ii_other = IngestInfo()
+        ii_other.create_person(person_id=TEST_ID, full_name=TEST_NAME2)
+
+        result = batch_persistence._dedup_people([ii, ii_dup, ii_other])
+
+        expected = IngestInfo(
+            people=copy.deepcopy(ii.people) + copy.deepcopy(ii_other.people))
+        expected.sort()
+        result.sort()
+        self.assertEqual(expected, result)
+
+
 @pytest.mark.usefixtures("client")
 class TestReadAndPersist(TestCase):
     """Tests read and persist"""
@@ -18,14 +18,18 @@
 """Base test class for testing subclasses of BaseHistoricalSnapshotUpdater"""
 import datetime
 from types import ModuleType
-from typing import Set, List
+from typing import Set, List, Callable, Dict, Tuple
 from unittest import TestCase
 
+from mock import patch, Mock
 from more_itertools import one
+from sqlalchemy import select
 
 from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.session_factory import SessionFactory
+from recidiviz.persistence.database.history import \
+    base_historical_snapshot_updater
 from recidiviz.persistence.database.history.historical_snapshot_update import \
     update_historical_snapshots
 from recidiviz.persistence.database.schema.history_table_shared_columns_mixin \
@@ -62,6 +66,40 @@ class BaseHistoricalSnapshotUpdaterTest(TestCase):
         act_session.commit()
         act_session.close()
 
+    @staticmethod
+    def _get_history_rows_after_updates(
+            schema: ModuleType,
+            write_updates: Callable[[], None],
+            use_bulk_snapshot_updates: bool) -> Dict[str, List[Tuple]]:
+        """Calls |write_updates| with snapshots written by either the bulk or
+        the per-entity snapshot update path, then returns the rows of every
+        history table in |schema|, keyed by table name. History table primary
+        keys are omitted, as they are generated by the database.
+        """
+        with patch(f'{base_historical_snapshot_updater.__name__}'
+                   f'._supports_bulk_snapshot_updates',
+                   Mock(return_value=use_bulk_snapshot_updates)):
+            write_updates()
+
+        rows_by_table_name: Dict[str, List[Tuple]] = {}
+        session = SessionFactory.for_schema_base(
+            schema_base_for_schema_module(schema))
+        try:
+            for table_class in _get_all_database_entities_in_module(schema):
+                if not table_class.__name__.endswith(
+                        HISTORICAL_TABLE_CLASS_SUFFIX):
+                    continue
+                table = table_class.__table__
+                columns = [column for column in table.columns
+                           if not column.primary_key]
+                rows_by_table_name[table.name] = sorted(
+                    (tuple(row) for row in session.execute(select(columns))),
+                    key=repr)
+        finally:
+            session.close()
+
+        return rows_by_table_name
+
     def _check_all_non_history_schema_object_types_in_list(
             self,
             schema_objects: List[DatabaseEntity],
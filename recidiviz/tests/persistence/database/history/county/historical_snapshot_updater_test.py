@@ -19,6 +19,8 @@
 import datetime
 from typing import Dict, Type, Optional
 
+from more_itertools import one
+
 from recidiviz.common.constants.bond import BondStatus, BondType
 from recidiviz.common.constants.county.booking import \
     AdmissionReason, Classification, CustodyStatus, ReleaseReason
@@ -34,6 +36,7 @@ from recidiviz.persistence.database.base_schema import \
     JailsBase
 from recidiviz.persistence.database.database_entity import DatabaseEntity
 from recidiviz.persistence.database.schema.county import schema as county_schema
+from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.entity.core_entity import primary_key_value_from_obj
 from recidiviz.tests.persistence.database.history.\
     base_historical_snapshot_updater_test import (
@@ -47,6 +50,11 @@ _SCHEMA_OBJECT_TYPES_TO_IGNORE = [
     'ScraperSuccess',
 ]
 
+_BOOKING_ADMISSION_TIME = datetime.datetime(2018, 7, 12)
+_SENTENCE_IMPOSED_TIME = datetime.datetime(2018, 7, 14)
+_INGEST_TIME_1 = datetime.datetime(2018, 7, 30)
+_INGEST_TIME_2 = datetime.datetime(2018, 8, 5)
+
 
 class TestCountyHistoricalSnapshotUpdater(BaseHistoricalSnapshotUpdaterTest):
     """Tests for CountyHistoricalSnapshotUpdater"""
@@ -227,3 +235,81 @@ class TestCountyHistoricalSnapshotUpdater(BaseHistoricalSnapshotUpdaterTest):
 
             self._assert_expected_snapshots_for_schema_object(
                 schema_object, [expected_ingest_time])
+
+
+class TestCountyHistoricalSnapshotUpdaterPostgres(
+        TestCountyHistoricalSnapshotUpdater):
+    """Runs the CountyHistoricalSnapshotUpdater tests against a postgres
+    database, where snapshots are written with set-based statements."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fakes.start_on_disk_postgresql_database()
+
+    def setUp(self) -> None:
+        fakes.use_on_disk_postgresql_database(JailsBase)
+
+    def tearDown(self) -> None:
+        fakes.teardown_on_disk_postgresql_database(JailsBase)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        fakes.stop_and_clear_on_disk_postgresql_database()
+
+    def _write_new_and_updated_person(self) -> None:
+        person = self.generate_schema_county_person_obj_tree()
+        # Snapshots of the new booking and its descendants are backdated to
+        # the booking admission date
+        one(person.bookings).admission_date_inferred = False
+        self._commit_person(person, SystemLevel.COUNTY, _INGEST_TIME_1)
+
+        update_session = SessionFactory.for_schema_base(JailsBase)
+        person = one(update_session.query(county_schema.Person).all())
+        booking = one(person.bookings)
+        # charge_class is stored in the 'class' column
+        one(booking.charges).charge_class = ChargeClass.FELONY.value
+        # New entities added to an existing booking are not backdated
+        booking.holds.append(county_schema.Hold(
+            hold_id=9946,
+            booking_id=booking.booking_id,
+            external_id='hold_id_2',
+            jurisdiction_name='another jurisdiction',
+            status=HoldStatus.ACTIVE.value,
+        ))
+        self._commit_person(person, SystemLevel.COUNTY, _INGEST_TIME_2)
+        update_session.close()
+
+    def testBulkSnapshotUpdatesMatchPerEntityUpdates(self):
+        per_entity_history_rows = self._get_history_rows_after_updates(
+            county_schema, self._write_new_and_updated_person,
+            use_bulk_snapshot_updates=False)
+
+        fakes.teardown_on_disk_postgresql_database(JailsBase)
+        fakes.use_on_disk_postgresql_database(JailsBase)
+
+        bulk_history_rows = self._get_history_rows_after_updates(
+            county_schema, self._write_new_and_updated_person,
+            use_bulk_snapshot_updates=True)
+
+        self.assertEqual(per_entity_history_rows, bulk_history_rows)
+
+        assert_session = SessionFactory.for_schema_base(JailsBase)
+        person = one(assert_session.query(county_schema.Person).all())
+        booking = one(person.bookings)
+        charge = one(booking.charges)
+        new_hold = one(hold for hold in booking.holds if hold.hold_id == 9946)
+
+        # Unchanged
+        self._assert_expected_snapshots_for_schema_object(
+            person, [_BOOKING_ADMISSION_TIME])
+        self._assert_expected_snapshots_for_schema_object(
+            booking, [_BOOKING_ADMISSION_TIME])
+        self._assert_expected_snapshots_for_schema_object(
+            charge.sentence, [_SENTENCE_IMPOSED_TIME])
+        # Changed
+        self._assert_expected_snapshots_for_schema_object(
+            charge, [_BOOKING_ADMISSION_TIME, _INGEST_TIME_2])
+        # New
+        self._assert_expected_snapshots_for_schema_object(
+            new_hold, [_INGEST_TIME_2])
+        assert_session.close()
@@ -19,8 +19,12 @@
 import datetime
 
 from more_itertools import one
+from sqlalchemy.dialects import postgresql
 
 from recidiviz.common.ingest_metadata import SystemLevel
+from recidiviz.persistence.database.history.base_historical_snapshot_updater \
+    import _close_changed_snapshots_query, \
+    _insert_snapshots_from_master_query
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.database.schema.state import schema as state_schema
 from recidiviz.persistence.database.base_schema import StateBase
@@ -32,6 +36,9 @@ from recidiviz.tests.persistence.database.database_test_utils import \
     generate_schema_state_person_obj_tree
 from recidiviz.tests.utils import fakes
 
+_INGEST_TIME_1 = datetime.datetime(2018, 7, 30)
+_INGEST_TIME_2 = datetime.datetime(2018, 7, 31)
+
 
 class TestStateHistoricalSnapshotUpdater(BaseHistoricalSnapshotUpdaterTest):
     """Tests for StateHistoricalSnapshotUpdater"""
@@ -76,3 +83,96 @@ class TestStateHistoricalSnapshotUpdater(BaseHistoricalSnapshotUpdaterTest):
         self._assert_expected_snapshots_for_schema_object(sentence_group,
                                                           [ingest_time_1])
         assert_session.close()
+
+    def testBulkSnapshotQueries(self):
+        master_table = state_schema.StateSentenceGroup.__table__
+        history_table = state_schema.StateSentenceGroupHistory.__table__
+        snapshot_time = datetime.datetime(2018, 7, 31)
+
+        close_query = str(_close_changed_snapshots_query(
+            master_table, history_table, [1, 2], snapshot_time).compile(
+                dialect=postgresql.dialect()))
+        self.assertIn('UPDATE state_sentence_group_history SET valid_to='
+                      '%(valid_to)s FROM state_sentence_group', close_query)
+        self.assertIn('state_sentence_group_history.sentence_group_id = '
+                      'ANY (%(master_ids)s)', close_query)
+        self.assertIn('state_sentence_group_history.status IS DISTINCT FROM '
+                      'state_sentence_group.status', close_query)
+        self.assertNotIn('sentence_group_history_id', close_query)
+        self.assertIn('RETURNING state_sentence_group_history.'
+                      'sentence_group_id', close_query)
+
+        insert_query = str(_insert_snapshots_from_master_query(
+            master_table, history_table, [1], snapshot_time).compile(
+                dialect=postgresql.dialect()))
+        self.assertTrue(insert_query.startswith(
+            'INSERT INTO state_sentence_group_history ('))
+        self.assertIn('sentence_group_id, person_id, valid_from) SELECT ',
+                      insert_query)
+        self.assertIn('FROM state_sentence_group \nWHERE state_sentence_group.'
+                      'sentence_group_id = ANY (%(master_ids)s)', insert_query)
+
+
+class TestStateHistoricalSnapshotUpdaterPostgres(
+        TestStateHistoricalSnapshotUpdater):
+    """Runs the StateHistoricalSnapshotUpdater tests against a postgres
+    database, where snapshots are written with set-based statements."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fakes.start_on_disk_postgresql_database()
+
+    def setUp(self) -> None:
+        fakes.use_on_disk_postgresql_database(StateBase)
+
+    def tearDown(self) -> None:
+        fakes.teardown_on_disk_postgresql_database(StateBase)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        fakes.stop_and_clear_on_disk_postgresql_database()
+
+    def _write_new_and_updated_person(self) -> None:
+        person = generate_schema_state_person_obj_tree()
+        self._commit_person(person, SystemLevel.STATE, _INGEST_TIME_1)
+
+        update_session = SessionFactory.for_schema_base(StateBase)
+        person = one(update_session.query(state_schema.StatePerson).all())
+        person.full_name = 'new name'
+        person.assessments.append(state_schema.StateAssessment(
+            assessment_id=346,
+            state_code='us_ca',
+            person=person,
+        ))
+        self._commit_person(person, SystemLevel.STATE, _INGEST_TIME_2)
+        update_session.close()
+
+    def testBulkSnapshotUpdatesMatchPerEntityUpdates(self):
+        per_entity_history_rows = self._get_history_rows_after_updates(
+            state_schema, self._write_new_and_updated_person,
+            use_bulk_snapshot_updates=False)
+
+        fakes.teardown_on_disk_postgresql_database(StateBase)
+        fakes.use_on_disk_postgresql_database(StateBase)
+
+        bulk_history_rows = self._get_history_rows_after_updates(
+            state_schema, self._write_new_and_updated_person,
+            use_bulk_snapshot_updates=True)
+
+        self.assertEqual(per_entity_history_rows, bulk_history_rows)
+
+        assert_session = SessionFactory.for_schema_base(StateBase)
+        person = one(assert_session.query(state_schema.StatePerson).all())
+        new_assessment = one(assessment for assessment in person.assessments
+                             if assessment.assessment_id == 346)
+
+        # Unchanged
+        self._assert_expected_snapshots_for_schema_object(
+            one(person.sentence_groups), [_INGEST_TIME_1])
+        # Changed
+        self._assert_expected_snapshots_for_schema_object(
+            person, [_INGEST_TIME_1, _INGEST_TIME_2])
+        # New
+        self._assert_expected_snapshots_for_schema_object(
+            new_assessment, [_INGEST_TIME_2])
+        assert_session.close()
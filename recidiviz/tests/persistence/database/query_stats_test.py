@@ -0,0 +1,128 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for query_stats.py."""
+from unittest import TestCase
+
+from recidiviz.common.constants.state import external_id_types
+from recidiviz.persistence.database.base_schema import StateBase
+from recidiviz.persistence.database.query_stats import record_query_stats
+from recidiviz.persistence.database.schema.state import dao, schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
+from recidiviz.persistence.database.session_factory import SessionFactory
+from recidiviz.tests.utils import fakes
+
+_STATE_CODE = 'US_ND'
+
+
+def _write_person() -> None:
+    person = schema.StatePerson(person_id=1)
+    person.external_ids = [schema.StatePersonExternalId(
+        person_external_id_id=1, external_id='EXTERNAL_ID', id_type=external_id_types.US_ND_SID,
+        state_code=_STATE_CODE, person=person)]
+
+    session = SessionFactory.for_schema_base(StateBase)
+    session.add(person)
+    session.commit()
+    session.close()
+
+
+class TestQueryStats(TestCase):
+    """Tests for record_query_stats."""
+
+    def setUp(self) -> None:
+        fakes.use_in_memory_sqlite_database(StateBase)
+        _write_person()
+
+    def tearDown(self) -> None:
+        fakes.teardown_in_memory_sqlite_databases()
+
+    def test_recordQueryStats(self):
+        session = SessionFactory.for_schema_base(StateBase)
+
+        with record_query_stats(session) as stats:
+            people = dao.read_people(session)
+
+        self.assertEqual(1, len(people))
+        # One query for the people and one for each eagerly loaded relationship on StatePerson
+        self.assertGreater(stats.query_count, 1)
+        # sqlite3 does not report row counts for SELECT statements
+        self.assertEqual(0, stats.rows_loaded)
+
+    def test_recordQueryStats_stopsRecordingOnExit(self):
+        session = SessionFactory.for_schema_base(StateBase)
+
+        with record_query_stats(session) as stats:
+            pass
+        dao.read_people(session)
+
+        self.assertEqual(0, stats.query_count)
+        self.assertEqual(0, stats.rows_loaded)
+
+
+class TestQueryStatsPostgres(TestCase):
+    """Tests for record_query_stats against a postgres database, which reports the rows returned for each query."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fakes.start_on_disk_postgresql_database()
+
+    def setUp(self) -> None:
+        fakes.use_on_disk_postgresql_database(StateBase)
+        _write_person()
+
+    def tearDown(self) -> None:
+        fakes.teardown_on_disk_postgresql_database(StateBase)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        fakes.stop_and_clear_on_disk_postgresql_database()
+
+    def test_recordQueryStats(self):
+        session = SessionFactory.for_schema_base(StateBase)
+
+        with record_query_stats(session) as stats:
+            people = dao.read_people(session)
+
+        self.assertEqual(1, len(people))
+        self.assertGreater(stats.query_count, 1)
+        # The person and its external id
+        self.assertEqual(2, stats.rows_loaded)
+
+    def test_recordQueryStats_objectsAlreadyInSession(self):
+        session = SessionFactory.for_schema_base(StateBase)
+        dao.read_people(session)
+
+        with record_query_stats(session) as stats:
+            people = dao.read_people(session)
+
+        # Rows are counted as they are returned by the database, even if their objects are already in the Session
+        self.assertEqual(1, len(people))
+        self.assertEqual(1, stats.rows_loaded)
+
+    def test_recordQueryStats_withLoadingProfile(self):
+        session = SessionFactory.for_schema_base(StateBase)
+        loading_profile = StatePersonLoadingProfile(ingested_classes={schema.StatePerson})
+
+        with record_query_stats(session) as stats:
+            people = dao.read_people_by_cls_external_ids(
+                session, _STATE_CODE, schema.StatePerson, ['EXTERNAL_ID'], loading_profile=loading_profile)
+
+        # One query for the matching person ids and one for the person. Relationships of the person are not queried
+        # for, as no classes other than StatePerson are ingested.
+        self.assertEqual(1, len(people))
+        self.assertEqual(2, stats.query_count)
+        self.assertEqual(2, stats.rows_loaded)
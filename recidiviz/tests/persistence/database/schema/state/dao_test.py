@@ -20,6 +20,11 @@
 import datetime
 from unittest import TestCase
 
+from mock import patch
+from sqlalchemy import inspect
+
+
+
 from recidiviz.common.constants.state import external_id_types
 from recidiviz.common.constants.state.state_sentence import StateSentenceStatus
 from recidiviz.persistence.database.session_factory import SessionFactory
@@ -27,6 +32,8 @@ from recidiviz.persistence.database.base_schema import StateBase
 from recidiviz.persistence.entity.state import entities
 from recidiviz.persistence.database.schema.state import dao
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile, \
+    RelationshipLoadingStrategy
 from recidiviz.tests.utils import fakes
 
 _REGION = 'region'
@@ -167,6 +174,105 @@ class TestDao(TestCase):
 
         self.assertCountEqual(people, expected_people)
 
+    @patch('recidiviz.persistence.database.schema.state.dao._MAX_IN_CLAUSE_SIZE', 1)
+    def test_readPeopleByRootExternalIds_batchedReads(self):
+        # Arrange
+        person_no_match = schema.StatePerson(person_id=1)
+        person_match = schema.StatePerson(person_id=2)
+        person_match.external_ids = [schema.StatePersonExternalId(
+            person_external_id_id=1, external_id=_EXTERNAL_ID, id_type=external_id_types.US_ND_SID,
+            state_code=_STATE_CODE, person=person_match)]
+        person_match_another = schema.StatePerson(person_id=3)
+        person_match_another.external_ids = [schema.StatePersonExternalId(
+            person_external_id_id=2, external_id=_EXTERNAL_ID2, id_type=external_id_types.US_ND_SID,
+            state_code=_STATE_CODE, person=person_match_another)]
+
+        session = SessionFactory.for_schema_base(StateBase)
+        session.add(person_no_match)
+        session.add(person_match)
+        session.add(person_match_another)
+        session.commit()
+
+        # Act
+        people = dao.read_people_by_cls_external_ids(
+            session, _STATE_CODE, schema.StatePerson, [_EXTERNAL_ID, _EXTERNAL_ID2])
+
+        # Assert
+        self.assertCountEqual(people, [person_match, person_match_another])
+
+    def _run_readPeopleByRootExternalIds_withLoadingProfile(self, strategy: RelationshipLoadingStrategy):
+        """Reads a person with a profile for ingested supervision sentences using the provided |strategy|."""
+        # Arrange
+        person = schema.StatePerson(person_id=1)
+        person.external_ids = [schema.StatePersonExternalId(
+            person_external_id_id=1, external_id=_EXTERNAL_ID, id_type=external_id_types.US_ND_SID,
+            state_code=_STATE_CODE, person=person)]
+        sentence_group = schema.StateSentenceGroup(
+            sentence_group_id=1, external_id=_EXTERNAL_ID, status=StateSentenceStatus.SERVING.value,
+            state_code=_STATE_CODE, person=person)
+        sentence_group.supervision_sentences = [schema.StateSupervisionSentence(
+            supervision_sentence_id=1, external_id=_EXTERNAL_ID, status=StateSentenceStatus.SERVING.value,
+            state_code=_STATE_CODE, person=person)]
+        person.sentence_groups = [sentence_group]
+
+        session = SessionFactory.for_schema_base(StateBase)
+        session.add(person)
+        session.commit()
+        session.close()
+
+        loading_profile = StatePersonLoadingProfile(ingested_classes={schema.StateSupervisionSentence},
+                                                    strategy=strategy)
+
+        # Act
+        session = SessionFactory.for_schema_base(StateBase)
+        people = dao.read_people_by_cls_external_ids(
+            session, _STATE_CODE, schema.StatePerson, [_EXTERNAL_ID], loading_profile=loading_profile)
+
+        # Assert
+        self.assertEqual(1, len(people))
+        unloaded = inspect(people[0]).unloaded
+        self.assertNotIn('sentence_groups', unloaded)
+        # Relationships that do not lead to ingested classes are only loaded once accessed
+        self.assertIn('external_ids', unloaded)
+        self.assertIn('assessments', unloaded)
+        [read_sentence_group] = people[0].sentence_groups
+        [read_supervision_sentence] = read_sentence_group.supervision_sentences
+        self.assertEqual(1, read_supervision_sentence.supervision_sentence_id)
+
+    def test_readPeopleByRootExternalIds_withLoadingProfile(self):
+        self._run_readPeopleByRootExternalIds_withLoadingProfile(RelationshipLoadingStrategy.SELECTIN)
+
+    def test_readPeopleByRootExternalIds_withSubqueryLoadingProfile(self):
+        self._run_readPeopleByRootExternalIds_withLoadingProfile(RelationshipLoadingStrategy.SUBQUERY)
+
+    @patch('recidiviz.persistence.database.schema.state.dao._MAX_IN_CLAUSE_SIZE', 1)
+    def test_readPersonIdsByClsExternalIds(self):
+        # Arrange
+        person = schema.StatePerson(person_id=1)
+        person.external_ids = [
+            schema.StatePersonExternalId(
+                person_external_id_id=1, external_id=_EXTERNAL_ID, id_type=external_id_types.US_ND_SID,
+                state_code=_STATE_CODE, person=person),
+            schema.StatePersonExternalId(
+                person_external_id_id=2, external_id=_EXTERNAL_ID2, id_type=external_id_types.US_ND_ELITE,
+                state_code=_STATE_CODE, person=person)]
+        person_another = schema.StatePerson(person_id=2)
+        person_another.external_ids = [schema.StatePersonExternalId(
+            person_external_id_id=3, external_id=_EXTERNAL_ID, id_type=external_id_types.US_ND_ELITE,
+            state_code=_STATE_CODE, person=person_another)]
+
+        session = SessionFactory.for_schema_base(StateBase)
+        session.add(person)
+        session.add(person_another)
+        session.commit()
+
+        # Act
+        person_ids_by_external_id = dao.read_person_ids_by_cls_external_ids(
+            session, _STATE_CODE, schema.StatePerson, [_EXTERNAL_ID, _EXTERNAL_ID2, 'unknown_id'])
+
+        # Assert
+        self.assertEqual({_EXTERNAL_ID: {1, 2}, _EXTERNAL_ID2: {1}}, person_ids_by_external_id)
+
     def test_readPeopleByRootExternalIds_entireTreeReturnedWithOneMatch(self):
         # Arrange
         person = schema.StatePerson(person_id=1)
@@ -0,0 +1,72 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for state/loading_profile.py."""
+from unittest import TestCase
+
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile, \
+    RelationshipLoadingStrategy, get_state_person_loading_profile
+
+
+def _option_paths(profile: StatePersonLoadingProfile):
+    return {tuple(attribute.key for attribute in option.path) for option in profile.loader_options()
+            if not isinstance(option.path[-1], str)}
+
+
+def _lazy_wildcard_paths(profile: StatePersonLoadingProfile):
+    return {tuple(attribute.key for attribute in option.path[:-1]) for option in profile.loader_options()
+            if isinstance(option.path[-1], str)}
+
+
+class TestLoadingProfile(TestCase):
+    """Tests for StatePersonLoadingProfile."""
+
+    def test_loaderOptions(self):
+        profile = StatePersonLoadingProfile(ingested_classes={schema.StatePerson, schema.StateSupervisionSentence})
+
+        self.assertEqual({('sentence_groups',), ('sentence_groups', 'supervision_sentences')}, _option_paths(profile))
+        self.assertEqual({(), ('sentence_groups',), ('sentence_groups', 'supervision_sentences')},
+                         _lazy_wildcard_paths(profile))
+
+    def test_loaderOptions_multipleParentPaths(self):
+        profile = StatePersonLoadingProfile(ingested_classes={schema.StateSupervisionViolation})
+
+        paths = _option_paths(profile)
+        self.assertIn(('sentence_groups', 'supervision_sentences', 'supervision_periods',
+                       'supervision_violation_entries'), paths)
+        self.assertIn(('sentence_groups', 'incarceration_sentences', 'supervision_periods',
+                       'supervision_violation_entries'), paths)
+        self.assertNotIn(('assessments',), paths)
+        for path in paths:
+            self.assertNotIn('supervision_violation_responses', path)
+
+    def test_loaderOptions_noIngestedChildren(self):
+        profile = StatePersonLoadingProfile(ingested_classes={schema.StatePerson},
+                                            strategy=RelationshipLoadingStrategy.SUBQUERY)
+
+        self.assertEqual(set(), _option_paths(profile))
+        self.assertEqual({()}, _lazy_wildcard_paths(profile))
+
+    def test_getStatePersonLoadingProfile(self):
+        self.assertIsNone(get_state_person_loading_profile({schema.StateCharge}, None))
+        self.assertEqual(
+            StatePersonLoadingProfile(ingested_classes={schema.StateCharge},
+                                      strategy=RelationshipLoadingStrategy.SUBQUERY),
+            get_state_person_loading_profile({schema.StateCharge}, 'subquery'))
+
+        with self.assertRaises(ValueError):
+            get_state_person_loading_profile({schema.StateCharge}, 'joined')
@@ -127,6 +127,7 @@ def test_get_all_database_entity_classes():
         'StateSupervisionViolationResponseDecisionEntryHistory',
     ]
     operations_database_entity_names = [
+        'CloudSqlToBQExportWatermark',
         'DirectIngestIngestFileMetadata',
         'DirectIngestRawFileMetadata',
     ]
@@ -261,6 +262,7 @@ def test_get_all_table_classes():
         'state_supervision_period_supervision_violation_association',
     ]
     operations_table_names = [
+        'cloud_sql_to_bq_export_watermark',
         'direct_ingest_ingest_file_metadata',
         'direct_ingest_raw_file_metadata',
     ]
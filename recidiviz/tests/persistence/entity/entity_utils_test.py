@@ -21,11 +21,13 @@ import attr
 
 from recidiviz.persistence.database import schema_utils
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.common.constants.state.state_court_case import StateCourtType
 from recidiviz.persistence.entity.entity_utils import EntityFieldType, \
     get_set_entity_field_names, is_standalone_class, \
-    SchemaEdgeDirectionChecker, prune_dangling_placeholders_from_tree
+    SchemaEdgeDirectionChecker, prune_dangling_placeholders_from_tree, \
+    get_entity_field_classification, is_placeholder
 from recidiviz.persistence.entity.state.entities import StateSentenceGroup, \
-    StateFine, StatePerson, StateSupervisionViolation
+    StateFine, StatePerson, StateSupervisionViolation, StateCourtCase
 from recidiviz.tests.persistence.database.schema.state.schema_test_utils \
     import generate_person, generate_sentence_group
 from recidiviz.persistence.database.schema_entity_converter import (
@@ -104,6 +106,48 @@ class TestEntityUtils(TestCase):
             {'fines', 'person', 'person_id', 'sentence_group_id'},
             get_set_entity_field_names(entity, EntityFieldType.ALL))
 
+    def test_getEntityFieldClassification_dbEntity(self):
+        classification = \
+            get_entity_field_classification(schema.StateSentenceGroup)
+        self.assertEqual({'person'}, classification.back_edges)
+        self.assertIn('fines', classification.forward_edges)
+        self.assertEqual({'person_id'}, classification.foreign_keys)
+        self.assertIn('sentence_group_id', classification.flat_fields)
+        self.assertNotIn('person_id', classification.flat_fields)
+        self.assertEqual({'sentence_group_id', 'state_code'},
+                         classification.placeholder_ignored_fields)
+        self.assertEqual({'status': None}, classification.default_enum_fields)
+
+    def test_getEntityFieldClassification_entity(self):
+        classification = get_entity_field_classification(StateCourtCase)
+        self.assertEqual({'person', 'charges'}, classification.back_edges)
+        self.assertEqual({'judge'}, classification.forward_edges)
+        self.assertEqual(set(), classification.foreign_keys)
+        self.assertEqual({'status': None,
+                          'court_type': StateCourtType.PRESENT_WITHOUT_INFO},
+                         classification.default_enum_fields)
+
+    def test_getEntityFieldClassification_cachedPerClass(self):
+        self.assertIs(
+            get_entity_field_classification(schema.StateSentenceGroup),
+            get_entity_field_classification(schema.StateSentenceGroup))
+        self.assertIs(SchemaEdgeDirectionChecker.state_direction_checker(),
+                      SchemaEdgeDirectionChecker.state_direction_checker())
+
+    def test_isPlaceholder_defaultEnumValues(self):
+        placeholder_court_case = StateCourtCase.new_with_defaults(
+            court_case_id=_ID,
+            state_code=_STATE_CODE,
+            court_type=StateCourtType.PRESENT_WITHOUT_INFO)
+        court_case = StateCourtCase.new_with_defaults(
+            court_case_id=_ID,
+            state_code=_STATE_CODE,
+            court_type=StateCourtType.PRESENT_WITHOUT_INFO,
+            court_type_raw_text='PRESENT_WITHOUT_INFO')
+
+        self.assertTrue(is_placeholder(placeholder_court_case))
+        self.assertFalse(is_placeholder(court_case))
+
     def test_isStandaloneClass(self):
         for cls in schema_utils.get_non_history_state_database_entities():
             if cls == schema.StateAgent:
@@ -277,3 +277,97 @@ class TestCountyMatchingUtils(TestCase):
         county_matching_utils.close_multiple_open_bookings([db_booking1, db_booking2])
         self.assertTrue(db_booking1.release_date == _DATE)
         self.assertIsNone(db_booking2.release_date)
+
+    def test_person_blocking_index_candidates(self):
+        external_id_person = entities.Person.new_with_defaults(
+            person_id=1, external_id=_EXTERNAL_ID, full_name=_FULL_NAME)
+        birthdate_person = entities.Person.new_with_defaults(
+            person_id=2, full_name=_FULL_NAME, birthdate=_DATE)
+        other_birthdate_person = entities.Person.new_with_defaults(
+            person_id=3, full_name=_FULL_NAME, birthdate=_DATE_OTHER)
+        inferred_person = entities.Person.new_with_defaults(
+            person_id=4, full_name=_FULL_NAME, birthdate=_DATE,
+            birthdate_inferred_from_age=True)
+        inferred_person_other = entities.Person.new_with_defaults(
+            person_id=5, full_name=_FULL_NAME,
+            birthdate=_DATE - relativedelta(years=1),
+            birthdate_inferred_from_age=True)
+        inferred_person_too_old = entities.Person.new_with_defaults(
+            person_id=6, full_name=_FULL_NAME,
+            birthdate=_DATE - relativedelta(years=2),
+            birthdate_inferred_from_age=True)
+        db_people = [external_id_person, birthdate_person,
+                     other_birthdate_person, inferred_person,
+                     inferred_person_other, inferred_person_too_old]
+        index = county_matching_utils.PersonBlockingIndex(db_people)
+
+        ingested_people = [
+            entities.Person.new_with_defaults(external_id=_EXTERNAL_ID),
+            entities.Person.new_with_defaults(
+                external_id=_EXTERNAL_ID_OTHER, full_name=_FULL_NAME),
+            entities.Person.new_with_defaults(
+                full_name=_FULL_NAME, birthdate=_DATE),
+            entities.Person.new_with_defaults(
+                full_name=_FULL_NAME, birthdate=_DATE,
+                birthdate_inferred_from_age=True),
+            entities.Person.new_with_defaults(
+                full_name=_FULL_NAME, birthdate=_DATE - relativedelta(years=1),
+                birthdate_inferred_from_age=True),
+            entities.Person.new_with_defaults(birthdate=_DATE),
+        ]
+
+        self.assertEqual([[external_id_person],
+                          [],
+                          [birthdate_person],
+                          [inferred_person, inferred_person_other],
+                          [inferred_person, inferred_person_other,
+                           inferred_person_too_old],
+                          []],
+                         [index.candidates(p) for p in ingested_people])
+
+        # The index returns a superset of the people that are person matches
+        for ingested_person in ingested_people:
+            self.assertEqual(
+                [db_person for db_person in db_people
+                 if county_matching_utils.is_person_match(
+                     db_entity=db_person, ingested_entity=ingested_person)],
+                [db_person for db_person in index.candidates(ingested_person)
+                 if county_matching_utils.is_person_match(
+                     db_entity=db_person, ingested_entity=ingested_person)])
+
+    def test_diff_count_children(self):
+        charge = entities.Charge.new_with_defaults(
+            charge_id=_CHARGE_ID, name=_CHARGE_NAME,
+            bond=entities.Bond.new_with_defaults(
+                bond_id=_BOND_ID, bond_type=BondType.CASH))
+        booking = entities.Booking.new_with_defaults(
+            booking_id=_BOOKING_ID, facility=_FACILITY, charges=[charge])
+        person = entities.Person.new_with_defaults(
+            person_id=_PERSON_ID, full_name=_FULL_NAME, bookings=[booking])
+
+        person_another = attr.evolve(person, bookings=[attr.evolve(
+            booking,
+            charges=[
+                attr.evolve(charge, bond=attr.evolve(
+                    charge.bond, bond_type=BondType.SECURED)),
+                entities.Charge.new_with_defaults(name=_CHARGE_NAME_2)
+            ])])
+
+        self.assertEqual(0, county_matching_utils.diff_count(person, person))
+        # The changed bond type and the added charge
+        self.assertEqual(
+            2, county_matching_utils.diff_count(person, person_another))
+        self.assertEqual(
+            2, county_matching_utils.diff_count(person_another, person))
+
+    def test_diff_count_relatedSentenceCycle(self):
+        sentence = entities.Sentence.new_with_defaults(
+            sentence_id=_SENTENCE_ID, is_life=True)
+        related_sentence = entities.Sentence.new_with_defaults(
+            sentence_id=_SENTENCE_ID_OTHER, related_sentences=[sentence])
+        sentence.related_sentences = [related_sentence]
+
+        sentence_copy = attr.evolve(sentence, is_life=False)
+
+        self.assertEqual(
+            1, county_matching_utils.diff_count(sentence, sentence_copy))
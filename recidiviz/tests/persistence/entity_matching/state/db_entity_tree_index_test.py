@@ -0,0 +1,98 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for db_entity_tree_index.py"""
+from unittest import TestCase
+
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
+from recidiviz.persistence.entity_matching.state.db_entity_tree_index import DbEntityTreeIndex
+
+_STATE_CODE = 'US_XX'
+_EXTERNAL_ID = 'EXTERNAL_ID-1'
+_EXTERNAL_ID_2 = 'EXTERNAL_ID-2'
+_EXTERNAL_ID_3 = 'EXTERNAL_ID-3'
+_ID_TYPE = 'ID_TYPE'
+
+
+def _tree(entity):
+    return EntityTree(entity=entity, ancestor_chain=[])
+
+
+class TestDbEntityTreeIndex(TestCase):
+    """Tests for DbEntityTreeIndex."""
+
+    def test_getMatchCandidates_externalId(self):
+        db_charge_trees = [
+            _tree(schema.StateCharge(state_code=_STATE_CODE, external_id=external_id))
+            for external_id in (_EXTERNAL_ID, _EXTERNAL_ID_2, _EXTERNAL_ID)
+        ]
+        index = DbEntityTreeIndex(db_charge_trees)
+
+        ingested_charge = schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID)
+        self.assertEqual([db_charge_trees[0], db_charge_trees[2]], index.get_match_candidates(ingested_charge))
+
+        ingested_charge.external_id = _EXTERNAL_ID_3
+        self.assertEqual([], index.get_match_candidates(ingested_charge))
+
+    def test_getMatchCandidates_placeholdersAlwaysCandidates(self):
+        db_charge_trees = [
+            _tree(schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2)),
+            _tree(schema.StateCharge(state_code=_STATE_CODE)),
+            _tree(schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID)),
+        ]
+        index = DbEntityTreeIndex(db_charge_trees)
+
+        ingested_charge = schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID)
+        self.assertEqual([db_charge_trees[1], db_charge_trees[2]], index.get_match_candidates(ingested_charge))
+
+        ingested_placeholder = schema.StateCharge(state_code=_STATE_CODE)
+        self.assertEqual(db_charge_trees, index.get_match_candidates(ingested_placeholder))
+
+    def test_getMatchCandidates_multipleIdEntity(self):
+        db_person_tree = _tree(schema.StatePerson(external_ids=[
+            schema.StatePersonExternalId(state_code=_STATE_CODE, external_id=_EXTERNAL_ID, id_type=_ID_TYPE)]))
+        db_person_tree_another = _tree(schema.StatePerson(external_ids=[
+            schema.StatePersonExternalId(state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2, id_type=_ID_TYPE)]))
+        index = DbEntityTreeIndex([db_person_tree, db_person_tree_another])
+
+        ingested_person = schema.StatePerson(external_ids=[
+            schema.StatePersonExternalId(state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2, id_type=_ID_TYPE),
+            schema.StatePersonExternalId(state_code=_STATE_CODE, external_id=_EXTERNAL_ID_3, id_type=_ID_TYPE)])
+        self.assertEqual([db_person_tree_another], index.get_match_candidates(ingested_person))
+
+        # Simulate the person gaining an external id when merged with a duplicate.
+        db_person_tree.entity.external_ids.append(
+            schema.StatePersonExternalId(state_code=_STATE_CODE, external_id=_EXTERNAL_ID_3, id_type=_ID_TYPE))
+        index.add_tree(db_person_tree)
+        self.assertEqual([db_person_tree, db_person_tree_another], index.get_match_candidates(ingested_person))
+
+    def test_getMatchCandidates_externalIdChangedByMerge(self):
+        db_period_tree = _tree(schema.StateIncarcerationPeriod(state_code=_STATE_CODE, external_id=_EXTERNAL_ID))
+        index = DbEntityTreeIndex([db_period_tree])
+
+        # Simulate a state-specific merge rewriting the external id of the DB entity, e.g. US_ND merging incomplete
+        # incarceration periods.
+        merged_external_id = f'{_EXTERNAL_ID}|{_EXTERNAL_ID_2}'
+        db_period_tree.entity.external_id = merged_external_id
+        index.add_tree(db_period_tree)
+
+        ingested_period = schema.StateIncarcerationPeriod(state_code=_STATE_CODE, external_id=merged_external_id)
+        self.assertEqual([db_period_tree], index.get_match_candidates(ingested_period))
+
+        # Keys from before the merge are kept
+        ingested_period.external_id = _EXTERNAL_ID
+        self.assertEqual([db_period_tree], index.get_match_candidates(ingested_period))
@@ -0,0 +1,149 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for matched_person_tree_cache.py."""
+from typing import List
+from unittest import TestCase
+
+from recidiviz.persistence.database.base_schema import StateBase
+from recidiviz.persistence.database.query_stats import record_query_stats
+from recidiviz.persistence.database.schema.state import schema, dao
+from recidiviz.persistence.database.session_factory import SessionFactory
+from recidiviz.persistence.entity_matching.state.matched_person_tree_cache import MatchedPersonTreeCache
+from recidiviz.tests.utils import fakes
+
+_STATE_CODE = 'US_XX'
+_ID_TYPE = 'ID_TYPE'
+
+
+def _person(external_id: str) -> schema.StatePerson:
+    person = schema.StatePerson()
+    person.external_ids = [schema.StatePersonExternalId(
+        state_code=_STATE_CODE, external_id=external_id, id_type=_ID_TYPE)]
+    person.sentence_groups = [schema.StateSentenceGroup(
+        state_code=_STATE_CODE, external_id=f'SG_{external_id}', status='PRESENT_WITHOUT_INFO')]
+    return person
+
+
+class TestMatchedPersonTreeCache(TestCase):
+    """Tests for MatchedPersonTreeCache."""
+
+    def setUp(self) -> None:
+        fakes.use_in_memory_sqlite_database(StateBase)
+
+    def tearDown(self) -> None:
+        fakes.teardown_in_memory_sqlite_databases()
+
+    def _write_and_cache(self, cache: MatchedPersonTreeCache, external_ids: List[str]) -> None:
+        """Writes a person for each of the provided |external_ids| and caches them as if they had been matched."""
+        session = SessionFactory.for_schema_base(StateBase)
+        session.expire_on_commit = False
+        persons = [_person(external_id) for external_id in external_ids]
+        _, uncached = cache.get_persons(session, persons, schema.StatePerson)
+        self.assertEqual(persons, uncached)
+        session.add_all(persons)
+        session.flush()
+        cache.stage(persons, set(external_ids))
+        session.commit()
+        cache.commit_staged()
+        session.close()
+
+    def test_getPersons_notCached(self):
+        cache = MatchedPersonTreeCache(max_size=10)
+        session = SessionFactory.for_schema_base(StateBase)
+        ingested_persons = [_person('1')]
+
+        db_persons, uncached = cache.get_persons(session, ingested_persons, schema.StatePerson)
+
+        self.assertEqual([], db_persons)
+        self.assertEqual(ingested_persons, uncached)
+        self.assertEqual(1, cache.misses)
+
+    def test_getPersons_cached(self):
+        cache = MatchedPersonTreeCache(max_size=10)
+        self._write_and_cache(cache, ['1', '2'])
+
+        session = SessionFactory.for_schema_base(StateBase)
+        ingested_persons = [_person('1'), _person('3')]
+        with record_query_stats(session) as stats:
+            db_persons, uncached = cache.get_persons(session, ingested_persons, schema.StatePerson)
+            self.assertEqual(['SG_1'], [sg.external_id for sg in db_persons[0].sentence_groups])
+
+        self.assertEqual(0, stats.query_count)
+        self.assertEqual([ingested_persons[1]], uncached)
+        self.assertEqual(1, len(db_persons))
+        self.assertIn(db_persons[0], session)
+        self.assertEqual(1, cache.hits)
+
+        # Updates to merged persons are written
+        db_persons[0].sentence_groups[0].county_code = 'COUNTY'
+        session.commit()
+        db_person = dao.read_people(SessionFactory.for_schema_base(StateBase))[0]
+        self.assertEqual('COUNTY', db_person.sentence_groups[0].county_code)
+
+    def test_getPersons_alreadyInSession(self):
+        cache = MatchedPersonTreeCache(max_size=10)
+        self._write_and_cache(cache, ['1'])
+
+        session = SessionFactory.for_schema_base(StateBase)
+        db_person = dao.read_people(session)[0]
+        db_persons, _ = cache.get_persons(session, [_person('1')], schema.StatePerson)
+
+        self.assertIs(db_person, db_persons[0])
+
+    def test_discardStaged(self):
+        cache = MatchedPersonTreeCache(max_size=10)
+        session = SessionFactory.for_schema_base(StateBase)
+        person = _person('1')
+        cache.get_persons(session, [person], schema.StatePerson)
+        session.add(person)
+        session.flush()
+
+        cache.stage([person], {'1'})
+        session.rollback()
+        cache.discard_staged()
+        cache.commit_staged()
+
+        _, uncached = cache.get_persons(session, [_person('1')], schema.StatePerson)
+        self.assertEqual(1, len(uncached))
+        self.assertEqual(0, len(cache))
+
+    def test_commitStaged_evictsLeastRecentlyUsed(self):
+        cache = MatchedPersonTreeCache(max_size=2)
+        self._write_and_cache(cache, ['1', '2'])
+
+        session = SessionFactory.for_schema_base(StateBase)
+        cache.get_persons(session, [_person('1')], schema.StatePerson)
+        session.close()
+        self._write_and_cache(cache, ['3'])
+
+        self.assertEqual(2, len(cache))
+        session = SessionFactory.for_schema_base(StateBase)
+        db_persons, uncached = cache.get_persons(
+            session, [_person('1'), _person('2'), _person('3')], schema.StatePerson)
+        self.assertEqual(['1', '3'], [p.external_ids[0].external_id for p in db_persons])
+        self.assertEqual(['2'], [p.external_ids[0].external_id for p in uncached])
+
+    def test_getPersons_newRootEntityClsClearsCache(self):
+        cache = MatchedPersonTreeCache(max_size=10)
+        self._write_and_cache(cache, ['1'])
+
+        session = SessionFactory.for_schema_base(StateBase)
+        db_persons, uncached = cache.get_persons(session, [_person('1')], schema.StateSentenceGroup)
+
+        self.assertEqual([], db_persons)
+        self.assertEqual(1, len(uncached))
+        self.assertEqual(0, len(cache))
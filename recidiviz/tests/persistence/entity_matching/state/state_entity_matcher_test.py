@@ -16,10 +16,11 @@
 # =============================================================================
 """Tests for state_entity_matcher.py."""
 import datetime
-from typing import List
+from typing import List, Optional
 
 import attr
 from mock import patch
+from sqlalchemy import inspect
 
 from recidiviz.common.constants.bond import BondStatus
 from recidiviz.common.constants.charge import ChargeStatus
@@ -44,7 +45,9 @@ from recidiviz.common.constants.state.state_supervision_violation import \
 from recidiviz.common.constants.state.state_supervision_violation_response \
     import StateSupervisionViolationResponseDecision, \
     StateSupervisionViolationResponseRevocationType
+from recidiviz.persistence.database.query_stats import record_query_stats
 from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema.state.loading_profile import StatePersonLoadingProfile
 from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.entity.state.entities import StatePersonAlias, \
     StatePersonExternalId, StatePersonRace, StatePersonEthnicity, StatePerson, \
@@ -100,10 +103,25 @@ class FakeStateMatchingDelegate(BaseStateMatchingDelegate):
         super().__init__(region_code)
 
     def read_potential_match_db_persons(
-            self, session: Session, ingested_persons: List[schema.StatePerson]) -> List[schema.StatePerson]:
+            self, session: Session, ingested_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile] = None) -> List[schema.StatePerson]:
         return state_matching_utils.read_persons(session, self.region_code, ingested_persons)
 
 
+class FakeRootEntityStateMatchingDelegate(BaseStateMatchingDelegate):
+    """Reads the DB persons that match ingested root entities, and all placeholder persons, according to the loading
+    profile."""
+    def __init__(self, region_code):
+        super().__init__(region_code)
+
+    def read_potential_match_db_persons(
+            self, session: Session, ingested_persons: List[schema.StatePerson],
+            loading_profile: Optional[StatePersonLoadingProfile] = None) -> List[schema.StatePerson]:
+        return state_matching_utils.read_persons_by_root_entity_cls(
+            session, self.region_code, ingested_persons, allowed_root_entity_classes=None,
+            loading_profile=loading_profile)
+
+
 class TestStateEntityMatching(BaseStateEntityMatcherTest):
     """Tests for default state entity matching logic."""
 
@@ -115,9 +133,10 @@ class TestStateEntityMatching(BaseStateEntityMatcherTest):
             "build", new=self._get_base_delegate)
         self.matching_delegate_patcher.start()
         self.addCleanup(self.matching_delegate_patcher.stop)
+        self.matching_delegate: BaseStateMatchingDelegate = FakeStateMatchingDelegate(_STATE_CODE)
 
     def _get_base_delegate(self, **_kwargs):
-        return FakeStateMatchingDelegate(_STATE_CODE)
+        return self.matching_delegate
 
     def test_match_newPerson(self):
         # Arrange 1 - Match
@@ -152,6 +171,50 @@ class TestStateEntityMatching(BaseStateEntityMatcherTest):
         self.assertEqual(1, matched_entities.total_root_entities)
         self.assert_no_errors(matched_entities)
 
+    def test_match_withLoadingProfile_doesNotLoadRelationshipsOutsideProfile(self):
+        # Arrange
+        self.matching_delegate = FakeRootEntityStateMatchingDelegate(_STATE_CODE)
+        num_people = 10
+        db_people = []
+        ingested_people = []
+        for i in range(1, num_people + 1):
+            db_person = generate_person(person_id=i, full_name=_FULL_NAME)
+            db_person.external_ids = [generate_external_id(person_external_id_id=i, external_id=f'EXTERNAL_ID-{i}')]
+            db_person.races = [generate_race(person_race_id=i, race=Race.WHITE.value)]
+            db_person.aliases = [generate_alias(person_alias_id=i, full_name=_FULL_NAME)]
+            db_person.assessments = [generate_assessment(person=db_person, assessment_id=i, external_id=f'A-{i}')]
+            db_person.sentence_groups = [generate_sentence_group(sentence_group_id=i, external_id=f'SG-{i}')]
+            db_people.append(db_person)
+
+            ingested_people.append(StatePerson.new_with_defaults(
+                full_name=_FULL_NAME,
+                external_ids=[StatePersonExternalId.new_with_defaults(
+                    state_code=_STATE_CODE, external_id=f'EXTERNAL_ID-{i}', id_type=_ID_TYPE)],
+                sentence_groups=[StateSentenceGroup.new_with_defaults(
+                    state_code=_STATE_CODE, external_id=f'SG-{i}', status=StateSentenceStatus.PRESENT_WITHOUT_INFO)]))
+
+        self._commit_to_db(*db_people)
+        expected_people = [self.to_entity(db_person) for db_person in db_people]
+
+        # Act
+        session = self._session()
+        with record_query_stats(session) as query_stats:
+            matched_entities = entity_matching.match(
+                session, _STATE_CODE, ingested_people, loading_strategy='selectin')
+
+        # Assert
+        # Walking the matched DB person trees, e.g. to populate person back edges, does not lazily load the
+        # relationships outside the loading profile, so the number of queries does not grow with the number of people
+        self.assertLess(query_stats.query_count, num_people)
+        for matched_person in matched_entities.people:
+            unloaded = inspect(matched_person).unloaded
+            self.assertNotIn('sentence_groups', unloaded)
+            self.assertTrue({'races', 'aliases', 'assessments'}.issubset(unloaded))
+
+        self.assert_people_match_pre_and_post_commit(expected_people, matched_entities.people, session)
+        self.assertEqual(num_people, matched_entities.total_root_entities)
+        self.assert_no_errors(matched_entities)
+
     def test_match_overwriteAgent(self):
         # Arrange 1 - Match
         db_agent = generate_agent(
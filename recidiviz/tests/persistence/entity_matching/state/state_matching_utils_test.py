@@ -38,7 +38,7 @@ from recidiviz.persistence.entity_matching.state.state_matching_utils import \
     nonnull_fields_entity_match, get_external_ids_of_cls, \
     get_all_entity_trees_of_cls, default_merge_flat_fields, \
     read_persons_by_root_entity_cls, read_db_entity_trees_of_cls_to_merge, \
-    read_persons
+    read_persons, get_match_index_keys
 from recidiviz.persistence.entity.entity_utils import is_placeholder
 
 from recidiviz.persistence.entity_matching.entity_matching_types import \
@@ -157,6 +157,36 @@ class TestStateMatchingUtils(BaseStateMatchingUtilsTest):
         self.assertFalse(
             _is_match(ingested_entity=charge, db_entity=charge_another))
 
+    def test_getMatchIndexKeys_defaultExternalId(self):
+        charge = schema.StateCharge(
+            state_code=_STATE_CODE, external_id=_EXTERNAL_ID)
+        self.assertEqual({(_STATE_CODE, _EXTERNAL_ID)},
+                         get_match_index_keys(charge))
+        self.assertIsNone(get_match_index_keys(schema.StateCharge()))
+
+    def test_getMatchIndexKeys_statePerson(self):
+        external_id = schema.StatePersonExternalId(
+            state_code=_STATE_CODE, external_id=_EXTERNAL_ID,
+            id_type=_ID_TYPE)
+        external_id_another = schema.StatePersonExternalId(
+            state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2,
+            id_type=_ID_TYPE_ANOTHER)
+        person = schema.StatePerson(
+            external_ids=[external_id, external_id_another])
+
+        self.assertEqual({(_STATE_CODE, _ID_TYPE, _EXTERNAL_ID),
+                          (_STATE_CODE, _ID_TYPE_ANOTHER, _EXTERNAL_ID_2)},
+                         get_match_index_keys(person))
+
+        person.external_ids.append(
+            schema.StatePersonExternalId(state_code=_STATE_CODE))
+        self.assertIsNone(get_match_index_keys(person))
+
+    def test_getMatchIndexKeys_nonExternalIdMatch(self):
+        alias = schema.StatePersonAlias(
+            state_code=_STATE_CODE, full_name='full_name')
+        self.assertIsNone(get_match_index_keys(alias))
+
     def test_mergeFlatFields_twoDbEntities(self):
         to_entity = schema.StateSentenceGroup(
             sentence_group_id=_ID, county_code='county_code',
@@ -33,6 +33,10 @@ from recidiviz.persistence.database.schema_entity_converter import (
 )
 from recidiviz.persistence.entity.state.entities import StatePerson, \
     StatePersonExternalId, StateSentenceGroup
+from recidiviz.persistence.entity_matching.state.matched_person_tree_cache \
+    import MatchedPersonTreeCache
+from recidiviz.persistence.entity_matching.state.state_matching_utils import \
+    read_persons_by_root_entity_cls
 from recidiviz.tests.utils import fakes
 
 EXTERNAL_ID = 'EXTERNAL_ID'
@@ -40,6 +44,7 @@ EXTERNAL_ID_2 = 'EXTERNAL_ID_2'
 FULL_NAME_1 = 'TEST_FULL_NAME_1'
 REGION_CODE = 'US_ND'
 COUNTY_CODE = 'COUNTY'
+COUNTY_CODE_2 = 'COUNTY_2'
 DEFAULT_METADATA = IngestMetadata.new_with_defaults(
     region='US_ND',
     jurisdiction_id='12345678',
@@ -255,3 +260,60 @@ class TestStatePersistence(TestCase):
         # Assert
         self.assertEqual([expected_person, expected_person_2],
                          converter.convert_schema_objects_to_entity(persons))
+
+    def test_state_writeWithPersonTreeCache(self):
+        # Arrange
+        db_person = schema.StatePerson(person_id=ID, full_name=FULL_NAME_1)
+        db_sentence_group = schema.StateSentenceGroup(
+            sentence_group_id=ID,
+            status=StateSentenceStatus.EXTERNAL_UNKNOWN.value,
+            external_id=SENTENCE_GROUP_ID,
+            state_code=REGION_CODE)
+        db_external_id = schema.StatePersonExternalId(
+            person_external_id_id=ID, state_code=REGION_CODE,
+            external_id=EXTERNAL_ID, id_type=ID_TYPE)
+        db_person.sentence_groups = [db_sentence_group]
+        db_person.external_ids = [db_external_id]
+
+        session = SessionFactory.for_schema_base(StateBase)
+        session.add(db_person)
+        session.commit()
+
+        ingest_info = IngestInfo()
+        ingest_info.state_people.add(
+            state_person_id='1_GENERATE',
+            state_sentence_group_ids=[SENTENCE_GROUP_ID])
+        ingest_info.state_sentence_groups.add(
+            state_sentence_group_id=SENTENCE_GROUP_ID,
+            county_code=COUNTY_CODE)
+
+        ingest_info_2 = IngestInfo()
+        ingest_info_2.state_people.add(
+            state_person_id='1_GENERATE',
+            state_sentence_group_ids=[SENTENCE_GROUP_ID])
+        ingest_info_2.state_sentence_groups.add(
+            state_sentence_group_id=SENTENCE_GROUP_ID,
+            county_code=COUNTY_CODE_2)
+
+        person_tree_cache = MatchedPersonTreeCache(max_size=10)
+
+        # Act
+        with patch('recidiviz.persistence.entity_matching.state.us_nd.'
+                   'us_nd_matching_delegate.read_persons_by_root_entity_cls',
+                   wraps=read_persons_by_root_entity_cls) as mock_read:
+            self.assertTrue(persistence.write(
+                ingest_info, DEFAULT_METADATA, person_tree_cache))
+            self.assertTrue(persistence.write(
+                ingest_info_2, DEFAULT_METADATA, person_tree_cache))
+
+        # Assert
+        # Only the first write reads from the DB
+        self.assertEqual(1, mock_read.call_count)
+        self.assertEqual(1, len(person_tree_cache))
+
+        session = SessionFactory.for_schema_base(StateBase)
+        persons = dao.read_people(session)
+        self.assertEqual(1, len(persons))
+        self.assertEqual(1, len(persons[0].sentence_groups))
+        self.assertEqual(COUNTY_CODE_2,
+                         persons[0].sentence_groups[0].county_code)
@@ -34,12 +34,16 @@ def fake_region(*,
                                          BaseDirectIngestController]] = None,
                 is_raw_vs_ingest_file_name_detection_enabled: bool = False,
                 are_raw_data_bq_imports_enabled_in_env: bool = False,
-                are_ingest_view_exports_enabled_in_env: bool = False):
+                are_ingest_view_exports_enabled_in_env: bool = False,
+                entity_matching_loading_strategy: Optional[str] = None,
+                split_file_person_tree_cache_size: Optional[int] = None):
     region = create_autospec(Region)
     region.region_code = region_code
     region.agency_type = agency_type
     region.environment = environment
     region.jurisdiction_id = jurisdiction_id
+    region.entity_matching_loading_strategy = entity_matching_loading_strategy
+    region.split_file_person_tree_cache_size = split_file_person_tree_cache_size
     region.get_ingestor.return_value = \
         ingestor if ingestor else create_autospec(BaseDirectIngestController)
     region.is_ingest_launched_in_env.return_value = \
@@ -0,0 +1,139 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Microbenchmark for BuildableAttr.build_from_dictionary, run over synthetic StateSupervisionPeriod rows shaped like the
+rows the calculation pipelines read from BigQuery.
+
+Times build_from_dictionary, which uses a per-class decoder that is built once, against the previous implementation,
+which classified every field of the class and filled in a Builder for every row.
+
+Example usage:
+
+python -m recidiviz.tools.benchmarks.build_from_dictionary_benchmark \
+    --rows 1000000 \
+    --repeat 3
+"""
+import argparse
+import datetime
+import logging
+import timeit
+from typing import Any, Callable, Dict, List, Type
+
+import attr
+
+from recidiviz.common.attr_mixins import BuildableAttr
+from recidiviz.common.attr_utils import is_enum, is_forward_ref, is_date
+from recidiviz.common.constants.state.state_supervision import StateSupervisionType
+from recidiviz.common.constants.state.state_supervision_period import StateSupervisionPeriodStatus, \
+    StateSupervisionPeriodAdmissionReason, StateSupervisionPeriodTerminationReason, StateSupervisionLevel
+from recidiviz.common.str_field_utils import is_yyyymmdd_date, parse_yyyymmdd_date
+from recidiviz.persistence.entity.state import entities
+
+_STATE_CODE = 'US_XX'
+
+
+def build_synthetic_rows(num_rows: int) -> List[Dict[str, Any]]:
+    """Returns |num_rows| StateSupervisionPeriod rows, with enum values as strings and dates in ISO format."""
+    rows = []
+    for i in range(num_rows):
+        start_date = datetime.date(2000, 1, 1) + datetime.timedelta(days=i % 5000)
+        rows.append({
+            'supervision_period_id': i,
+            'person_id': i // 10,
+            'external_id': f'SP_{i}',
+            'state_code': _STATE_CODE,
+            'status': StateSupervisionPeriodStatus.TERMINATED.value,
+            'status_raw_text': 'TERMINATED',
+            'supervision_type': StateSupervisionType.PROBATION.value,
+            'supervision_type_raw_text': 'PROB',
+            'supervision_period_supervision_type': None,
+            'supervision_period_supervision_type_raw_text': None,
+            'start_date': start_date.isoformat(),
+            'termination_date': (start_date + datetime.timedelta(days=100)).isoformat(),
+            'county_code': 'COUNTY',
+            'supervision_site': 'SITE',
+            'admission_reason': StateSupervisionPeriodAdmissionReason.COURT_SENTENCE.value,
+            'admission_reason_raw_text': 'SENT',
+            'termination_reason': StateSupervisionPeriodTerminationReason.DISCHARGE.value,
+            'termination_reason_raw_text': 'DIS',
+            'supervision_level': StateSupervisionLevel.MEDIUM.value,
+            'supervision_level_raw_text': 'MED',
+            'custodial_authority': None,
+            'conditions': 'CURFEW',
+        })
+    return rows
+
+
+def _build_with_builder(cls: Type[BuildableAttr], build_dict: Dict[str, Any]) -> BuildableAttr:
+    """The implementation of build_from_dictionary before per-class decoders were introduced."""
+    cls_builder = cls.builder()
+
+    for field, attribute in attr.fields_dict(cls).items():
+        if field in build_dict:
+            if is_forward_ref(attribute):
+                raise ValueError(f"Should not contain any ForwardRef fields: {build_dict}")
+
+            if is_enum(attribute):
+                value = cls.extract_enum_value(build_dict, field, attribute)
+            elif is_date(attribute):
+                value = build_dict.get(field)
+                if value and isinstance(value, str):
+                    if is_yyyymmdd_date(value):
+                        value = parse_yyyymmdd_date(value)
+                    else:
+                        value = datetime.datetime.strptime(value, '%Y-%m-%d').date()
+            else:
+                value = build_dict.get(field)
+
+            setattr(cls_builder, field, value)
+
+    return cls_builder.build()
+
+
+def _build_all(build_fn: Callable[[Dict[str, Any]], Any], rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        build_fn(row)
+
+
+def _time(name: str, fn: Callable[[], None], repeat: int) -> None:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    logging.info('%-45s %8.3f s', name, best)
+
+
+def main(num_rows: int, repeat: int) -> None:
+    rows = build_synthetic_rows(num_rows)
+    logging.info('Built %d synthetic StateSupervisionPeriod rows', len(rows))
+
+    cls = entities.StateSupervisionPeriod
+    if cls.build_from_dictionary(rows[0]) != _build_with_builder(cls, rows[0]):
+        raise ValueError('build_from_dictionary and the Builder implementation produced different results')
+
+    _time('build_from_dictionary', lambda: _build_all(cls.build_from_dictionary, rows), repeat)
+    _time('Builder per row', lambda: _build_all(lambda row: _build_with_builder(cls, row), rows), repeat)
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    args = _parse_arguments()
+    main(args.rows, args.repeat)
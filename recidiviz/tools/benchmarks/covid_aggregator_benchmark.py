@@ -0,0 +1,198 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Benchmark for the COVID facility data aggregator, run over a year of synthetic daily data from each of the sources.
+
+Times covid_aggregator.aggregate end to end, from the source readers to the output CSV string, with the remote facility
+info mapping replaced by a synthetic one.
+
+Example usage:
+
+python -m recidiviz.tools.benchmarks.covid_aggregator_benchmark \
+    --days 365 \
+    --facilities 500 \
+    --repeat 3
+"""
+import argparse
+import csv
+import datetime
+import logging
+import random
+import timeit
+from typing import Any, Callable, List, NamedTuple, Tuple
+from unittest import mock
+
+from recidiviz.cloud_functions.covid import covid_aggregator
+
+_STATES = ['Alabama', 'California', 'Delaware', 'Federal', 'Ohio', 'Tennessee', 'Texas', 'Wyoming']
+
+_PRISON_COLUMNS = [
+    'scrape_date', 'state', 'facilities', 'inmates_tested', 'inmates_positive', 'inmates_negative',
+    'inmates_pending', 'inmates_deaths', 'inmates_deaths_confirmed', 'staff_tested', 'staff_positive',
+    'staff_negative', 'staff_pending', 'staff_deaths'
+]
+
+_UCLA_COLUMNS = [
+    'Date', 'State', 'Name', 'Staff Confirmed', 'Residents confirmed', 'Staff Deaths', 'Resident Deaths',
+    'Staff Tested', 'Residents Tested', 'Website', 'Add\'l Notes'
+]
+
+_RECIDIVIZ_COLUMNS = [
+    'As of...? (Date)', 'Facility Type', 'State', 'Facility', 'Population Tested', 'Population Tested Positive',
+    'Population Tested Negative', 'Population Deaths', 'Staff Tested', 'Staff Tested Positive',
+    'Staff Tested Negative', 'Staff Deaths', 'Source', 'Notes'
+]
+
+
+class _FakeCell(NamedTuple):
+    ctype: int
+    value: Any
+
+
+class _FakeSheet:
+    """Stand-in for an xlrd Sheet, supporting the operations used by the aggregator."""
+
+    def __init__(self, name: str, rows: List[List[_FakeCell]]):
+        self.name = name
+        self._rows = rows
+        self.nrows = len(rows)
+
+    def row(self, index: int) -> List[_FakeCell]:
+        return self._rows[index]
+
+
+class _FakeWorkbook:
+    """Stand-in for an xlrd Book, supporting the operations used by the aggregator."""
+
+    def __init__(self, sheets: List[_FakeSheet]):
+        self._sheets = sheets
+        self.datemode = 0
+
+    def sheets(self) -> List[_FakeSheet]:
+        return self._sheets
+
+
+def _count(rng: random.Random, upper: int) -> str:
+    """Returns a random count as a string, or occasionally an empty or unparseable value."""
+    roll = rng.random()
+    if roll < 0.15:
+        return ''
+    if roll < 0.18:
+        return 'NA'
+    if roll < 0.22:
+        return '0'
+    return str(rng.randint(0, upper))
+
+
+def _text_cell(value: str) -> _FakeCell:
+    return _FakeCell(ctype=1, value=value) if value else _FakeCell(ctype=0, value='')
+
+
+def build_synthetic_sources(num_days: int, num_facilities: int, seed: int = 0) \
+        -> Tuple[List[str], _FakeWorkbook, List[str], covid_aggregator.FacilityInfoMapping]:
+    """Returns the lines of a prison CSV, a UCLA workbook, the lines of a Recidiviz CSV and the facility info mapping
+    for |num_facilities| facilities reporting daily over |num_days| days."""
+    rng = random.Random(seed)
+
+    mapping = covid_aggregator.FacilityInfoMapping()
+    facilities = []
+    for i in range(num_facilities):
+        state = _STATES[i % len(_STATES)]
+        facility_type = 'Federal Prisons' if state == 'Federal' else 'State Prisons'
+        canonical_name = f'Facility {i}'
+        alternate_name = f'FACILITY #{i} '
+        for name in (canonical_name, alternate_name):
+            mapping.add_facility(state, name, canonical_name, facility_type)
+        facilities.append((state, canonical_name, alternate_name, facility_type))
+    # Facilities that are not in the mapping, whose rows are dropped
+    facilities.extend((state, f'Unmapped {state}', f'Unmapped {state}', 'Jails') for state in _STATES)
+
+    prison_lines = [','.join(_PRISON_COLUMNS)]
+    recidiviz_lines = [','.join(_RECIDIVIZ_COLUMNS)]
+    ucla_sheets = [_FakeSheet('Summary', [[_text_cell('Summary')]])]
+
+    start_date = datetime.date(2020, 4, 1)
+    for day in range(num_days):
+        date = start_date + datetime.timedelta(days=day)
+        ucla_date = f'{date.month}/{date.day}/{date.year}'
+        ucla_rows = [[_text_cell(column) for column in _UCLA_COLUMNS]]
+
+        for state, canonical_name, alternate_name, facility_type in facilities:
+            scale = 10 * (day + 1)
+            if rng.random() < 0.7:
+                name = canonical_name if rng.random() < 0.5 else alternate_name.lower()
+                prison_row = [date.isoformat() if rng.random() > 0.01 else 'NA', state, name] + \
+                    [_count(rng, scale) for _ in _PRISON_COLUMNS[3:]]
+                prison_lines.append(','.join(f' {value} ' for value in prison_row))
+            if rng.random() < 0.5:
+                ucla_values = [ucla_date, state, alternate_name] + [_count(rng, scale) for _ in range(6)] + \
+                    ['https://example.com', 'Some notes' if rng.random() < 0.1 else '']
+                cells = [_text_cell(value) for value in ucla_values]
+                # Numeric cells are read as floats
+                cells[3] = _FakeCell(ctype=2, value=float(rng.randint(0, scale)))
+                ucla_rows.append(cells)
+            if rng.random() < 0.3:
+                recidiviz_row = [f'{date.month:02}/{date.day:02}/{date.year}', facility_type, state,
+                                 canonical_name] + [_count(rng, scale) for _ in range(8)] + \
+                    ['https://example.org', 'Other notes' if rng.random() < 0.1 else '']
+                recidiviz_lines.append(','.join(recidiviz_row))
+
+        ucla_sheets.append(_FakeSheet(f'{date.month}.{date.day}.{date.year % 100}', ucla_rows))
+
+    return prison_lines, _FakeWorkbook(ucla_sheets), recidiviz_lines, mapping
+
+
+def aggregate_synthetic_sources(prison_lines: List[str],
+                                ucla_workbook: _FakeWorkbook,
+                                recidiviz_lines: List[str],
+                                mapping: covid_aggregator.FacilityInfoMapping) -> str:
+    """Runs covid_aggregator.aggregate over the provided synthetic sources."""
+    with mock.patch.object(covid_aggregator, '_fetch_facility_info_mapping', return_value=mapping):
+        return covid_aggregator.aggregate(csv.DictReader(prison_lines, delimiter=','),
+                                          ucla_workbook,
+                                          csv.DictReader(recidiviz_lines, delimiter=','))
+
+
+def _time(name: str, fn: Callable[[], Any], repeat: int) -> None:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    logging.info('%-45s %8.3f s', name, best)
+
+
+def main(num_days: int, num_facilities: int, repeat: int) -> None:
+    prison_lines, ucla_workbook, recidiviz_lines, mapping = build_synthetic_sources(num_days, num_facilities)
+    logging.info('Built %d prison rows, %d UCLA sheets and %d Recidiviz rows', len(prison_lines) - 1,
+                 len(ucla_workbook.sheets()), len(recidiviz_lines) - 1)
+
+    output = aggregate_synthetic_sources(prison_lines, ucla_workbook, recidiviz_lines, mapping)
+    logging.info('Aggregated into %d output rows', len(output.splitlines()) - 1)
+
+    _time('aggregate', lambda: aggregate_synthetic_sources(prison_lines, ucla_workbook, recidiviz_lines, mapping),
+          repeat)
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--facilities', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    args = _parse_arguments()
+    main(args.days, args.facilities, args.repeat)
@@ -0,0 +1,137 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Microbenchmark for the entity tree traversal helpers in entity_utils, run over a large synthetic StatePerson tree.
+
+Times is_placeholder, get_all_entities_from_tree / get_entities_by_type and prune_dangling_placeholders_from_tree on
+both the Entity and the schema version of the tree, with the per-class field classification cache warm, and with the
+cache cleared before every call (which approximates the cost of recomputing the classification on every call).
+
+Example usage:
+
+python -m recidiviz.tools.benchmarks.entity_utils_benchmark \
+    --sentence-groups 20 \
+    --supervision-periods 50 \
+    --repeat 3
+"""
+import argparse
+import datetime
+import logging
+import timeit
+from typing import Callable, List
+
+from recidiviz.common.constants.charge import ChargeStatus
+from recidiviz.common.constants.state.state_sentence import StateSentenceStatus
+from recidiviz.common.constants.state.state_supervision import StateSupervisionType
+from recidiviz.persistence.database.schema_entity_converter import schema_entity_converter as converter
+from recidiviz.persistence.entity.core_entity import CoreEntity
+from recidiviz.persistence.entity.entity_utils import get_entity_field_classification, is_placeholder, \
+    get_all_entities_from_tree, get_entities_by_type, prune_dangling_placeholders_from_tree, \
+    SchemaEdgeDirectionChecker
+from recidiviz.persistence.entity.state import entities
+
+_STATE_CODE = 'US_XX'
+
+
+def build_synthetic_person(num_sentence_groups: int, num_supervision_periods: int) -> entities.StatePerson:
+    """Returns a StatePerson with |num_sentence_groups| sentence groups, each with one supervision sentence that has
+    |num_supervision_periods| supervision periods, each with a violation and two violation responses."""
+    person = entities.StatePerson.new_with_defaults()
+    person.external_ids = [entities.StatePersonExternalId.new_with_defaults(
+        state_code=_STATE_CODE, external_id='PERSON_1', id_type='US_XX_ID', person=person)]
+
+    for sg_index in range(num_sentence_groups):
+        sentence_group = entities.StateSentenceGroup.new_with_defaults(
+            state_code=_STATE_CODE, external_id=f'SG_{sg_index}', status=StateSentenceStatus.SERVING,
+            person=person)
+        supervision_sentence = entities.StateSupervisionSentence.new_with_defaults(
+            state_code=_STATE_CODE, external_id=f'SS_{sg_index}', status=StateSentenceStatus.SERVING,
+            supervision_type=StateSupervisionType.PROBATION, person=person, sentence_group=sentence_group)
+        sentence_group.supervision_sentences = [supervision_sentence]
+        supervision_sentence.charges = [entities.StateCharge.new_with_defaults(
+            state_code=_STATE_CODE, external_id=f'CHARGE_{sg_index}', status=ChargeStatus.PRESENT_WITHOUT_INFO,
+            person=person, supervision_sentences=[supervision_sentence])]
+
+        for sp_index in range(num_supervision_periods):
+            start_date = datetime.date(2000, 1, 1) + datetime.timedelta(days=sp_index * 30)
+            supervision_period = entities.StateSupervisionPeriod.new_with_defaults(
+                state_code=_STATE_CODE, external_id=f'SP_{sg_index}_{sp_index}', start_date=start_date,
+                termination_date=start_date + datetime.timedelta(days=29), person=person,
+                supervision_sentences=[supervision_sentence])
+            violation = entities.StateSupervisionViolation.new_with_defaults(
+                state_code=_STATE_CODE, external_id=f'SV_{sg_index}_{sp_index}', violation_date=start_date,
+                person=person, supervision_periods=[supervision_period])
+            violation.supervision_violation_responses = [
+                entities.StateSupervisionViolationResponse.new_with_defaults(
+                    state_code=_STATE_CODE, external_id=f'SVR_{sg_index}_{sp_index}_{i}', response_date=start_date,
+                    person=person, supervision_violation=violation)
+                for i in range(2)
+            ]
+            supervision_period.supervision_violation_entries = [violation]
+            supervision_sentence.supervision_periods.append(supervision_period)
+
+        person.sentence_groups.append(sentence_group)
+
+    return person
+
+
+def _clear_caches() -> None:
+    get_entity_field_classification.cache_clear()
+    SchemaEdgeDirectionChecker.state_direction_checker.cache_clear()  # type: ignore
+
+
+def _traverse(root: CoreEntity, all_entities: List[CoreEntity], clear_caches: bool) -> None:
+    for entity in all_entities:
+        if clear_caches:
+            _clear_caches()
+        is_placeholder(entity)
+
+    get_entities_by_type([root])
+    prune_dangling_placeholders_from_tree(root)
+
+
+def _time(name: str, fn: Callable[[], None], repeat: int) -> None:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    logging.info('%-45s %8.3f s', name, best)
+
+
+def main(num_sentence_groups: int, num_supervision_periods: int, repeat: int) -> None:
+    person = build_synthetic_person(num_sentence_groups, num_supervision_periods)
+    schema_person = converter.convert_entity_people_to_schema_people([person])[0]
+
+    entity_tree = get_all_entities_from_tree(person)
+    schema_tree = list(get_all_entities_from_tree(schema_person))  # type: ignore
+    logging.info('Built synthetic StatePerson tree with %d entities', len(entity_tree))
+
+    _time('entity tree, cached classification', lambda: _traverse(person, entity_tree, False), repeat)
+    _time('entity tree, classification per call', lambda: _traverse(person, entity_tree, True), repeat)
+    _time('schema tree, cached classification', lambda: _traverse(schema_person, schema_tree, False), repeat)
+    _time('schema tree, classification per call', lambda: _traverse(schema_person, schema_tree, True), repeat)
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sentence-groups', type=int, default=20)
+    parser.add_argument('--supervision-periods', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    args = _parse_arguments()
+    main(args.sentence_groups, args.supervision_periods, args.repeat)
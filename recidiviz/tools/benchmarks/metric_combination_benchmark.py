@@ -0,0 +1,162 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Profile of the fused Calculate -> Produce steps of the supervision pipeline, run over synthetic people with a
+supervision population bucket for each month on supervision.
+
+Times, per person, the three steps that run in the same fused stage on Dataflow:
+    - map_supervision_combinations, which expands each bucket into (combo, value) pairs,
+    - building a SupervisionMetric from each pair, as ProduceSupervisionMetrics does, and
+    - converting each metric into the dictionary that is written to BigQuery,
+and reports how much of the combination step is spent in augmented_combo_for_calculations, which is the part of the
+per-element work that a columnar combination engine would replace.
+
+Example usage:
+
+python -m recidiviz.tools.benchmarks.metric_combination_benchmark \
+    --people 200 \
+    --months 36 \
+    --repeat 3
+"""
+import argparse
+import cProfile
+import datetime
+import logging
+import pstats
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+from recidiviz.calculator.pipeline.supervision import calculator
+from recidiviz.calculator.pipeline.supervision.metrics import SupervisionMetricType, SupervisionPopulationMetric, \
+    SupervisionMetric
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
+    NonRevocationReturnSupervisionTimeBucket, SupervisionTimeBucket
+from recidiviz.calculator.pipeline.utils.calculator_utils import last_day_of_month
+from recidiviz.calculator.pipeline.utils.metric_utils import json_serializable_metric_key
+from recidiviz.common.constants.person_characteristics import Gender, Race, Ethnicity
+from recidiviz.common.constants.state.state_assessment import StateAssessmentLevel, StateAssessmentType
+from recidiviz.common.constants.state.state_case_type import StateSupervisionCaseType
+from recidiviz.common.constants.state.state_supervision_period import StateSupervisionPeriodSupervisionType, \
+    StateSupervisionLevel
+from recidiviz.persistence.entity.state import entities
+
+_STATE_CODE = 'US_ND'
+_JOB_ID = 'benchmark_job'
+
+_METRIC_INCLUSIONS = {metric_type: metric_type == SupervisionMetricType.POPULATION
+                      for metric_type in SupervisionMetricType}
+
+
+def build_synthetic_person(person_id: int, num_months: int) \
+        -> Tuple[entities.StatePerson, List[SupervisionTimeBucket]]:
+    """Returns a StatePerson and a supervision population bucket for each of the |num_months| months up to and
+    including the current month."""
+    person = entities.StatePerson.new_with_defaults(
+        person_id=person_id, birthdate=datetime.date(1980, 1, 1), gender=Gender.FEMALE)
+    person.races = [entities.StatePersonRace.new_with_defaults(state_code=_STATE_CODE, race=Race.WHITE)]
+    person.ethnicities = [entities.StatePersonEthnicity.new_with_defaults(
+        state_code=_STATE_CODE, ethnicity=Ethnicity.NOT_HISPANIC)]
+
+    first_month = datetime.date.today().replace(day=1) - relativedelta(months=num_months - 1)
+    buckets: List[SupervisionTimeBucket] = []
+    for i in range(num_months):
+        bucket_date = last_day_of_month(first_month + relativedelta(months=i))
+        buckets.append(NonRevocationReturnSupervisionTimeBucket(
+            state_code=_STATE_CODE, year=bucket_date.year, month=bucket_date.month, bucket_date=bucket_date,
+            is_on_supervision_last_day_of_month=True,
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION,
+            case_type=StateSupervisionCaseType.GENERAL,
+            supervision_level=StateSupervisionLevel.MEDIUM,
+            supervision_level_raw_text='MED',
+            assessment_score=20,
+            assessment_level=StateAssessmentLevel.MODERATE,
+            assessment_type=StateAssessmentType.LSIR,
+            supervising_officer_external_id=f'OFFICER_{person_id % 50}',
+            supervising_district_external_id=f'DISTRICT_{person_id % 5}'))
+    return person, buckets
+
+
+def _combinations(people: List[Tuple[entities.StatePerson, List[SupervisionTimeBucket]]],
+                  num_months: int) -> List[Tuple[Dict[str, Any], Any]]:
+    combinations: List[Tuple[Dict[str, Any], Any]] = []
+    for person, buckets in people:
+        combinations.extend(calculator.map_supervision_combinations(
+            person, buckets, _METRIC_INCLUSIONS, calculation_end_month=None, calculation_month_count=num_months))
+    return combinations
+
+
+def _metrics(combinations: List[Tuple[Dict[str, Any], Any]]) -> List[SupervisionMetric]:
+    """Builds metrics from the |combinations| the way ProduceSupervisionMetrics does for population combinations."""
+    metrics = []
+    for combo, _value in combinations:
+        dict_metric_key = dict(combo)
+        dict_metric_key['count'] = 1
+        metric = SupervisionPopulationMetric.build_from_metric_key_group(dict_metric_key, _JOB_ID)
+        if metric:
+            metrics.append(metric)
+    return metrics
+
+
+def _bigquery_rows(metrics: List[SupervisionMetric]) -> List[Dict[str, Any]]:
+    return [json_serializable_metric_key(metric.__dict__) for metric in metrics]
+
+
+def _time(name: str, fn: Callable[[], Any], repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    logging.info('%-45s %8.3f s', name, best)
+    return best
+
+
+def main(num_people: int, num_months: int, repeat: int) -> None:
+    people = [build_synthetic_person(person_id, num_months) for person_id in range(num_people)]
+    combinations = _combinations(people, num_months)
+    metrics = _metrics(combinations)
+    logging.info('Built %d people with %d buckets each, producing %d combinations',
+                 num_people, num_months, len(combinations))
+
+    combination_seconds = _time('map_supervision_combinations', lambda: _combinations(people, num_months), repeat)
+    metric_seconds = _time('Build metrics from combinations', lambda: _metrics(combinations), repeat)
+    row_seconds = _time('Convert metrics to BigQuery rows', lambda: _bigquery_rows(metrics), repeat)
+    total_seconds = combination_seconds + metric_seconds + row_seconds
+
+    profiler = cProfile.Profile()
+    profiler.runcall(_combinations, people, num_months)
+    stats = pstats.Stats(profiler)
+    profiled_total = stats.total_tt
+    augment_seconds = sum(cumulative for (_, _, function_name), (_, _, _, cumulative, _) in stats.stats.items()
+                          if function_name == 'augmented_combo_for_calculations')
+
+    logging.info('%-45s %8.1f %%', 'Share of fused stage in combinations', 100 * combination_seconds / total_seconds)
+    logging.info('%-45s %8.1f %%', 'Share of combinations in augmented combos', 100 * augment_seconds / profiled_total)
+    logging.info('%-45s %8.1f %%', 'Share of fused stage in augmented combos',
+                 100 * augment_seconds / profiled_total * combination_seconds / total_seconds)
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--people', type=int, default=200)
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    args = _parse_arguments()
+    main(args.people, args.months, args.repeat)
@@ -0,0 +1,134 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Benchmark for StateEntityMatcher matching a single person with thousands of children against its DB counterpart.
+
+Times matching with the DbEntityTreeIndex candidate lookup and with every ingested child compared against every DB
+child of the same class (the behavior before the index existed). No database is required - the DB person is built in
+memory and given fake primary keys.
+
+Example usage:
+
+python -m recidiviz.tools.benchmarks.state_entity_matcher_benchmark \
+    --supervision-periods 2000 \
+    --repeat 3
+"""
+import argparse
+import datetime
+import logging
+import timeit
+from typing import List
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
+from recidiviz.persistence.entity_matching.state.base_state_matching_delegate import BaseStateMatchingDelegate
+from recidiviz.persistence.entity_matching.state.db_entity_tree_index import DbEntityTreeIndex
+from recidiviz.persistence.entity_matching.state.state_entity_matcher import StateEntityMatcher
+
+_STATE_CODE = 'US_XX'
+
+
+class _BenchmarkMatchingDelegate(BaseStateMatchingDelegate):
+    """Matching delegate with no state-specific logic that does not require a region config."""
+
+    def __init__(self):  # pylint: disable=super-init-not-called
+        self.region_code = _STATE_CODE.lower()
+        self.region = None
+
+    def read_potential_match_db_persons(self, session, ingested_persons, loading_profile=None):
+        raise NotImplementedError
+
+
+def _build_person(num_supervision_periods: int, with_ids: bool) -> schema.StatePerson:
+    """Returns a schema StatePerson with a single supervision sentence that has |num_supervision_periods| supervision
+    periods, each with a violation that has a violation response. If |with_ids| is set, all entities are given
+    primary keys, as if they had been read from the DB."""
+    next_id = iter(range(1, 10 * num_supervision_periods + 100))
+
+    def _id():
+        return next(next_id) if with_ids else None
+
+    person = schema.StatePerson(person_id=_id())
+    person.external_ids = [schema.StatePersonExternalId(
+        person_external_id_id=_id(), state_code=_STATE_CODE, external_id='PERSON_1', id_type='US_XX_ID')]
+    sentence_group = schema.StateSentenceGroup(
+        sentence_group_id=_id(), state_code=_STATE_CODE, external_id='SG_1', status='SERVING')
+    supervision_sentence = schema.StateSupervisionSentence(
+        supervision_sentence_id=_id(), state_code=_STATE_CODE, external_id='SS_1', status='SERVING')
+
+    for i in range(num_supervision_periods):
+        start_date = datetime.date(2000, 1, 1) + datetime.timedelta(days=i)
+        supervision_period = schema.StateSupervisionPeriod(
+            supervision_period_id=_id(), state_code=_STATE_CODE, external_id=f'SP_{i}', status='PRESENT_WITHOUT_INFO',
+            start_date=start_date)
+        violation = schema.StateSupervisionViolation(
+            supervision_violation_id=_id(), state_code=_STATE_CODE, external_id=f'SV_{i}', violation_date=start_date)
+        violation.supervision_violation_responses = [schema.StateSupervisionViolationResponse(
+            supervision_violation_response_id=_id(), state_code=_STATE_CODE, external_id=f'SVR_{i}',
+            response_date=start_date)]
+        supervision_period.supervision_violation_entries = [violation]
+        supervision_sentence.supervision_periods.append(supervision_period)
+
+    sentence_group.supervision_sentences = [supervision_sentence]
+    person.sentence_groups = [sentence_group]
+    return person
+
+
+def _match(num_supervision_periods: int) -> None:
+    db_person = _build_person(num_supervision_periods, with_ids=True)
+    ingested_person = _build_person(num_supervision_periods, with_ids=False)
+
+    matcher = StateEntityMatcher(_BenchmarkMatchingDelegate())
+    matcher.set_session(Session())
+    matcher.set_root_entity_cache([db_person])
+    matched_entities = matcher._match_persons(  # pylint: disable=protected-access
+        ingested_persons=[ingested_person], db_persons=[db_person]).build()
+
+    if matched_entities.error_count or len(matched_entities.people) != 1:
+        raise ValueError(f'Unexpected matching result: {matched_entities}')
+
+
+def _get_all_candidates(index: DbEntityTreeIndex, _ingested_entity) -> List[EntityTree]:
+    return index.db_entity_trees
+
+
+def main(num_supervision_periods: int, repeat: int) -> None:
+    logging.info('Matching a person with [%d] supervision periods, violations and violation responses',
+                 num_supervision_periods)
+
+    indexed_time = min(timeit.repeat(lambda: _match(num_supervision_periods), number=1, repeat=repeat))
+    logging.info('%-30s %8.3f s', 'with index', indexed_time)
+
+    with patch.object(DbEntityTreeIndex, 'get_match_candidates', new=_get_all_candidates):
+        full_scan_time = min(timeit.repeat(lambda: _match(num_supervision_periods), number=1, repeat=repeat))
+    logging.info('%-30s %8.3f s', 'full scan', full_scan_time)
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--supervision-periods', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    args = _parse_arguments()
+    main(args.supervision_periods, args.repeat)
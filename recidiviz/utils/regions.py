@@ -105,6 +105,14 @@ class Region:
     raw_data_bq_imports_enabled_env = attr.ib(default=None)
     ingest_view_exports_enabled_env = attr.ib(default=None)
 
+    # If set, entity matching for this region reads the relationships of DB people that lead to ingested entity types
+    # with this loading strategy ('selectin' or 'subquery') instead of the schema default.
+    entity_matching_loading_strategy: Optional[str] = attr.ib(default=None)
+
+    # If set, consecutive split files of the same ingest file are processed in a single ingest job, reusing the person
+    # trees matched by earlier splits from an in-memory cache of at most this many people.
+    split_file_person_tree_cache_size: Optional[int] = attr.ib(default=None)
+
     def __attrs_post_init__(self):
         if self.queue and self.shared_queue:
             raise ValueError(